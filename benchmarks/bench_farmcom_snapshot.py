@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: per-element WebDriver extraction vs single-snapshot extraction
+for the Russia Farmcom VED table (scripts/Russia/farmcom_snapshot.py).
+
+Pages come from --pages DIR (saved *.html pages or table outerHTML dumps) or
+are generated (--synthetic N, 100 main rows + 100 EAN rows each).
+
+Without --driver only the local snapshot parse is timed. With --driver each
+page is opened in headless Chrome via file:// and both paths are timed in
+the browser: the legacy per-cell reads (find_elements / .text /
+get_attribute / nextElementSibling per row) and the one-call outerHTML
+snapshot + lxml parse. Rows from both paths are compared.
+
+Usage:
+    python benchmarks/bench_farmcom_snapshot.py --synthetic 20
+    python benchmarks/bench_farmcom_snapshot.py --pages saved_pages/ --driver
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RUSSIA_DIR = REPO_ROOT / "scripts" / "Russia"
+for _p in (REPO_ROOT, RUSSIA_DIR):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from farmcom_snapshot import (
+    extract_ean, extract_price_and_date, item_id_from_linkhref,
+    parse_report_table, snapshot_table,
+)
+
+
+def make_page(rng: random.Random, rows: int = 100) -> str:
+    trs = []
+    for i in range(rows):
+        item_id = rng.randint(10_000, 99_999)
+        ean = "".join(rng.choice("0123456789") for _ in range(13))
+        price = f"{rng.randint(1, 99_999)}.{rng.randint(0, 99):02d}"
+        date = f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/20{rng.randint(10, 25)}"
+        trs.append(
+            "<tr>"
+            f"<td onclick=\"showInfo({item_id})\"><img class=\"bullet\" linkhref=\"frm_reestr_det.php?value={price}&amp;item_id={item_id}\"></td>"
+            f"<td>{i + 1}</td><td>Трейд {item_id}</td><td>МНН {i % 37}</td>"
+            f"<td>Производитель {i % 11}, Россия</td>"
+            f"<td>таблетки {rng.randint(1, 500)} мг, {rng.randint(10, 100)} шт. <a class=\"info\" onclick=\"getEanCode({item_id})\">Barcode</a></td>"
+            f"<td>{price}<br>{date}</td>"
+            "</tr>"
+            f"<tr class=\"gray\"><td></td><td></td><td></td><td></td><td></td><td>{ean}</td><td></td></tr>"
+        )
+    return ("<html><body><table class=\"report\"><thead><tr><th>#</th></tr></thead><tbody>"
+            + "".join(trs) + "</tbody></table></body></html>")
+
+
+def load_pages(args) -> list:
+    if args.pages:
+        return [p.read_text(encoding="utf-8", errors="replace")
+                for p in sorted(Path(args.pages).glob("*.htm*"))]
+    rng = random.Random(args.seed)
+    return [make_page(rng) for _ in range(args.synthetic)]
+
+
+def legacy_extract(driver, page_num: int = 0) -> list:
+    """Per-element path, mirroring extract_rows_from_table (FETCH_EAN on)."""
+    from selenium.webdriver.common.by import By
+
+    rows = []
+    for tr in driver.find_elements(By.CSS_SELECTOR, "table.report tbody tr"):
+        bullets = tr.find_elements(By.CSS_SELECTOR, "img.bullet[linkhref]")
+        if not bullets:
+            continue
+        item_id = item_id_from_linkhref(bullets[0].get_attribute("linkhref") or "")
+        if not item_id:
+            continue
+        tds = tr.find_elements(By.CSS_SELECTOR, "td")
+        if len(tds) < 7:
+            continue
+        release_form_full = tds[5].text.strip()
+        price, date_text = extract_price_and_date(tds[6].text)
+        ean = ""
+        next_tr = driver.execute_script("return arguments[0].nextElementSibling;", tr)
+        if next_tr and not next_tr.find_elements(By.CSS_SELECTOR, "img.bullet[linkhref]"):
+            next_tds = next_tr.find_elements(By.CSS_SELECTOR, "td")
+            if len(next_tds) >= 6:
+                ean = extract_ean(next_tds[5].text.strip())
+        if not ean:
+            ean = extract_ean(release_form_full)
+        rows.append({
+            "item_id": item_id,
+            "tn": tds[2].text.strip(),
+            "inn": tds[3].text.strip(),
+            "manufacturer_country": tds[4].text.strip(),
+            "release_form": re.sub(r"\b(Barcode|\d{8,14})\b\s*$", "", release_form_full).strip(),
+            "ean": ean,
+            "registered_price_rub": price,
+            "start_date_text": date_text,
+            "page_number": page_num,
+        })
+    return rows
+
+
+def bench_local(pages: list) -> None:
+    from lxml import html
+
+    tables = []
+    for page in pages:
+        root = html.fromstring(page)
+        found = root.xpath("//table[contains(concat(' ', normalize-space(@class), ' '), ' report ')]")
+        tables.append(html.tostring(found[0], encoding="unicode") if found else page)
+
+    t0 = time.perf_counter()
+    total = 0
+    malformed = 0
+    for i, table_html in enumerate(tables, 1):
+        result = parse_report_table(table_html, i)
+        if result is None:
+            malformed += 1
+        else:
+            total += len(result.rows)
+    elapsed = time.perf_counter() - t0
+    print(f"snapshot parse (local): {total:,} rows from {len(tables)} pages in {elapsed:.3f}s "
+          f"-> {total / max(elapsed, 1e-9):,.0f} rows/s ({malformed} malformed)")
+
+
+def bench_driver(pages: list) -> None:
+    from core.browser.driver_factory import create_chrome_driver
+
+    driver = create_chrome_driver(headless=True)
+    legacy_rows = snap_rows = 0
+    legacy_s = snap_s = 0.0
+    mismatched = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, page in enumerate(pages, 1):
+                path = Path(tmp) / f"page_{i}.html"
+                path.write_text(page, encoding="utf-8")
+                driver.get(path.as_uri())
+
+                t0 = time.perf_counter()
+                before = legacy_extract(driver, i)
+                legacy_s += time.perf_counter() - t0
+
+                t0 = time.perf_counter()
+                result = parse_report_table(snapshot_table(driver), i)
+                snap_s += time.perf_counter() - t0
+                after = result.rows if result else []
+
+                legacy_rows += len(before)
+                snap_rows += len(after)
+                if before != after:
+                    mismatched += 1
+    finally:
+        driver.quit()
+
+    print(f"per-element (before): {legacy_rows:,} rows in {legacy_s:.2f}s -> {legacy_rows / max(legacy_s, 1e-9):,.0f} rows/s")
+    print(f"snapshot    (after):  {snap_rows:,} rows in {snap_s:.2f}s -> {snap_rows / max(snap_s, 1e-9):,.0f} rows/s")
+    print(f"speedup: {legacy_s / max(snap_s, 1e-9):.1f}x, pages with differing rows: {mismatched}/{len(pages)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="Directory of saved *.html pages")
+    parser.add_argument("--synthetic", type=int, default=20, help="Generated pages when --pages is not given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--driver", action="store_true", help="Also time both paths in headless Chrome")
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        sys.exit("No pages to benchmark")
+    bench_local(pages)
+    if args.driver:
+        bench_driver(pages)
+
+
+if __name__ == "__main__":
+    main()
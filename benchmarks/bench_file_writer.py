@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: DataWriter vs BufferedDataWriter
+
+Writes N synthetic product records with each writer configuration and
+reports records/sec.
+
+Usage:
+    python benchmarks/bench_file_writer.py --records 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from core.io.file_writer import DataWriter, BufferedDataWriter, ZSTD_AVAILABLE
+
+FIELDS = ["product_id", "name", "company", "price", "currency", "url"]
+
+
+def make_record(i: int) -> dict:
+    return {
+        "product_id": i,
+        "name": f"Product {i} 500mg tablets",
+        "company": f"Company {i % 997}",
+        "price": f"{(i % 10000) / 100:.2f}",
+        "currency": "EUR",
+        "url": f"https://example.org/products/{i}",
+    }
+
+
+def bench_data_writer(out_dir: Path, n: int) -> float:
+    records = [make_record(i) for i in range(n)]
+    start = time.perf_counter()
+    with DataWriter(out_dir, "legacy.jsonl") as w:
+        for rec in records:
+            w.write_jsonl(rec)
+    return time.perf_counter() - start
+
+
+def bench_buffered(out_dir: Path, n: int, **kwargs) -> float:
+    records = [make_record(i) for i in range(n)]
+    start = time.perf_counter()
+    with BufferedDataWriter(out_dir, kwargs.pop("filename", "buffered.jsonl"), **kwargs) as w:
+        for rec in records:
+            w.write(rec)
+    return time.perf_counter() - start
+
+
+def run(n: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        results["DataWriter (flush per record)"] = bench_data_writer(out, n)
+        results["BufferedDataWriter jsonl"] = bench_buffered(out, n)
+        results["BufferedDataWriter jsonl inline"] = bench_buffered(out, n, background=False)
+        results["BufferedDataWriter csv"] = bench_buffered(
+            out, n, filename="buffered.csv", fmt="csv", fieldnames=FIELDS
+        )
+        results["BufferedDataWriter jsonl gzip"] = bench_buffered(
+            out, n, compression="gzip", compress_level=1
+        )
+        if ZSTD_AVAILABLE:
+            results["BufferedDataWriter jsonl zstd"] = bench_buffered(
+                out, n, compression="zstd", compress_level=3
+            )
+    return {name: n / secs for name, secs in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark output writers")
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rates = run(args.records)
+    baseline = rates["DataWriter (flush per record)"]
+    print(f"{'writer':<36} {'records/sec':>14} {'speedup':>8}")
+    for name, rate in rates.items():
+        print(f"{name:<36} {rate:>14,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: scalar vs batch price/date parsers
+
+Builds a column of N raw values (with realistic repetition) and times the
+row-by-row scalar functions against parse_prices / ar_money_to_floats /
+parse_dates. Also checks that both produce identical output.
+
+Usage:
+    python benchmarks/bench_parsers.py --rows 1000000 --distinct 50000
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import pandas as pd
+
+from core.parsing.date_parser import parse_date, parse_dates
+from core.parsing.price_parser import ar_money_to_float, ar_money_to_floats, parse_price, parse_prices
+
+
+def make_prices(rows: int, distinct: int, rng: random.Random) -> pd.Series:
+    pool = []
+    for _ in range(distinct):
+        whole = rng.randint(1, 999_999)
+        cents = rng.randint(0, 99)
+        pool.append(f"$ {whole:,}".replace(",", ".") + f",{cents:02d}")
+    pool += ["", "s/d", "Consultar"]
+    return pd.Series(rng.choices(pool, k=rows))
+
+
+def make_dates(rows: int, distinct: int, rng: random.Random) -> pd.Series:
+    pool = []
+    for _ in range(distinct):
+        d, m, y = rng.randint(1, 31), rng.randint(1, 12), rng.randint(0, 30)
+        fmt = rng.random()
+        if fmt < 0.6:
+            pool.append(f"({d:02d}/{m:02d}/{y:02d})")
+        elif fmt < 0.9:
+            pool.append(f"{d:02d}/{m:02d}/{y:02d}")
+        else:
+            pool.append(f"{d}.{m}.{2000 + y}")
+    pool += ["", "n/a"]
+    return pd.Series(rng.choices(pool, k=rows))
+
+
+def _same(a, b) -> bool:
+    na = a is None or (isinstance(a, float) and math.isnan(a))
+    nb = b is None or (isinstance(b, float) and math.isnan(b))
+    return (na and nb) or a == b
+
+
+def bench(name, series, scalar, batch):
+    start = time.perf_counter()
+    expected = [scalar(v) for v in series]
+    scalar_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = batch(series).tolist()
+    batch_secs = time.perf_counter() - start
+
+    ok = all(_same(a, b) for a, b in zip(got, expected))
+    n = len(series)
+    print(f"{name:<20} scalar {n / scalar_secs:>12,.0f}/s   batch {n / batch_secs:>12,.0f}/s   "
+          f"speedup {scalar_secs / batch_secs:>6.1f}x   match={ok}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch parsers")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    prices = make_prices(args.rows, args.distinct, rng)
+    dates = make_dates(args.rows, args.distinct, rng)
+
+    ok = bench("parse_price", prices, parse_price, parse_prices)
+    ok &= bench("ar_money_to_float", prices, ar_money_to_float, ar_money_to_floats)
+    ok &= bench("parse_date", dates, parse_date, parse_dates)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
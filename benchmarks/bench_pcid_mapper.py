@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: PcidMapper row-by-row find_match vs bulk match_many + fuzzy fallback
+
+Builds a synthetic PCID reference (product + generic + pack) and a product
+table sampled from it: most rows match exactly after normalization, some
+carry a typo (fuzzy stage), some are unknown. Times the per-row loop on a
+sample, the bulk exact stage on all rows and the fuzzy stage on the
+leftovers, and checks the bulk result equals the per-row one.
+
+Usage:
+    python benchmarks/bench_pcid_mapper.py --rows 1000000 --refs 100000
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import pandas as pd
+
+from core.utils.pcid_mapper import RAPIDFUZZ_AVAILABLE, PcidMapper
+
+STRATEGIES = [
+    {"Local Pack Code": "local_pack_code"},
+    {"Product": "local_product_name", "Generic": "generic_name", "Pack": "local_pack_description"},
+]
+
+
+def _word(rng: random.Random, lo: int = 4, hi: int = 10) -> str:
+    return "".join(rng.choices(string.ascii_uppercase, k=rng.randint(lo, hi)))
+
+
+def make_reference(refs: int, rng: random.Random) -> list:
+    generics = [_word(rng, 6, 12) for _ in range(max(1, refs // 20))]
+    rows = []
+    for i in range(refs):
+        rows.append({
+            "pcid": "OOS" if rng.random() < 0.02 else f"PC{i:07d}",
+            "local_pack_code": f"{i:07d}" if rng.random() < 0.3 else "",
+            "local_product_name": f"{_word(rng)} {_word(rng, 3, 6)} {i}",
+            "generic_name": rng.choice(generics),
+            "local_pack_description": f"{rng.choice([10, 20, 28, 30, 60, 100])} {rng.choice(['TAB', 'CAP', 'ML'])}",
+        })
+    return rows
+
+
+def _typo(text: str, rng: random.Random) -> str:
+    pos = rng.randrange(len(text))
+    return text[:pos] + text[pos + 1:]
+
+
+def make_products(rows: int, reference: list, rng: random.Random) -> pd.DataFrame:
+    data = {"Local Pack Code": [], "Product": [], "Generic": [], "Pack": []}
+    for _ in range(rows):
+        ref = rng.choice(reference)
+        kind = rng.random()
+        product = ref["local_product_name"]
+        if kind < 0.80:
+            product = product.lower().replace(" ", "-")  # exact after normalization
+        elif kind < 0.92:
+            product = _typo(product, rng)  # fuzzy territory
+        else:
+            product = f"{_word(rng)} {_word(rng)}"  # unknown
+        data["Local Pack Code"].append(ref["local_pack_code"] if rng.random() < 0.5 else None)
+        data["Product"].append(product)
+        data["Generic"].append(ref["generic_name"].title())
+        data["Pack"].append(ref["local_pack_description"])
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk PCID matching")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--refs", type=int, default=100_000)
+    parser.add_argument("--loop-rows", type=int, default=100_000,
+                        help="rows timed with the per-row find_match loop (extrapolated)")
+    parser.add_argument("--threshold", type=float, default=90.0)
+    parser.add_argument("--no-fuzzy", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    reference = make_reference(args.refs, rng)
+    products = make_products(args.rows, reference, rng)
+
+    mapper = PcidMapper(STRATEGIES)
+    start = time.perf_counter()
+    mapper.build_reference_store(reference)
+    print(f"build_reference_store  {args.refs:>9,} refs   {time.perf_counter() - start:6.2f}s")
+
+    sample = products.head(args.loop_rows)
+    sample_dicts = sample.astype(object).where(sample.notna(), None).to_dict("records")
+    start = time.perf_counter()
+    loop = [mapper.find_match(p) for p in sample_dicts]
+    loop_secs = time.perf_counter() - start
+    print(f"find_match loop        {len(sample):>9,} rows   {loop_secs:6.2f}s   "
+          f"{len(sample) / loop_secs:>10,.0f}/s   (~{loop_secs * args.rows / max(1, len(sample)):.1f}s for all)")
+
+    start = time.perf_counter()
+    bulk = mapper.match_many(products)
+    bulk_secs = time.perf_counter() - start
+    matched = sum(m is not None for m in bulk)
+    print(f"match_many             {len(products):>9,} rows   {bulk_secs:6.2f}s   "
+          f"{len(products) / bulk_secs:>10,.0f}/s   matched={matched:,}")
+
+    ok = all(a is b for a, b in zip(loop, bulk))
+    print(f"bulk == loop on sample: {ok}")
+
+    if not args.no_fuzzy:
+        if not RAPIDFUZZ_AVAILABLE:
+            print("rapidfuzz not installed; skipping fuzzy stage")
+        else:
+            leftover = products[[m is None for m in bulk]]
+            start = time.perf_counter()
+            mapper._fuzzy_index(len(STRATEGIES) - 1)
+            index_secs = time.perf_counter() - start
+            start = time.perf_counter()
+            candidates = mapper.fuzzy_candidates(leftover, threshold=args.threshold)
+            fuzzy_secs = time.perf_counter() - start
+            found = sum(bool(c) for c in candidates)
+            print(f"fuzzy index build      {args.refs:>9,} refs   {index_secs:6.2f}s")
+            print(f"fuzzy_candidates       {len(leftover):>9,} rows   {fuzzy_secs:6.2f}s   "
+                  f"{len(leftover) / max(fuzzy_secs, 1e-9):>10,.0f}/s   with candidates={found:,}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: pipeline hot-path suite with baseline regression gating
+
+Runs repeatable benchmarks of the core hot paths against synthetic local
+fixtures (seeded, so every run sees the same data):
+
+    parsers       parse_prices / ar_money_to_floats / parse_dates
+    dedup         Deduplicator.find_duplicates (fuzzy, pairwise)
+    diff          detect_changes on two snapshots of the same table
+    pcid          PcidMapper.match_many
+    frontier      CrawlFrontier add/get/complete on fakeredis
+    csv_import    CSVImporter.import_csv            (PostgreSQL)
+    upsert        bulk_insert + upsert_items        (PostgreSQL)
+    queue_claims  URLWorkQueue enqueue/claim/complete (PostgreSQL)
+
+PostgreSQL cases run in a throwaway schema and are skipped when no server is
+reachable (--dsn, BENCHMARK_PG_DSN or the usual POSTGRES_* variables). The
+frontier case is skipped without fakeredis.
+
+Each case gets one warmup and --repeats timed runs. Results go to a JSON file
+(--output) and optionally to the pipeline_benchmarks table (--record-db).
+With --baseline the medians are compared to a stored run using
+core.monitoring.benchmarking.compare_to_baseline and the process exits 1 on
+any regression; --save-baseline writes the current run as the new baseline.
+
+Usage:
+    python benchmarks/run_suite.py --quick --save-baseline benchmarks/baseline.json
+    python benchmarks/run_suite.py --baseline benchmarks/baseline.json --only parsers,pcid
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = Path(__file__).resolve().parent
+for _p in (REPO_ROOT, BENCH_DIR):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+import pandas as pd
+
+from core.monitoring.benchmarking import compare_to_baseline, record_step_benchmark, summarize_samples
+
+try:
+    import psycopg2
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    psycopg2 = None
+    PSYCOPG2_AVAILABLE = False
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    fakeredis = None
+    FAKEREDIS_AVAILABLE = False
+
+
+class SkipCase(Exception):
+    """Raised by a case setup when its backend is unavailable."""
+
+
+CASES = {}
+
+
+def case(name, rows):
+    """Register a case. ``rows`` is the fixture size at --scale 1."""
+    def register(setup):
+        CASES[name] = {"setup": setup, "rows": rows}
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+def _default_dsn() -> str:
+    dsn = os.getenv("BENCHMARK_PG_DSN")
+    if dsn:
+        return dsn
+    return "host={} port={} dbname={} user={} password={}".format(
+        os.getenv("POSTGRES_HOST") or os.getenv("DB_HOST") or "localhost",
+        os.getenv("POSTGRES_PORT") or os.getenv("DB_PORT") or "5432",
+        os.getenv("POSTGRES_DB") or os.getenv("DB_NAME") or "scrappers",
+        os.getenv("POSTGRES_USER") or os.getenv("DB_USER") or "postgres",
+        os.getenv("POSTGRES_PASSWORD") or os.getenv("DB_PASSWORD") or "",
+    )
+
+
+class BenchSchema:
+    """A throwaway schema; every connection opened through it resolves tables there."""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.name = f"bench_{uuid.uuid4().hex[:10]}"
+        self.config = {"dsn": dsn, "options": f"-c search_path={self.name}"}
+        self._conn = None
+
+    def connect(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(**self.config)
+        return self._conn
+
+    def commit(self):
+        self.connect().commit()
+
+    def execute(self, sql, params=None):
+        conn = self.connect()
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+        conn.commit()
+
+    def __enter__(self):
+        if not PSYCOPG2_AVAILABLE:
+            raise SkipCase("psycopg2 not installed")
+        try:
+            conn = psycopg2.connect(self.dsn, connect_timeout=3)
+        except Exception as exc:
+            raise SkipCase(f"PostgreSQL unreachable: {str(exc).strip().splitlines()[0]}")
+        with conn, conn.cursor() as cur:
+            cur.execute(f"CREATE SCHEMA {self.name}")
+        conn.close()
+        return self
+
+    def __exit__(self, *exc):
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        conn = psycopg2.connect(self.dsn)
+        with conn, conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {self.name} CASCADE")
+        conn.close()
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Cases: setup(n, rng, ctx) returns a callable that runs once and returns rows
+# ---------------------------------------------------------------------------
+
+@case("parsers", rows=500_000)
+def _parsers(n, rng, ctx):
+    from bench_parsers import make_dates, make_prices
+    from core.parsing.date_parser import parse_dates
+    from core.parsing.price_parser import ar_money_to_floats, parse_prices
+
+    prices = make_prices(n, max(1, n // 20), rng)
+    dates = make_dates(n, max(1, n // 20), rng)
+
+    def run():
+        parse_prices(prices)
+        ar_money_to_floats(prices)
+        parse_dates(dates)
+        return 3 * n
+    return run
+
+
+@case("dedup", rows=1_500)
+def _dedup(n, rng, ctx):
+    from core.data.deduplicator import RAPIDFUZZ_AVAILABLE, Deduplicator
+
+    if not RAPIDFUZZ_AVAILABLE:
+        raise SkipCase("rapidfuzz not installed")
+    base = [f"{_word(rng)} {_word(rng, 3, 6)} {rng.choice([10, 20, 30])} TAB" for _ in range(n)]
+    values = [v if rng.random() < 0.9 else v[:-1] for v in base]
+    dedup = Deduplicator(threshold=90.0)
+
+    def run():
+        dedup.find_duplicates(values)
+        return n
+    return run
+
+
+@case("diff", rows=200_000)
+def _diff(n, rng, ctx):
+    from core.data.data_diff import detect_changes
+
+    old = pd.DataFrame({
+        "id": [f"K{i:08d}" for i in range(n)],
+        "name": [_word(rng) for _ in range(n)],
+        "price": [round(rng.uniform(1, 500), 2) for _ in range(n)],
+    })
+    new = old.sample(frac=0.97, random_state=rng.randint(0, 2 ** 31)).copy()
+    changed = new.sample(frac=0.05, random_state=1).index
+    new.loc[changed, "price"] = new.loc[changed, "price"] * 1.1
+    extra = pd.DataFrame({"id": [f"N{i:08d}" for i in range(n // 50)],
+                          "name": "NEW", "price": 1.0})
+    new = pd.concat([new, extra], ignore_index=True)
+
+    def run():
+        detect_changes(old, new, "id")
+        return len(old) + len(new)
+    return run
+
+
+@case("pcid", rows=200_000)
+def _pcid(n, rng, ctx):
+    from bench_pcid_mapper import STRATEGIES, make_products, make_reference
+    from core.utils.pcid_mapper import PcidMapper
+
+    reference = make_reference(max(1, n // 10), rng)
+    products = make_products(n, reference, rng)
+
+    def run():
+        mapper = PcidMapper(STRATEGIES)
+        mapper.build_reference_store(reference)
+        mapper.match_many(products)
+        return n
+    return run
+
+
+@case("frontier", rows=20_000)
+def _frontier(n, rng, ctx):
+    from core.pipeline.frontier import CrawlFrontier
+
+    if not FAKEREDIS_AVAILABLE:
+        raise SkipCase("fakeredis not installed")
+    urls = [f"https://shop{i % 50}.example/p/{i}" for i in range(n)]
+
+    def run():
+        client = fakeredis.FakeStrictRedis()
+        frontier = CrawlFrontier("Bench", client, max_depth=5)
+        frontier.add_urls(urls)
+        frontier.add_urls(urls[: n // 10])  # already-seen path
+        while True:
+            batch = frontier.get_next_batch(size=100, respect_politeness=False)
+            if not batch:
+                break
+            for entry in batch:
+                frontier.mark_completed(entry.url, success=True)
+        return n
+    return run
+
+
+@case("csv_import", rows=20_000)
+def _csv_import(n, rng, ctx):
+    from core.db.csv_importer import CSVImporter
+
+    schema = ctx["schema"]()
+    schema.execute("""
+        CREATE TABLE bench_input (code TEXT PRIMARY KEY, name TEXT, price TEXT);
+        CREATE TABLE input_uploads (id SERIAL PRIMARY KEY, table_name TEXT, source_file TEXT,
+            row_count INTEGER, replaced_previous INTEGER, source_country TEXT,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    """)
+    path = Path(ctx["tmp"]) / "bench_input.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Code", "Name", "Price"])
+        for i in range(n):
+            writer.writerow([f"C{i:08d}", _word(rng), f"{rng.uniform(1, 500):.2f}"])
+    importer = CSVImporter(schema)
+    column_map = {"Code": "code", "Name": "name", "Price": "price"}
+
+    def run():
+        result = importer.import_csv(path, "bench_input", column_map, mode="replace")
+        if result.status != "ok":
+            raise RuntimeError(result.message)
+        return n
+    return run
+
+
+@case("upsert", rows=50_000)
+def _upsert(n, rng, ctx):
+    from core.db.upsert import bulk_insert, compute_item_hash, upsert_items
+
+    schema = ctx["schema"]()
+    schema.execute("CREATE TABLE bench_items (item_hash TEXT PRIMARY KEY, name TEXT, price REAL)")
+    items = [{"name": _word(rng), "price": round(rng.uniform(1, 500), 2)} for _ in range(n)]
+    for item in items:
+        item["item_hash"] = compute_item_hash(item, ["name", "price"])
+    items = list({item["item_hash"]: item for item in items}.values())
+    half = len(items) // 2
+
+    def run():
+        schema.execute("TRUNCATE bench_items")
+        conn = schema.connect()
+        bulk_insert(conn, "bench_items", items[:half], batch_size=1000)
+        upsert_items(conn, "bench_items", items, ["item_hash"], batch_size=1000)
+        return len(items) + half
+    return run
+
+
+@case("queue_claims", rows=10_000)
+def _queue_claims(n, rng, ctx):
+    from core.pipeline.url_work_queue import URLWorkQueue
+
+    schema = ctx["schema"]()
+    queue = URLWorkQueue(schema.config)
+    urls = [f"https://shop.example/p/{i}" for i in range(n)]
+
+    def run():
+        run_id = uuid.uuid4().hex
+        queue.enqueue_urls(run_id, "Bench", urls)
+        claimed = 0
+        while True:
+            batch = queue.claim_batch("bench-worker", "Bench", run_id, batch_size=100)
+            if not batch:
+                break
+            for row in batch:
+                queue.complete_url(row["id"], success=True)
+            claimed += len(batch)
+        return claimed
+    return run
+
+
+def _word(rng: random.Random, lo: int = 4, hi: int = 10) -> str:
+    return "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=rng.randint(lo, hi)))
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def run_case(name, spec, args, ctx) -> dict:
+    n = max(1, int(spec["rows"] * args.scale))
+    rng = random.Random(f"{args.seed}:{name}")
+    try:
+        run = spec["setup"](n, rng, ctx)
+        for _ in range(args.warmup):
+            run()
+        samples, rows = [], 0
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            rows = run()
+            samples.append(time.perf_counter() - start)
+    except SkipCase as exc:
+        return {"status": "skipped", "reason": str(exc)}
+    summary = summarize_samples(samples)
+    return {
+        "status": "ok",
+        "rows": rows,
+        "samples": samples,
+        "summary": summary,
+        "rows_per_second": rows / summary["median"] if summary["median"] > 0 else None,
+    }
+
+
+def baseline_mismatch(baseline_run: dict, base: dict, result: dict, scale: float):
+    """
+    Why a baseline case can't be compared with this run's result, or None.
+
+    Timings only compare on the same fixture: a --quick or --scale baseline
+    against a full run would flag (or hide) regressions that are not there.
+    """
+    base_scale = baseline_run.get("scale")
+    if base_scale is not None and base_scale != scale:
+        return f"baseline scale {base_scale} != {scale}"
+    if base.get("rows") != result.get("rows"):
+        return f"fixture size differs ({base.get('rows')} vs {result.get('rows')} rows)"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pipeline benchmark suite")
+    parser.add_argument("--only", default="", help="comma-separated case names (default: all)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--scale", type=float, default=1.0, help="fixture size multiplier")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--quick", action="store_true", help="--scale 0.1 --repeats 3")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dsn", default=None, help="PostgreSQL DSN for the database cases")
+    parser.add_argument("--output", type=Path, default=None, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare against this results JSON")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="write results as a new baseline")
+    parser.add_argument("--rel-threshold", type=float, default=0.10,
+                        help="minimum relative slowdown of the median to flag")
+    parser.add_argument("--mad-k", type=float, default=3.0,
+                        help="slowdown must also exceed this many robust deviations")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="absolute slowdown floor in seconds")
+    parser.add_argument("--record-db", action="store_true",
+                        help="also store medians in pipeline_benchmarks")
+    parser.add_argument("--verbose", action="store_true", help="keep INFO logging from the code under test")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    if args.list:
+        for name, spec in CASES.items():
+            print(f"{name:<14} {spec['rows']:>10,} rows")
+        return
+    if args.quick:
+        args.scale, args.repeats = 0.1, 3
+
+    selected = [c.strip() for c in args.only.split(",") if c.strip()] or list(CASES)
+    unknown = [c for c in selected if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    baseline_run, baseline = {}, {}
+    if args.baseline:
+        baseline_run = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline = baseline_run.get("cases", {})
+
+    run_id = f"bench_{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+    results = {
+        "run_id": run_id,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "repeats": args.repeats,
+        "seed": args.seed,
+        "cases": {},
+    }
+
+    regressions = []
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+        schemas, unreachable = [], []
+
+        def new_schema():
+            if unreachable:  # don't wait out the connect timeout once per case
+                raise SkipCase(unreachable[0])
+            try:
+                schema = BenchSchema(args.dsn or _default_dsn()).__enter__()
+            except SkipCase as exc:
+                unreachable.append(str(exc))
+                raise
+            schemas.append(schema)
+            return schema
+
+        ctx = {"tmp": tmp, "schema": new_schema}
+        try:
+            for step, name in enumerate(selected, 1):
+                result = run_case(name, CASES[name], args, ctx)
+                results["cases"][name] = result
+                if result["status"] != "ok":
+                    print(f"{name:<14} skipped ({result['reason']})")
+                    continue
+
+                s = result["summary"]
+                line = (f"{name:<14} {result['rows']:>10,} rows   median {s['median']:8.3f}s   "
+                        f"mad {s['mad']:7.3f}s   {result['rows_per_second'] or 0:>12,.0f}/s")
+                base = baseline.get(name)
+                mismatch = None
+                if base and base.get("status") == "ok":
+                    mismatch = baseline_mismatch(baseline_run, base, result, args.scale)
+                if mismatch:
+                    result["comparison"] = {"skipped": mismatch}
+                    line += f"   not compared ({mismatch})"
+                elif base and base.get("status") == "ok":
+                    verdict = compare_to_baseline(
+                        result["samples"], base["samples"],
+                        rel_threshold=args.rel_threshold, mad_k=args.mad_k,
+                        min_delta_seconds=args.min_delta,
+                    )
+                    result["comparison"] = {k: verdict[k] for k in ("is_regression", "ratio", "delta", "noise")
+                                            if k in verdict}
+                    line += f"   x{verdict.get('ratio', 1.0):.2f} vs baseline"
+                    if verdict["is_regression"]:
+                        line += "   REGRESSION"
+                        regressions.append(name)
+                print(line)
+
+                if args.record_db:
+                    record_step_benchmark(
+                        scraper_name="benchmarks", step_number=step, step_name=name, run_id=run_id,
+                        duration_seconds=s["median"], rows_processed=result["rows"],
+                        metrics={"summary": s, "scale": args.scale, "comparison": result.get("comparison")},
+                    )
+        finally:
+            for schema in schemas:
+                schema.__exit__(None, None, None)
+
+    results["regressions"] = regressions
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+            print(f"wrote {path}")
+
+    if regressions:
+        print(f"regressions: {', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
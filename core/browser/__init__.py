@@ -7,12 +7,14 @@ from .chrome_instance_tracker import *
 from .chrome_manager import *
 from .chrome_pid_tracker import *
 from .firefox_pid_tracker import *
+from .process_registry import *
 from .selector_healer import *
 from .stealth_profile import *
 from .human_actions import *
 
 __all__ = [
     'BrowserObserver',
+    'BrowserProcessRegistry',
     'BrowserSession',
     'ChromeInstanceTracker',
     'ChromeManager',
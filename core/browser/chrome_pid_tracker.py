@@ -23,6 +23,8 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+from core.browser.process_registry import ProcReader, driver_service_pid, get_process_registry
+
 logger = logging.getLogger(__name__)
 
 _PID_LOCK_TIMEOUT_S = 5.0
@@ -78,136 +80,76 @@ def _atomic_write_json(path: Path, payload: dict) -> None:
             pass
 
 
-def get_chrome_pids_from_playwright_browser(browser) -> Set[int]:
+def get_chrome_pids_from_playwright_browser(browser, scraper_name: Optional[str] = None) -> Set[int]:
     """
     Extract Chrome/Chromium process IDs from a Playwright browser instance.
     
+    Playwright doesn't expose the browser PID, but a launched browser is
+    always under our own process tree (Python -> node driver -> chromium),
+    so only that tree is walked; the host process table is never scanned.
+    The first call for a browser claims the browser roots no other browser
+    object has claimed (the one just launched), so two browsers in one
+    process each get their own PIDs.
+    
     Args:
         browser: Playwright Browser instance
+        scraper_name: If given, also register the PIDs in the process registry
         
     Returns:
         Set of process IDs (browser process and child processes)
     """
-    pids = set()
-    
-    if not PSUTIL_AVAILABLE:
-        return pids
-    
+    if browser is None:
+        return set()
     try:
-        # Playwright browser doesn't expose PID directly, so we need to find it
-        # by looking for Chrome/Chromium processes with Playwright-specific flags
-        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'cmdline']):
-            try:
-                proc_name = (proc.info.get('name') or '').lower()
-                cmdline = ' '.join(proc.info.get('cmdline') or [])
-                
-                # Playwright uses chromium with specific flags
-                if 'chrome' in proc_name or 'chromium' in proc_name:
-                    # Look for Playwright-specific flags
-                    playwright_flags = [
-                        '--remote-debugging-pipe',
-                        '--disable-blink-features=AutomationControlled',
-                        '--test-type',
-                        '--user-data-dir'
-                    ]
-                    
-                    # Check if it has Playwright flags (usually has multiple)
-                    flag_count = sum(1 for flag in playwright_flags if flag in cmdline)
-                    if flag_count >= 2:  # At least 2 Playwright flags
-                        pids.add(proc.info['pid'])
-                        logger.debug(f"Found Playwright Chrome PID: {proc.info['pid']}")
-                        
-                        # Also get all child processes
-                        try:
-                            parent = psutil.Process(proc.info['pid'])
-                            for child in parent.children(recursive=True):
-                                pids.add(child.pid)
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        if not browser.is_connected():
+            return set()
+    except AttributeError:
+        pass  # BrowserContext / persistent context: no connection state
+    registry = get_process_registry()
+    try:
+        roots = registry.claim_browser_roots(browser)
+        pids = set(roots)
+        for root in roots:
+            pids |= registry.descendants(root)
+        if scraper_name and roots:
+            registry.register(scraper_name, roots)
+        logger.debug(f"Found {len(pids)} Playwright browser process(es) for {len(roots)} browser root(s)")
+        return pids
     except Exception as e:
         logger.warning(f"Error finding Playwright Chrome PIDs: {e}")
-    
-    return pids
+        return set()
 
 
-def get_chrome_pids_from_driver(driver) -> Set[int]:
+def get_chrome_pids_from_driver(driver, scraper_name: Optional[str] = None) -> Set[int]:
     """
     Extract Chrome and ChromeDriver process IDs from a WebDriver instance.
     
+    The ChromeDriver PID comes from the driver's service handle; Chrome and
+    its helpers are its descendants.
+    
     Args:
         driver: Selenium WebDriver instance
+        scraper_name: If given, also register the PIDs in the process registry
         
     Returns:
         Set of process IDs (ChromeDriver PID and Chrome browser PIDs)
     """
-    pids = set()
+    chromedriver_pid = driver_service_pid(driver)
+    if not chromedriver_pid:
+        logger.warning("Could not get ChromeDriver PID from driver.service")
+        return set()
     
+    registry = get_process_registry()
     try:
-        # Get ChromeDriver process ID
-        if hasattr(driver, 'service') and hasattr(driver.service, 'process'):
-            chromedriver_pid = driver.service.process.pid
-            if chromedriver_pid:
-                pids.add(chromedriver_pid)
-                logger.debug(f"Found ChromeDriver PID: {chromedriver_pid}")
+        if scraper_name:
+            pids = registry.register_driver(scraper_name, driver)
+        else:
+            pids = {chromedriver_pid} | registry.descendants(chromedriver_pid)
+        logger.debug(f"Found ChromeDriver PID {chromedriver_pid} with {len(pids) - 1} descendant(s)")
+        return pids
     except Exception as e:
-        logger.warning(f"Could not get ChromeDriver PID: {e}")
-    
-    # Find Chrome browser processes spawned by this ChromeDriver
-    if PSUTIL_AVAILABLE:
-        try:
-            # Get ChromeDriver PID first
-            chromedriver_pid = None
-            try:
-                if hasattr(driver, 'service') and hasattr(driver.service, 'process'):
-                    chromedriver_pid = driver.service.process.pid
-            except Exception:
-                pass
-            
-            # Get all descendant processes of ChromeDriver (recursive)
-            def get_descendant_pids(pid):
-                """Get all descendant PIDs of a process"""
-                descendants = set()
-                try:
-                    parent = psutil.Process(pid)
-                    for child in parent.children(recursive=True):
-                        descendants.add(child.pid)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-                return descendants
-            
-            if chromedriver_pid:
-                # Get all descendants of ChromeDriver
-                descendant_pids = get_descendant_pids(chromedriver_pid)
-                pids.update(descendant_pids)
-                logger.debug(f"Found {len(descendant_pids)} descendant process(es) of ChromeDriver {chromedriver_pid}")
-            
-            # Also find Chrome processes by automation flags (more aggressive)
-            for proc in psutil.process_iter(['pid', 'ppid', 'name', 'cmdline']):
-                try:
-                    proc_name = (proc.info.get('name') or '').lower()
-                    cmdline = ' '.join(proc.info.get('cmdline') or [])
-                    
-                    # Check if it's a Chrome browser process (not ChromeDriver)
-                    if 'chrome' in proc_name and 'chromedriver' not in proc_name:
-                        # Check if it's a child of our ChromeDriver
-                        if chromedriver_pid and proc.info.get('ppid') == chromedriver_pid:
-                            pids.add(proc.info['pid'])
-                            logger.debug(f"Found Chrome browser PID (child of ChromeDriver): {proc.info['pid']}")
-                        # Also check for automation flags that indicate Selenium-controlled Chrome
-                        elif any(flag in cmdline for flag in ['--remote-debugging-port', '--test-type', '--user-data-dir', '--incognito']):
-                            # Check for Selenium-specific flags
-                            selenium_flags = ['--remote-debugging-port', '--disable-blink-features=AutomationControlled']
-                            if any(flag in cmdline for flag in selenium_flags):
-                                pids.add(proc.info['pid'])
-                                logger.debug(f"Found Chrome browser PID (automation flags): {proc.info['pid']}")
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-        except Exception as e:
-            logger.warning(f"Error finding Chrome browser PIDs: {e}")
-    
-    return pids
+        logger.warning(f"Error finding Chrome browser PIDs: {e}")
+        return {chromedriver_pid}
 
 
 def get_pid_file_path(scraper_name: str, repo_root: Path) -> Path:
@@ -532,6 +474,49 @@ def terminate_chrome_pids(scraper_name: str, repo_root: Path, silent: bool = Fal
     return terminated_count
 
 
+_AUTOMATION_FLAGS = (
+    '--remote-debugging-port',
+    '--disable-blink-features=AutomationControlled',
+    '--test-type',
+    '--user-data-dir',
+    '--incognito',
+)
+
+
+def _iter_chrome_candidates():
+    """
+    Yield (pid, cmdline) for Chrome browser processes (not ChromeDriver).
+    
+    Names are checked first (/proc/<pid>/stat, or psutil's name) and the
+    cmdline is only read for processes that are actually Chrome.
+    """
+    reader = ProcReader()
+    if reader.available:
+        for entry in os.listdir(reader.root):
+            if not entry.isdigit():
+                continue
+            info = reader.stat(int(entry))
+            name = (info[0] if info else "").lower()
+            if 'chrome' not in name or 'chromedriver' in name:
+                continue
+            try:
+                raw = (reader.root / entry / "cmdline").read_bytes()
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                continue
+            yield int(entry), raw.replace(b"\x00", b" ").decode("utf-8", errors="replace")
+        return
+    
+    if not PSUTIL_AVAILABLE:
+        return
+    for proc in psutil.process_iter(['pid', 'name']):
+        try:
+            name = (proc.info.get('name') or '').lower()
+            if 'chrome' in name and 'chromedriver' not in name:
+                yield proc.info['pid'], ' '.join(proc.cmdline() or [])
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+
+
 def terminate_chrome_by_flags(silent: bool = False) -> int:
     """
     Fallback method: Find and terminate Chrome processes with automation flags.
@@ -549,34 +534,17 @@ def terminate_chrome_by_flags(silent: bool = False) -> int:
         return 0
     
     try:
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                proc_name = (proc.info.get('name') or '').lower()
-                cmdline = ' '.join(proc.info.get('cmdline') or [])
-                
-                # Check if it's a Chrome browser process with automation flags
-                if 'chrome' in proc_name and 'chromedriver' not in proc_name:
-                    # Look for Selenium automation flags
-                    automation_flags = [
-                        '--remote-debugging-port',
-                        '--disable-blink-features=AutomationControlled',
-                        '--test-type',
-                        '--user-data-dir',
-                        '--incognito'
-                    ]
-                    
-                    # Check if it has multiple automation flags (more likely to be Selenium-controlled)
-                    flag_count = sum(1 for flag in automation_flags if flag in cmdline)
-                    if flag_count >= 2:  # At least 2 automation flags
-                        try:
-                            proc.kill()
-                            terminated_count += 1
-                            if not silent:
-                                logger.debug(f"Terminated Chrome process (automation flags): PID {proc.info['pid']}")
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+        for pid, cmdline in _iter_chrome_candidates():
+            # Check if it has multiple automation flags (more likely to be Selenium-controlled)
+            flag_count = sum(1 for flag in _AUTOMATION_FLAGS if flag in cmdline)
+            if flag_count >= 2:  # At least 2 automation flags
+                try:
+                    psutil.Process(pid).kill()
+                    terminated_count += 1
+                    if not silent:
+                        logger.debug(f"Terminated Chrome process (automation flags): PID {pid}")
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
     except Exception as e:
         if not silent:
             logger.warning(f"Error terminating Chrome by flags: {e}")
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Browser Process Registry
+
+Keeps the browser process trees of each scraper without scanning the host
+process table. PIDs are recorded when a browser is launched (the
+chromedriver service process, or the Playwright-launched Chromium found
+under our own process tree) and their descendants are tracked incrementally
+from a cached parent -> children map. Each refresh reads only
+``/proc/<pid>/task/*/children`` for the tracked PIDs, so counting and
+measuring a scraper's browsers costs O(tracked processes), not O(host
+processes), and no cmdline is ever read.
+
+Descendants stay tracked after their parent exits (chromedriver dying
+re-parents Chrome to init), and every PID is pinned to its start time so a
+recycled PID is never mistaken for one of ours.
+
+Fallbacks: kernels without CONFIG_PROC_CHILDREN get one pass over
+``/proc/*/stat`` per refresh (still no cmdline reads); hosts without /proc
+(Windows, macOS) use psutil per tracked PID.
+
+Usage:
+    from core.browser.process_registry import get_process_registry
+
+    registry = get_process_registry()
+    registry.register_driver("Malaysia", driver)       # Selenium
+    registry.register_playwright("Malaysia")           # after chromium.launch()
+
+    registry.count("Malaysia"), registry.rss_bytes("Malaysia")
+    registry.stats()  # {"Malaysia": {"processes": 14, "rss_bytes": ...}}
+"""
+
+import logging
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# /proc/<pid>/comm is truncated to 15 chars ("chromium-browse"); match on prefixes
+BROWSER_NAME_TOKENS = ("chrome", "chromium", "headless_shell", "msedge", "brave", "opera")
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def is_browser_name(name: str) -> bool:
+    name = (name or "").lower()
+    return any(token in name for token in BROWSER_NAME_TOKENS)
+
+
+class ProcReader:
+    """Minimal /proc reader: children, stat (name/ppid/start time) and RSS for one PID."""
+
+    def __init__(self, proc_root: Union[str, Path] = "/proc"):
+        self.root = Path(proc_root)
+        self.available = (self.root / "self").exists() or (self.root / "1").exists()
+        self._children_files: Optional[bool] = None
+
+    @property
+    def children_files(self) -> bool:
+        """Whether the kernel exposes /proc/<pid>/task/<tid>/children."""
+        if self._children_files is None:
+            probe = self.root / str(os.getpid()) / "task" / str(os.getpid()) / "children"
+            self._children_files = self.available and probe.exists()
+        return self._children_files
+
+    def stat(self, pid: int):
+        """(name, state, ppid, start_time) or None if the process is gone."""
+        try:
+            raw = (self.root / str(pid) / "stat").read_text(encoding="utf-8", errors="replace")
+        except (FileNotFoundError, ProcessLookupError, PermissionError, NotADirectoryError):
+            return None
+        # The name is in parentheses and may itself contain spaces or ')'
+        lpar, rpar = raw.find("("), raw.rfind(")")
+        fields = raw[rpar + 2:].split()
+        try:
+            return raw[lpar + 1:rpar], fields[0], int(fields[1]), int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+    def children(self, pid: int) -> Optional[Set[int]]:
+        """Direct children of pid from its per-thread children files; None if gone."""
+        task_dir = self.root / str(pid) / "task"
+        try:
+            tids = os.listdir(task_dir)
+        except (FileNotFoundError, ProcessLookupError, PermissionError, NotADirectoryError):
+            return None
+        kids: Set[int] = set()
+        for tid in tids:
+            try:
+                kids.update(int(p) for p in (task_dir / tid / "children").read_text().split())
+            except (FileNotFoundError, ProcessLookupError, PermissionError, ValueError):
+                continue
+        return kids
+
+    def parent_map(self) -> Dict[int, Set[int]]:
+        """parent -> children for every process, from /proc/*/stat only."""
+        mapping: Dict[int, Set[int]] = {}
+        for entry in os.listdir(self.root):
+            if not entry.isdigit():
+                continue
+            info = self.stat(int(entry))
+            if info:
+                mapping.setdefault(info[2], set()).add(int(entry))
+        return mapping
+
+    def rss_bytes(self, pid: int) -> int:
+        try:
+            fields = (self.root / str(pid) / "statm").read_text().split()
+            return int(fields[1]) * _PAGE_SIZE
+        except (FileNotFoundError, ProcessLookupError, PermissionError, IndexError, ValueError):
+            return 0
+
+
+class BrowserProcessRegistry:
+    """
+    Per-scraper browser process trees, tracked from launch.
+
+    All public methods are thread-safe.
+    """
+
+    def __init__(self, proc_root: Union[str, Path] = "/proc"):
+        self._proc = ProcReader(proc_root)
+        self._lock = threading.RLock()
+        # scraper -> {pid: start_time}; start_time is None when it can't be read
+        self._tracked: Dict[str, Dict[int, Optional[int]]] = {}
+        # Cached parent -> children for tracked PIDs (refreshed per tracked PID)
+        self._children: Dict[int, Set[int]] = {}
+        self._names: Dict[int, str] = {}
+        # Playwright Browser object -> the browser root PIDs it launched
+        self._owned_roots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    # -- registration ---------------------------------------------------
+
+    def register(self, scraper_name: str, pids: Iterable[int]) -> Set[int]:
+        """Track pids (and, from the next refresh on, their descendants) for a scraper."""
+        with self._lock:
+            tracked = self._tracked.setdefault(scraper_name, {})
+            for pid in pids:
+                pid = int(pid)
+                if pid > 0 and pid not in tracked:
+                    tracked[pid] = self._start_time(pid)
+            return self.refresh(scraper_name)
+
+    def register_driver(self, scraper_name: str, driver) -> Set[int]:
+        """Track a Selenium driver's chromedriver service process and everything it spawns."""
+        pid = driver_service_pid(driver)
+        if not pid:
+            return set()
+        return self.register(scraper_name, [pid])
+
+    def register_playwright(self, scraper_name: str, root_pid: Optional[int] = None) -> Set[int]:
+        """
+        Track Playwright-launched browsers: the browser processes under our
+        own process tree (Python -> node driver -> chromium).
+        """
+        return self.register(scraper_name, self.browser_roots(root_pid or os.getpid()))
+
+    def claim_browser_roots(self, owner, root_pid: Optional[int] = None) -> Set[int]:
+        """
+        Browser roots launched for one Playwright Browser object.
+
+        The first call for an owner claims the roots under root_pid (default:
+        our own process) that no earlier owner claimed, i.e. the browser just
+        launched; later calls return the owner's claimed roots still alive.
+        """
+        with self._lock:
+            try:
+                claimed = self._owned_roots.get(owner)
+            except TypeError:  # owner can't be weakly referenced
+                claimed = None
+            if claimed is None:
+                taken = set().union(*self._owned_roots.values()) if self._owned_roots else set()
+                claimed = self.browser_roots(root_pid or os.getpid()) - taken
+                try:
+                    self._owned_roots[owner] = claimed
+                except TypeError:
+                    pass
+            return {pid for pid in claimed if self._alive(pid, None)}
+
+    def unregister(self, scraper_name: str, pids: Optional[Iterable[int]] = None) -> None:
+        """Stop tracking some or all of a scraper's processes."""
+        with self._lock:
+            if pids is None:
+                dropped = self._tracked.pop(scraper_name, {})
+            else:
+                tracked = self._tracked.get(scraper_name, {})
+                dropped = {p: tracked.pop(int(p)) for p in pids if int(p) in tracked}
+            for pid in dropped:
+                self._forget(pid)
+
+    # -- tree walking ---------------------------------------------------
+
+    def _tree(self, pid: int) -> Dict[int, int]:
+        """{descendant: parent} for every live descendant of pid."""
+        parent_map = None if self._proc.children_files or not self._proc.available else self._proc.parent_map()
+        parents: Dict[int, int] = {}
+        frontier = [pid]
+        while frontier:
+            current = frontier.pop()
+            for child in self._read_children(current, parent_map) or ():
+                if child not in parents and child != pid:
+                    parents[child] = current
+                    frontier.append(child)
+        return parents
+
+    def descendants(self, pid: int) -> Set[int]:
+        """All live descendants of pid (not cached, not tracked)."""
+        return set(self._tree(pid))
+
+    def browser_roots(self, pid: int) -> Set[int]:
+        """Top-most browser processes under pid (their own subtrees are picked up by refresh)."""
+        parents = self._tree(pid)
+        browsers = {p for p in parents if is_browser_name(self._name(p, cache=False))}
+        return {p for p in browsers if parents[p] not in browsers}
+
+    def browser_tree(self, pid: int) -> Set[int]:
+        """Browser processes under pid plus everything they spawned (renderers, GPU, crashpad)."""
+        parents = self._tree(pid)
+        browsers = {p for p in parents if is_browser_name(self._name(p, cache=False))}
+        tree = set()
+        for p in parents:
+            node = p
+            while node in parents and node not in browsers:
+                node = parents[node]
+            if node in browsers:
+                tree.add(p)
+        return tree
+
+    def refresh(self, scraper_name: Optional[str] = None) -> Set[int]:
+        """
+        Drop dead/recycled PIDs and add newly spawned descendants.
+
+        Returns:
+            Live tracked PIDs of scraper_name (all scrapers if None)
+        """
+        with self._lock:
+            names = [scraper_name] if scraper_name is not None else list(self._tracked)
+            parent_map = None
+            if self._proc.available and not self._proc.children_files and any(
+                    self._tracked.get(n) for n in names):
+                parent_map = self._proc.parent_map()
+
+            live: Set[int] = set()
+            for name in names:
+                tracked = self._tracked.get(name)
+                if not tracked:
+                    continue
+                frontier = list(tracked)
+                while frontier:
+                    pid = frontier.pop()
+                    if not self._alive(pid, tracked.get(pid)):
+                        tracked.pop(pid, None)
+                        self._forget(pid)
+                        continue
+                    live.add(pid)
+                    kids = self._read_children(pid, parent_map)
+                    if kids is None:
+                        continue
+                    self._children[pid] = kids
+                    for kid in kids:
+                        if kid not in tracked:
+                            tracked[kid] = self._start_time(kid)
+                            frontier.append(kid)
+            return live
+
+    # -- queries --------------------------------------------------------
+
+    def pids(self, scraper_name: str, refresh: bool = True) -> Set[int]:
+        with self._lock:
+            if refresh:
+                return self.refresh(scraper_name)
+            return set(self._tracked.get(scraper_name, ()))
+
+    def count(self, scraper_name: str, browsers_only: bool = False) -> int:
+        """Live tracked processes (optionally only browser-named ones, no chromedriver)."""
+        pids = self.pids(scraper_name)
+        if browsers_only:
+            return sum(1 for p in pids if is_browser_name(self._name(p)) and "driver" not in self._name(p))
+        return len(pids)
+
+    def instance_count(self, scraper_name: str) -> int:
+        """Browser instances: tracked browser processes not spawned by another tracked browser."""
+        with self._lock:
+            pids = self.refresh(scraper_name)
+            browsers = {p for p in pids if is_browser_name(self._name(p)) and "driver" not in self._name(p)}
+            spawned = set().union(*(self._children.get(p, ()) for p in browsers)) if browsers else set()
+            return len(browsers - spawned)
+
+    def rss_bytes(self, scraper_name: str) -> int:
+        return sum(self._rss(p) for p in self.pids(scraper_name))
+
+    def stats(self, scraper_name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """{scraper: {"processes": n, "rss_bytes": b}} after one refresh."""
+        with self._lock:
+            self.refresh(scraper_name)
+            names = [scraper_name] if scraper_name is not None else list(self._tracked)
+            return {
+                name: {
+                    "processes": len(self._tracked.get(name, ())),
+                    "rss_bytes": sum(self._rss(p) for p in self._tracked.get(name, ())),
+                }
+                for name in names
+            }
+
+    def scrapers(self) -> Set[str]:
+        with self._lock:
+            return {name for name, tracked in self._tracked.items() if tracked}
+
+    # -- internals ------------------------------------------------------
+
+    def _forget(self, pid: int) -> None:
+        self._children.pop(pid, None)
+        self._names.pop(pid, None)
+
+    def _read_children(self, pid: int, parent_map: Optional[Dict[int, Set[int]]]) -> Optional[Set[int]]:
+        if self._proc.children_files:
+            return self._proc.children(pid)
+        if parent_map is not None:
+            return set(parent_map.get(pid, ()))
+        if PSUTIL_AVAILABLE:
+            try:
+                return {c.pid for c in psutil.Process(pid).children()}
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return None
+        return None
+
+    def _start_time(self, pid: int) -> Optional[int]:
+        if self._proc.available:
+            info = self._proc.stat(pid)
+            return info[3] if info else None
+        if PSUTIL_AVAILABLE:
+            try:
+                return int(psutil.Process(pid).create_time() * 100)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return None
+        return None
+
+    def _alive(self, pid: int, start_time: Optional[int]) -> bool:
+        if self._proc.available:
+            info = self._proc.stat(pid)
+            if info is None or info[1] in ("Z", "X"):
+                return False
+            return start_time is None or info[3] == start_time
+        if PSUTIL_AVAILABLE:
+            try:
+                proc = psutil.Process(pid)
+                if start_time is not None and int(proc.create_time() * 100) != start_time:
+                    return False
+                return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return False
+        return True
+
+    def _name(self, pid: int, cache: bool = True) -> str:
+        name = self._names.get(pid) if cache else None
+        if name is None:
+            name = ""
+            if self._proc.available:
+                info = self._proc.stat(pid)
+                name = info[0] if info else ""
+            elif PSUTIL_AVAILABLE:
+                try:
+                    name = psutil.Process(pid).name()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    name = ""
+            if cache:
+                self._names[pid] = name
+        return name
+
+    def _rss(self, pid: int) -> int:
+        if self._proc.available:
+            return self._proc.rss_bytes(pid)
+        if PSUTIL_AVAILABLE:
+            try:
+                return psutil.Process(pid).memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return 0
+        return 0
+
+
+def driver_service_pid(driver) -> Optional[int]:
+    """PID of a Selenium driver's service (chromedriver/geckodriver) process, if any."""
+    try:
+        return driver.service.process.pid or None
+    except AttributeError:
+        return None
+
+
+_registry: Optional[BrowserProcessRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_process_registry() -> BrowserProcessRegistry:
+    """Process-wide registry instance."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = BrowserProcessRegistry()
+    return _registry
@@ -0,0 +1,72 @@
+"""
+Per-stage throughput/latency counters for staged (fetch -> parse -> write) pipelines.
+
+Usage:
+    stats = PipelineStats(["fetch", "parse", "write"])
+    t0 = time.monotonic()
+    ...
+    stats["fetch"].record(time.monotonic() - t0)
+    logger.info(f"[Phase2] Stages: {stats.summary()}")
+"""
+
+import time
+from threading import Lock
+from typing import Dict, Iterable, Optional
+
+
+class StageStats:
+    """Counts items and time spent in one pipeline stage. Thread safe."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.monotonic()
+        self.items = 0
+        self.calls = 0
+        self.busy_seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = 0
+        self._lock = Lock()
+
+    def record(self, seconds: float, items: int = 1, error: bool = False) -> None:
+        with self._lock:
+            self.items += items
+            self.calls += 1
+            self.busy_seconds += seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+            if error:
+                self.errors += 1
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = now or time.monotonic()
+        with self._lock:
+            elapsed = max(now - self.started_at, 1e-9)
+            return {
+                "items": self.items,
+                "calls": self.calls,
+                "errors": self.errors,
+                "items_per_sec": self.items / elapsed,
+                "avg_ms": (self.busy_seconds / self.calls * 1000) if self.calls else 0.0,
+                "max_ms": self.max_seconds * 1000,
+            }
+
+    def format(self) -> str:
+        s = self.snapshot()
+        return (f"{self.name}={s['items']} ({s['items_per_sec']:.1f}/s, "
+                f"avg {s['avg_ms']:.0f}ms, max {s['max_ms']:.0f}ms, err {s['errors']})")
+
+
+class PipelineStats:
+    """A named group of StageStats."""
+
+    def __init__(self, stages: Iterable[str]):
+        self.stages: Dict[str, StageStats] = {name: StageStats(name) for name in stages}
+
+    def __getitem__(self, name: str) -> StageStats:
+        return self.stages[name]
+
+    def summary(self) -> str:
+        return ", ".join(stage.format() for stage in self.stages.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
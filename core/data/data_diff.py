@@ -15,13 +15,30 @@ Usage:
     # Get detailed change report
     report = diff.get_report()
     print(f"Added: {report['added_count']}, Removed: {report['removed_count']}")
+    
+    # Diff every output file against its previous run (manifests are cached)
+    tracker = DataDiffTracker("Malaysia")
+    reports = tracker.track_all_outputs(key_column="product_id")
+
+Row manifests:
+    A RowManifest holds, per business key, a 64-bit hash of the whole row and
+    one per column. DataDiffTracker stores them as Parquet under
+    .diffs/manifests, named by the SHA-256 of the file content, so a file is
+    parsed once however often it is diffed. Two manifests give the added,
+    removed and modified keys and the changed columns of each; only the rows
+    of changed keys are then read back from the files for the report.
 """
 
+import hashlib
+import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union, Set, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Union, Set, Tuple
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 import pandas as pd
 import numpy as np
@@ -36,6 +53,214 @@ except ImportError:
     DATACOMPY_AVAILABLE = False
     datacompy = None
 
+# pyarrow stores row manifests; without it they are rebuilt on every diff
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+# Rows per chunk when hashing or re-reading CSVs
+DEFAULT_CHUNKSIZE = 100_000
+
+# Reserved manifest columns (every other column is a per-column hash)
+MANIFEST_KEY = "__key__"
+MANIFEST_ROW_HASH = "__row_hash__"
+MANIFEST_ROWS = "__rows__"
+MANIFEST_VERSION = 1
+
+_MANIFEST_META = b"row_manifest"
+
+
+def default_processes() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a file's content, read in 1 MiB blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_frames(path: Path, chunksize: Optional[int] = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Yield a data file as string-typed frames (CSV in chunks, Excel whole)."""
+    if path.suffix.lower() == '.xlsx':
+        yield pd.read_excel(path, dtype=str)
+    elif chunksize:
+        yield from pd.read_csv(path, dtype=str, chunksize=chunksize)
+    else:
+        yield pd.read_csv(path, dtype=str)
+
+
+def _hash_columns(frame: pd.DataFrame, columns: List[str]) -> Dict[str, np.ndarray]:
+    return {col: pd.util.hash_pandas_object(frame[col], index=False).to_numpy() for col in columns}
+
+
+class RowManifest:
+    """
+    Row-hash digest of one data file, keyed by business key.
+    
+    ``hashes`` is indexed by key (as str) with a row count, a whole-row hash
+    and one hash per column. Rows with an empty key are counted but not
+    keyed; for duplicate keys the first row wins, as in DiffReport.
+    """
+    
+    def __init__(
+        self,
+        hashes: pd.DataFrame,
+        key_column: str,
+        columns: List[str],
+        rows: int,
+        digest: Optional[str] = None,
+    ):
+        self.hashes = hashes
+        self.key_column = key_column
+        self.columns = list(columns)
+        self.rows = rows
+        self.digest = digest
+    
+    def __len__(self) -> int:
+        return len(self.hashes)
+    
+    @classmethod
+    def build(
+        cls,
+        path: Union[str, Path],
+        key_column: str,
+        chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+        digest: Optional[str] = None,
+    ) -> "RowManifest":
+        """Hash a CSV/Excel file chunk by chunk; only the hashes are kept in memory."""
+        path = Path(path)
+        parts = []
+        columns = None
+        rows = 0
+        for chunk in _read_frames(path, chunksize):
+            if key_column not in chunk.columns:
+                raise ValueError(f"Key column '{key_column}' not found in {path.name}")
+            if columns is None:
+                columns = [c for c in chunk.columns if c != key_column]
+            rows += len(chunk)
+            chunk = chunk[chunk[key_column].notna()]
+            part = pd.DataFrame(_hash_columns(chunk, columns),
+                                index=chunk[key_column].astype(str).to_numpy())
+            # Sorted so that reordering the columns does not change the row hash
+            row_hash = (pd.util.hash_pandas_object(chunk[sorted(columns)], index=False).to_numpy()
+                        if columns else np.zeros(len(chunk), dtype=np.uint64))
+            part.insert(0, MANIFEST_ROW_HASH, row_hash)
+            parts.append(part)
+        
+        hashes = pd.concat(parts) if parts else pd.DataFrame(columns=[MANIFEST_ROW_HASH])
+        counts = hashes.index.value_counts()
+        hashes = hashes[~hashes.index.duplicated(keep="first")]
+        hashes.insert(0, MANIFEST_ROWS, counts.reindex(hashes.index).to_numpy(dtype=np.int64))
+        hashes.index.name = MANIFEST_KEY
+        return cls(hashes, key_column, columns or [], rows, digest)
+    
+    def save(self, path: Union[str, Path]):
+        """Write the manifest as Parquet (atomically, via a temp file)."""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to save row manifests")
+        path = Path(path)
+        table = pa.Table.from_pandas(self.hashes.reset_index(), preserve_index=False)
+        meta = dict(table.schema.metadata or {})
+        meta[_MANIFEST_META] = json.dumps({
+            "version": MANIFEST_VERSION,
+            "key_column": self.key_column,
+            "columns": self.columns,
+            "rows": self.rows,
+            "digest": self.digest,
+        }).encode("utf-8")
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(table.replace_schema_metadata(meta), tmp)
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RowManifest":
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to load row manifests")
+        table = pq.read_table(path)
+        info = json.loads(table.schema.metadata[_MANIFEST_META])
+        if info.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version {info.get('version')} in {path}")
+        hashes = table.to_pandas().set_index(MANIFEST_KEY)
+        return cls(hashes, info["key_column"], info["columns"], info["rows"], info.get("digest"))
+
+
+def diff_manifests(
+    old: RowManifest,
+    new: RowManifest,
+    compare_columns: List[str] = None,
+) -> Dict[str, Any]:
+    """
+    Compare two manifests without touching the data files.
+    
+    Returns:
+        Dict with added_keys, removed_keys, modified (key -> changed columns,
+        in new-file order), unchanged_count and column_changes (column ->
+        number of modified keys).
+    """
+    if compare_columns:
+        cols = [c for c in compare_columns if c in old.columns and c in new.columns]
+    else:
+        cols = [c for c in new.columns if c in set(old.columns)]
+    
+    old_h, new_h = old.hashes, new.hashes
+    added = new_h.index.difference(old_h.index, sort=False)
+    removed = old_h.index.difference(new_h.index, sort=False)
+    common = new_h.index[new_h.index.isin(old_h.index)]
+    
+    # Same columns on both sides: the row hash rules out unchanged keys first
+    if not compare_columns and set(old.columns) == set(new.columns):
+        differs = old_h[MANIFEST_ROW_HASH].reindex(common).to_numpy() != new_h.loc[common, MANIFEST_ROW_HASH].to_numpy()
+        candidates = common[differs]
+    else:
+        candidates = common
+    
+    if cols and len(candidates):
+        changed = old_h.loc[candidates, cols].to_numpy() != new_h.loc[candidates, cols].to_numpy()
+    else:
+        changed = np.zeros((len(candidates), len(cols)), dtype=bool)
+    is_modified = changed.any(axis=1)
+    modified_keys = candidates[is_modified]
+    modified = {
+        key: [c for c, hit in zip(cols, row) if hit]
+        for key, row in zip(modified_keys, changed[is_modified])
+    }
+    unchanged = common[~common.isin(modified_keys)]
+    
+    return {
+        "added_keys": list(added),
+        "removed_keys": list(removed),
+        "modified": modified,
+        "unchanged_count": int(new_h.loc[unchanged, MANIFEST_ROWS].sum()),
+        "column_changes": {c: int(n) for c, n in zip(cols, changed.sum(axis=0)) if n},
+    }
+
+
+def _load_rows(
+    path: Path,
+    key_column: str,
+    keys: Set[str],
+    chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """Read only the rows whose key is in ``keys`` (all duplicates of each)."""
+    if not keys:
+        if path.suffix.lower() == '.xlsx':
+            return pd.read_excel(path, dtype=str, nrows=0)
+        return pd.read_csv(path, dtype=str, nrows=0)
+    parts = []
+    for chunk in _read_frames(path, chunksize):
+        key = chunk[key_column]
+        parts.append(chunk[key.notna() & key.astype(str).isin(keys)])
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[key_column])
+
 
 class DiffReport:
     """
@@ -68,6 +293,10 @@ class DiffReport:
         self._modified: Optional[pd.DataFrame] = None
         self._unchanged: Optional[pd.DataFrame] = None
         self._changes: List[Dict] = []
+        self._column_changes: Dict[str, int] = {}
+        self._old_count = len(old_df)
+        self._new_count = len(new_df)
+        self._unchanged_count = 0
         
         self._compute_diff()
     
@@ -181,6 +410,10 @@ class DiffReport:
         self._unchanged = self.new_df[
             self.new_df[self.key_column].astype(str).isin(unchanged_keys)
         ].copy()
+        self._unchanged_count = len(self._unchanged)
+        self._column_changes = dict(Counter(
+            c["column"] for record in self._changes for c in record["changes"]
+        ))
     
     @property
     def added(self) -> pd.DataFrame:
@@ -207,21 +440,27 @@ class DiffReport:
         """Detailed list of changes per record."""
         return self._changes
     
+    @property
+    def column_changes(self) -> Dict[str, int]:
+        """Number of modified records per changed column."""
+        return self._column_changes
+    
     def get_report(self) -> Dict[str, Any]:
         """Get summary report of differences."""
         return {
             "key_column": self.key_column,
-            "old_count": len(self.old_df),
-            "new_count": len(self.new_df),
+            "old_count": self._old_count,
+            "new_count": self._new_count,
             "added_count": len(self._added),
             "removed_count": len(self._removed),
             "modified_count": len(self._modified),
-            "unchanged_count": len(self._unchanged),
+            "unchanged_count": self._unchanged_count,
             "total_changes": len(self._added) + len(self._removed) + len(self._modified),
             "change_rate": (
                 (len(self._added) + len(self._removed) + len(self._modified)) / 
-                max(len(self.old_df), 1) * 100
+                max(self._old_count, 1) * 100
             ),
+            "column_changes": self._column_changes,
             "generated_at": datetime.now().isoformat(),
         }
     
@@ -288,6 +527,169 @@ class DiffReport:
         return files
 
 
+class ManifestDiffReport(DiffReport):
+    """
+    DiffReport computed from two RowManifests.
+    
+    Keys are classified from the hashes alone; the files are then read once
+    more, keeping only the rows of added, removed and modified keys. Counts
+    match DiffReport, but ``unchanged`` is left empty (those rows are never
+    loaded) and values are compared as the strings in the file.
+    """
+    
+    def __init__(
+        self,
+        old_file: Union[str, Path],
+        new_file: Union[str, Path],
+        old_manifest: RowManifest,
+        new_manifest: RowManifest,
+        compare_columns: List[str] = None,
+        chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+    ):
+        if old_manifest.key_column != new_manifest.key_column:
+            raise ValueError(
+                f"Manifests use different key columns: "
+                f"'{old_manifest.key_column}' vs '{new_manifest.key_column}'"
+            )
+        self.old_file = Path(old_file)
+        self.new_file = Path(new_file)
+        self.old_manifest = old_manifest
+        self.new_manifest = new_manifest
+        self.key_column = new_manifest.key_column
+        self.compare_columns = compare_columns
+        self.chunksize = chunksize
+        
+        self._changes: List[Dict] = []
+        self._column_changes: Dict[str, int] = {}
+        self._old_count = old_manifest.rows
+        self._new_count = new_manifest.rows
+        self._unchanged_count = 0
+        
+        self._compute_diff()
+    
+    def _compute_diff(self):
+        delta = diff_manifests(self.old_manifest, self.new_manifest, self.compare_columns)
+        modified = delta["modified"]
+        added, removed = set(delta["added_keys"]), set(delta["removed_keys"])
+        
+        self.old_df = _load_rows(self.old_file, self.key_column, removed | set(modified), self.chunksize)
+        self.new_df = _load_rows(self.new_file, self.key_column, added | set(modified), self.chunksize)
+        old_keys = self.old_df[self.key_column].astype(str)
+        new_keys = self.new_df[self.key_column].astype(str)
+        
+        self._added = self.new_df[new_keys.isin(added)].copy()
+        self._removed = self.old_df[old_keys.isin(removed)].copy()
+        self._modified = self.new_df[new_keys.isin(modified.keys())].copy()
+        self._unchanged = self.new_df.iloc[0:0].copy()
+        self._unchanged_count = delta["unchanged_count"]
+        self._column_changes = delta["column_changes"]
+        
+        if not modified:
+            return
+        old_rows = self.old_df[old_keys.isin(modified.keys())].drop_duplicates(self.key_column)
+        new_rows = self._modified.drop_duplicates(self.key_column)
+        old_rows = old_rows.set_index(old_rows[self.key_column].astype(str))
+        new_rows = new_rows.set_index(new_rows[self.key_column].astype(str))
+        
+        for key, columns in modified.items():
+            old_row, new_row = old_rows.loc[key], new_rows.loc[key]
+            changes = []
+            for col in columns:
+                old_val, new_val = old_row.get(col), new_row.get(col)
+                changes.append({
+                    "column": col,
+                    "old_value": None if pd.isna(old_val) else old_val,
+                    "new_value": None if pd.isna(new_val) else new_val,
+                })
+            self._changes.append({"key": key, "changes": changes})
+
+
+def _manifest_path(manifest_dir: Path, path: Path, key_column: str, digest: str) -> Path:
+    tag = hashlib.sha256(f"{digest}\0{key_column}".encode("utf-8")).hexdigest()[:16]
+    return manifest_dir / f"{path.stem}_{tag}.parquet"
+
+
+def load_or_build_manifest(
+    path: Union[str, Path],
+    key_column: str,
+    manifest_dir: Union[str, Path] = None,
+    digest: Optional[str] = None,
+    chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+) -> Tuple[RowManifest, Optional[Path]]:
+    """
+    Return the manifest of a file, reusing the cached one for its content.
+    
+    Without ``manifest_dir`` or pyarrow the manifest is built and not saved.
+    
+    Returns:
+        (manifest, cached manifest path or None)
+    """
+    path = Path(path)
+    if manifest_dir is None or not PYARROW_AVAILABLE:
+        return RowManifest.build(path, key_column, chunksize, digest), None
+    
+    manifest_dir = Path(manifest_dir)
+    digest = digest or file_digest(path)
+    cached = _manifest_path(manifest_dir, path, key_column, digest)
+    if cached.exists():
+        try:
+            return RowManifest.load(cached), cached
+        except Exception as e:
+            logger.warning(f"Rebuilding unreadable manifest {cached.name}: {e}")
+    
+    manifest = RowManifest.build(path, key_column, chunksize, digest)
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    manifest.save(cached)
+    return manifest, cached
+
+
+def _track_file_task(
+    diff_dir: str,
+    current_file: str,
+    previous_file: Optional[str],
+    key_column: str,
+    digests: Dict[str, Optional[str]],
+    prefix: str,
+    chunksize: Optional[int],
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Diff one file against its previous version; returns (report, history entry)."""
+    diff_dir = Path(diff_dir)
+    manifest_dir = diff_dir / "manifests"
+    current_file = Path(current_file)
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "key_column": key_column,
+        "current_digest": digests.get("current"),
+        "previous_digest": digests.get("previous"),
+    }
+    
+    try:
+        current, current_path = load_or_build_manifest(
+            current_file, key_column, manifest_dir, digests.get("current"), chunksize)
+        entry["current_manifest"] = current_path.name if current_path else None
+        
+        if previous_file is None:
+            # First run: nothing to compare, but the manifest is ready for the next one
+            entry.update({"file": str(current_file), "is_first_run": True})
+            return {"is_first_run": True, "file": str(current_file)}, entry
+        
+        previous, previous_path = load_or_build_manifest(
+            previous_file, key_column, manifest_dir, digests.get("previous"), chunksize)
+        entry["previous_manifest"] = previous_path.name if previous_path else None
+        diff = ManifestDiffReport(previous_file, current_file, previous, current, chunksize=chunksize)
+    except Exception as e:
+        return {"error": f"Failed to diff {current_file.name}: {e}"}, None
+    
+    report = diff.get_report()
+    report["diff_files"] = diff.save_diff_report(diff_dir, prefix)
+    entry.update({
+        "current_file": str(current_file),
+        "previous_file": str(previous_file),
+        "report": report,
+    })
+    return report, entry
+
+
 class DataDiffTracker:
     """
     Tracks changes across multiple scraper runs.
@@ -314,6 +716,7 @@ class DataDiffTracker:
         self.diff_dir = self.output_dir / ".diffs"
         self.diff_dir.mkdir(parents=True, exist_ok=True)
         
+        self.manifest_dir = self.diff_dir / "manifests"
         self._history_file = self.diff_dir / "diff_history.json"
         self._history: List[Dict] = self._load_history()
     
@@ -329,24 +732,78 @@ class DataDiffTracker:
         return []
     
     def _save_history(self):
-        """Save diff history."""
-        import json
+        """Save diff history and drop manifests it no longer references."""
+        self._history = self._history[-100:]  # Keep last 100
         with open(self._history_file, 'w', encoding='utf-8') as f:
-            json.dump(self._history[-100:], f, indent=2, default=str)  # Keep last 100
+            json.dump(self._history, f, indent=2, default=str)
+        self._prune_manifests()
+    
+    def _prune_manifests(self):
+        if not self.manifest_dir.exists():
+            return
+        keep = {
+            entry.get(field)
+            for entry in self._history
+            for field in ("current_manifest", "previous_manifest")
+        }
+        for path in self.manifest_dir.glob("*.parquet"):
+            if path.name not in keep:
+                path.unlink(missing_ok=True)
+    
+    def _cached_report(self, key_column: str, digests: Dict[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+        """Report of an earlier diff of the same two file contents, if its files remain."""
+        if not digests.get("previous"):
+            return None
+        for entry in reversed(self._history):
+            report = entry.get("report")
+            if (report
+                    and entry.get("key_column") == key_column
+                    and entry.get("current_digest") == digests["current"]
+                    and entry.get("previous_digest") == digests["previous"]
+                    and all(Path(f).exists() for f in report.get("diff_files", {}).values())):
+                return dict(report, cached=True)
+        return None
+    
+    def _task_args(
+        self,
+        current_file: Path,
+        previous_file: Optional[Path],
+        key_column: str,
+        prefix: str,
+        chunksize: Optional[int],
+    ) -> Tuple[Dict[str, Optional[str]], tuple]:
+        digests = {
+            "current": file_digest(current_file),
+            "previous": file_digest(previous_file) if previous_file else None,
+        }
+        args = (
+            str(self.diff_dir), str(current_file),
+            str(previous_file) if previous_file else None,
+            key_column, digests, prefix, chunksize,
+        )
+        return digests, args
     
     def track_run(
         self,
         current_file: Union[str, Path],
         key_column: str,
         previous_file: Union[str, Path] = None,
+        use_manifests: bool = True,
+        chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
     ) -> Dict[str, Any]:
         """
         Track changes from previous run.
         
+        Both files are diffed through their cached row manifests; a pair of
+        file contents that was already diffed returns the stored report
+        (marked ``cached``) without reading either file.
+        
         Args:
             current_file: Current output file
             key_column: Key column for comparison
             previous_file: Previous file (auto-detect if None)
+            use_manifests: False re-reads both files whole, as compare_runs does
+            chunksize: Rows per chunk when hashing or re-reading CSVs
         
         Returns:
             Diff report dict
@@ -360,6 +817,89 @@ class DataDiffTracker:
         if previous_file is None:
             previous_file = self._find_previous_file(current_file)
         
+        if not use_manifests:
+            return self._track_run_full(current_file, key_column, previous_file)
+        
+        digests, args = self._task_args(
+            current_file, Path(previous_file) if previous_file else None,
+            key_column, self.scraper_name, chunksize,
+        )
+        cached = self._cached_report(key_column, digests)
+        if cached is not None:
+            return cached
+        
+        report, entry = _track_file_task(*args)
+        if entry is not None:
+            self._history.append(entry)
+            self._save_history()
+        return report
+    
+    def track_all_outputs(
+        self,
+        key_column: Union[str, Dict[str, str]],
+        pattern: str = "*.csv",
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Track changes for every output file, diffing files in parallel.
+        
+        Each file is one task in a process pool (manifests are built and
+        compared in the workers); history is written once at the end.
+        
+        Args:
+            key_column: Key column for all files, or a mapping of file name
+                to key column (files not in the mapping are skipped)
+            pattern: Glob for output files in output_dir
+            processes: Worker processes (default: CPU count - 1; 1 disables the pool)
+            chunksize: Rows per chunk when hashing or re-reading CSVs
+        
+        Returns:
+            Dict of file name -> diff report dict
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        tasks = []
+        for path in sorted(p for p in self.output_dir.glob(pattern) if p.is_file()):
+            key = key_column.get(path.name) if isinstance(key_column, dict) else key_column
+            if key is None:
+                continue
+            digests, args = self._task_args(
+                path, self._find_previous_file(path), key,
+                f"{self.scraper_name}_{path.stem}", chunksize,
+            )
+            cached = self._cached_report(key, digests)
+            if cached is not None:
+                results[path.name] = cached
+            else:
+                tasks.append((path.name, args))
+        
+        workers = min(processes or default_processes(), len(tasks))
+        if workers <= 1:
+            outcomes = [_track_file_task(*args) for _, args in tasks]
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(_track_file_task, *args) for _, args in tasks]
+                    outcomes = [fut.result() for fut in futures]
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning(f"Diff pool failed ({e}); diffing in-process")
+                outcomes = [_track_file_task(*args) for _, args in tasks]
+        
+        for (name, _), (report, entry) in zip(tasks, outcomes):
+            results[name] = report
+            if entry is not None:
+                self._history.append(entry)
+        if tasks:
+            self._save_history()
+        return results
+    
+    def _track_run_full(
+        self,
+        current_file: Path,
+        key_column: str,
+        previous_file: Union[str, Path, None],
+    ) -> Dict[str, Any]:
+        """Diff by loading both files whole (the pre-manifest behaviour)."""
         if previous_file is None:
             # First run, no comparison possible
             self._history.append({
@@ -478,6 +1018,7 @@ def compare_runs(
     new_file: Union[str, Path],
     key_column: str,
     compare_columns: List[str] = None,
+    manifest_dir: Union[str, Path] = None,
 ) -> DiffReport:
     """
     Compare two data files.
@@ -487,6 +1028,8 @@ def compare_runs(
         new_file: Path to new/current file
         key_column: Column to use as unique identifier
         compare_columns: Columns to compare (all if None)
+        manifest_dir: Cache row manifests here and diff through them
+            (returns a ManifestDiffReport) instead of loading both files
     
     Returns:
         DiffReport object
@@ -494,6 +1037,11 @@ def compare_runs(
     old_file = Path(old_file)
     new_file = Path(new_file)
     
+    if manifest_dir is not None:
+        old_manifest, _ = load_or_build_manifest(old_file, key_column, manifest_dir)
+        new_manifest, _ = load_or_build_manifest(new_file, key_column, manifest_dir)
+        return ManifestDiffReport(old_file, new_file, old_manifest, new_manifest, compare_columns)
+    
     # Load DataFrames
     if old_file.suffix.lower() == '.xlsx':
         old_df = pd.read_excel(old_file)
@@ -19,11 +19,27 @@ Usage:
     
     # Export validation
     results = checker.validate_export(export_file_path)
+
+Table checks are AggregateCheck definitions: all enabled aggregates on a
+table are merged into one scan per run, and the values are cached per
+(run_id, table). Add checks with register_check() or the ``checks``
+argument, as objects or plain dicts:
+
+    register_check({
+        "name": "price_nulls", "check_type": "postrun",
+        "tables": ["{prefix}products"], "columns": ["price_ars"],
+        "metrics": {"total": "COUNT(*)",
+                    "null_price": "COUNT(*) FILTER (WHERE price_ars IS NULL)"},
+        "rules": [{"metric": "null_price", "of": "total", "max_pct": 5}],
+    })
 """
 
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -60,82 +76,445 @@ class QualityCheckResult:
         }
 
 
+@dataclass
+class ThresholdRule:
+    """
+    Declarative threshold on one aggregate metric.
+
+    With ``of`` set the metric is compared as a percentage of that metric
+    (e.g. null count of total rows); otherwise its raw value is compared.
+    """
+    metric: str
+    of: Optional[str] = None
+    max_pct: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    label: Optional[str] = None
+    detail_key: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ThresholdRule":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+    def check(self, metrics: Dict[str, Any]) -> Tuple[Optional[float], Optional[str]]:
+        """Return (value, issue); value is None when the metric is not comparable."""
+        value = metrics.get(self.metric)
+        if value is None:
+            return None, None
+        label = self.label or self.metric
+        if self.of is not None:
+            base = metrics.get(self.of) or 0
+            if base <= 0:
+                return None, None
+            pct = (value / base) * 100
+            if self.max_pct is not None and pct > self.max_pct:
+                return pct, f"{label}: {pct:.1f}%"
+            return pct, None
+        if self.min is not None and value < self.min:
+            return value, f"{label}: {value} < {self.min}"
+        if self.max is not None and value > self.max:
+            return value, f"{label}: {value} > {self.max}"
+        return value, None
+
+
+@dataclass
+class AggregateCheck:
+    """
+    Declarative per-table check evaluated from SQL aggregates.
+
+    ``metrics`` maps names to aggregate expressions over the table
+    (``COUNT(*) FILTER (WHERE company IS NULL)``). The aggregates of every
+    check that reads the same table are merged into one SELECT, so all
+    checks on a table cost a single scan per run. Tables are templates
+    expanded with the scraper's prefix (``{prefix}products`` ->
+    ``my_products``); tables that don't exist or lack ``columns`` are
+    skipped. Results come from ``rules`` unless ``evaluate`` is given.
+    """
+    name: str
+    check_type: str
+    tables: Tuple[str, ...]
+    metrics: Dict[str, str]
+    columns: Tuple[str, ...] = ()
+    run_scoped: bool = True
+    rules: Tuple[ThresholdRule, ...] = ()
+    severity: CheckSeverity = CheckSeverity.WARNING
+    ok_message: str = "Within acceptable range"
+    fail_message: str = "Threshold exceeded"
+    evaluate: Optional[Callable[["AggregateCheck", Dict[str, Dict[str, Any]]], "QualityCheckResult"]] = None
+    enabled: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AggregateCheck":
+        """Build a check from a plain (e.g. JSON) definition."""
+        data = dict(data)
+        data["tables"] = tuple(data.get("tables") or ())
+        data["columns"] = tuple(data.get("columns") or ())
+        data["rules"] = tuple(
+            r if isinstance(r, ThresholdRule) else ThresholdRule.from_dict(r)
+            for r in data.get("rules") or ()
+        )
+        if isinstance(data.get("severity"), str):
+            data["severity"] = CheckSeverity(data["severity"])
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+    def table_names(self, prefix: str) -> List[str]:
+        return [t.format(prefix=prefix) for t in self.tables]
+
+    def result(self, passed: bool, message: str, severity: Optional[CheckSeverity] = None,
+               details: Optional[Dict[str, Any]] = None) -> "QualityCheckResult":
+        return QualityCheckResult(
+            check_type=self.check_type,
+            check_name=self.name,
+            severity=severity or (CheckSeverity.INFO if passed else self.severity),
+            passed=passed,
+            message=message,
+            details=details or {},
+        )
+
+    def evaluate_rules(self, metrics_by_table: Dict[str, Dict[str, Any]]) -> "QualityCheckResult":
+        issues = []
+        details: Dict[str, Any] = {}
+        multi = len(metrics_by_table) > 1
+        for table, metrics in metrics_by_table.items():
+            for rule in self.rules:
+                value, issue = rule.check(metrics)
+                if value is None:
+                    continue
+                key = rule.detail_key or rule.metric
+                details[f"{table}.{key}" if multi else key] = value
+                if issue:
+                    issues.append(f"{table} {issue}" if multi else issue)
+        if issues:
+            return self.result(False, f"{self.fail_message}: {', '.join(issues)}", details=details)
+        return self.result(True, self.ok_message)
+
+
+def _normalize_sql(expr: str) -> str:
+    return " ".join(expr.split())
+
+
+class AggregateCache:
+    """
+    Aggregate values per (scraper, run_id, table, run_scoped), shared by all
+    checkers in the process so repeated GUI/API requests don't rescan.
+
+    Entries expire after ``ttl_seconds`` (the run may still be writing) and
+    the least recently used are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry["at"] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: Dict[str, Any], at: Optional[float] = None):
+        entry["at"] = time.monotonic() if at is None else at
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scraper_name: Optional[str] = None, run_id: Optional[str] = None):
+        with self._lock:
+            for key in list(self._entries):
+                if (scraper_name is None or key[0] == scraper_name) and (run_id is None or key[1] == run_id):
+                    del self._entries[key]
+
+
+_AGGREGATE_CACHE = AggregateCache()
+
+
+def invalidate_quality_cache(scraper_name: Optional[str] = None, run_id: Optional[str] = None):
+    """Drop cached aggregates, e.g. after re-running or clearing a step."""
+    _AGGREGATE_CACHE.invalidate(scraper_name, run_id)
+
+
+def _evaluate_input_counts(check: AggregateCheck, metrics_by_table: Dict[str, Dict[str, Any]]) -> QualityCheckResult:
+    counts = {table: metrics["rows"] for table, metrics in metrics_by_table.items()}
+    if not counts:
+        return check.result(True, "No input tables found (may be expected)",
+                            CheckSeverity.WARNING, {"counts": counts})
+    total = sum(counts.values())
+    if total == 0:
+        return check.result(False, "Input tables are empty", CheckSeverity.CRITICAL, {"counts": counts})
+    return check.result(True, f"Input tables populated: {total} total rows", details={"counts": counts})
+
+
+def _evaluate_row_count_deltas(check: AggregateCheck, metrics_by_table: Dict[str, Dict[str, Any]]) -> QualityCheckResult:
+    steps = next(iter(metrics_by_table.values()), {}).get("steps") or []
+    if not steps:
+        return check.result(True, "No step data available")
+
+    # Check for significant drops (>50%)
+    issues = []
+    for i in range(1, len(steps)):
+        prev_processed = steps[i-1][1] or 0
+        curr_processed = steps[i][1] or 0
+        if prev_processed > 0:
+            delta_pct = ((curr_processed - prev_processed) / prev_processed) * 100
+            if delta_pct < -50:
+                issues.append({
+                    "step": steps[i][0],
+                    "delta_pct": delta_pct,
+                    "prev": prev_processed,
+                    "curr": curr_processed
+                })
+
+    if issues:
+        return check.result(False, f"Significant row count drops detected: {len(issues)} issues",
+                            details={"issues": issues})
+    return check.result(True, "Row count deltas within normal range")
+
+
+INPUT_TABLE_COUNTS = AggregateCheck(
+    name="input_table_counts",
+    check_type="preflight",
+    tables=("{prefix}input_products", "{prefix}input_search_terms"),
+    metrics={"rows": "COUNT(*)"},
+    run_scoped=False,
+    evaluate=_evaluate_input_counts,
+)
+
+ROW_COUNT_DELTAS = AggregateCheck(
+    name="row_count_deltas",
+    check_type="postrun",
+    tables=("{prefix}step_progress",),
+    columns=("step_number", "rows_processed"),
+    metrics={"steps": "json_agg(json_build_array(step_number, rows_processed) ORDER BY step_number)"},
+    evaluate=_evaluate_row_count_deltas,
+)
+
+NULL_RATES = AggregateCheck(
+    name="null_rates",
+    check_type="postrun",
+    tables=("{prefix}products",),
+    columns=("product_name", "company"),
+    metrics={
+        "total": "COUNT(*)",
+        "null_product_name": "COUNT(*) FILTER (WHERE product_name IS NULL)",
+        "null_company": "COUNT(*) FILTER (WHERE company IS NULL)",
+    },
+    rules=(
+        ThresholdRule("null_product_name", of="total", max_pct=10, label="product_name",
+                      detail_key="null_rate_product"),
+        ThresholdRule("null_company", of="total", max_pct=10, label="company",
+                      detail_key="null_rate_company"),
+    ),
+    ok_message="Null rates within acceptable range",
+    fail_message="High null rates detected",
+)
+
+# Checks every DataQualityChecker runs; extend with register_check()
+AGGREGATE_CHECKS: List[AggregateCheck] = [INPUT_TABLE_COUNTS, ROW_COUNT_DELTAS, NULL_RATES]
+
+
+def register_check(check: Union[AggregateCheck, Dict[str, Any]]) -> AggregateCheck:
+    """Add a check (object or plain definition) to the default set, replacing one with the same name."""
+    if not isinstance(check, AggregateCheck):
+        check = AggregateCheck.from_dict(check)
+    AGGREGATE_CHECKS[:] = [c for c in AGGREGATE_CHECKS if c.name != check.name] + [check]
+    return check
+
+
 class DataQualityChecker:
     """Automated data quality checks."""
     
-    def __init__(self, scraper_name: str, run_id: str):
+    def __init__(self, scraper_name: str, run_id: str,
+                 checks: Optional[List[Union[AggregateCheck, Dict[str, Any]]]] = None,
+                 cache: Optional[AggregateCache] = None,
+                 db_factory: Optional[Callable[[str], Any]] = None):
         """
         Initialize data quality checker.
         
         Args:
             scraper_name: Name of the scraper
             run_id: Current run ID
+            checks: Extra AggregateCheck objects or plain definitions on top of AGGREGATE_CHECKS
+            cache: Aggregate cache (defaults to the process-wide one)
+            db_factory: Callable returning a PostgresDB for the scraper (defaults to get_db)
         """
         self.scraper_name = scraper_name
         self.run_id = run_id
         self.results: List[QualityCheckResult] = []
+        self.cache = cache if cache is not None else _AGGREGATE_CACHE
+        self._db_factory = db_factory
+        extra = [c if isinstance(c, AggregateCheck) else AggregateCheck.from_dict(c) for c in checks or ()]
+        names = {c.name for c in extra}
+        self.checks: List[AggregateCheck] = [c for c in AGGREGATE_CHECKS if c.name not in names] + extra
     
-    def check_input_table_counts(self) -> QualityCheckResult:
-        """Pre-flight: Check input table row counts."""
+    def _get_db(self):
+        if self._db_factory is not None:
+            return self._db_factory(self.scraper_name)
+        from core.db.postgres_connection import get_db
+        return get_db(self.scraper_name)
+    
+    def _prefix(self) -> str:
+        from core.db.postgres_connection import COUNTRY_PREFIX_MAP
+        return COUNTRY_PREFIX_MAP.get(self.scraper_name, "")
+    
+    def collect_aggregates(self, checks: List[AggregateCheck]) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute the metrics of ``checks`` with one SELECT per table.
+        
+        Cached tables are not queried again; a table only scans for the
+        aggregates it does not have cached yet. Returns, per check name,
+        ``{"tables": {table: {metric: value}}, "errors": {table: message}}``.
+        """
+        prefix = self._prefix()
+        entries: Dict[tuple, Dict[str, Any]] = {}
+        uncached = []
+        for check in checks:
+            for table in check.table_names(prefix):
+                key = (self.scraper_name, self.run_id, table, check.run_scoped)
+                if key not in entries:
+                    entry = self.cache.get(key)
+                    if entry is None:
+                        entry = {"columns": None, "values": {}, "error": None, "at": None}
+                        uncached.append(key)
+                    else:
+                        entry = dict(entry, values=dict(entry["values"]))
+                    entries[key] = entry
+        
+        def available(check: AggregateCheck, entry: Dict[str, Any]) -> bool:
+            columns = entry["columns"]
+            if not columns or entry["error"]:
+                return False
+            needed = set(check.columns) | ({"run_id"} if check.run_scoped else set())
+            return needed <= columns
+        
+        grown = set()
+        db = None
         try:
-            from core.db.postgres_connection import get_db, COUNTRY_PREFIX_MAP
-            
-            with get_db(self.scraper_name) as db:
-                prefix = COUNTRY_PREFIX_MAP.get(self.scraper_name, "")
-                
-                input_tables = [
-                    f"{prefix}input_products",
-                    f"{prefix}input_search_terms",
-                ]
-                
-                counts = {}
-                with db.cursor() as cur:
-                    for table in input_tables:
-                        try:
-                            cur.execute(f"SELECT COUNT(*) FROM {table}")
-                            count = cur.fetchone()[0]
-                            counts[table] = count
-                        except Exception:
-                            pass
+            if uncached:
+                db = self._get_db()
+                # One catalog lookup tells which tables exist and which checks they support
+                tables = sorted({key[2] for key in uncached})
+                catalog: Dict[str, set] = {}
+                try:
+                    with db.cursor() as cur:
+                        cur.execute("""
+                            SELECT table_name, column_name
+                            FROM information_schema.columns
+                            WHERE table_schema = current_schema()
+                              AND table_name = ANY(%s)
+                        """, (tables,))
+                        for table, column in cur.fetchall():
+                            catalog.setdefault(table, set()).add(column)
+                except Exception as e:
+                    for key in uncached:
+                        entries[key]["error"] = str(e)
+                else:
+                    for key in uncached:
+                        entries[key]["columns"] = catalog.get(key[2], set())
             
-                if not counts:
-                    return QualityCheckResult(
-                        check_type="preflight",
-                        check_name="input_table_counts",
-                        severity=CheckSeverity.WARNING,
-                        passed=True,
-                        message="No input tables found (may be expected)",
-                        details={"counts": counts}
-                    )
-                
-                total = sum(counts.values())
-                if total == 0:
-                    return QualityCheckResult(
-                        check_type="preflight",
-                        check_name="input_table_counts",
-                        severity=CheckSeverity.CRITICAL,
-                        passed=False,
-                        message="Input tables are empty",
-                        details={"counts": counts}
-                    )
-                
-                return QualityCheckResult(
-                    check_type="preflight",
-                    check_name="input_table_counts",
-                    severity=CheckSeverity.INFO,
-                    passed=True,
-                    message=f"Input tables populated: {total} total rows",
-                    details={"counts": counts}
-                )
+            # Merge every pending aggregate of a table into a single scan
+            for key, entry in entries.items():
+                exprs = []
+                for check in checks:
+                    if key[2] in check.table_names(prefix) and key[3] == check.run_scoped and available(check, entry):
+                        exprs += [_normalize_sql(e) for e in check.metrics.values()]
+                pending = [e for e in dict.fromkeys(exprs) if e not in entry["values"]]
+                if not pending:
+                    continue
+                if db is None:
+                    db = self._get_db()
+                select = ", ".join(f'{e.replace("%", "%%")} AS m{i}' for i, e in enumerate(pending))
+                where = " WHERE run_id = %s" if key[3] else ""
+                params = (self.run_id,) if key[3] else ()
+                try:
+                    with db.cursor() as cur:
+                        cur.execute(f"SELECT {select} FROM {key[2]}{where}", params)
+                        row = cur.fetchone()
+                    entry["values"].update(zip(pending, row))
+                    grown.add(key)
+                except Exception as e:
+                    logger.warning(f"Quality scan of {key[2]} failed: {e}")
+                    entry["error"] = str(e)
+        finally:
+            close = getattr(db, "close", None)
+            if callable(close):
+                close()
+        
+        # Failed lookups are retried next time; extending a cached entry keeps its age
+        for key, entry in entries.items():
+            if not entry["error"] and (key in uncached or key in grown):
+                self.cache.put(key, entry, at=entry["at"])
+        
+        out: Dict[str, Dict[str, Any]] = {}
+        for check in checks:
+            tables: Dict[str, Dict[str, Any]] = {}
+            errors: Dict[str, str] = {}
+            for table in check.table_names(prefix):
+                entry = entries[(self.scraper_name, self.run_id, table, check.run_scoped)]
+                if entry["error"]:
+                    errors[table] = entry["error"]
+                elif available(check, entry):
+                    tables[table] = {name: entry["values"].get(_normalize_sql(expr))
+                                     for name, expr in check.metrics.items()}
+            out[check.name] = {"tables": tables, "errors": errors}
+        return out
+    
+    def run_aggregate_checks(self, check_type: Optional[str] = None,
+                             names: Optional[List[str]] = None) -> List[QualityCheckResult]:
+        """Run enabled aggregate checks (optionally one type or named ones) in one pass."""
+        checks = [c for c in self.checks
+                  if c.enabled
+                  and (check_type is None or c.check_type == check_type)
+                  and (names is None or c.name in names)]
+        if not checks:
+            return []
+        try:
+            collected = self.collect_aggregates(checks)
         except Exception as e:
-            return QualityCheckResult(
-                check_type="preflight",
-                check_name="input_table_counts",
-                severity=CheckSeverity.WARNING,
-                passed=False,
-                message=f"Could not check input tables: {e}",
-                details={"error": str(e)}
-            )
+            collected = {c.name: {"tables": {}, "errors": {"*": str(e)}} for c in checks}
+        
+        results = []
+        for check in checks:
+            data = collected[check.name]
+            if data["errors"] and not data["tables"]:
+                error = "; ".join(data["errors"].values())
+                results.append(check.result(False, f"Could not check {check.name.replace('_', ' ')}: {error}",
+                                            CheckSeverity.WARNING, {"error": error}))
+                continue
+            try:
+                evaluate = check.evaluate or AggregateCheck.evaluate_rules
+                results.append(evaluate(check, data["tables"]))
+            except Exception as e:
+                results.append(check.result(False, f"Could not evaluate {check.name}: {e}",
+                                            CheckSeverity.WARNING, {"error": str(e)}))
+        return results
+    
+    def _run_single(self, name: str) -> QualityCheckResult:
+        return self.run_aggregate_checks(names=[name])[0]
+    
+    def check_input_table_counts(self) -> QualityCheckResult:
+        """Pre-flight: Check input table row counts."""
+        return self._run_single(INPUT_TABLE_COUNTS.name)
+    
+    def check_row_count_deltas(self) -> QualityCheckResult:
+        """Post-run: Check row count deltas between steps."""
+        return self._run_single(ROW_COUNT_DELTAS.name)
+    
+    def check_null_rates(self) -> QualityCheckResult:
+        """Post-run: Check null rates in key columns."""
+        return self._run_single(NULL_RATES.name)
     
     def check_pcid_mapping_coverage(self) -> QualityCheckResult:
         """Pre-flight: Check PCID mapping coverage."""
@@ -173,147 +552,6 @@ class DataQualityChecker:
                 details={"error": str(e)}
             )
     
-    def check_row_count_deltas(self) -> QualityCheckResult:
-        """Post-run: Check row count deltas between steps."""
-        try:
-            from core.db.postgres_connection import get_db, COUNTRY_PREFIX_MAP
-            
-            with get_db(self.scraper_name) as db:
-                prefix = COUNTRY_PREFIX_MAP.get(self.scraper_name, "")
-                table_name = f"{prefix}_step_progress"
-                
-                with db.cursor() as cur:
-                    cur.execute(f"""
-                        SELECT step_number, rows_inserted, rows_processed
-                        FROM {table_name}
-                        WHERE run_id = %s
-                        ORDER BY step_number
-                    """, (self.run_id,))
-                
-                steps = cur.fetchall()
-                if not steps:
-                    return QualityCheckResult(
-                        check_type="postrun",
-                        check_name="row_count_deltas",
-                        severity=CheckSeverity.INFO,
-                        passed=True,
-                        message="No step data available",
-                        details={}
-                    )
-                
-                # Check for significant drops (>50%)
-                issues = []
-                for i in range(1, len(steps)):
-                    prev_processed = steps[i-1][2] or 0
-                    curr_processed = steps[i][2] or 0
-                    if prev_processed > 0:
-                        delta_pct = ((curr_processed - prev_processed) / prev_processed) * 100
-                        if delta_pct < -50:
-                            issues.append({
-                                "step": steps[i][0],
-                                "delta_pct": delta_pct,
-                                "prev": prev_processed,
-                                "curr": curr_processed
-                            })
-                
-                if issues:
-                    return QualityCheckResult(
-                        check_type="postrun",
-                        check_name="row_count_deltas",
-                        severity=CheckSeverity.WARNING,
-                        passed=False,
-                        message=f"Significant row count drops detected: {len(issues)} issues",
-                        details={"issues": issues}
-                    )
-                
-                return QualityCheckResult(
-                    check_type="postrun",
-                    check_name="row_count_deltas",
-                    severity=CheckSeverity.INFO,
-                    passed=True,
-                    message="Row count deltas within normal range",
-                    details={}
-                )
-        except Exception as e:
-            return QualityCheckResult(
-                check_type="postrun",
-                check_name="row_count_deltas",
-                severity=CheckSeverity.WARNING,
-                passed=False,
-                message=f"Could not check row count deltas: {e}",
-                details={"error": str(e)}
-            )
-    
-    def check_null_rates(self) -> QualityCheckResult:
-        """Post-run: Check null rates in key columns."""
-        try:
-            from core.db.postgres_connection import get_db, COUNTRY_PREFIX_MAP
-            
-            with get_db(self.scraper_name) as db:
-                prefix = COUNTRY_PREFIX_MAP.get(self.scraper_name, "")
-                
-                # Check main product table
-                product_table = f"{prefix}_products"
-                with db.cursor() as cur:
-                    try:
-                        cur.execute(f"""
-                            SELECT 
-                                COUNT(*) as total,
-                                COUNT(*) FILTER (WHERE product_name IS NULL) as null_product_name,
-                                COUNT(*) FILTER (WHERE company IS NULL) as null_company
-                            FROM {product_table}
-                            WHERE run_id = %s
-                        """, (self.run_id,))
-                    
-                        row = cur.fetchone()
-                        if row and row[0] > 0:
-                            total = row[0]
-                            null_product = row[1]
-                            null_company = row[2]
-                            
-                            null_rate_product = (null_product / total) * 100
-                            null_rate_company = (null_company / total) * 100
-                            
-                            issues = []
-                            if null_rate_product > 10:
-                                issues.append(f"product_name: {null_rate_product:.1f}%")
-                            if null_rate_company > 10:
-                                issues.append(f"company: {null_rate_company:.1f}%")
-                            
-                            if issues:
-                                return QualityCheckResult(
-                                    check_type="postrun",
-                                    check_name="null_rates",
-                                    severity=CheckSeverity.WARNING,
-                                    passed=False,
-                                    message=f"High null rates detected: {', '.join(issues)}",
-                                    details={
-                                        "null_rate_product": null_rate_product,
-                                        "null_rate_company": null_rate_company
-                                    }
-                                )
-                    except Exception:
-                        # Table doesn't exist or different schema
-                        pass
-            
-            return QualityCheckResult(
-                check_type="postrun",
-                check_name="null_rates",
-                severity=CheckSeverity.INFO,
-                passed=True,
-                message="Null rates within acceptable range",
-                details={}
-            )
-        except Exception as e:
-            return QualityCheckResult(
-                check_type="postrun",
-                check_name="null_rates",
-                severity=CheckSeverity.WARNING,
-                passed=False,
-                message=f"Could not check null rates: {e}",
-                details={"error": str(e)}
-            )
-    
     def validate_export(self, export_file_path: Path) -> QualityCheckResult:
         """Export: Validate export file integrity."""
         try:
@@ -373,18 +611,14 @@ class DataQualityChecker:
     
     def run_preflight_checks(self) -> List[QualityCheckResult]:
         """Run all pre-flight checks."""
-        self.results = [
-            self.check_input_table_counts(),
+        self.results = self.run_aggregate_checks("preflight") + [
             self.check_pcid_mapping_coverage(),
         ]
         return self.results
     
     def run_postrun_checks(self) -> List[QualityCheckResult]:
         """Run all post-run checks."""
-        self.results = [
-            self.check_row_count_deltas(),
-            self.check_null_rates(),
-        ]
+        self.results = self.run_aggregate_checks("postrun")
         return self.results
     
     def save_results_to_db(self):
@@ -15,13 +15,21 @@ Usage:
     # Or get a validator for custom use
     validator = get_validator("Malaysia")
     validated_df = validator.validate(df)
+    
+    # Large files: stream in row chunks; validate a directory in parallel
+    result = validator.validate_file("output/Malaysia/products.csv", chunksize=100_000)
+    results = validate_all_outputs("output/Malaysia", "Malaysia", processes=4)
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 # Try to import pandera, gracefully degrade if not available
@@ -38,6 +46,74 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Rows per chunk when validate_all_outputs streams files
+DEFAULT_CHUNKSIZE = 100_000
+
+# Failure cases kept per file in chunked mode (counts cover all of them)
+MAX_ERROR_SAMPLES = 100
+
+
+def default_processes() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class _ChunkAccumulator:
+    """Running totals of a chunked validation: stats, error counts and a bounded error sample."""
+    
+    def __init__(self, max_error_samples: int):
+        self.max_error_samples = max_error_samples
+        self.rows = 0
+        self.chunks = 0
+        self.columns: List[str] = []
+        self.null_counts: Dict[str, int] = {}
+        self.row_hashes: List[np.ndarray] = []
+        self.error_count = 0
+        self.error_counts: Dict[str, int] = {}
+        self.errors: List[Dict[str, Any]] = []
+        self._column_level = set()
+        self.basic_failures: Dict[Tuple[str, str], int] = {}
+    
+    def add_chunk(self, chunk: pd.DataFrame):
+        if not self.chunks:
+            self.columns = list(chunk.columns)
+        self.chunks += 1
+        self.rows += len(chunk)
+        for col, count in chunk.isnull().sum().items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(count)
+        if len(chunk):
+            self.row_hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+    
+    def add_error(self, error: Dict[str, Any], row: Any = None):
+        # Column-level failures (missing column, wrong dtype) repeat in every chunk; count once
+        if row is None:
+            key = (error.get("column"), error.get("check"), error.get("failure_case"), error.get("message"))
+            if key in self._column_level:
+                return
+            self._column_level.add(key)
+        self.error_count += 1
+        name = f"{error.get('column')}:{error.get('check')}"
+        self.error_counts[name] = self.error_counts.get(name, 0) + 1
+        if len(self.errors) < self.max_error_samples:
+            self.errors.append(dict(error, row=row) if row is not None else error)
+    
+    def add_basic_failure(self, column: str, check: str, count: int):
+        # Basic checks are per column: sum the counts and report once for the file
+        key = (column, check)
+        self.basic_failures[key] = self.basic_failures.get(key, 0) + count
+    
+    def duplicate_rows(self) -> int:
+        if not self.row_hashes:
+            return 0
+        hashes = np.concatenate(self.row_hashes)
+        return int(len(hashes) - len(np.unique(hashes)))
+
+
+def _validate_file_task(scraper_name: str, file_path: str, chunksize: Optional[int],
+                        max_error_samples: int) -> Dict[str, Any]:
+    """Process-pool entry point: validate one file with a fresh validator."""
+    return DataValidator(scraper_name).validate_file(
+        file_path, chunksize=chunksize, max_error_samples=max_error_samples)
+
 
 class DataValidator:
     """
@@ -258,50 +334,57 @@ class DataValidator:
     
     def _basic_validation(self, df: pd.DataFrame, result: Dict) -> Dict:
         """Basic validation when pandera is not available."""
+        for column, check, count in self._basic_failures(df):
+            result["valid"] = False
+            result["errors"].append(self._basic_error(column, check, count))
+        return result
+    
+    def _basic_failures(self, df: pd.DataFrame) -> List[Tuple[str, str, int]]:
+        """(column, check, failing values) for each basic check that fails on df."""
         schema_config = self.SCRAPER_SCHEMAS.get(self.scraper_name, {})
+        failures = []
         
         for col_name, col_config in schema_config.get("columns", {}).items():
             if col_name not in df.columns:
                 if not col_config.get("nullable", True):
-                    result["valid"] = False
-                    result["errors"].append({
-                        "column": col_name,
-                        "check": "column_exists",
-                        "message": f"Required column '{col_name}' not found"
-                    })
+                    failures.append((col_name, "column_exists", 0))
                 continue
             
             # Check for nulls in non-nullable columns
             if not col_config.get("nullable", True):
-                null_count = df[col_name].isnull().sum()
+                null_count = int(df[col_name].isnull().sum())
                 if null_count > 0:
-                    result["valid"] = False
-                    result["errors"].append({
-                        "column": col_name,
-                        "check": "not_null",
-                        "message": f"Column '{col_name}' has {null_count} null values"
-                    })
+                    failures.append((col_name, "not_null", null_count))
             
             # Check for valid prices
             if "valid_price" in col_config.get("checks", []):
                 if df[col_name].dtype in ['float64', 'int64']:
-                    negative_count = (df[col_name] < 0).sum()
+                    negative_count = int((df[col_name] < 0).sum())
                     if negative_count > 0:
-                        result["valid"] = False
-                        result["errors"].append({
-                            "column": col_name,
-                            "check": "valid_price",
-                            "message": f"Column '{col_name}' has {negative_count} negative values"
-                        })
+                        failures.append((col_name, "valid_price", negative_count))
         
-        return result
+        return failures
+    
+    @staticmethod
+    def _basic_error(column: str, check: str, count: int) -> Dict[str, Any]:
+        messages = {
+            "column_exists": "Required column '{column}' not found",
+            "not_null": "Column '{column}' has {count} null values",
+            "valid_price": "Column '{column}' has {count} negative values",
+        }
+        return {"column": column, "check": check,
+                "message": messages[check].format(column=column, count=count)}
     
-    def validate_file(self, file_path: Union[str, Path], **read_kwargs) -> Dict[str, Any]:
+    def validate_file(self, file_path: Union[str, Path], chunksize: Optional[int] = None,
+                      max_error_samples: int = MAX_ERROR_SAMPLES, **read_kwargs) -> Dict[str, Any]:
         """
         Validate a CSV/Excel file.
         
         Args:
             file_path: Path to the file
+            chunksize: Stream CSVs in chunks of this many rows instead of loading
+                them whole (Excel files are always read whole)
+            max_error_samples: Failure cases kept in "errors" in chunked mode
             **read_kwargs: Additional arguments for pd.read_csv/read_excel
         
         Returns:
@@ -316,6 +399,16 @@ class DataValidator:
                 "file_path": str(file_path),
             }
         
+        if chunksize and file_path.suffix.lower() != '.xlsx':
+            try:
+                return self._validate_file_chunked(file_path, chunksize, max_error_samples, **read_kwargs)
+            except Exception as e:
+                return {
+                    "valid": False,
+                    "errors": [{"message": f"Failed to read file: {str(e)}"}],
+                    "file_path": str(file_path),
+                }
+        
         try:
             if file_path.suffix.lower() == '.xlsx':
                 df = pd.read_excel(file_path, **read_kwargs)
@@ -335,6 +428,87 @@ class DataValidator:
             }
 
 
+    def _prepare_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Numeric schema columns for the basic (no pandera) path, which compares numbers."""
+        schema_config = self.SCRAPER_SCHEMAS.get(self.scraper_name, {})
+        for col_name, col_config in schema_config.get("columns", {}).items():
+            if col_config.get("dtype") in (float, int) and col_name in chunk.columns:
+                chunk[col_name] = pd.to_numeric(chunk[col_name], errors="coerce")
+        return chunk
+    
+    def _validate_chunk(self, chunk: pd.DataFrame, acc: _ChunkAccumulator):
+        """Validate one chunk against the compiled schema into the accumulator."""
+        if PANDERA_AVAILABLE and self.schema is not None:
+            try:
+                self.schema.validate(chunk, lazy=True)
+            except pa.errors.SchemaErrors as e:
+                for error in e.failure_cases.to_dict('records'):
+                    row = error.get("index")
+                    acc.add_error({
+                        "column": error.get("column"),
+                        "check": error.get("check"),
+                        "failure_case": str(error.get("failure_case", ""))[:100],
+                    }, row=None if pd.isna(row) else int(row))
+            except pa.errors.SchemaError as e:
+                acc.add_error({"message": str(e)[:500]})
+        else:
+            for column, check, count in self._basic_failures(self._prepare_chunk(chunk)):
+                acc.add_basic_failure(column, check, count)
+    
+    def _validate_file_chunked(self, file_path: Path, chunksize: int, max_error_samples: int,
+                               **read_kwargs) -> Dict[str, Any]:
+        """
+        Stream a CSV in row chunks, validating each against the compiled schema.
+        
+        Every column is read as text (explicit dtype, no per-chunk inference
+        that could disagree between chunks); the schema's coerce step turns
+        declared numeric columns into numbers. Null counts, duplicate rows
+        and error counts cover the whole file, "errors" keeps the first
+        ``max_error_samples`` failure cases. Basic-validation (no pandera)
+        counts are summed over the chunks and reported once per column and
+        check, as validate() reports them for the whole file.
+        """
+        read_kwargs.setdefault("dtype", str)
+        acc = _ChunkAccumulator(max_error_samples)
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, **read_kwargs):
+            acc.add_chunk(chunk)
+            self._validate_chunk(chunk, acc)
+        if not acc.chunks:
+            # Header-only file: validate the empty frame so missing columns still show up
+            header = pd.read_csv(file_path, nrows=0, **read_kwargs)
+            acc.add_chunk(header)
+            self._validate_chunk(header, acc)
+        for (column, check), count in acc.basic_failures.items():
+            acc.add_error(self._basic_error(column, check, count))
+        
+        result = {
+            "valid": acc.error_count == 0,
+            "rows": acc.rows,
+            "columns": acc.columns,
+            "errors": acc.errors,
+            "warnings": [],
+            "stats": {
+                "total_rows": acc.rows,
+                "total_columns": len(acc.columns),
+                "null_counts": acc.null_counts,
+                "duplicate_rows": acc.duplicate_rows(),
+            },
+            "validated_at": datetime.now().isoformat(),
+            "scraper": self.scraper_name,
+            "error_count": acc.error_count,
+            "error_counts": acc.error_counts,
+            "errors_truncated": acc.error_count > len(acc.errors),
+            "chunks": acc.chunks,
+            "file_path": str(file_path),
+            "file_size_bytes": file_path.stat().st_size,
+        }
+        if acc.rows == 0:
+            result["warnings"].append("DataFrame is empty")
+        if result["stats"]["duplicate_rows"] > 0:
+            result["warnings"].append(f"Found {result['stats']['duplicate_rows']} duplicate rows")
+        return result
+
+
 def get_validator(scraper_name: str) -> DataValidator:
     """Get a validator instance for a scraper."""
     return DataValidator(scraper_name)
@@ -371,29 +545,45 @@ def validate_dataframe(df: pd.DataFrame, scraper_name: str) -> Dict[str, Any]:
     return validator.validate(df)
 
 
-def validate_all_outputs(output_dir: Union[str, Path], scraper_name: str) -> List[Dict[str, Any]]:
+def validate_all_outputs(output_dir: Union[str, Path], scraper_name: str,
+                         chunksize: Optional[int] = DEFAULT_CHUNKSIZE,
+                         processes: Optional[int] = None,
+                         max_error_samples: int = MAX_ERROR_SAMPLES) -> List[Dict[str, Any]]:
     """
     Validate all CSV/Excel files in an output directory.
     
+    CSVs are streamed in chunks; with more than one file they are validated
+    in parallel across a process pool (one file per task).
+    
     Args:
         output_dir: Directory containing output files
         scraper_name: Name of the scraper
+        chunksize: Rows per chunk for CSVs (None reads each file whole)
+        processes: Worker processes (default: CPU count - 1; 1 disables the pool)
+        max_error_samples: Failure cases kept per file in chunked mode
     
     Returns:
-        List of validation results
+        List of validation results (CSV files first, then Excel, as before)
     """
     output_dir = Path(output_dir)
-    results = []
-    
-    validator = get_validator(scraper_name)
-    
-    for file_path in output_dir.glob("*.csv"):
-        results.append(validator.validate_file(file_path))
+    files = [str(p) for p in output_dir.glob("*.csv")] + [str(p) for p in output_dir.glob("*.xlsx")]
+    if not files:
+        return []
     
-    for file_path in output_dir.glob("*.xlsx"):
-        results.append(validator.validate_file(file_path))
+    workers = min(processes or default_processes(), len(files))
+    if workers <= 1:
+        validator = get_validator(scraper_name)
+        return [validator.validate_file(f, chunksize=chunksize, max_error_samples=max_error_samples)
+                for f in files]
     
-    return results
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_validate_file_task, scraper_name, f, chunksize, max_error_samples)
+                       for f in files]
+            return [fut.result() for fut in futures]
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"Validation pool failed ({e}); validating in-process")
+        return [_validate_file_task(scraper_name, f, chunksize, max_error_samples) for f in files]
 
 
 # CLI interface
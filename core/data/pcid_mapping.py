@@ -11,14 +11,46 @@ Usage:
     mappings = pcid.get_all()  # Get all PCID mappings for country
     oos_products = pcid.get_oos()  # Get OOS products
     pcid_value = pcid.lookup(company, product, generic, pack_desc)  # Lookup PCID
+    export_df = pcid.lookup_many(export_df, "company", "product")  # Bulk lookup
+
+Lookups go through an in-memory index built once per instance: normalized
+keys are computed at load time and stored in dicts keyed by
+(company, product), (company, product, generic), (company, product, pack)
+and the full tuple. The index is rebuilt after reload_pcid_mapping_from_csv
+or clear_cache().
 """
 
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Bumped per country by reload_pcid_mapping_from_csv so every PCIDMapping
+# instance in the process drops its index on the next lookup.
+_mapping_versions: Dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+
+def _mapping_version(country: str) -> int:
+    return _mapping_versions.get(country, 0)
+
+
+def _bump_mapping_version(country: str) -> None:
+    with _versions_lock:
+        _mapping_versions[country] = _mapping_versions.get(country, 0) + 1
+
+
+def _is_missing(value) -> bool:
+    """None and NaN-like values (float NaN, pd.NA) count as missing, as in pandas."""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except (TypeError, ValueError):
+        return True  # pd.NA refuses bool()
+
 
 @dataclass
 class PCIDMappingRow:
@@ -38,6 +70,31 @@ class PCIDMappingRow:
         return self.pcid.strip().upper() == "OOS"
 
 
+class PCIDIndex:
+    """
+    Normalized-key dict indexes over a list of mapping rows.
+
+    Each dict keeps the first row (in load order) for its key, which is the
+    row the original linear scan returned.
+    """
+
+    def __init__(self, rows: List[PCIDMappingRow], normalize):
+        self.by_product: Dict[Tuple[str, str], str] = {}
+        self.by_generic: Dict[Tuple[str, str, str], str] = {}
+        self.by_pack: Dict[Tuple[str, str, str], str] = {}
+        self.by_full: Dict[Tuple[str, str, str, str], str] = {}
+        for m in rows:
+            comp = normalize(m.company)
+            prod = normalize(m.local_product_name)
+            gen = normalize(m.generic_name)
+            pack = normalize(m.local_pack_description)
+            self.by_product.setdefault((comp, prod), m.pcid)
+            self.by_generic.setdefault((comp, prod, gen), m.pcid)
+            self.by_pack.setdefault((comp, prod, pack), m.pcid)
+            self.by_full.setdefault((comp, prod, gen, pack), m.pcid)
+        self.size = len(rows)
+
+
 class PCIDMapping:
     """
     PCID Mapping manager - reads from pcid_mapping database table only.
@@ -55,6 +112,9 @@ class PCIDMapping:
         self.country = country
         self._db = db
         self._cache: Optional[List[PCIDMappingRow]] = None
+        self._index: Optional[PCIDIndex] = None
+        self._index_version = -1
+        self._index_lock = threading.Lock()
     
     def _get_db(self):
         """Get database connection"""
@@ -118,6 +178,20 @@ class PCIDMapping:
         all_mappings = self.get_all()
         return [m for m in all_mappings if not m.is_oos()]
     
+    def get_index(self) -> PCIDIndex:
+        """Build (once) and return the normalized-key index for this country."""
+        version = _mapping_version(self.country)
+        index = self._index
+        if index is not None and self._index_version == version:
+            return index
+        with self._index_lock:
+            if self._index is None or self._index_version != version:
+                rows = self.get_all()
+                self._index = PCIDIndex(rows, self._normalize)
+                self._index_version = version
+                logger.debug(f"[PCID] Indexed {self._index.size} mappings for {self.country}")
+            return self._index
+    
     def lookup(self, company: str, product: str, 
                generic: str = "", pack_desc: str = "") -> Optional[str]:
         """
@@ -132,33 +206,88 @@ class PCIDMapping:
         Returns:
             PCID value or None if not found
         """
-        all_mappings = self.get_all()
+        index = self.get_index()
         
         # Normalize inputs
         comp_norm = self._normalize(company)
         prod_norm = self._normalize(product)
-        gen_norm = self._normalize(generic)
-        pack_norm = self._normalize(pack_desc)
         
-        # Try exact match first
-        for m in all_mappings:
-            if (self._normalize(m.company) == comp_norm and 
-                self._normalize(m.local_product_name) == prod_norm):
-                # If generic and pack_desc provided, match them too
-                if generic and pack_desc:
-                    if (self._normalize(m.generic_name) == gen_norm and
-                        self._normalize(m.local_pack_description) == pack_norm):
-                        return m.pcid
-                elif generic:
-                    if self._normalize(m.generic_name) == gen_norm:
-                        return m.pcid
-                elif pack_desc:
-                    if self._normalize(m.local_pack_description) == pack_norm:
-                        return m.pcid
-                else:
-                    return m.pcid
+        # If generic and pack_desc provided, match them too (NaN counts as not provided)
+        generic = "" if _is_missing(generic) else generic
+        pack_desc = "" if _is_missing(pack_desc) else pack_desc
+        if generic and pack_desc:
+            return index.by_full.get(
+                (comp_norm, prod_norm, self._normalize(generic), self._normalize(pack_desc)))
+        if generic:
+            return index.by_generic.get((comp_norm, prod_norm, self._normalize(generic)))
+        if pack_desc:
+            return index.by_pack.get((comp_norm, prod_norm, self._normalize(pack_desc)))
+        return index.by_product.get((comp_norm, prod_norm))
+    
+    def lookup_many(self, df, company_col: str, product_col: str,
+                    generic_col: Optional[str] = None, pack_col: Optional[str] = None,
+                    out_col: str = "pcid"):
+        """
+        Bulk lookup: add out_col with the PCID for every row of a DataFrame.
+        
+        Matches row for row what lookup() would return (None where not found,
+        and None/NaN cells treated as missing, as lookup() does), but
+        normalizes whole columns at once and resolves each key shape with a
+        single merge against the index.
+        
+        Args:
+            df: pandas DataFrame to map
+            company_col, product_col: Company / product name columns
+            generic_col, pack_col: Optional generic name / pack description columns
+            out_col: Name of the output column
+            
+        Returns:
+            Copy of df with out_col added
+        """
+        import numpy as np
+        import pandas as pd
+        
+        index = self.get_index()
+        result = df.copy()
+        n = len(df)
+        
+        def given(col):
+            # lookup() treats None/NaN/"" arguments as "not provided"
+            if col is None:
+                return np.zeros(n, dtype=bool)
+            values = df[col]
+            return (values.notna() & (values.astype(str) != "")).to_numpy()
+        
+        def normalized(col):
+            values = df[col]
+            return values.where(values.notna(), "").astype(str).str.strip().str.lower().to_numpy()
+        
+        keys = pd.DataFrame({"c": normalized(company_col), "p": normalized(product_col)})
+        has_gen, has_pack = given(generic_col), given(pack_col)
+        if generic_col is not None:
+            keys["g"] = normalized(generic_col)
+        if pack_col is not None:
+            keys["k"] = normalized(pack_col)
+        
+        cases = [
+            (has_gen & has_pack, ["c", "p", "g", "k"], index.by_full),
+            (has_gen & ~has_pack, ["c", "p", "g"], index.by_generic),
+            (~has_gen & has_pack, ["c", "p", "k"], index.by_pack),
+            (~has_gen & ~has_pack, ["c", "p"], index.by_product),
+        ]
+        pcids = np.full(n, None, dtype=object)
+        for mask, cols, table in cases:
+            if not mask.any() or not table:
+                continue
+            table_df = pd.DataFrame(list(table.keys()), columns=cols)
+            table_df["_pcid"] = list(table.values())
+            merged = keys.loc[mask, cols].merge(table_df, on=cols, how="left")
+            found = merged["_pcid"].to_numpy(dtype=object)
+            found[pd.isna(found)] = None
+            pcids[mask] = found
         
-        return None
+        result[out_col] = pd.Series(pcids, index=df.index, dtype=object)
+        return result
     
     def is_oos_product(self, company: str, product: str) -> bool:
         """Check if a product is OOS"""
@@ -178,12 +307,13 @@ class PCIDMapping:
     
     @staticmethod
     def _normalize(s: str) -> str:
-        """Normalize string for comparison"""
-        return str(s).strip().lower() if s else ""
+        """Normalize string for comparison (None/NaN become "")"""
+        return "" if _is_missing(s) or not s else str(s).strip().lower()
     
     def clear_cache(self):
-        """Clear the cache if use_cache was True"""
+        """Clear the cache if use_cache was True, and the lookup index"""
         self._cache = None
+        self._index = None
 
 
 def reload_pcid_mapping_from_csv(country: str, csv_path: str, db=None) -> int:
@@ -213,6 +343,8 @@ def reload_pcid_mapping_from_csv(country: str, csv_path: str, db=None) -> int:
     # Clear existing mappings for this country
     with db.cursor() as cur:
         cur.execute("DELETE FROM pcid_mapping WHERE source_country = %s", (country,))
+    # Lookup indexes built from the old rows are stale from here on
+    _bump_mapping_version(country)
     
     rows_loaded = 0
     
@@ -293,5 +425,6 @@ def reload_pcid_mapping_from_csv(country: str, csv_path: str, db=None) -> int:
                     ))
                     rows_loaded += 1
     
+    _bump_mapping_version(country)
     logger.info(f"[PCID] Reloaded {rows_loaded} mappings for {country} from {csv_path}")
     return rows_loaded
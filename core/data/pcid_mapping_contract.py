@@ -90,6 +90,12 @@ class SharedPCIDMapping(PCIDMappingInterface):
         """Lookup PCID using normalized matching."""
         return self._mapping.lookup(company, product, generic, pack_desc)
     
+    def lookup_many(self, df, company_col: str, product_col: str,
+                    generic_col: Optional[str] = None, pack_col: Optional[str] = None,
+                    out_col: str = "pcid"):
+        """Bulk lookup for a whole DataFrame (adds out_col)."""
+        return self._mapping.lookup_many(df, company_col, product_col, generic_col, pack_col, out_col)
+    
     def get_oos(self) -> List[Dict]:
         """Get OOS products (PCID = 'OOS')."""
         rows = self._mapping.get_oos()
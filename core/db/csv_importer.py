@@ -29,6 +29,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from core.io.csv_reader import CsvStreamReader, sniff_csv
+
 try:
     from psycopg2 import IntegrityError as PgIntegrityError
 except ImportError:
@@ -36,9 +38,6 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# Common CSV encodings to try in order
-_ENCODINGS = ["utf-8-sig", "utf-8", "latin-1", "cp1252"]
-
 # Country → list of input table configs
 # Each config: (table_name, display_name, expected_columns_hint)
 INPUT_TABLE_REGISTRY: Dict[str, List[dict]] = {
@@ -271,11 +270,8 @@ class CSVImporter:
             return result
 
         try:
-            encoding = self._detect_encoding(csv_path)
-            delimiter = self._detect_delimiter(csv_path, encoding)
-            with csv_path.open("r", encoding=encoding, newline="") as fh:
-                reader = csv.DictReader(fh, delimiter=delimiter)
-                csv_columns = [c.strip() for c in (reader.fieldnames or [])]
+            reader = CsvStreamReader(csv_path)
+            csv_columns = [c.strip() for c in reader.fieldnames]
         except Exception as exc:
             result["valid"] = False
             result["errors"].append(f"Cannot read CSV: {exc}")
@@ -395,22 +391,18 @@ class CSVImporter:
                 "sample_rows": [{...}, ...],
             }
         """
-        encoding = self._detect_encoding(csv_path)
-        delimiter = self._detect_delimiter(csv_path, encoding)
-
-        with csv_path.open("r", encoding=encoding, newline="") as fh:
-            reader = csv.DictReader(fh, delimiter=delimiter)
-            columns = list(reader.fieldnames or [])
-            sample = []
-            total = 0
-            for row in reader:
-                total += 1
-                if len(sample) < max_rows:
-                    sample.append(dict(row))
+        reader = CsvStreamReader(csv_path)
+        sample = []
+        total = 0
+        for row in reader.iter_rows():
+            total += 1
+            if len(sample) < max_rows:
+                sample.append(dict(row))
+        columns = list(reader.fieldnames)
 
         return {
-            "encoding": encoding,
-            "delimiter": delimiter,
+            "encoding": reader.encoding,
+            "delimiter": reader.delimiter,
             "columns": columns,
             "row_count": total,
             "sample_rows": sample,
@@ -440,61 +432,43 @@ class CSVImporter:
         if not csv_path.exists():
             return ImportResult(status="error", message=f"File not found: {csv_path}", table=table)
 
-        # Try multiple encodings with full file read to avoid mid-file encoding failures
-        rows = []
-        columns_unmapped = []
-        encoding_used = None
-        last_error = None
-
-        for encoding in _ENCODINGS:
-            try:
-                delimiter = self._detect_delimiter(csv_path, encoding)
-                with csv_path.open("r", encoding=encoding, newline="", errors="strict") as fh:
-                    reader = csv.DictReader(fh, delimiter=delimiter)
-                    csv_columns = list(reader.fieldnames or [])
-
-                    # Build active column mapping (only columns present in CSV)
-                    active_map = {}
-                    columns_unmapped = []
-                    for csv_col in csv_columns:
-                        csv_col_stripped = csv_col.strip()
-                        if csv_col_stripped in column_map:
-                            active_map[csv_col_stripped] = column_map[csv_col_stripped]
-                        else:
-                            columns_unmapped.append(csv_col_stripped)
-
-                    if not active_map:
-                        return ImportResult(
-                            status="error",
-                            message=f"No columns matched. CSV has: {csv_columns}",
-                            table=table,
-                            columns_unmapped=columns_unmapped,
-                        )
-
-                    rows = []
-                    for row in reader:
-                        mapped_row = {}
-                        for csv_col, db_col in active_map.items():
-                            value = (row.get(csv_col) or "").strip()
-                            if value:
-                                mapped_row[db_col] = value
-                        if mapped_row:
-                            if country and table == "pcid_mapping":
-                                mapped_row["source_country"] = country
-                            rows.append(mapped_row)
-
-                    encoding_used = encoding
-                    break  # Success - exit encoding loop
-
-            except (UnicodeDecodeError, UnicodeError) as exc:
-                last_error = exc
-                continue  # Try next encoding
-            except Exception as exc:
-                last_error = exc
-                continue  # Try next encoding
-
-        if encoding_used is None:
-            return ImportResult(status="error", message=f"CSV read error (tried all encodings): {last_error}", table=table)
+        # Encoding/delimiter are sniffed once; stray bytes later in the file are
+        # handled by the reader's fallback decoder instead of re-reading the file.
+        try:
+            reader = CsvStreamReader(csv_path)
+            csv_columns = list(reader.fieldnames)
+
+            # Build active column mapping (only columns present in CSV)
+            active_map = {}
+            columns_unmapped = []
+            for csv_col in csv_columns:
+                csv_col_stripped = csv_col.strip()
+                if csv_col_stripped in column_map:
+                    active_map[csv_col_stripped] = column_map[csv_col_stripped]
+                else:
+                    columns_unmapped.append(csv_col_stripped)
+
+            if not active_map:
+                return ImportResult(
+                    status="error",
+                    message=f"No columns matched. CSV has: {csv_columns}",
+                    table=table,
+                    columns_unmapped=columns_unmapped,
+                )
+
+            rows = []
+            for row in reader.iter_rows():
+                mapped_row = {}
+                for csv_col, db_col in active_map.items():
+                    value = (row.get(csv_col) or "").strip()
+                    if value:
+                        mapped_row[db_col] = value
+                if mapped_row:
+                    if country and table == "pcid_mapping":
+                        mapped_row["source_country"] = country
+                    rows.append(mapped_row)
+        except Exception as exc:
+            return ImportResult(status="error", message=f"CSV read error: {exc}", table=table)
 
         if not rows:
             return ImportResult(status="warning", message="No valid rows found in CSV", table=table)
@@ -626,21 +600,8 @@ class CSVImporter:
 
     @staticmethod
     def _detect_encoding(path: Path) -> str:
-        for enc in _ENCODINGS:
-            try:
-                with path.open("r", encoding=enc) as f:
-                    f.read(4096)
-                return enc
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-        return "utf-8"
+        return sniff_csv(path).encoding
 
     @staticmethod
     def _detect_delimiter(path: Path, encoding: str) -> str:
-        with path.open("r", encoding=encoding) as f:
-            sample = f.read(4096)
-        try:
-            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
-            return dialect.delimiter
-        except csv.Error:
-            return ","
+        return sniff_csv(path).delimiter
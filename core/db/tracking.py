@@ -9,10 +9,16 @@ without mutating existing run_ledger status/mode.
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Iterable, Optional, Sequence
 
 from core.db.models import run_ledger_insert_if_missing
 
+try:
+    from psycopg2.extras import execute_values
+    _HAS_EXECUTE_VALUES = True
+except ImportError:
+    _HAS_EXECUTE_VALUES = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,3 +65,42 @@ def log_http_request(
     except Exception as e:
         logger.debug("http_requests insert failed (non-fatal): %s", e)
 
+
+
+def log_http_requests(
+    db,
+    run_id: str,
+    scraper_name: str,
+    entries: Iterable[Sequence],
+    ensure_run: bool = True,
+    mode_if_missing: str = "resume",
+) -> int:
+    """
+    Batch version of log_http_request (best-effort).
+
+    Args:
+        entries: (url, method, status_code, response_bytes, elapsed_ms, error) tuples
+
+    Returns:
+        Number of rows sent
+    """
+    rows = [(run_id, *e) for e in entries if e and e[0]]
+    if not db or not run_id or not rows:
+        return 0
+    if ensure_run:
+        ensure_run_ledger_row(db, run_id, scraper_name, mode=mode_if_missing)
+    sql = """
+        INSERT INTO http_requests
+        (run_id, url, method, status_code, response_bytes, elapsed_ms, error)
+        VALUES %s
+    """
+    try:
+        with db.cursor() as cur:
+            if _HAS_EXECUTE_VALUES:
+                execute_values(cur, sql, rows, page_size=1000)
+            else:
+                cur.executemany(sql.replace("%s", "(%s, %s, %s, %s, %s, %s, %s)"), rows)
+    except Exception as e:
+        logger.debug("http_requests batch insert failed (non-fatal): %s", e)
+        return 0
+    return len(rows)
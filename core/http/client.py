@@ -1,52 +1,319 @@
-import httpx
+"""
+Shared async HTTP client for scrapers.
+
+Wraps httpx.AsyncClient with:
+- optional HTTP/2 multiplexing (needs the `h2` package)
+- per-host connection / concurrency caps on top of the global pool limit
+- jittered exponential retries that honour Retry-After on 429/503
+- an ETag / Last-Modified conditional-GET cache backed by ScrapeCache, so an
+  unchanged page costs a 304 instead of a full download
+- streamed file downloads that resume a partial ``.part`` file with Range
+
+Usage:
+    from core.http.client import HttpClient
+
+    async with HttpClient(http2=True, max_per_host=8,
+                          conditional_cache="Netherlands") as http:
+        resp = await http.get(url)
+        print(http.stats)  # cache_hits, revalidations, bytes_saved, ...
+"""
+
+import asyncio
+import contextlib
+import email.utils
 import logging
-from typing import Optional, Dict
+import os
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
 
 log = logging.getLogger(__name__)
 
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
 class HttpClient:
     """Wrapper for httpx client with defaults."""
-    
-    def __init__(self, 
-                 timeout: float = 30.0, 
+
+    def __init__(self,
+                 timeout: float = 30.0,
                  retries: int = 3,
                  headers: Optional[Dict[str, str]] = None,
-                 cookies: Optional[Dict[str, str]] = None):
-        
+                 cookies: Optional[Dict[str, str]] = None,
+                 http2: bool = False,
+                 max_connections: int = 50,
+                 max_per_host: Optional[int] = None,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 60.0,
+                 retry_statuses=RETRY_STATUSES,
+                 conditional_cache: Union[None, str, Any] = None,
+                 cache_expire: int = 30 * 86400,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            timeout: Request timeout in seconds
+            retries: Total attempts per request
+            headers: Default headers
+            cookies: Default cookies
+            http2: Enable HTTP/2 (falls back to HTTP/1.1 if `h2` is missing)
+            max_connections: Global pool size
+            max_per_host: Max in-flight requests (and so connections) per host
+            backoff_base: First retry delay ceiling in seconds (doubles per attempt)
+            backoff_max: Upper bound for any single retry delay
+            retry_statuses: Status codes that trigger a retry
+            conditional_cache: ScrapeCache instance, or a scraper name to create one;
+                enables If-None-Match / If-Modified-Since revalidation for GETs
+            cache_expire: How long cached bodies are kept for revalidation
+            transport: Custom httpx transport (e.g. httpx.MockTransport in tests)
+        """
         self.headers = headers or {}
         if not self.headers.get("User-Agent"):
             self.headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/110.0.0.0 Safari/537.36"
-            
+
         self.cookies = cookies
         self.timeout = timeout
-        self.retries = retries
-        
+        self.retries = max(1, retries)
+        self.max_per_host = max_per_host
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.cache_expire = cache_expire
+
+        if http2 and not H2_AVAILABLE:
+            log.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        if isinstance(conditional_cache, str):
+            from core.utils.cache_manager import ScrapeCache
+            conditional_cache = ScrapeCache(conditional_cache, expire=cache_expire)
+        self.cache = conditional_cache
+
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "retries": 0,
+            "revalidations": 0,
+            "cache_hits": 0,
+            "cache_stores": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+        }
+
         # Configure client
         self.client = httpx.AsyncClient(
             headers=self.headers,
             cookies=self.cookies,
             timeout=self.timeout,
             follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=50, max_connections=50)
+            http2=self.http2,
+            transport=transport,
+            limits=httpx.Limits(max_keepalive_connections=max_connections,
+                                max_connections=max_connections)
         )
 
-    async def get(self, url: str) -> httpx.Response:
-        """Get URL with retry logic."""
+    def _host_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        if not self.max_per_host:
+            return None
+        host = urlsplit(url).netloc.lower()
+        sem = self._host_limits.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_per_host)
+            self._host_limits[host] = sem
+        return sem
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        # Full jitter: uniform(0, base * 2^(attempt-1))
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        sem = self._host_semaphore(url)
+        if sem is None:
+            return await self.client.request(method, url, **kwargs)
+        async with sem:
+            return await self.client.request(method, url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request with per-host limiting and retry logic."""
+        resp = None
         for attempt in range(1, self.retries + 1):
+            self.stats["requests"] += 1
             try:
-                resp = await self.client.get(url)
-                return resp
+                resp = await self._send(method, url, **kwargs)
             except Exception as e:
-                log.warning(f"GET {url} failed attempt {attempt}: {e}")
+                log.warning(f"{method} {url} failed attempt {attempt}: {e}")
                 if attempt == self.retries:
                     raise
-                await httpx.sleep(1.0) # Simple backoff
-    
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            self.stats["bytes_downloaded"] += len(resp.content)
+            if resp.status_code in self.retry_statuses and attempt < self.retries:
+                delay = self._backoff(attempt, resp)
+                log.warning(f"{method} {url} returned {resp.status_code} attempt {attempt}, retrying in {delay:.1f}s")
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+            return resp
+        return resp
+
+    async def get(self, url: str, use_cache: bool = True, **kwargs) -> httpx.Response:
+        """Get URL with retry logic (and conditional revalidation when a cache is set)."""
+        if self.cache is None or not use_cache:
+            return await self.request("GET", url, **kwargs)
+
+        cache_key = str(httpx.URL(url, params=kwargs.get("params")))
+        entry = self.cache.get_http_entry(cache_key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            self.stats["revalidations"] += 1
+
+        resp = await self.request("GET", url, headers=headers, **kwargs)
+
+        if resp.status_code == 304 and entry:
+            self.stats["cache_hits"] += 1
+            self.stats["bytes_saved"] += len(entry["content"])
+            return httpx.Response(
+                status_code=entry.get("status_code", 200),
+                headers=entry.get("headers") or {},
+                content=entry["content"],
+                request=resp.request,
+                extensions={"from_cache": True},
+            )
+
+        if resp.status_code == 200:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.cache.set_http_entry(cache_key, {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "status_code": resp.status_code,
+                    "headers": {k: v for k, v in resp.headers.items()
+                                if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")},
+                    "content": resp.content,
+                    "stored_at": time.time(),
+                }, expire=self.cache_expire)
+                self.stats["cache_stores"] += 1
+        return resp
+
+    async def download(self, url: str, dest: Union[str, Path], chunk_size: int = 64 * 1024,
+                       resume: bool = True, **kwargs) -> int:
+        """
+        Stream a response body to ``dest`` in chunks (memory stays flat).
+
+        The body is written to ``<dest>.part`` and renamed once complete. A
+        leftover .part from an interrupted attempt or run is continued with a
+        Range request when ``resume`` is set; servers that ignore Range send
+        the whole body and the file is rewritten.
+
+        Returns:
+            Bytes received by this call
+        Raises:
+            httpx.HTTPStatusError on a non-success final status
+        """
+        dest = Path(dest)
+        part = dest.with_name(dest.name + ".part")
+        base_headers = dict(kwargs.pop("headers", None) or {})
+        received = 0
+        for attempt in range(1, self.retries + 1):
+            offset = part.stat().st_size if resume and part.exists() else 0
+            headers = dict(base_headers)
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            self.stats["requests"] += 1
+            retry_delay: Optional[float] = None
+            try:
+                async with self._host_semaphore(url) or contextlib.nullcontext():
+                    async with self.client.stream("GET", url, headers=headers, **kwargs) as resp:
+                        if resp.status_code == 416 and offset:
+                            # Range past the end: the .part is already complete
+                            # if the server's length matches, otherwise restart.
+                            total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+                            if total.isdigit() and int(total) == offset:
+                                os.replace(part, dest)
+                                return received
+                            part.unlink(missing_ok=True)
+                            raise httpx.TransportError(f"stale partial download ({offset} bytes)")
+                        if resp.status_code in self.retry_statuses and attempt < self.retries:
+                            # Sleep below, after the stream and host slot are released
+                            retry_delay = self._backoff(attempt, resp)
+                            log.warning(f"GET {url} returned {resp.status_code} attempt {attempt}, "
+                                        f"retrying in {retry_delay:.1f}s")
+                        else:
+                            resp.raise_for_status()
+                            mode = "ab" if resp.status_code == 206 and offset else "wb"
+                            with open(part, mode) as f:
+                                async for chunk in resp.aiter_bytes(chunk_size):
+                                    f.write(chunk)
+                                    received += len(chunk)
+                                    self.stats["bytes_downloaded"] += len(chunk)
+                if retry_delay is not None:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(retry_delay)
+                    continue
+                os.replace(part, dest)
+                return received
+            except httpx.HTTPStatusError:
+                raise
+            except Exception as e:
+                # Connection dropped mid-body: keep the .part and resume from it
+                log.warning(f"GET {url} download failed attempt {attempt}: {e}")
+                if attempt == self.retries:
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._backoff(attempt))
+        return received
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
     async def close(self):
         await self.client.aclose()
-    
+
     async def __aenter__(self):
         return self
-        
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
@@ -1,31 +1,243 @@
+"""
+CSV readers.
+
+read_state_rows() keeps the old "whole file as a list" contract.
+CsvStreamReader is the streaming API for large files: encoding and delimiter
+are sniffed once from a sample, rows are decoded in a single pass and can be
+consumed one by one, in fixed-size batches, or as column arrays.
+
+Usage:
+    from core.io.csv_reader import CsvStreamReader
+
+    reader = CsvStreamReader(path, progress_callback=lambda done, total: ...)
+    for batch in reader.iter_batches(5000):
+        process(batch)
+"""
+
+import codecs
 import csv
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from core.utils.text_utils import nk
 
 log = logging.getLogger(__name__)
 
+# Encodings tried (in order) against the sniff sample
+SNIFF_ENCODINGS = ["utf-8-sig", "utf-8", "cp1252", "latin-1"]
+SNIFF_DELIMITERS = ",;\t|"
+DEFAULT_SAMPLE_BYTES = 64 * 1024
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _cp1252_fallback(err: UnicodeDecodeError):
+    """Decode stray non-UTF-8 bytes as cp1252 instead of failing mid-file.
+
+    The sample decides the encoding; if a legacy byte shows up further down
+    a UTF-8 file we keep streaming rather than re-reading the whole file
+    with another codec.
+    """
+    bad = err.object[err.start:err.end]
+    return bad.decode("cp1252", errors="replace"), err.end
+
+
+_FALLBACK_ERRORS = "csv_reader_cp1252"
+codecs.register_error(_FALLBACK_ERRORS, _cp1252_fallback)
+
+
+@dataclass
+class CsvFormat:
+    """Result of sniffing a CSV sample."""
+    encoding: str
+    delimiter: str
+    total_bytes: int
+
+
+def sniff_csv(path: Path, sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> CsvFormat:
+    """Detect encoding and delimiter from the first ``sample_bytes`` of a file."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+        total = f.seek(0, 2)
+
+    encoding = "utf-8"
+    text = ""
+    has_bom = sample.startswith(codecs.BOM_UTF8)
+    for enc in SNIFF_ENCODINGS:
+        if enc == "utf-8-sig" and not has_bom:
+            continue
+        try:
+            # Incremental decode so a multibyte char cut at the sample edge is not an error
+            text = codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            encoding = enc
+            break
+        except UnicodeDecodeError:
+            continue
+
+    delimiter = ","
+    if text:
+        # Sniff on whole lines only
+        head = text[: text.rfind("\n") + 1] or text
+        try:
+            delimiter = csv.Sniffer().sniff(head, delimiters=SNIFF_DELIMITERS).delimiter
+        except csv.Error:
+            first = head.split("\n", 1)[0]
+            counts = {d: first.count(d) for d in SNIFF_DELIMITERS}
+            best = max(counts, key=counts.get)
+            delimiter = best if counts[best] else ","
+
+    return CsvFormat(encoding=encoding, delimiter=delimiter, total_bytes=total)
+
+
+class CsvStreamReader:
+    """Lazy CSV reader with one-time encoding/delimiter sniffing.
+
+    Each iter_* call opens the file and makes a single decoding pass; nothing
+    beyond the current batch is held in memory.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        sample_bytes: int = DEFAULT_SAMPLE_BYTES,
+        progress_callback: Optional[ProgressCallback] = None,
+        progress_every_rows: int = 10_000,
+    ):
+        """
+        Args:
+            path: CSV file path
+            encoding: Force an encoding instead of sniffing
+            delimiter: Force a delimiter instead of sniffing
+            sample_bytes: Size of the sniff sample
+            progress_callback: Called as callback(bytes_read, total_bytes)
+            progress_every_rows: How often (in rows) to report progress
+        """
+        self.path = Path(path)
+        fmt = sniff_csv(self.path, sample_bytes)
+        self.encoding = encoding or fmt.encoding
+        self.delimiter = delimiter or fmt.delimiter
+        self.total_bytes = fmt.total_bytes
+        self.progress_callback = progress_callback
+        self.progress_every_rows = max(1, progress_every_rows)
+        self.bytes_read = 0
+        self.rows_read = 0
+        self._fieldnames: Optional[List[str]] = None
+
+    @property
+    def fieldnames(self) -> List[str]:
+        if self._fieldnames is None:
+            with self._open() as f:
+                header = next(csv.reader(f, delimiter=self.delimiter), [])
+            self._fieldnames = header
+        return self._fieldnames
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """{normalized_key: original_key} for the header row."""
+        return {nk(h): h for h in self.fieldnames}
+
+    @property
+    def progress(self) -> float:
+        if not self.total_bytes:
+            return 1.0
+        return min(1.0, self.bytes_read / self.total_bytes)
+
+    def _open(self):
+        return open(self.path, "r", encoding=self.encoding, errors=_FALLBACK_ERRORS, newline="")
+
+    def _report(self, f):
+        # Raw byte offset of the underlying file (ahead of the parser by at most one buffer)
+        self.bytes_read = f.buffer.raw.tell()
+        if self.progress_callback:
+            try:
+                self.progress_callback(self.bytes_read, self.total_bytes)
+            except Exception as e:
+                log.debug(f"CSV progress callback failed: {e}")
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return self.iter_rows()
+
+    def iter_rows(self) -> Iterator[Dict[str, str]]:
+        """Yield rows as dicts, one at a time."""
+        self.rows_read = 0
+        self.bytes_read = 0
+        with self._open() as f:
+            reader = csv.DictReader(f, delimiter=self.delimiter)
+            self._fieldnames = list(reader.fieldnames or [])
+            every = self.progress_every_rows
+            for row in reader:
+                self.rows_read += 1
+                if self.rows_read % every == 0:
+                    self._report(f)
+                yield row
+            self._report(f)
+
+    def iter_batches(self, batch_size: int = 10_000) -> Iterator[List[Dict[str, str]]]:
+        """Yield lists of up to ``batch_size`` row dicts."""
+        batch: List[Dict[str, str]] = []
+        for row in self.iter_rows():
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def iter_columns(self, batch_size: int = 10_000) -> Iterator[Dict[str, List[str]]]:
+        """Yield {column: [values...]} arrays of up to ``batch_size`` rows.
+
+        Skips the per-row dict so vectorized consumers (pandas/numpy) can build
+        their arrays directly. Short rows are padded with "".
+        """
+        self.rows_read = 0
+        self.bytes_read = 0
+        with self._open() as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            self._fieldnames = header
+            width = len(header)
+            every = self.progress_every_rows
+            cols: List[List[str]] = [[] for _ in range(width)]
+            n = 0
+            for rec in reader:
+                if not rec:
+                    continue
+                if len(rec) < width:
+                    rec = rec + [""] * (width - len(rec))
+                for i in range(width):
+                    cols[i].append(rec[i])
+                n += 1
+                self.rows_read += 1
+                if self.rows_read % every == 0:
+                    self._report(f)
+                if n >= batch_size:
+                    yield dict(zip(header, cols))
+                    cols = [[] for _ in range(width)]
+                    n = 0
+            self._report(f)
+            if n:
+                yield dict(zip(header, cols))
+
+
 def read_state_rows(path: Path) -> Tuple[List[Dict], Dict]:
     """
-    Read CSV file with fallback encoding detection.
+    Read CSV file with encoding detection.
     Returns: (list of rows, dict of {lowercase_normalized_key: original_key})
     """
     if not path.exists():
         return [], {}
-        
-    encoding_attempts = ["utf-8-sig", "utf-8", "latin-1", "windows-1252", "cp1252"]
-    for encoding in encoding_attempts:
-        try:
-            with open(path, "r", encoding=encoding, newline="") as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames or []
-                headers = {nk(h): h for h in fieldnames}
-                return (list(reader), headers)
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            log.warning(f"Error reading CSV {path} with {encoding}: {e}")
-            break
-            
+
+    try:
+        reader = CsvStreamReader(path)
+        rows = list(reader.iter_rows())
+        return (rows, reader.headers)
+    except Exception as e:
+        log.warning(f"Error reading CSV {path}: {e}")
+
     return ([], {})
@@ -1,30 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Output Writers
+
+DataWriter is the simple line-at-a-time JSONL writer (flushes every record).
+BufferedDataWriter is the high-throughput variant for fast scrapers:
+
+- buffered flush by bytes, records or elapsed time (FlushPolicy)
+- optional on-the-fly gzip / zstd compression
+- size-based file rotation
+- JSONL or CSV (fixed header) output
+- background writer thread so producers never wait on disk
+- explicit checkpoint() that flushes and fsyncs for crash durability
+
+Usage:
+    from core.io.file_writer import BufferedDataWriter, FlushPolicy
+
+    with BufferedDataWriter(out_dir, "products.jsonl", compression="gzip",
+                            rotate_bytes=512 * 1024 * 1024) as w:
+        for item in items:
+            w.write(item)
+        w.checkpoint()  # durable up to here
+"""
+
 from pathlib import Path
-import os
+import csv
 import datetime
+import gzip
+import io
 import json
 import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
 
 log = logging.getLogger(__name__)
 
+_COMPRESSION_SUFFIX = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
 class DataWriter:
     """Standardized output writer."""
-    
+
     def __init__(self, output_dir: Path, filename: str, encoding: str = 'utf-8'):
         self.output_dir = output_dir
         self.output_file = output_dir / filename
         self.encoding = encoding
         self._f = None
-        
+
         self.output_dir.mkdir(parents=True, exist_ok=True)
-    
+
     def __enter__(self):
         self._f = open(self.output_file, 'w', encoding=self.encoding)
         return self
-    
+
     def write_jsonl(self, item: dict):
         if not self._f:
             raise RuntimeError("File not open. Use context manager.")
-        
+
         item.setdefault('scraped_at', datetime.datetime.now().isoformat())
         self._f.write(json.dumps(item, ensure_ascii=False) + "\n")
         self._f.flush()
@@ -32,3 +75,363 @@ class DataWriter:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._f:
             self._f.close()
+
+
+@dataclass
+class FlushPolicy:
+    """When the background writer pushes buffered lines to the file.
+
+    A flush happens as soon as any limit is reached. Set a limit to 0 to
+    disable it.
+    """
+    max_bytes: int = 1024 * 1024
+    max_records: int = 10_000
+    max_interval: float = 1.0
+
+
+class BufferedDataWriter:
+    """Buffered, optionally compressed and rotated output writer.
+
+    Records are serialized on the calling thread and appended to an in-memory
+    pending list; a background thread swaps that list out whenever a
+    ``flush_policy`` limit is reached and owns all file I/O. Producers only
+    block when ``max_pending`` records are waiting (i.e. the disk cannot keep up).
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        filename: str,
+        encoding: str = 'utf-8',
+        fmt: str = "jsonl",
+        fieldnames: Optional[Sequence[str]] = None,
+        compression: Optional[str] = None,
+        compress_level: int = 6,
+        rotate_bytes: Optional[int] = None,
+        flush_policy: Optional[FlushPolicy] = None,
+        background: bool = True,
+        max_pending: int = 200_000,
+        add_timestamp: bool = True,
+    ):
+        """
+        Args:
+            output_dir: Directory for output files (created if missing)
+            filename: Base filename, e.g. "products.jsonl"
+            encoding: Text encoding of the records
+            fmt: "jsonl" or "csv"
+            fieldnames: CSV header (required for fmt="csv"); extra keys are dropped
+            compression: None, "gzip" or "zstd" (needs the zstandard package)
+            compress_level: Compression level passed to the codec
+            rotate_bytes: Start a new file once this many bytes are on disk
+            flush_policy: Buffered flush limits (defaults to FlushPolicy())
+            background: Use a writer thread; False flushes on the calling thread
+            max_pending: Max unwritten records before producers block
+            add_timestamp: Add 'scraped_at' to records that lack it
+        """
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported format: {fmt}")
+        if fmt == "csv" and not fieldnames:
+            raise ValueError("CSV mode requires fieldnames")
+        if compression not in _COMPRESSION_SUFFIX:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ImportError("zstd compression requires the 'zstandard' package")
+
+        self.output_dir = Path(output_dir)
+        self.filename = filename
+        self.encoding = encoding
+        self.fmt = fmt
+        self.fieldnames = list(fieldnames or [])
+        self.compression = compression
+        self.compress_level = compress_level
+        self.rotate_bytes = rotate_bytes
+        self.flush_policy = flush_policy or FlushPolicy()
+        self.background = background
+        self.max_pending = max_pending
+        self.add_timestamp = add_timestamp
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Producer/writer hand-off, guarded by _cond
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._sync_requested = 0
+        self._sync_done = 0
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._closed = True
+        self._local = threading.local()
+        self._encode_json = json.JSONEncoder(ensure_ascii=False, default=str).encode
+
+        # Writer-side state (only touched by whoever holds _io_lock)
+        self._io_lock = threading.Lock()
+        self._raw = None
+        self._stream = None
+        self._part = 0
+        self._last_flush = time.monotonic()
+
+        self.files: List[Path] = []
+        self.records_written = 0
+        self.bytes_written = 0
+        self.flush_count = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def open(self) -> "BufferedDataWriter":
+        if not self._closed:
+            return self
+        self._closed = False
+        self._stopping = False
+        self._open_next_file()
+        if self.background:
+            self._thread = threading.Thread(
+                target=self._run, name=f"writer-{self.filename}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def write(self, item: Dict[str, Any]):
+        """Add one record to the pending buffer."""
+        self._raise_writer_error()
+        if self._closed:
+            raise RuntimeError("File not open. Use context manager.")
+        if self.add_timestamp:
+            item.setdefault('scraped_at', datetime.datetime.now().isoformat())
+        line = self._serialize(item)
+
+        policy = self.flush_policy
+        with self._cond:
+            if self.background and len(self._pending) >= self.max_pending:
+                self._cond.notify_all()
+                self._cond.wait_for(
+                    lambda: len(self._pending) < self.max_pending or self._error is not None
+                )
+            if self._error is not None:
+                self._raise_writer_error()
+            self._pending.append(line)
+            self._pending_bytes += len(line)
+            due = ((policy.max_records and len(self._pending) >= policy.max_records)
+                   or (policy.max_bytes and self._pending_bytes >= policy.max_bytes))
+            if due and self.background:
+                self._cond.notify_all()
+        if due and not self.background:
+            self._drain(sync=False)
+
+    write_jsonl = write
+
+    def write_many(self, items: Iterable[Dict[str, Any]]):
+        for item in items:
+            self.write(item)
+
+    def flush(self):
+        """Write pending records to the file without fsync."""
+        self._raise_writer_error()
+        if self._closed:
+            return
+        if not self.background:
+            self._drain(sync=False)
+            return
+        with self._cond:
+            self._cond.notify_all()
+
+    def checkpoint(self, timeout: Optional[float] = None) -> bool:
+        """Flush everything written so far and fsync it to disk.
+
+        Blocks until the data is durable. Returns False on timeout.
+        """
+        self._raise_writer_error()
+        if self._closed:
+            return True
+        if not self.background:
+            self._drain(sync=True)
+            return True
+        with self._cond:
+            self._sync_requested += 1
+            ticket = self._sync_requested
+            self._cond.notify_all()
+            ok = self._cond.wait_for(
+                lambda: self._sync_done >= ticket or self._error is not None, timeout
+            )
+        self._raise_writer_error()
+        return bool(ok)
+
+    def close(self):
+        """Write out pending records and close the file.
+
+        Raises if the background writer failed, including when records were
+        left unwritten because of it.
+        """
+        if self._closed:
+            self._raise_writer_error()
+            return
+        self._closed = True
+        if self.background and self._thread:
+            with self._cond:
+                self._stopping = True
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+        else:
+            self._drain(sync=False)
+        with self._io_lock:
+            self._close_file()
+        self._raise_writer_error()
+        if self._pending:
+            raise RuntimeError(f"{len(self._pending)} records were not written to {self.filename}")
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "records": self.records_written,
+            "bytes": self.bytes_written,
+            "flushes": self.flush_count,
+            "files": [str(p) for p in self.files],
+            "pending": len(self._pending),
+        }
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Serialization (producer side)
+    # ------------------------------------------------------------------
+
+    def _serialize(self, item: Dict[str, Any]) -> str:
+        if self.fmt == "jsonl":
+            return self._encode_json(item) + "\n"
+        # csv.writer is not thread safe; keep one per producer thread
+        state = getattr(self._local, "csv", None)
+        if state is None:
+            buf = io.StringIO()
+            state = (buf, csv.writer(buf))
+            self._local.csv = state
+        buf, writer = state
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow([item.get(k, "") for k in self.fieldnames])
+        return buf.getvalue()
+
+    def _header_line(self) -> str:
+        buf = io.StringIO()
+        csv.writer(buf).writerow(self.fieldnames)
+        return buf.getvalue()
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _ready(self) -> bool:
+        policy = self.flush_policy
+        return bool(
+            self._stopping
+            or self._sync_requested > self._sync_done
+            or (policy.max_records and len(self._pending) >= policy.max_records)
+            or (policy.max_bytes and self._pending_bytes >= policy.max_bytes)
+            or len(self._pending) >= self.max_pending
+        )
+
+    def _run(self):
+        interval = self.flush_policy.max_interval or None
+        while True:
+            with self._cond:
+                self._cond.wait_for(self._ready, interval)
+                stopping = self._stopping
+                sync_ticket = self._sync_requested
+            try:
+                self._drain(sync=sync_ticket > self._sync_done)
+            except BaseException as e:
+                log.error(f"Writer for {self.filename} failed: {e}")
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._sync_done = sync_ticket
+                self._cond.notify_all()
+            if stopping:
+                return
+
+    def _drain(self, sync: bool):
+        """Swap out the pending buffer and write it (plus fsync if asked)."""
+        with self._cond:
+            lines, self._pending = self._pending, []
+            self._pending_bytes = 0
+            if self.background:
+                self._cond.notify_all()
+        with self._io_lock:
+            if lines:
+                data = "".join(lines).encode(self.encoding)
+                self._stream.write(data)
+                self.records_written += len(lines)
+                self.bytes_written += len(data)
+                self.flush_count += 1
+            self._last_flush = time.monotonic()
+
+            if sync:
+                self._sync_stream()
+                self._raw.flush()
+                os.fsync(self._raw.fileno())
+
+            if self.rotate_bytes and self._raw.tell() >= self.rotate_bytes:
+                self._close_file()
+                self._open_next_file()
+
+    def _sync_stream(self):
+        if self.compression == "gzip":
+            self._stream.flush(zlib.Z_SYNC_FLUSH)
+        elif self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+
+    def _next_path(self) -> Path:
+        base = Path(self.filename)
+        if self.rotate_bytes:
+            name = f"{base.stem}_{self._part:04d}{base.suffix}"
+        else:
+            name = base.name
+        return self.output_dir / (name + _COMPRESSION_SUFFIX[self.compression])
+
+    def _open_next_file(self):
+        path = self._next_path()
+        self._part += 1
+        self._raw = open(path, "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(
+                filename=path.name, mode="wb", fileobj=self._raw,
+                compresslevel=self.compress_level,
+            )
+        elif self.compression == "zstd":
+            cctx = zstandard.ZstdCompressor(level=self.compress_level)
+            self._stream = cctx.stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self.files.append(path)
+        if self.fmt == "csv":
+            header = self._header_line().encode(self.encoding)
+            self._stream.write(header)
+            self.bytes_written += len(header)
+
+    def _close_file(self):
+        if self._stream is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+        self._stream = None
+        self._raw = None
+
+    def _raise_writer_error(self):
+        # The writer thread is gone once it fails, so the error stays set:
+        # every later call must fail instead of waiting on a dead thread.
+        err = self._error
+        if err is not None:
+            unwritten = len(self._pending)
+            raise RuntimeError(
+                f"Background writer failed ({unwritten} records not written): {err}"
+            ) from err
@@ -11,6 +11,14 @@ Detects:
 - Data quality anomalies (missing patterns, format issues)
 - Statistical outliers in numeric columns
 
+All selected columns are analysed together as one 2-D float array: column
+statistics come from a single sort of that array, threshold methods (zscore,
+iqr) are evaluated as broadcast comparisons, and model-based methods
+(isolation_forest, lof) are fitted per column (or per column and group) in a
+process pool. ``detect_mask`` returns a boolean frame aligned with the input;
+``flag_anomalies_streaming`` keeps only the numeric columns of a CSV in memory
+and rewrites the file chunk by chunk.
+
 Usage:
     from core.monitoring.anomaly_detector import detect_price_anomalies, detect_anomalies
     
@@ -19,11 +27,17 @@ Usage:
     
     # Detect anomalies in a file
     result = detect_anomalies_in_file("output/Malaysia/products.csv", ["Price", "Quantity"])
+
+    # Per-company outliers as a boolean mask frame
+    mask = AnomalyDetector(method="iqr").detect_mask(df, ["Price"], group_by="Company")
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 import pandas as pd
@@ -43,6 +57,180 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+MODEL_METHODS = ("isolation_forest", "lof")
+
+# Below this many values per worker a process pool costs more than it saves
+MIN_VALUES_PER_WORKER = 50_000
+
+# Fewer valid values than this in a column (or group) are never flagged
+MIN_VALID_VALUES = 3
+
+
+def default_processes() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _to_matrix(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """Numeric columns as one (rows x columns) float64 array; unparseable cells become NaN."""
+    # Column-major so per-column reductions and sorts walk contiguous memory
+    X = np.empty((len(df), len(columns)), dtype=float, order="F")
+    for j, col in enumerate(columns):
+        s = df[col]
+        if not pd.api.types.is_numeric_dtype(s):
+            s = pd.to_numeric(s, errors="coerce")
+        X[:, j] = s.to_numpy(dtype=float, na_value=np.nan)
+    return X
+
+
+def column_stats(X: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-column statistics of a 2-D array (NaN = missing) from one sort.
+
+    Returns:
+        Dict of 1-D arrays (one entry per column): count, mean, std, min, max,
+        median, q1, q3, iqr. Columns without values get NaN statistics.
+    """
+    n, k = X.shape
+    valid = ~np.isnan(X)
+    count = valid.sum(axis=0)
+    S = np.sort(X, axis=0)  # NaN sorts last, so row i < count is the i-th valid value
+    cols = np.arange(k)
+
+    def quantile(q):
+        pos = np.maximum(count - 1, 0) * q
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.minimum(lo + 1, np.maximum(count - 1, 0))
+        if n == 0:
+            return np.full(k, np.nan)
+        a, b = S[lo, cols], S[hi, cols]
+        return a + (b - a) * (pos - lo)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.add.reduce(X, axis=0, where=valid) / count
+        dev = X - mean
+        dev *= dev
+        std = np.sqrt(np.add.reduce(dev, axis=0, where=valid) / count)
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    empty = count == 0
+    last = np.maximum(count - 1, 0)
+    stats = {
+        "count": count,
+        "mean": mean,
+        "std": std,
+        "min": np.where(empty, np.nan, S[0, cols]) if n else np.full(k, np.nan),
+        "max": np.where(empty, np.nan, S[last, cols]) if n else np.full(k, np.nan),
+        "median": np.where(empty, np.nan, median),
+        "q1": np.where(empty, np.nan, q1),
+        "q3": np.where(empty, np.nan, q3),
+    }
+    stats["iqr"] = stats["q3"] - stats["q1"]
+    return stats
+
+
+def _grouped_stats(X: np.ndarray, codes: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """column_stats per group: every entry is a (groups x columns) array."""
+    frame = pd.DataFrame(X)
+    grouped = frame.groupby(codes, sort=True)
+    index = np.arange(n_groups)
+
+    def agg(result):
+        return result.reindex(index).to_numpy(dtype=float)
+
+    quantiles = grouped.quantile([0.25, 0.5, 0.75])
+    stats = {
+        "count": agg(grouped.count()).astype(np.int64),
+        "mean": agg(grouped.mean()),
+        "std": agg(grouped.std(ddof=0)),
+        "min": agg(grouped.min()),
+        "max": agg(grouped.max()),
+        "q1": agg(quantiles.xs(0.25, level=1)),
+        "median": agg(quantiles.xs(0.5, level=1)),
+        "q3": agg(quantiles.xs(0.75, level=1)),
+    }
+    stats["iqr"] = stats["q3"] - stats["q1"]
+    return stats
+
+
+def _fit_model(values: np.ndarray, method: str, contamination: float,
+               random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit one 1-D IsolationForest/LOF; returns (anomaly mask, scores)."""
+    X = values.reshape(-1, 1)
+    if method == "lof":
+        # LOF needs at least n_neighbors + 1 samples
+        n_neighbors = min(20, len(values) - 1)
+        if n_neighbors < 2:
+            return np.zeros(len(values), dtype=bool), np.zeros(len(values))
+        clf = LocalOutlierFactor(n_neighbors=n_neighbors, contamination=contamination)
+        predictions = clf.fit_predict(X)
+        return predictions == -1, clf.negative_outlier_factor_
+
+    clf = IsolationForest(contamination=contamination, random_state=random_state, n_estimators=100)
+    predictions = clf.fit_predict(X)
+    # -1 = anomaly, 1 = normal
+    return predictions == -1, clf.decision_function(X)
+
+
+def _fit_model_batch(batch: List[Tuple[Any, np.ndarray]], method: str, contamination: float,
+                     random_state: int) -> List[Tuple[Any, np.ndarray, np.ndarray]]:
+    return [(key, *_fit_model(values, method, contamination, random_state)) for key, values in batch]
+
+
+def _run_model_tasks(tasks: List[Tuple[Any, np.ndarray]], method: str, contamination: float,
+                     random_state: int, n_jobs: Optional[int]) -> List[Tuple[Any, np.ndarray, np.ndarray]]:
+    """Fit every (key, values) task, in a process pool when the work is large enough."""
+    total = sum(len(values) for _, values in tasks)
+    workers = min(n_jobs or default_processes(), len(tasks), max(1, total // MIN_VALUES_PER_WORKER))
+    if workers <= 1:
+        return _fit_model_batch(tasks, method, contamination, random_state)
+
+    # Largest first into the lightest batch keeps workers evenly loaded
+    batches: List[List[Tuple[Any, np.ndarray]]] = [[] for _ in range(workers * 2)]
+    loads = [0] * len(batches)
+    for task in sorted(tasks, key=lambda t: -len(t[1])):
+        i = loads.index(min(loads))
+        batches[i].append(task)
+        loads[i] += len(task[1])
+
+    out: List[Tuple[Any, np.ndarray, np.ndarray]] = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_fit_model_batch, b, method, contamination, random_state)
+                       for b in batches if b]
+            for fut in futures:
+                out.extend(fut.result())
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"Anomaly model pool failed ({e}); fitting in-process")
+        return _fit_model_batch(tasks, method, contamination, random_state)
+    return out
+
+
+class _GroupCoder:
+    """Stable integer codes for group keys, consistent across chunks of one file."""
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self.ids: Dict[tuple, int] = {}
+
+    def encode(self, df: pd.DataFrame) -> np.ndarray:
+        keys = df[self.columns]
+        local = keys.groupby(self.columns, dropna=False, sort=False).ngroup().to_numpy()
+        uniques = keys.drop_duplicates()
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, row in enumerate(uniques.itertuples(index=False, name=None)):
+            key = tuple(None if pd.isna(v) else v for v in row)
+            mapping[i] = self.ids.setdefault(key, len(self.ids))
+        return mapping[local]
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.ids)
+
+
+def _as_columns(group_by: Union[str, Sequence[str], None]) -> List[str]:
+    if group_by is None:
+        return []
+    return [group_by] if isinstance(group_by, str) else list(group_by)
+
 
 class AnomalyDetector:
     """
@@ -72,7 +260,8 @@ class AnomalyDetector:
         self, 
         method: str = "isolation_forest",
         contamination: float = DEFAULT_CONTAMINATION,
-        random_state: int = 42
+        random_state: int = 42,
+        n_jobs: Optional[int] = None,
     ):
         """
         Initialize anomaly detector.
@@ -82,10 +271,13 @@ class AnomalyDetector:
                    "zscore", "iqr"
             contamination: Expected proportion of outliers (0.0 to 0.5)
             random_state: Random seed for reproducibility
+            n_jobs: Worker processes for model-based methods
+                   (None = cpu_count - 1, 1 = in-process)
         """
         self.method = method
         self.contamination = contamination
         self.random_state = random_state
+        self.n_jobs = n_jobs
     
     def detect_numeric_anomalies(
         self,
@@ -172,41 +364,11 @@ class AnomalyDetector:
     
     def _isolation_forest(self, values: np.ndarray) -> tuple:
         """Detect anomalies using Isolation Forest."""
-        clf = IsolationForest(
-            contamination=self.contamination,
-            random_state=self.random_state,
-            n_estimators=100,
-        )
-        
-        # Reshape for sklearn
-        X = values.reshape(-1, 1)
-        predictions = clf.fit_predict(X)
-        scores = clf.decision_function(X)
-        
-        # -1 = anomaly, 1 = normal
-        anomaly_mask = predictions == -1
-        
-        return anomaly_mask, scores
+        return _fit_model(values, "isolation_forest", self.contamination, self.random_state)
     
     def _local_outlier_factor(self, values: np.ndarray) -> tuple:
         """Detect anomalies using Local Outlier Factor."""
-        # LOF needs at least n_neighbors + 1 samples
-        n_neighbors = min(20, len(values) - 1)
-        if n_neighbors < 2:
-            return np.zeros(len(values), dtype=bool), np.zeros(len(values))
-        
-        clf = LocalOutlierFactor(
-            n_neighbors=n_neighbors,
-            contamination=self.contamination,
-        )
-        
-        X = values.reshape(-1, 1)
-        predictions = clf.fit_predict(X)
-        scores = clf.negative_outlier_factor_
-        
-        anomaly_mask = predictions == -1
-        
-        return anomaly_mask, scores
+        return _fit_model(values, "lof", self.contamination, self.random_state)
     
     def _zscore_method(self, values: np.ndarray, stats: dict) -> tuple:
         """Detect anomalies using Z-score method."""
@@ -241,11 +403,146 @@ class AnomalyDetector:
         
         return anomaly_mask, scores
     
+    def _resolve_method(self, method: Optional[str]) -> str:
+        method = method or self.method
+        if method in MODEL_METHODS and SKLEARN_AVAILABLE:
+            return method
+        if method == "zscore":
+            return method
+        # Fallback to IQR if sklearn not available
+        return "iqr"
+    
+    def _detect_matrix(
+        self,
+        X: np.ndarray,
+        method: Optional[str] = None,
+        codes: Optional[np.ndarray] = None,
+        n_groups: int = 1,
+        with_scores: bool = True,
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[Dict[str, np.ndarray]]]:
+        """
+        Columnar detection over a (rows x columns) array.
+        
+        Args:
+            X: Float array, NaN = missing
+            method: Detection method
+            codes: Optional group code per row (0..n_groups-1); statistics and
+                   models are then per group and column
+            n_groups: Number of distinct codes
+            with_scores: Also return scores for threshold methods
+        
+        Returns:
+            (anomaly mask, scores, column_stats) - mask and scores shaped like X
+            (scores are only meaningful where the mask is set);
+            column_stats of X when they were computed (ungrouped threshold methods)
+        """
+        method = self._resolve_method(method)
+        n, k = X.shape
+        mask = np.zeros((n, k), dtype=bool)
+        scores = np.zeros((n, k))
+        if n == 0 or k == 0:
+            return mask, scores, None
+        
+        if method in MODEL_METHODS:
+            valid = ~np.isnan(X)
+            if codes is None:
+                groups = [np.arange(n)]
+            else:
+                order = np.argsort(codes, kind="stable")
+                groups = np.split(order, np.cumsum(np.bincount(codes, minlength=n_groups))[:-1])
+            tasks = []
+            for j in range(k):
+                for rows in groups:
+                    rows = rows[valid[rows, j]]
+                    if len(rows) >= MIN_VALID_VALUES:
+                        tasks.append(((j, rows), X[rows, j]))
+            for (j, rows), task_mask, task_scores in _run_model_tasks(
+                    tasks, method, self.contamination, self.random_state, self.n_jobs):
+                mask[rows, j] = task_mask
+                scores[rows, j] = task_scores
+            return mask, scores, None
+        
+        overall = None
+        if codes is None:
+            overall = table = column_stats(X)
+            take = lambda a: a[np.newaxis, :]
+        else:
+            table = _grouped_stats(X, codes, n_groups)
+            take = lambda a: a[codes]
+        eligible = table["count"] >= MIN_VALID_VALUES
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if method == "zscore":
+                # Ineligible or constant columns/groups get an infinite scale: z = 0
+                std = np.where(eligible & (table["std"] != 0), table["std"], np.inf)
+                z = np.abs(X - take(table["mean"]))
+                z /= take(std)
+                # Values with |z| > 3 are anomalies (NaN compares False)
+                mask = z > 3.0
+                scores = np.where(mask, z, 0.0) if with_scores else None
+            else:
+                iqr = table["iqr"]
+                use = eligible & (iqr != 0)
+                lower = take(np.where(use, table["q1"] - 1.5 * iqr, -np.inf))
+                upper = take(np.where(use, table["q3"] + 1.5 * iqr, np.inf))
+                below = X < lower
+                above = X > upper
+                mask = below | above
+                scores = None
+                if with_scores:
+                    # Distance from the violated bound, in IQRs
+                    scores = np.zeros_like(X)
+                    scale = take(iqr)
+                    for hit, bound, sign in ((below, lower, -1.0), (above, upper, 1.0)):
+                        r, c = np.nonzero(hit)
+                        scores[r, c] = sign * (X[r, c] - np.broadcast_to(bound, X.shape)[r, c]) \
+                            / np.broadcast_to(scale, X.shape)[r, c]
+        return mask, scores, overall
+    
+    def _group_codes(self, df: pd.DataFrame, group_by) -> Tuple[Optional[np.ndarray], int]:
+        columns = _as_columns(group_by)
+        if not columns:
+            return None, 1
+        coder = _GroupCoder(columns)
+        return coder.encode(df), coder.n_groups
+    
+    def detect_mask(
+        self,
+        df: pd.DataFrame,
+        numeric_columns: Optional[List[str]] = None,
+        method: Optional[str] = None,
+        group_by: Union[str, List[str], None] = None,
+    ) -> pd.DataFrame:
+        """
+        Flag anomalies in all numeric columns at once.
+        
+        Args:
+            df: DataFrame to analyze
+            numeric_columns: Columns to check (auto-detect if None)
+            method: Detection method
+            group_by: Column(s) whose groups (e.g. company) get their own statistics/models
+        
+        Returns:
+            Boolean DataFrame (same index as df, one column per analyzed column)
+        """
+        columns = self._numeric_columns(df, numeric_columns)
+        codes, n_groups = self._group_codes(df, group_by)
+        mask, _, _ = self._detect_matrix(_to_matrix(df, columns), method, codes, n_groups, with_scores=False)
+        return pd.DataFrame(mask, index=df.index, columns=columns)
+    
+    @staticmethod
+    def _numeric_columns(df: pd.DataFrame, numeric_columns: Optional[List[str]]) -> List[str]:
+        if numeric_columns is None:
+            # Auto-detect numeric columns
+            return df.select_dtypes(include=[np.number]).columns.tolist()
+        return [c for c in numeric_columns if c in df.columns]
+    
     def detect_in_dataframe(
         self,
         df: pd.DataFrame,
         numeric_columns: Optional[List[str]] = None,
         method: Optional[str] = None,
+        group_by: Union[str, List[str], None] = None,
     ) -> Dict[str, Any]:
         """
         Detect anomalies in multiple columns of a DataFrame.
@@ -254,29 +551,52 @@ class AnomalyDetector:
             df: DataFrame to analyze
             numeric_columns: List of columns to check (auto-detect if None)
             method: Detection method
+            group_by: Column(s) to detect within (statistics/models per group)
         
         Returns:
             Dict with anomaly results per column
         """
-        if numeric_columns is None:
-            # Auto-detect numeric columns
-            numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        
+        columns = self._numeric_columns(df, numeric_columns)
+        X = _to_matrix(df, columns)
+        codes, n_groups = self._group_codes(df, group_by)
+        mask, scores, stats = self._detect_matrix(X, method, codes, n_groups)
+        return self._column_results(X, mask, scores, columns, method or self.method, group_by, stats)
+    
+    @staticmethod
+    def _column_results(X, mask, scores, columns, method, group_by=None, stats=None) -> Dict[str, Any]:
+        """Per-column result dicts (the detect_numeric_anomalies layout) from the columnar output."""
         results = {
             "columns_analyzed": [],
             "total_anomalies": 0,
             "anomalies_by_column": {},
             "analyzed_at": datetime.now().isoformat(),
         }
-        
-        for col in numeric_columns:
-            if col not in df.columns:
-                continue
-            
-            col_result = self.detect_numeric_anomalies(df[col], method)
-            results["anomalies_by_column"][col] = col_result
+        if group_by is not None:
+            results["group_by"] = _as_columns(group_by)
+        
+        if stats is None:
+            stats = column_stats(X)
+        total = X.shape[0]
+        for j, col in enumerate(columns):
+            idx = np.flatnonzero(mask[:, j])
+            if stats["count"][j] < MIN_VALID_VALUES:
+                col_stats = {"error": "Not enough valid values for anomaly detection"}
+            else:
+                col_stats = {name: float(stats[name][j]) for name in
+                             ("mean", "std", "min", "max", "median", "q1", "q3", "iqr")}
+                col_stats = {"count": int(stats["count"][j]), **col_stats}
+            results["anomalies_by_column"][col] = {
+                "anomaly_indices": idx.tolist(),
+                "anomaly_values": X[idx, j].tolist(),
+                "anomaly_scores": scores[idx, j].tolist(),
+                "anomaly_count": len(idx),
+                "total_count": total,
+                "anomaly_rate": len(idx) / total if total > 0 else 0,
+                "method": method,
+                "stats": col_stats,
+            }
             results["columns_analyzed"].append(col)
-            results["total_anomalies"] += col_result["anomaly_count"]
+            results["total_anomalies"] += len(idx)
         
         return results
     
@@ -285,6 +605,7 @@ class AnomalyDetector:
         df: pd.DataFrame,
         numeric_columns: Optional[List[str]] = None,
         method: Optional[str] = None,
+        group_by: Union[str, List[str], None] = None,
     ) -> pd.DataFrame:
         """
         Get rows containing anomalies.
@@ -293,33 +614,27 @@ class AnomalyDetector:
             df: DataFrame to analyze
             numeric_columns: Columns to check
             method: Detection method
+            group_by: Column(s) to detect within
         
         Returns:
             DataFrame with anomaly rows and a column indicating which column(s) had anomalies
         """
-        results = self.detect_in_dataframe(df, numeric_columns, method)
-        
-        # Collect all anomaly indices
-        anomaly_info = {}
-        for col, col_result in results["anomalies_by_column"].items():
-            for idx in col_result["anomaly_indices"]:
-                if idx not in anomaly_info:
-                    anomaly_info[idx] = []
-                anomaly_info[idx].append(col)
-        
-        if not anomaly_info:
+        mask = self.detect_mask(df, numeric_columns, method, group_by)
+        rows = np.flatnonzero(mask.to_numpy().any(axis=1))
+        if len(rows) == 0:
             return pd.DataFrame()
         
-        # Get anomaly rows
-        anomaly_indices = sorted(anomaly_info.keys())
-        anomaly_df = df.iloc[anomaly_indices].copy()
-        anomaly_df["_anomaly_columns"] = [
-            ", ".join(anomaly_info[idx]) for idx in anomaly_indices
-        ]
-        
+        anomaly_df = df.iloc[rows].copy()
+        anomaly_df["_anomaly_columns"] = _anomaly_labels(mask.to_numpy()[rows], mask.columns)
         return anomaly_df
 
 
+def _anomaly_labels(mask: np.ndarray, columns: Sequence[str]) -> List[str]:
+    """Comma-joined flagged column names per row of a boolean mask."""
+    names = np.asarray(columns, dtype=object)
+    return [", ".join(names[m]) for m in mask]
+
+
 def detect_price_anomalies(
     df: pd.DataFrame,
     price_column: str,
@@ -346,11 +661,43 @@ def detect_price_anomalies(
     return detector.detect_numeric_anomalies(df[price_column])
 
 
+def _read_numeric_chunks(
+    file_path: Path,
+    numeric_columns: Optional[List[str]],
+    group_by: Union[str, List[str], None],
+    chunksize: int,
+) -> Tuple[np.ndarray, List[str], Optional[np.ndarray], int]:
+    """
+    Stream a CSV and keep only what detection needs: the numeric columns as one
+    float array and, when grouping, an integer group code per row.
+    """
+    group_columns = _as_columns(group_by)
+    if numeric_columns is None:
+        head = pd.read_csv(file_path, nrows=1000)
+        numeric_columns = [c for c in head.select_dtypes(include=[np.number]).columns
+                           if c not in group_columns]
+    header = pd.read_csv(file_path, nrows=0).columns
+    columns = [c for c in numeric_columns if c in header]
+    usecols = set(columns) | set(group_columns)
+
+    coder = _GroupCoder(group_columns) if group_columns else None
+    blocks, code_blocks = [], []
+    for chunk in pd.read_csv(file_path, usecols=lambda c: c in usecols, chunksize=chunksize):
+        blocks.append(_to_matrix(chunk, columns))
+        if coder:
+            code_blocks.append(coder.encode(chunk))
+    X = np.asfortranarray(np.vstack(blocks)) if blocks else np.empty((0, len(columns)))
+    codes = np.concatenate(code_blocks) if code_blocks else None
+    return X, columns, codes, coder.n_groups if coder else 1
+
+
 def detect_anomalies_in_file(
     file_path: Union[str, Path],
     numeric_columns: Optional[List[str]] = None,
     method: str = "iqr",
     contamination: float = 0.05,
+    group_by: Union[str, List[str], None] = None,
+    chunksize: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Detect anomalies in a CSV/Excel file.
@@ -360,6 +707,9 @@ def detect_anomalies_in_file(
         numeric_columns: Columns to analyze (auto-detect if None)
         method: Detection method
         contamination: Expected anomaly rate
+        group_by: Column(s) to detect within
+        chunksize: For CSV, read in chunks of this many rows and keep only the
+                   numeric/group columns in memory
     
     Returns:
         Anomaly detection results
@@ -370,13 +720,17 @@ def detect_anomalies_in_file(
         return {"error": f"File not found: {file_path}"}
     
     try:
-        if file_path.suffix.lower() == '.xlsx':
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_csv(file_path)
-        
         detector = AnomalyDetector(method=method, contamination=contamination)
-        result = detector.detect_in_dataframe(df, numeric_columns)
+        if chunksize and file_path.suffix.lower() != '.xlsx':
+            X, columns, codes, n_groups = _read_numeric_chunks(file_path, numeric_columns, group_by, chunksize)
+            mask, scores, stats = detector._detect_matrix(X, method, codes, n_groups)
+            result = detector._column_results(X, mask, scores, columns, method, group_by, stats)
+        else:
+            if file_path.suffix.lower() == '.xlsx':
+                df = pd.read_excel(file_path)
+            else:
+                df = pd.read_csv(file_path)
+            result = detector.detect_in_dataframe(df, numeric_columns, group_by=group_by)
         result["file_path"] = str(file_path)
         
         return result
@@ -410,6 +764,8 @@ def flag_anomalies_in_file(
     output_path: Optional[Union[str, Path]] = None,
     numeric_columns: Optional[List[str]] = None,
     method: str = "iqr",
+    group_by: Union[str, List[str], None] = None,
+    chunksize: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Add anomaly flags to a file and save.
@@ -419,6 +775,8 @@ def flag_anomalies_in_file(
         output_path: Path for output (default: adds "_flagged" suffix)
         numeric_columns: Columns to analyze
         method: Detection method
+        group_by: Column(s) to detect within
+        chunksize: For CSV, stream the file (see flag_anomalies_streaming)
     
     Returns:
         Result dict with file paths and anomaly counts
@@ -428,6 +786,10 @@ def flag_anomalies_in_file(
     if not file_path.exists():
         return {"success": False, "error": f"File not found: {file_path}"}
     
+    if chunksize and file_path.suffix.lower() != '.xlsx':
+        return flag_anomalies_streaming(file_path, output_path, numeric_columns, method,
+                                        group_by=group_by, chunksize=chunksize)
+    
     try:
         if file_path.suffix.lower() == '.xlsx':
             df = pd.read_excel(file_path)
@@ -435,7 +797,7 @@ def flag_anomalies_in_file(
             df = pd.read_csv(file_path)
         
         detector = AnomalyDetector(method=method)
-        anomaly_df = detector.get_anomaly_rows(df, numeric_columns)
+        anomaly_df = detector.get_anomaly_rows(df, numeric_columns, group_by=group_by)
         
         # Add anomaly flag column to original df
         df["_is_anomaly"] = False
@@ -468,6 +830,81 @@ def flag_anomalies_in_file(
         return {"success": False, "error": str(e)}
 
 
+def flag_anomalies_streaming(
+    file_path: Union[str, Path],
+    output_path: Optional[Union[str, Path]] = None,
+    numeric_columns: Optional[List[str]] = None,
+    method: str = "iqr",
+    contamination: float = 0.05,
+    group_by: Union[str, List[str], None] = None,
+    chunksize: int = 100_000,
+) -> Dict[str, Any]:
+    """
+    Flag anomalies in a CSV that may not fit in memory.
+    
+    Pass one reads only the numeric (and group) columns in chunks and runs the
+    columnar detection on them; pass two re-reads the file chunk by chunk as
+    text and writes it back unchanged plus ``_is_anomaly`` and
+    ``_anomaly_columns``. Peak memory is the numeric columns as float64 plus
+    one chunk, regardless of how wide the text columns are.
+    
+    Args:
+        file_path: Path to input CSV
+        output_path: Path for output (default: adds "_flagged" suffix)
+        numeric_columns: Columns to analyze (auto-detect from the first rows if None)
+        method: Detection method
+        contamination: Expected anomaly rate (model-based methods)
+        group_by: Column(s) to detect within
+        chunksize: Rows per chunk
+    
+    Returns:
+        Result dict with file paths and anomaly counts
+    """
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        return {"success": False, "error": f"File not found: {file_path}"}
+    
+    if output_path is None:
+        output_path = file_path.parent / f"{file_path.stem}_flagged{file_path.suffix}"
+    else:
+        output_path = Path(output_path)
+    
+    try:
+        detector = AnomalyDetector(method=method, contamination=contamination)
+        X, columns, codes, n_groups = _read_numeric_chunks(file_path, numeric_columns, group_by, chunksize)
+        mask, _, _ = detector._detect_matrix(X, method, codes, n_groups, with_scores=False)
+        flagged = mask.any(axis=1)
+        
+        start = 0
+        with output_path.open("w", newline="", encoding="utf-8") as out:
+            reader = pd.read_csv(file_path, dtype=str, keep_default_na=False, chunksize=chunksize)
+            for i, chunk in enumerate(reader):
+                end = start + len(chunk)
+                chunk["_is_anomaly"] = flagged[start:end]
+                labels = np.full(len(chunk), "", dtype=object)
+                rows = np.flatnonzero(flagged[start:end])
+                labels[rows] = _anomaly_labels(mask[start:end][rows], columns)
+                chunk["_anomaly_columns"] = labels
+                chunk.to_csv(out, index=False, header=(i == 0))
+                start = end
+        
+        total = len(flagged)
+        anomaly_rows = int(flagged.sum())
+        return {
+            "success": True,
+            "input_path": str(file_path),
+            "output_path": str(output_path),
+            "total_rows": total,
+            "anomaly_rows": anomaly_rows,
+            "anomaly_rate": anomaly_rows / total if total > 0 else 0,
+            "anomalies_by_column": dict(zip(columns, mask.sum(axis=0).tolist())),
+        }
+        
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 # CLI interface
 if __name__ == "__main__":
     import sys
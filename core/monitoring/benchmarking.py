@@ -18,13 +18,51 @@ Usage:
     )
 """
 
+import json
 import logging
-from typing import Optional, Dict, Any, List
+import math
+import threading
+from typing import Optional, Dict, Any, List, Sequence, Set
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 
+_tables_ready: Set[str] = set()
+_tables_lock = threading.Lock()
+
+
+def _ensure_benchmark_table(db, cur) -> None:
+    """Create pipeline_benchmarks (and its metrics column) once per process and database."""
+    key = getattr(db, "country", "") or "default"
+    if key in _tables_ready:
+        return
+    with _tables_lock:
+        if key in _tables_ready:
+            return
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS pipeline_benchmarks (
+                id SERIAL PRIMARY KEY,
+                scraper_name TEXT NOT NULL,
+                step_number INTEGER NOT NULL,
+                step_name TEXT NOT NULL,
+                run_id TEXT NOT NULL,
+                duration_seconds REAL NOT NULL,
+                rows_processed INTEGER DEFAULT 0,
+                rows_per_second REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cur.execute("ALTER TABLE pipeline_benchmarks ADD COLUMN IF NOT EXISTS metrics JSONB")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_benchmarks_scraper_step ON pipeline_benchmarks(scraper_name, step_number);
+            CREATE INDEX IF NOT EXISTS idx_benchmarks_run ON pipeline_benchmarks(run_id);
+            CREATE INDEX IF NOT EXISTS idx_benchmarks_created ON pipeline_benchmarks(created_at DESC);
+        """)
+        db.commit()
+        _tables_ready.add(key)
+
+
 def record_step_benchmark(
     scraper_name: str,
     step_number: int,
@@ -32,7 +70,8 @@ def record_step_benchmark(
     run_id: str,
     duration_seconds: float,
     rows_processed: int = 0,
-    rows_per_second: Optional[float] = None
+    rows_per_second: Optional[float] = None,
+    metrics: Optional[Dict[str, Any]] = None,
 ) -> bool:
     """
     Record a step benchmark to database.
@@ -45,6 +84,7 @@ def record_step_benchmark(
         duration_seconds: Step duration in seconds
         rows_processed: Number of rows processed
         rows_per_second: Optional rows per second (calculated if not provided)
+        metrics: Optional extra measurements (e.g. sample summary), stored as JSONB
     
     Returns:
         True if recorded successfully, False otherwise
@@ -57,43 +97,12 @@ def record_step_benchmark(
         
         db = get_db(scraper_name)
         with db.cursor() as cur:
-            # Check if table exists
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = 'pipeline_benchmarks'
-                )
-            """)
-            table_exists = cur.fetchone()[0]
-            
-            if not table_exists:
-                # Create table
-                cur.execute("""
-                    CREATE TABLE pipeline_benchmarks (
-                        id SERIAL PRIMARY KEY,
-                        scraper_name TEXT NOT NULL,
-                        step_number INTEGER NOT NULL,
-                        step_name TEXT NOT NULL,
-                        run_id TEXT NOT NULL,
-                        duration_seconds REAL NOT NULL,
-                        rows_processed INTEGER DEFAULT 0,
-                        rows_per_second REAL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                cur.execute("""
-                    CREATE INDEX idx_benchmarks_scraper_step ON pipeline_benchmarks(scraper_name, step_number);
-                    CREATE INDEX idx_benchmarks_run ON pipeline_benchmarks(run_id);
-                    CREATE INDEX idx_benchmarks_created ON pipeline_benchmarks(created_at DESC);
-                """)
-                db.commit()
-            
-            # Insert benchmark
+            _ensure_benchmark_table(db, cur)
             cur.execute("""
                 INSERT INTO pipeline_benchmarks
-                    (scraper_name, step_number, step_name, run_id, duration_seconds, rows_processed, rows_per_second)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    (scraper_name, step_number, step_name, run_id, duration_seconds,
+                     rows_processed, rows_per_second, metrics)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             """, (
                 scraper_name,
                 step_number,
@@ -101,7 +110,8 @@ def record_step_benchmark(
                 run_id,
                 duration_seconds,
                 rows_processed,
-                rows_per_second
+                rows_per_second,
+                json.dumps(metrics, default=str) if metrics is not None else None,
             ))
             db.commit()
             return True
@@ -196,3 +206,90 @@ def detect_performance_regression(
         }
     
     return {"is_regression": False}
+
+
+# ---------------------------------------------------------------------------
+# Offline sample statistics (benchmarks/run_suite.py)
+# ---------------------------------------------------------------------------
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted sequence."""
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * q
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize_samples(samples: Sequence[float]) -> Dict[str, Any]:
+    """
+    Robust summary of repeated timings.
+
+    Returns:
+        Dictionary with n, median, mad (median absolute deviation), p95, mean, min, max
+    """
+    ordered = sorted(float(s) for s in samples)
+    if not ordered:
+        return {"n": 0}
+    median = _percentile(ordered, 0.5)
+    mad = _percentile(sorted(abs(s - median) for s in ordered), 0.5)
+    return {
+        "n": len(ordered),
+        "median": median,
+        "mad": mad,
+        "p95": _percentile(ordered, 0.95),
+        "mean": sum(ordered) / len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def compare_to_baseline(
+    current: Sequence[float],
+    baseline: Sequence[float],
+    rel_threshold: float = 0.10,
+    mad_k: float = 3.0,
+    min_delta_seconds: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Decide whether repeated timings regressed against a stored baseline.
+
+    A regression needs all of: the median slowed down by more than
+    ``rel_threshold`` (relative), by more than ``mad_k`` robust standard
+    deviations of the two sample sets combined (1.4826 * MAD each), and by
+    more than ``min_delta_seconds``. The noise term keeps jittery cases from
+    flapping; the relative term keeps very stable cases from failing on
+    trivial slowdowns.
+
+    Args:
+        current: Timings from this run (seconds)
+        baseline: Timings from the baseline run (seconds)
+        rel_threshold: Minimum relative slowdown of the median
+        mad_k: Multiplier for the combined robust deviation
+        min_delta_seconds: Absolute slowdown floor
+
+    Returns:
+        Dictionary with is_regression, ratio, delta, noise and both summaries
+    """
+    cur = summarize_samples(current)
+    base = summarize_samples(baseline)
+    if not cur.get("n") or not base.get("n") or base["median"] <= 0:
+        return {"is_regression": False, "reason": "insufficient samples", "current": cur, "baseline": base}
+
+    delta = cur["median"] - base["median"]
+    noise = mad_k * 1.4826 * math.hypot(cur["mad"], base["mad"])
+    ratio = cur["median"] / base["median"]
+    is_regression = (
+        ratio > 1.0 + rel_threshold
+        and delta > noise
+        and delta > min_delta_seconds
+    )
+    return {
+        "is_regression": is_regression,
+        "ratio": ratio,
+        "delta": delta,
+        "noise": noise,
+        "current": cur,
+        "baseline": base,
+    }
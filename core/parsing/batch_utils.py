@@ -0,0 +1,73 @@
+"""
+Helpers shared by the batch (Series/list) parsing APIs.
+
+The batch parsers evaluate each *distinct* raw value once and broadcast the
+result back, so columns with heavy repetition (prices, dates, pack sizes)
+cost O(unique values) instead of O(rows).
+"""
+
+from typing import Any, Callable, List, Sequence
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    pd = None
+    PANDAS_AVAILABLE = False
+
+
+def is_missing(value: Any) -> bool:
+    """None / NaN / pd.NA / NaT."""
+    if value is None:
+        return True
+    if PANDAS_AVAILABLE:
+        try:
+            return bool(pd.isna(value))
+        except (TypeError, ValueError):
+            return False
+    return value != value  # NaN
+
+
+def is_series(values: Any) -> bool:
+    return PANDAS_AVAILABLE and isinstance(values, pd.Series)
+
+
+def map_unique(
+    values: Sequence,
+    parse_uniques: Callable[[List[str]], List[Any]],
+    missing_value: Any,
+) -> List[Any]:
+    """Apply ``parse_uniques`` to the distinct non-missing values and broadcast back.
+
+    Non-string values are converted with str() before parsing.
+    Returns a plain list aligned with ``values``.
+    """
+    if is_series(values):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        raw = [v if isinstance(v, str) else str(v) for v in uniques]
+        parsed = parse_uniques(raw) if raw else []
+        return [missing_value if c < 0 else parsed[c] for c in codes]
+
+    index = {}
+    raw: List[str] = []
+    codes = []
+    for v in values:
+        if is_missing(v):
+            codes.append(-1)
+            continue
+        key = v if isinstance(v, str) else str(v)
+        code = index.get(key)
+        if code is None:
+            code = len(raw)
+            index[key] = code
+            raw.append(key)
+        codes.append(code)
+    parsed = parse_uniques(raw) if raw else []
+    return [missing_value if c < 0 else parsed[c] for c in codes]
+
+
+def wrap_like(values: Any, results: List[Any], dtype=None):
+    """Return results as a Series (same index/name) when the input was one."""
+    if is_series(values):
+        return pd.Series(results, index=values.index, name=values.name, dtype=dtype)
+    return results
@@ -1,11 +1,28 @@
 import re
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
+
+from core.parsing.batch_utils import PANDAS_AVAILABLE, map_unique, wrap_like
+
+if PANDAS_AVAILABLE:
+    import pandas as pd
+
+_DMY2_PAREN_RE = re.compile(r"\((\d{2})/(\d{2})/(\d{2})\)")
+_DMY2_RE = re.compile(r"\b(\d{2})/(\d{2})/(\d{2})\b")
+_DMY4_DOT_RE = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b")
+_YMD4_DOT_RE = re.compile(r"\b(\d{4})\.(\d{1,2})\.(\d{1,2})\b")
+
+# Whole-value forms of the most common input ('24/07/25' or '(24/07/25)'),
+# ASCII digits only, handled by the vectorized fast path
+_FAST_DMY2 = r"\(?[0-9]{2}/[0-9]{2}/[0-9]{2}\)?"
+
+_VECTORIZE_MIN_UNIQUES = 256
+
 
 def parse_date(s: str) -> Optional[str]:
     """Parse date: '(24/07/25)' or '24/07/25' -> '2025-07-24'"""
     s = (s or "").strip()
-    m = re.search(r"\((\d{2})/(\d{2})/(\d{2})\)", s) or re.search(r"\b(\d{2})/(\d{2})/(\d{2})\b", s)
+    m = _DMY2_PAREN_RE.search(s) or _DMY2_RE.search(s)
     if m:
         d, mn, y = map(int, m.groups())
         y += 2000
@@ -13,9 +30,9 @@ def parse_date(s: str) -> Optional[str]:
             return datetime(y, mn, d).date().isoformat()
         except (ValueError, OverflowError):
             return None
-            
+
     # Support DD.MM.YYYY
-    m = re.search(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b", s)
+    m = _DMY4_DOT_RE.search(s)
     if m:
         d, mn, y = map(int, m.groups())
         try:
@@ -24,7 +41,7 @@ def parse_date(s: str) -> Optional[str]:
             return None
 
     # Support YYYY.MM.DD
-    m = re.search(r"\b(\d{4})\.(\d{1,2})\.(\d{1,2})\b", s)
+    m = _YMD4_DOT_RE.search(s)
     if m:
         y, mn, d = map(int, m.groups())
         try:
@@ -34,6 +51,42 @@ def parse_date(s: str) -> Optional[str]:
 
     return None
 
+
+def _parse_date_uniques(raw: List[str]) -> List[Optional[str]]:
+    if not PANDAS_AVAILABLE or len(raw) < _VECTORIZE_MIN_UNIQUES:
+        return [parse_date(v) for v in raw]
+    s = pd.Series(raw, dtype=object).str.strip()
+    fast = s.str.fullmatch(_FAST_DMY2).fillna(False).astype(bool)
+    # '(24/07/25' or '24/07/25)' are not the common form; leave them to the scalar path
+    fast &= s.str.startswith("(") == s.str.endswith(")")
+    out: List[Optional[str]] = [None] * len(raw)
+    if fast.any():
+        core = s[fast].str.strip("()")
+        parts = pd.DataFrame({
+            "day": core.str.slice(0, 2).astype(int),
+            "month": core.str.slice(3, 5).astype(int),
+            "year": core.str.slice(6, 8).astype(int) + 2000,
+        })
+        dates = pd.to_datetime(parts, errors="coerce")
+        iso = dates.dt.strftime("%Y-%m-%d")
+        for i, v in zip(iso.index, iso.tolist()):
+            out[i] = v if isinstance(v, str) else None
+    for i in (~fast).to_numpy().nonzero()[0]:
+        out[i] = parse_date(raw[i])
+    return out
+
+
+def parse_dates(values: Any):
+    """Batch version of parse_date for a pandas Series or a list.
+
+    Each distinct value is parsed once; missing values map to None. Returns
+    an object Series of ISO date strings / None for Series input, otherwise
+    a list.
+    """
+    results = map_unique(values, _parse_date_uniques, None)
+    return wrap_like(values, results, dtype=object)
+
+
 def russia_extract_date(cell_text: str) -> str:
     """Extract date from cell text like '531.51 \n03/15/2010'"""
     lines = [ln.strip() for ln in (cell_text or "").splitlines() if ln.strip()]
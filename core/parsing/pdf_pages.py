@@ -0,0 +1,327 @@
+"""
+Page-parallel PDF text/word extraction with an on-disk page cache.
+
+pdfplumber layout analysis dominates the run time of the annex extractors,
+and the same pages are re-read by every detection pass. ``iter_pages``
+walks the requested pages in windows of ``window`` pages: each window is
+split into contiguous chunks, extracted in a process pool (each worker
+opens the PDF itself, so nothing large is pickled) and yielded in page
+order before the next window starts, so memory stays bounded however long
+the PDF is. Results are cached keyed by the PDF's SHA-256 plus the
+extraction kind and options, so re-runs and repeated scans of the same
+file skip extraction entirely.
+
+Kinds:
+    "words"       pdfplumber ``page.extract_words(**options)`` -> list of word dicts
+    "text"        pdfplumber ``page.extract_text(**options)`` -> str
+    "pypdf_text"  PyPDF2 (pypdf if PyPDF2 is missing) ``page.extract_text()`` -> str
+
+Stateful parsers (context carried across pages) stay sequential: they
+consume the per-page data in order.
+
+Usage:
+    from core.parsing.pdf_pages import iter_pages
+
+    for page_idx, words in enumerate(iter_pages(pdf_path, "words", cache_dir=out / "page_cache",
+                                                x_tolerance=1.0, y_tolerance=1.6)):
+        ...
+
+``extract_pages`` returns the same data as a list, for short page ranges.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("words", "text", "pypdf_text")
+
+# Below this many uncached pages per worker a pool costs more than it saves
+MIN_PAGES_PER_WORKER = 4
+
+# Pages extracted (and held in memory) at a time by iter_pages
+WINDOW_PAGES = 64
+
+# Pages per page-cache file
+SHARD_PAGES = 64
+
+PathLike = Union[str, Path]
+
+
+def file_sha256(path: PathLike, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_pages(pdf_path: PathLike) -> int:
+    """Number of pages in a PDF."""
+    import pdfplumber
+
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        return len(pdf.pages)
+
+
+def _options_key(kind: str, options: Dict[str, Any]) -> str:
+    blob = json.dumps({"kind": kind, **options}, sort_keys=True, default=str)
+    return f"{kind}-{hashlib.sha1(blob.encode('utf-8')).hexdigest()[:12]}"
+
+
+class PageCache:
+    """
+    Per-PDF page results on disk, in shards of ``SHARD_PAGES`` pages:
+    ``<cache_dir>/<sha256>/<kind>-<opts>/<shard>.json.gz`` holding
+    ``{"<page_idx>": data}``. Only the shards covering the requested pages
+    are read. A changed PDF gets a new hash, so stale entries are never served.
+    """
+
+    def __init__(self, cache_dir: PathLike):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, pdf_hash: str, kind: str, options: Dict[str, Any], shard: int) -> Path:
+        return self.cache_dir / pdf_hash / _options_key(kind, options) / f"{shard:05d}.json.gz"
+
+    def _load_shard(self, path: Path) -> Dict[int, Any]:
+        if not path.exists():
+            return {}
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return {int(k): v for k, v in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable page cache {path}: {e}")
+            return {}
+
+    def load(self, pdf_hash: str, kind: str, options: Dict[str, Any],
+             pages: Iterable[int]) -> Dict[int, Any]:
+        wanted = set(pages)
+        out: Dict[int, Any] = {}
+        for shard in sorted({i // SHARD_PAGES for i in wanted}):
+            for idx, data in self._load_shard(self._path(pdf_hash, kind, options, shard)).items():
+                if idx in wanted:
+                    out[idx] = data
+        return out
+
+    def save(self, pdf_hash: str, kind: str, options: Dict[str, Any], pages: Dict[int, Any]) -> None:
+        by_shard: Dict[int, Dict[int, Any]] = {}
+        for idx, data in pages.items():
+            by_shard.setdefault(idx // SHARD_PAGES, {})[idx] = data
+        for shard, entries in by_shard.items():
+            path = self._path(pdf_hash, kind, options, shard)
+            merged = self._load_shard(path)
+            merged.update(entries)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=3) as f:
+                json.dump({str(k): v for k, v in sorted(merged.items())}, f, default=float)
+            os.replace(tmp, path)
+
+
+def _pdf_reader_class():
+    # PyPDF2 is the pinned dependency; pypdf lays text out differently
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        from pypdf import PdfReader
+    return PdfReader
+
+
+def _extract_chunk(pdf_path: str, kind: str, options: Dict[str, Any],
+                   page_indices: Sequence[int]) -> List[Tuple[int, Any, Optional[str]]]:
+    """
+    Worker: open the PDF once and extract the given pages.
+
+    Returns ``(page_idx, data, error)`` per page. A page that fails to
+    extract gets empty data and the error message, so one bad page does not
+    take the rest of the chunk down with it.
+    """
+    out: List[Tuple[int, Any, Optional[str]]] = []
+    if kind == "pypdf_text":
+        reader = _pdf_reader_class()(pdf_path)
+        for idx in page_indices:
+            try:
+                out.append((idx, reader.pages[idx].extract_text() or "", None))
+            except Exception as e:
+                out.append((idx, "", f"{type(e).__name__}: {e}"))
+        return out
+
+    import pdfplumber
+
+    empty: Any = [] if kind == "words" else ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for idx in page_indices:
+            page = None
+            try:
+                page = pdf.pages[idx]
+                if kind == "words":
+                    data: Any = page.extract_words(**options) or []
+                else:
+                    data = page.extract_text(**options) or ""
+                out.append((idx, data, None))
+            except Exception as e:
+                out.append((idx, empty, f"{type(e).__name__}: {e}"))
+            finally:
+                if page is not None:
+                    page.close()  # drop cached layout objects; workers walk many pages
+    return out
+
+
+def _chunks(indices: List[int], n_chunks: int) -> List[List[int]]:
+    """Split indices into n roughly equal contiguous runs."""
+    n_chunks = max(1, min(n_chunks, len(indices)))
+    size, extra = divmod(len(indices), n_chunks)
+    result, start = [], 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        result.append(indices[start:end])
+        start = end
+    return result
+
+
+def default_processes() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def iter_pages(pdf_path: PathLike,
+               kind: str = "words",
+               pages: Optional[Iterable[int]] = None,
+               processes: Optional[int] = None,
+               cache_dir: Optional[PathLike] = None,
+               pdf_hash: Optional[str] = None,
+               window: int = WINDOW_PAGES,
+               failed_pages: Optional[Set[int]] = None,
+               **options: Any) -> Iterator[Any]:
+    """
+    Yield per-page data in the order given, in parallel and through the cache.
+
+    Pages are extracted ``window`` at a time; only the current window is
+    held in memory. A page that fails to extract is logged and yielded as
+    empty data ([] or ""); it is not cached, so a re-run tries it again.
+
+    Args:
+        pdf_path: PDF to read
+        kind: "words", "text" or "pypdf_text"
+        pages: 0-based page indices (default: all pages)
+        processes: Worker processes (None/0 = cpu_count - 1, 1 = in-process)
+        cache_dir: Page cache root; None disables caching
+        pdf_hash: Precomputed file_sha256(pdf_path), if the caller has it
+        window: Pages extracted per round
+        failed_pages: If given, indices of pages that failed to extract are
+            added to it before the page is yielded
+        **options: Passed to extract_words / extract_text; part of the cache key
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown page extraction kind: {kind!r} (expected one of {KINDS})")
+    pdf_path = str(pdf_path)
+    wanted = list(range(count_pages(pdf_path))) if pages is None else list(pages)
+    if not wanted:
+        return
+
+    cache = PageCache(cache_dir) if cache_dir else None
+    cache_options = options
+    if cache:
+        pdf_hash = pdf_hash or file_sha256(pdf_path)
+        # pypdf and PyPDF2 lay text out differently; keep their entries apart
+        if kind == "pypdf_text":
+            cache_options = dict(options, backend=_pdf_reader_class().__module__.split(".")[0])
+
+    window = max(1, window)
+    max_workers = processes or default_processes()
+    pool: Optional[ProcessPoolExecutor] = None
+    extracted = 0
+    t0 = time.monotonic()
+    try:
+        for start in range(0, len(wanted), window):
+            batch = wanted[start:start + window]
+            results = cache.load(pdf_hash, kind, cache_options, batch) if cache else {}
+            missing = sorted({i for i in batch if i not in results})
+            if missing:
+                workers = min(max_workers, max(1, len(missing) // MIN_PAGES_PER_WORKER))
+                if workers > 1 and pool is None:
+                    pool = _start_pool(workers)
+                fresh = _run_chunks(pdf_path, kind, options, missing,
+                                    pool if workers > 1 else None, workers)
+                if fresh is None:  # pool broke: finish this and later windows in-process
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool, max_workers = None, 1
+                    fresh = _extract_chunk(pdf_path, kind, options, missing)
+                good = {}
+                for idx, data, error in fresh:
+                    results[idx] = data
+                    if error is None:
+                        good[idx] = data
+                        continue
+                    logger.warning(f"Page {idx + 1} of {Path(pdf_path).name}: {kind} extraction failed: {error}")
+                    if failed_pages is not None:
+                        failed_pages.add(idx)
+                extracted += len(fresh)
+                if cache and good:
+                    try:
+                        cache.save(pdf_hash, kind, cache_options, good)
+                    except OSError as e:
+                        logger.warning(f"Could not write page cache for {pdf_path}: {e}")
+            for idx in batch:
+                yield results[idx]
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    if extracted:
+        logger.info(f"Extracted {kind} for {extracted} page(s) of {Path(pdf_path).name} "
+                    f"in {time.monotonic() - t0:.1f}s ({len(wanted) - extracted} cached)")
+
+
+def extract_pages(pdf_path: PathLike,
+                  kind: str = "words",
+                  pages: Optional[Iterable[int]] = None,
+                  processes: Optional[int] = None,
+                  cache_dir: Optional[PathLike] = None,
+                  pdf_hash: Optional[str] = None,
+                  failed_pages: Optional[Set[int]] = None,
+                  **options: Any) -> List[Any]:
+    """
+    List form of iter_pages: one entry per requested page, in the order given.
+
+    Holds every page in memory; prefer iter_pages for whole large PDFs.
+    """
+    return list(iter_pages(pdf_path, kind, pages=pages, processes=processes,
+                           cache_dir=cache_dir, pdf_hash=pdf_hash,
+                           failed_pages=failed_pages, **options))
+
+
+def _start_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    try:
+        return ProcessPoolExecutor(max_workers=workers)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Page extraction pool unavailable ({e}); extracting in-process")
+        return None
+
+
+def _run_chunks(pdf_path: str, kind: str, options: Dict[str, Any], missing: List[int],
+                pool: Optional[ProcessPoolExecutor],
+                workers: int) -> Optional[List[Tuple[int, Any, Optional[str]]]]:
+    """Extract ``missing`` pages, on ``pool`` if given; None if the pool broke."""
+    if pool is None:
+        return _extract_chunk(pdf_path, kind, options, missing)
+
+    # More chunks than workers keeps the pool busy when page costs are uneven
+    chunks = _chunks(missing, workers * 4)
+    out: List[Tuple[int, Any, Optional[str]]] = []
+    try:
+        futures = [pool.submit(_extract_chunk, pdf_path, kind, options, c) for c in chunks]
+        for fut in futures:
+            out.extend(fut.result())
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"Page extraction pool failed ({e}); extracting in-process")
+        return None
+    return out
@@ -1,19 +1,33 @@
 import re
 import math
-from typing import Optional
+from typing import Any, List, Optional
+
+from core.parsing.batch_utils import PANDAS_AVAILABLE, map_unique, wrap_like
+
+if PANDAS_AVAILABLE:
+    import pandas as pd
+
+_PRICE_DIGITS_RE = re.compile(r"[\d\s]+")
+_AR_MONEY_STRIP_RE = re.compile(r"[^\d\.,]")
+# Cleaned AR amounts that pd.to_numeric parses exactly like float()
+_ASCII_DECIMAL = r"(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)"
+
+# Below this many distinct values the pandas fast path costs more than it saves
+_VECTORIZE_MIN_UNIQUES = 256
+
 
 def parse_price(val: str) -> str:
     """Extract numeric price from string"""
     if not val:
         return ""
-    nums = re.findall(r"[\d\s]+", val.replace(" ", ""))
+    nums = _PRICE_DIGITS_RE.findall(val.replace(" ", ""))
     return nums[0] if nums else val.strip()
 
 def ar_money_to_float(s: str) -> Optional[float]:
     """Convert Argentine money format to float: '$ 1.234,56' -> 1234.56"""
     if not s:
         return None
-    t = re.sub(r"[^\d\.,]", "", s.strip())
+    t = _AR_MONEY_STRIP_RE.sub("", s.strip())
     if not t:
         return None
     # AR: dot thousands, comma decimals
@@ -22,3 +36,57 @@ def ar_money_to_float(s: str) -> Optional[float]:
         return float(t)
     except ValueError:
         return None
+
+
+def _parse_price_uniques(raw: List[str]) -> List[str]:
+    if not PANDAS_AVAILABLE or len(raw) < _VECTORIZE_MIN_UNIQUES:
+        return [parse_price(v) for v in raw]
+    s = pd.Series(raw, dtype=object)
+    first = s.str.replace(" ", "", regex=False).str.extract(r"([\d\s]+)", expand=False)
+    out = first.where(first.notna(), s.str.strip())
+    out = out.where(s != "", "")
+    return out.tolist()
+
+
+def _ar_money_uniques(raw: List[str]) -> List[Optional[float]]:
+    if not PANDAS_AVAILABLE or len(raw) < _VECTORIZE_MIN_UNIQUES:
+        return [ar_money_to_float(v) for v in raw]
+    s = pd.Series(raw, dtype=object)
+    cleaned = (s.str.strip()
+                .str.replace(_AR_MONEY_STRIP_RE.pattern, "", regex=True)
+                .str.replace(".", "", regex=False)
+                .str.replace(",", ".", regex=False))
+    fast = cleaned.str.fullmatch(_ASCII_DECIMAL).fillna(False).astype(bool)
+    out: List[Optional[float]] = [None] * len(raw)
+    if fast.any():
+        nums = pd.to_numeric(cleaned[fast], errors="coerce").astype(float)
+        for i, v in zip(nums.index, nums.tolist()):
+            out[i] = v
+    # Unusual leftovers (non-ASCII digits, empty, malformed) go through the scalar path
+    for i in (~fast).to_numpy().nonzero()[0]:
+        out[i] = ar_money_to_float(raw[i])
+    return out
+
+
+def parse_prices(values: Any):
+    """Batch version of parse_price for a pandas Series or a list.
+
+    Each distinct value is parsed once. Missing values (None/NaN) map to "",
+    like parse_price(None). Returns a Series aligned with the input when given
+    a Series, otherwise a list.
+    """
+    results = map_unique(values, _parse_price_uniques, "")
+    return wrap_like(values, results, dtype=object)
+
+
+def ar_money_to_floats(values: Any):
+    """Batch version of ar_money_to_float for a pandas Series or a list.
+
+    Returns a float64 Series (NaN where the scalar returns None) for Series
+    input, otherwise a list of Optional[float].
+    """
+    results = map_unique(values, _ar_money_uniques, None)
+    if PANDAS_AVAILABLE and isinstance(values, pd.Series):
+        return pd.Series([math.nan if v is None else v for v in results],
+                         index=values.index, name=values.name, dtype="float64")
+    return results
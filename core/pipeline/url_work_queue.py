@@ -8,7 +8,7 @@ Supports horizontal scaling with shared run_id and independent Tor/browser per n
 import psycopg2
 from psycopg2 import sql
 from psycopg2.extras import execute_values
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import hashlib
 import logging
@@ -196,6 +196,129 @@ class URLWorkQueue:
                 cur.execute(update_sql, params)
             conn.commit()
     
+    def complete_urls(self, results: List[Tuple[int, bool, Optional[str]]]) -> int:
+        """
+        Mark many URLs completed or failed in one transaction.
+        
+        Same semantics as complete_url: failures go back to pending (or to
+        failed once max_retries is reached) with retry_count incremented.
+        
+        Args:
+            results: (work_id, success, error_message) tuples
+            
+        Returns:
+            Number of rows updated
+        """
+        if not results:
+            return 0
+        
+        done = [work_id for work_id, success, _ in results if success]
+        failed = [(work_id, error) for work_id, success, error in results if not success]
+        
+        fail_sql = """
+        UPDATE url_work_queue AS q
+        SET status = CASE 
+                WHEN q.retry_count + 1 >= q.max_retries THEN 'failed'
+                ELSE 'pending'
+            END,
+            retry_count = q.retry_count + 1,
+            error_message = v.error_message,
+            worker_id = NULL,
+            claimed_at = NULL
+        FROM (VALUES %s) AS v(id, error_message)
+        WHERE q.id = v.id
+        RETURNING q.id
+        """
+        
+        updated = 0
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                if done:
+                    cur.execute("""
+                    UPDATE url_work_queue
+                    SET status = 'completed',
+                        completed_at = CURRENT_TIMESTAMP
+                    WHERE id = ANY(%s)
+                    """, (done,))
+                    updated += cur.rowcount
+                if failed:
+                    # rowcount only covers the last page; count the returned ids instead
+                    returned = execute_values(cur, fail_sql, failed,
+                                              template="(%s::int, %s::text)", page_size=500,
+                                              fetch=True)
+                    updated += len(returned)
+            conn.commit()
+        
+        return updated
+    
+    def renew_leases(self, worker_id: str, work_ids: List[int]) -> int:
+        """
+        Extend the lease on URLs this worker still holds.
+        
+        Args:
+            worker_id: Worker that claimed the URLs
+            work_ids: Work queue item IDs to renew
+            
+        Returns:
+            Number of leases renewed
+        """
+        if not work_ids:
+            return 0
+        
+        renew_sql = """
+        UPDATE url_work_queue
+        SET claimed_at = CURRENT_TIMESTAMP
+        WHERE id = ANY(%s)
+          AND worker_id = %s
+          AND status = 'claimed'
+        """
+        
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(renew_sql, (list(work_ids), worker_id))
+                renewed = cur.rowcount
+            conn.commit()
+        
+        return renewed
+    
+    def release_claims(self, worker_id: str, work_ids: List[int]) -> int:
+        """
+        Hand claimed but unprocessed URLs back to the queue.
+        
+        Used on shutdown for prefetched items; retry_count is not touched
+        because the URL was never attempted.
+        
+        Args:
+            worker_id: Worker that claimed the URLs
+            work_ids: Work queue item IDs to release
+            
+        Returns:
+            Number of URLs released
+        """
+        if not work_ids:
+            return 0
+        
+        release_sql = """
+        UPDATE url_work_queue
+        SET status = 'pending',
+            worker_id = NULL,
+            claimed_at = NULL
+        WHERE id = ANY(%s)
+          AND worker_id = %s
+          AND status = 'claimed'
+        """
+        
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(release_sql, (list(work_ids), worker_id))
+                released = cur.rowcount
+            conn.commit()
+        
+        if released > 0:
+            logger.info(f"Worker {worker_id} released {released} unprocessed URLs")
+        
+        return released
+    
     def release_expired_leases(self, lease_seconds: int = 300):
         """
         Release URLs from workers that have stopped responding.
@@ -17,14 +17,20 @@ Stores one row per run_id with:
 - started_at: When the run first started
 - ended_at: When the run completed
 - status: final status of the run
+
+Per-run JSON files remain the source of truth; a SQLite index next to them
+(RunMetricsIndex) answers list/filter/summary queries without opening every
+file. Existing JSON files are migrated into the index on first use.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import sqlite3
 import time
 import psutil
+from contextlib import closing
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from enum import Enum
@@ -114,6 +120,141 @@ class RunMetrics:
         return datetime.now(timezone.utc).isoformat()
 
 
+class RunMetricsIndex:
+    """
+    SQLite index over the per-run JSON metrics files.
+
+    Updated on every save so list/summary queries are a single indexed query
+    instead of a glob + json.load of every run file.
+    """
+
+    INDEX_FILENAME = "_index.sqlite3"
+    _COLUMNS = (
+        "run_id", "scraper_name", "started_at", "ended_at",
+        "active_duration_seconds", "network_sent_bytes",
+        "network_received_bytes", "status", "last_updated",
+    )
+
+    def __init__(self, metrics_dir: Path) -> None:
+        self.metrics_dir = Path(metrics_dir)
+        self.db_path = self.metrics_dir / self.INDEX_FILENAME
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_metrics (
+                    run_id TEXT PRIMARY KEY,
+                    scraper_name TEXT NOT NULL,
+                    started_at TEXT,
+                    ended_at TEXT,
+                    active_duration_seconds REAL DEFAULT 0,
+                    network_sent_bytes INTEGER DEFAULT 0,
+                    network_received_bytes INTEGER DEFAULT 0,
+                    status TEXT,
+                    last_updated TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_run_metrics_scraper "
+                "ON run_metrics (scraper_name, run_id)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            conn.commit()
+            migrated = conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'json_migrated'"
+            ).fetchone()
+        if not migrated:
+            count = self.rebuild()
+            if count:
+                log.info(f"Migrated {count} run metrics files into {self.db_path.name}")
+
+    @staticmethod
+    def _row_values(metrics: RunMetrics) -> tuple:
+        return (
+            metrics.run_id, metrics.scraper_name, metrics.started_at,
+            metrics.ended_at, metrics.active_duration_seconds,
+            metrics.network_sent_bytes, metrics.network_received_bytes,
+            metrics.status, metrics.last_updated,
+        )
+
+    def upsert(self, metrics: RunMetrics) -> None:
+        placeholders = ", ".join("?" * len(self._COLUMNS))
+        with closing(self._connect()) as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO run_metrics ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                self._row_values(metrics),
+            )
+            conn.commit()
+
+    def delete(self, run_id: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM run_metrics WHERE run_id = ?", (run_id,))
+            conn.commit()
+
+    def rebuild(self) -> int:
+        """Re-index every JSON file in the metrics directory (one-time migration)."""
+        rows = []
+        for metrics_file in self.metrics_dir.glob("*.json"):
+            try:
+                with open(metrics_file, "r", encoding="utf-8") as f:
+                    rows.append(self._row_values(RunMetrics.from_dict(json.load(f))))
+            except Exception as exc:
+                log.debug(f"Skipping unreadable metrics file {metrics_file.name}: {exc}")
+
+        placeholders = ", ".join("?" * len(self._COLUMNS))
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM run_metrics")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO run_metrics ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+            conn.commit()
+        return len(rows)
+
+    def list(self, scraper_name: Optional[str] = None, limit: int = 100) -> List[RunMetrics]:
+        # Same ordering as the old file listing (filenames = run_id, newest first)
+        sql = f"SELECT {', '.join(self._COLUMNS)} FROM run_metrics"
+        params: List[Any] = []
+        if scraper_name:
+            sql += " WHERE scraper_name = ?"
+            params.append(scraper_name)
+        sql += " ORDER BY run_id DESC LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [RunMetrics.from_dict(dict(row)) for row in rows]
+
+    def summary(self, scraper_name: Optional[str] = None) -> Dict[str, float]:
+        sql = (
+            "SELECT COUNT(*) AS runs, "
+            "COALESCE(SUM(active_duration_seconds), 0) AS duration, "
+            "COALESCE(SUM(network_sent_bytes + network_received_bytes), 0) AS bytes "
+            "FROM run_metrics"
+        )
+        params: List[Any] = []
+        if scraper_name:
+            sql += " WHERE scraper_name = ?"
+            params.append(scraper_name)
+        with closing(self._connect()) as conn:
+            row = conn.execute(sql, params).fetchone()
+        return {"runs": row["runs"], "duration": row["duration"], "bytes": row["bytes"]}
+
+
 class RunMetricsTracker:
     """
     Tracks network consumption and active execution time for scraper runs.
@@ -155,6 +296,12 @@ class RunMetricsTracker:
         self._active_runs: Dict[str, Dict[str, Any]] = {}
         self._lock = Lock()
         
+        self._index: Optional[RunMetricsIndex] = None
+        try:
+            self._index = RunMetricsIndex(self.metrics_dir)
+        except Exception as exc:
+            log.warning(f"Run metrics index unavailable, falling back to file scans: {exc}")
+
         # Get initial network stats for the process
         self._process = psutil.Process()
         self._initial_io = self._get_net_io()
@@ -471,6 +618,13 @@ class RunMetricsTracker:
             temp_path.replace(metrics_path)
         except Exception as exc:
             log.warning(f"Failed to save metrics for {metrics.run_id}: {exc}")
+            return
+
+        if self._index:
+            try:
+                self._index.upsert(metrics)
+            except Exception as exc:
+                log.warning(f"Failed to index metrics for {metrics.run_id}: {exc}")
     
     def _load_metrics(self, run_id: str) -> Optional[RunMetrics]:
         """Load metrics from disk."""
@@ -506,6 +660,12 @@ class RunMetricsTracker:
         Returns:
             List of RunMetrics objects
         """
+        if self._index:
+            try:
+                return self._index.list(scraper_name=scraper_name, limit=limit)
+            except Exception as exc:
+                log.warning(f"Metrics index query failed, scanning files: {exc}")
+
         results = []
         
         try:
@@ -538,6 +698,23 @@ class RunMetricsTracker:
         Returns:
             Dictionary with summary statistics
         """
+        if self._index:
+            try:
+                agg = self._index.summary(scraper_name=scraper_name)
+                runs = agg["runs"]
+                total_duration = agg["duration"]
+                total_network_gb = agg["bytes"] / (1024 ** 3)
+                return {
+                    "total_runs": runs,
+                    "total_duration_seconds": round(total_duration, 2),
+                    "total_duration_hours": round(total_duration / 3600, 2),
+                    "total_network_gb": round(total_network_gb, 4),
+                    "avg_duration_seconds": round(total_duration / runs, 2) if runs else 0.0,
+                    "avg_network_gb": round(total_network_gb / runs, 4) if runs else 0.0,
+                }
+            except Exception as exc:
+                log.warning(f"Metrics index query failed, scanning files: {exc}")
+
         metrics_list = self.list_metrics(scraper_name=scraper_name, limit=10000)
         
         if not metrics_list:
@@ -578,6 +755,9 @@ class RunMetricsTracker:
                 if run_id in self._active_runs:
                     del self._active_runs[run_id]
             
+            if self._index:
+                self._index.delete(run_id)
+
             # Delete file
             metrics_path = self._get_metrics_path(run_id)
             if metrics_path.exists():
@@ -6,5 +6,6 @@ Replaces: JSON file caches, in-memory caches, ad-hoc DB caches
 """
 
 from .cache import TranslationCache, get_cache
+from .batch import BatchTranslator
 
-__all__ = ['TranslationCache', 'get_cache']
+__all__ = ['TranslationCache', 'get_cache', 'BatchTranslator']
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Deduplicating batch translation stage.
+
+Collects the distinct strings of a batch, resolves them through the
+TranslationCache in bulk, and sends only the misses to the translator in
+chunks with bounded concurrency. Results are remembered for the rest of the
+run, so a value repeated across thousands of pages is looked up once.
+
+Translators that issue one request per string anyway (googletrans does for
+a list) are called string by string with ``per_string_requests=True``, so
+``translator_calls`` counts the requests actually sent.
+
+Usage:
+    from core.translation import BatchTranslator, get_cache
+
+    translator = BatchTranslator(
+        translate_batch=lambda texts: [...],   # sync: list[str] -> list[str]
+        cache=get_cache("north_macedonia"),
+        source_lang="mk", target_lang="en",
+        needs_translation=looks_cyrillic,
+    )
+    await translator.translate_rows(rows, ["Generic Name", "Formulation"])
+    print(translator.summary())
+"""
+
+import asyncio
+import logging
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTranslator:
+    """
+    Async translation stage: memo -> TranslationCache.get_many -> translator
+    (chunked, max_concurrency in flight) -> TranslationCache.set_many.
+
+    A chunk that still fails after its retries is retried one string at a
+    time, so one bad string does not leave the rest untranslated.
+    Untranslatable or failed strings are returned unchanged and not cached.
+    """
+
+    def __init__(self,
+                 translate_batch: Optional[Callable[[List[str]], Sequence[str]]],
+                 cache: Any = None,
+                 source_lang: str = "auto",
+                 target_lang: str = "en",
+                 needs_translation: Optional[Callable[[str], bool]] = None,
+                 chunk_size: int = 50,
+                 max_concurrency: int = 3,
+                 retries: int = 3,
+                 backoff_base: float = 0.5,
+                 per_string_requests: bool = False):
+        """
+        Args:
+            translate_batch: Blocking callable translating a list of strings
+                (run in a worker thread); None disables translator calls
+            cache: TranslationCache (or anything with get_many/set_many)
+            source_lang: Source language code
+            target_lang: Target language code
+            needs_translation: Predicate selecting strings worth translating
+            chunk_size: Strings per translator call
+            max_concurrency: Translator calls in flight at once
+            retries: Attempts per chunk (or per string) before giving up on it
+            backoff_base: First retry delay ceiling in seconds (doubles per attempt)
+            per_string_requests: translate_batch sends one request per string,
+                so call it with one string at a time
+        """
+        self.translate_batch = translate_batch
+        self.cache = cache
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.needs_translation = needs_translation or (lambda text: bool(text))
+        self.chunk_size = max(1, chunk_size)
+        self.retries = max(1, retries)
+        self.backoff_base = backoff_base
+        self.per_string_requests = per_string_requests
+        self._sem = asyncio.Semaphore(max(1, max_concurrency))
+        self._memo: Dict[str, str] = {}
+        self.stats: Dict[str, int] = {
+            "requested": 0,        # strings seen (with repeats)
+            "unique": 0,           # distinct strings not already memoized
+            "memo_hits": 0,
+            "cache_hits": 0,
+            "translated": 0,
+            "failed": 0,
+            "translator_calls": 0,  # requests sent, retries included
+        }
+
+    async def translate_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """Translate texts; returns {text: translation} for every input text."""
+        wanted: List[str] = []
+        seen = set()
+        for text in texts:
+            if not text or not self.needs_translation(text):
+                continue
+            self.stats["requested"] += 1
+            if text in self._memo or text in seen:
+                self.stats["memo_hits"] += 1  # repeat within the run or the batch
+            else:
+                wanted.append(text)
+            seen.add(text)
+
+        if wanted:
+            self.stats["unique"] += len(wanted)
+            misses = await self._resolve_from_cache(wanted)
+            if misses:
+                await self._translate_misses(misses)
+
+        return {text: self._memo.get(text, text) for text in seen}
+
+    async def translate_rows(self, rows: List[Dict[str, Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """Translate the given fields of each row in place (one bulk pass per batch)."""
+        values = [row.get(f) for row in rows for f in fields if isinstance(row.get(f), str)]
+        await self.translate_many(values)
+        for row in rows:
+            for f in fields:
+                value = row.get(f)
+                if isinstance(value, str) and value in self._memo:
+                    row[f] = self._memo[value]
+        return rows
+
+    async def _resolve_from_cache(self, texts: List[str]) -> List[str]:
+        if self.cache is None:
+            return texts
+        keys = [(t, self.source_lang, self.target_lang) for t in texts]
+        try:
+            found = await asyncio.to_thread(self.cache.get_many, keys)
+        except Exception as e:
+            logger.warning(f"Translation cache lookup failed: {e}")
+            found = {}
+        misses = []
+        for key in keys:
+            translated = found.get(key)
+            if translated:
+                self._memo[key[0]] = translated
+                self.stats["cache_hits"] += 1
+            else:
+                misses.append(key[0])
+        return misses
+
+    async def _translate_misses(self, texts: List[str]) -> None:
+        if self.translate_batch is None:
+            self.stats["failed"] += len(texts)
+            return
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        results = await asyncio.gather(*(self._translate_chunk(c) for c in chunks))
+
+        fresh: Dict[tuple, str] = {}
+        for chunk, translated in zip(chunks, results):
+            for source, target in zip(chunk, translated):
+                if target and target.strip():
+                    self._memo[source] = target
+                    fresh[(source, self.source_lang, self.target_lang)] = target
+                    self.stats["translated"] += 1
+                else:
+                    self.stats["failed"] += 1
+
+        if fresh and self.cache is not None:
+            try:
+                await asyncio.to_thread(self.cache.set_many, fresh)
+            except Exception as e:
+                logger.warning(f"Translation cache store failed: {e}")
+
+    async def _translate_chunk(self, chunk: List[str]) -> List[Optional[str]]:
+        async with self._sem:
+            if not self.per_string_requests and len(chunk) > 1:
+                translated = await self._call(chunk, self.retries)
+                if translated is not None:
+                    return translated
+                logger.debug(f"Translation chunk of {len(chunk)} failed; retrying strings one at a time")
+                # The chunk already used its retries: one more attempt per string
+                retries = 1
+            else:
+                retries = self.retries
+            results: List[Optional[str]] = []
+            for text in chunk:
+                translated = await self._call([text], retries)
+                results.append(translated[0] if translated else None)
+            return results
+
+    async def _call(self, texts: List[str], retries: int) -> Optional[List[str]]:
+        """One translator call with retries; None once every attempt failed."""
+        for attempt in range(1, retries + 1):
+            self.stats["translator_calls"] += 1
+            try:
+                translated = await asyncio.to_thread(self.translate_batch, texts)
+                translated = list(translated or [])
+                if len(translated) != len(texts):
+                    raise ValueError(f"translator returned {len(translated)} results for {len(texts)} inputs")
+                return translated
+            except Exception as e:
+                if attempt == retries:
+                    logger.debug(f"Translation of {len(texts)} string(s) failed: {e}")
+                    return None
+                await asyncio.sleep(random.uniform(0, self.backoff_base * (2 ** (attempt - 1))))
+        return None
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of requested strings answered without calling the translator."""
+        requested = self.stats["requested"]
+        if not requested:
+            return 0.0
+        return (self.stats["memo_hits"] + self.stats["cache_hits"]) / requested
+
+    @property
+    def calls_saved(self) -> int:
+        """Translator requests avoided versus translating every requested string once."""
+        return self.stats["requested"] - self.stats["translator_calls"]
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"requested={s['requested']}, unique={s['unique']}, memo_hits={s['memo_hits']}, "
+                f"cache_hits={s['cache_hits']}, hit_ratio={self.hit_ratio:.1%}, "
+                f"translated={s['translated']}, failed={s['failed']}, "
+                f"translator_calls={s['translator_calls']}, calls_saved={self.calls_saved}")
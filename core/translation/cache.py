@@ -32,8 +32,17 @@ from datetime import datetime
 
 from core.db.connection import CountryDB
 
+try:
+    from psycopg2.extras import execute_values
+    _HAS_EXECUTE_VALUES = True
+except ImportError:
+    _HAS_EXECUTE_VALUES = False
+
 logger = logging.getLogger(__name__)
 
+# Keys per bulk SELECT / rows per bulk upsert page
+_BULK_CHUNK = 1000
+
 # Scraper name to table prefix mapping
 # Supports: lowercase_snake, CamelCase, and Title Case
 PREFIX_MAP = {
@@ -306,7 +315,8 @@ class TranslationCache:
     
     def get_many(self, items: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], str]:
         """
-        Get multiple translations at once.
+        Get multiple translations at once (one query per language pair and
+        chunk of _BULK_CHUNK keys).
         
         Args:
             items: List of (source_text, source_lang, target_lang) tuples
@@ -315,15 +325,45 @@ class TranslationCache:
             Dict mapping (source, src_lang, tgt_lang) -> translation
         """
         results = {}
-        for source_text, src_lang, tgt_lang in items:
-            translation = self.get(source_text, src_lang, tgt_lang)
-            if translation:
-                results[(source_text, src_lang, tgt_lang)] = translation
+        if not items:
+            return results
+
+        self._ensure_schema_detected()
+
+        # (src_lang, tgt_lang) -> lookup key -> requested items
+        groups: Dict[Tuple[str, str], Dict[str, List[Tuple[str, str, str]]]] = {}
+        for item in items:
+            source_text, src_lang, tgt_lang = item
+            if not source_text or not source_text.strip():
+                continue
+            key = source_text.strip()
+            if not self._is_legacy:
+                key = self._hash_text(key)
+            groups.setdefault((src_lang, tgt_lang), {}).setdefault(key, []).append(item)
+
+        key_column = "source_text" if self._is_legacy else "source_hash"
+        sql = f"""
+            SELECT {key_column}, translated_text FROM {self.table_name}
+            WHERE {key_column} = ANY(%s)
+              AND source_language = %s
+              AND target_language = %s
+        """
+        try:
+            for (src_lang, tgt_lang), by_key in groups.items():
+                keys = list(by_key)
+                for i in range(0, len(keys), _BULK_CHUNK):
+                    rows = self.db.fetchall(sql, (keys[i:i + _BULK_CHUNK], src_lang, tgt_lang))
+                    for key, translated in rows:
+                        if translated:
+                            for item in by_key.get(key, ()):
+                                results[item] = translated
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
         return results
     
     def set_many(self, translations: Dict[Tuple[str, str, str], str]) -> int:
         """
-        Cache multiple translations at once.
+        Cache multiple translations at once (single multi-row upsert).
         
         Args:
             translations: Dict mapping (source, src_lang, tgt_lang) -> translation
@@ -331,11 +371,65 @@ class TranslationCache:
         Returns:
             Number of items cached
         """
-        count = 0
+        if not translations:
+            return 0
+
+        # The row shape depends on the detected schema, not the prefix guess
+        self._ensure_schema_detected()
+
+        # One row per conflict key: an upsert may not touch the same row twice
+        rows: Dict[Any, tuple] = {}
         for (source, src_lang, tgt_lang), translation in translations.items():
-            if self.set(source, translation, src_lang, tgt_lang):
-                count += 1
-        return count
+            if not source or not translation:
+                continue
+            source = source.strip()
+            translation = translation.strip()
+            if not source or not translation:
+                continue
+            if self._is_legacy:
+                rows[source] = (source, translation, src_lang, tgt_lang)
+            else:
+                text_hash = self._hash_text(source)
+                rows[(text_hash, src_lang, tgt_lang)] = (source, text_hash, translation, src_lang, tgt_lang)
+        if not rows:
+            return 0
+
+        if not _HAS_EXECUTE_VALUES:
+            return sum(1 for (source, src_lang, tgt_lang), translation in translations.items()
+                       if self.set(source, translation, src_lang, tgt_lang))
+
+        if self._is_legacy:
+            sql = f"""
+                INSERT INTO {self.table_name}
+                    (source_text, translated_text, source_language, target_language)
+                VALUES %s
+                ON CONFLICT (source_text)
+                DO UPDATE SET
+                    translated_text = EXCLUDED.translated_text,
+                    updated_at = CURRENT_TIMESTAMP
+            """
+        else:
+            sql = f"""
+                INSERT INTO {self.table_name}
+                    (source_text, source_hash, translated_text, source_language, target_language)
+                VALUES %s
+                ON CONFLICT (source_hash, source_language, target_language)
+                DO UPDATE SET
+                    translated_text = EXCLUDED.translated_text,
+                    updated_at = CURRENT_TIMESTAMP
+            """
+        try:
+            with self.db.cursor() as cur:
+                execute_values(cur, sql, list(rows.values()), page_size=_BULK_CHUNK)
+            self.db.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Cache set_many error: {e}")
+            try:
+                self.db.rollback()
+            except:
+                pass
+            return 0
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -529,6 +529,14 @@ class ScrapeCache:
             expire or self.expire
         )
     
+    def get_http_entry(self, url: str) -> Optional[Dict]:
+        """Get cached HTTP response + validators (etag / last_modified) for a URL."""
+        return self.cache.get(self._make_key("http", url))
+
+    def set_http_entry(self, url: str, entry: Dict, expire: Optional[int] = None):
+        """Cache an HTTP response with its validators for conditional GETs."""
+        self.cache.set(self._make_key("http", url), entry, expire or self.expire)
+
     def clear_scraper_cache(self):
         """Clear all cache entries for this scraper."""
         # Note: This is a simplified implementation
@@ -52,8 +52,8 @@ def categorize_products(
     missing = []
     oos = []
 
-    for product in products:
-        match, category = mapper.categorize_match(product)
+    # Keys for all products are built and joined in bulk, not per row
+    for product, (match, category) in zip(products, mapper.categorize_many(products)):
 
         if category == "mapped":
             product["PCID"] = match[pcid_field]
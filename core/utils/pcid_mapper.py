@@ -1,10 +1,145 @@
 import re
 import logging
 import unicodedata
-from typing import List, Dict, Any, Optional, Tuple
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Try to import rapidfuzz, gracefully degrade if not available
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    fuzz = None
+    process = None
 
 logger = logging.getLogger(__name__)
 
+Products = Union[List[Dict[str, Any]], pd.DataFrame]
+
+
+def _fuzzy_text(text: Any) -> str:
+    """Normalization for fuzzy scoring: like the key parts, but keeps word boundaries."""
+    if text is None:
+        return ""
+    text = unicodedata.normalize("NFC", str(text)).upper()
+    return re.sub(r"[^A-Z0-9]+", " ", text).strip()
+
+
+class FuzzyIndex:
+    """
+    Blocked fuzzy search over reference strings with rapidfuzz.
+
+    Each reference is indexed under its tokens and 4-character token
+    prefixes (n-gram blocks that survive typos in a word's tail). A query
+    is only scored against the references sharing one of its rarest
+    blocks. Blocks shared by many queries are scored as one rapidfuzz
+    ``cdist`` matrix (chunked to at most ``max_cells`` entries); the
+    candidate pairs of small blocks are pooled and scored in a single
+    multithreaded ``cpdist`` call, so per-call overhead does not dominate.
+    """
+
+    def __init__(self, texts: Sequence[str], min_token_len: int = 3, prefix_len: int = 4,
+                 max_block_size: int = 5000, max_cells: int = 4_000_000, dense_min_queries: int = 16):
+        self.texts = np.empty(len(texts), dtype=object)
+        self.texts[:] = list(texts)
+        self.min_token_len = min_token_len
+        self.prefix_len = prefix_len
+        self.max_block_size = max_block_size
+        self.max_cells = max_cells
+        self.dense_min_queries = dense_min_queries
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for ref_id, text in enumerate(self.texts):
+            for key in self._block_keys(text):
+                postings[key].append(ref_id)
+        self.postings = {k: np.asarray(v, dtype=np.int64) for k, v in postings.items()}
+
+    def _block_keys(self, text: str) -> set:
+        keys = set()
+        for token in text.split():
+            if len(token) < self.min_token_len:
+                continue
+            keys.add(token)
+            if len(token) > self.prefix_len:
+                keys.add("~" + token[:self.prefix_len])
+        return keys
+
+    def search(self, queries: Sequence[str], threshold: float = 85.0, top_k: int = 3,
+               blocks_per_query: int = 3, scorer=None, workers: int = -1) -> List[List[Tuple[int, float]]]:
+        """
+        Return, per query, up to top_k (ref_id, score) pairs with score >= threshold,
+        best first. Identical queries are scored once.
+        """
+        if not RAPIDFUZZ_AVAILABLE:
+            raise RuntimeError("rapidfuzz is required for fuzzy matching")
+        # Both sides list the same columns in the same order, so plain ratio fits
+        scorer = scorer or fuzz.ratio
+
+        codes, unique_queries = pd.factorize(pd.Series(list(queries), dtype=object).fillna(""))
+        unique_queries = np.asarray(unique_queries, dtype=object)
+        by_block: Dict[str, List[int]] = defaultdict(list)
+        for qi, text in enumerate(unique_queries):
+            sized = [(len(self.postings[k]), k) for k in self._block_keys(text) if k in self.postings]
+            sized = [sk for sk in sized if sk[0] <= self.max_block_size]
+            for _, key in sorted(sized)[:blocks_per_query]:
+                by_block[key].append(qi)
+
+        hits_q, hits_r, hits_s = [], [], []
+        pairs_q, pairs_r = [], []
+        for key, qids in by_block.items():
+            ref_ids = self.postings[key]
+            qids = np.asarray(qids, dtype=np.int64)
+            if len(qids) < self.dense_min_queries:
+                pairs_q.append(np.repeat(qids, len(ref_ids)))
+                pairs_r.append(np.tile(ref_ids, len(qids)))
+                continue
+            choices = self.texts[ref_ids].tolist()
+            step = max(1, self.max_cells // len(ref_ids))
+            for start in range(0, len(qids), step):
+                chunk = qids[start:start + step]
+                scores = process.cdist(unique_queries[chunk].tolist(), choices, scorer=scorer,
+                                       score_cutoff=threshold, workers=workers)
+                rows, cols = np.nonzero(scores)
+                hits_q.append(chunk[rows])
+                hits_r.append(ref_ids[cols])
+                hits_s.append(scores[rows, cols].astype(np.float64))
+
+        if pairs_q:
+            pq_, pr_ = np.concatenate(pairs_q), np.concatenate(pairs_r)
+            # A query can reach the same reference through several blocks
+            pair_ids = np.unique(pq_ * len(self.texts) + pr_)
+            pq_, pr_ = pair_ids // len(self.texts), pair_ids % len(self.texts)
+            for start in range(0, len(pq_), self.max_cells):
+                q, r = pq_[start:start + self.max_cells], pr_[start:start + self.max_cells]
+                scores = process.cpdist(unique_queries[q].tolist(), self.texts[r].tolist(), scorer=scorer,
+                                        score_cutoff=threshold, workers=workers)
+                keep = scores > 0
+                hits_q.append(q[keep])
+                hits_r.append(r[keep])
+                hits_s.append(scores[keep].astype(np.float64))
+
+        ranked: List[List[Tuple[int, float]]] = [[] for _ in range(len(unique_queries))]
+        if hits_q:
+            q, r, sc = np.concatenate(hits_q), np.concatenate(hits_r), np.concatenate(hits_s)
+            order = np.lexsort((r, -sc, q))  # per query: best score first, then lowest ref id
+            q, r, sc = q[order], r[order], sc[order]
+            first = np.ones(len(q), dtype=bool)
+            seen = set()
+            for i, pair in enumerate(zip(q.tolist(), r.tolist())):
+                if pair in seen:
+                    first[i] = False  # same pair reached via another dense block
+                else:
+                    seen.add(pair)
+            q, r, sc = q[first], r[first], sc[first]
+            for qi, ref_id, score in zip(q.tolist(), r.tolist(), sc.tolist()):
+                found = ranked[qi]
+                if len(found) < top_k:
+                    found.append((ref_id, score))
+        return [ranked[c] for c in codes]
+
 
 class PcidMapper:
     """
@@ -89,6 +224,9 @@ class PcidMapper:
         self.strategies = strategies
         self.lookup_maps: List[Dict[str, Dict[str, Any]]] = [{} for _ in strategies]
         self._matched_keys: List[set] = [set() for _ in strategies]
+        # Bulk matching: per-strategy key index (parallel to lookup_maps) and fuzzy index
+        self._key_indexes: List[Optional[Tuple[pd.Index, List[Dict[str, Any]]]]] = [None for _ in strategies]
+        self._fuzzy: Dict[int, Tuple[FuzzyIndex, List[Dict[str, Any]]]] = {}
 
     def _normalize_part(self, text: str) -> str:
         """
@@ -122,6 +260,8 @@ class PcidMapper:
             m.clear()
         for s in self._matched_keys:
             s.clear()
+        self._key_indexes = [None for _ in self.strategies]
+        self._fuzzy.clear()
 
         for row in reference_data:
             for i, strategy in enumerate(self.strategies):
@@ -186,14 +326,7 @@ class PcidMapper:
               - "missing": no match found
         """
         match = self.find_match(product_row)
-        if match is None:
-            return None, "missing"
-        pcid_val = str(match.get("pcid", "")).strip().upper()
-        if pcid_val == "OOS":
-            return match, "oos"
-        if pcid_val == "":
-            return match, "missing"
-        return match, "mapped"
+        return match, self._category(match)
 
     def get_unmatched_references(self) -> List[Dict[str, Any]]:
         """
@@ -222,3 +355,204 @@ class PcidMapper:
                         unmatched.append(ref)
 
         return unmatched
+
+    # ------------------------------------------------------------------
+    # Bulk matching
+    # ------------------------------------------------------------------
+
+    def _normalize_column(self, values: Iterable[Any], fuzzy: bool = False) -> np.ndarray:
+        """
+        _normalize_part (or _fuzzy_text with fuzzy=True) over a whole column.
+
+        Distinct values are found with pd.factorize and normalized once with
+        vectorized string ops; columns holding non-string values fall back to
+        the scalar function per distinct (type, value) so results are identical.
+        """
+        scalar = _fuzzy_text if fuzzy else self._normalize_part
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        if pd.api.types.infer_dtype(arr, skipna=True) not in ("string", "empty"):
+            cache: Dict[Tuple[type, Any], str] = {}
+            for i, v in enumerate(arr):
+                k = (v.__class__, v)
+                n = cache.get(k)
+                if n is None:
+                    n = cache[k] = scalar(v)
+                arr[i] = n
+            return arr
+
+        codes, uniques = pd.factorize(arr)
+        text = pd.Series(uniques, dtype=object).str.normalize("NFC")
+        if fuzzy:
+            text = text.str.upper().str.replace(r"[^A-Z0-9]+", " ", regex=True).str.strip()
+        else:
+            text = text.str.replace(r"[^A-Za-z0-9]", "", regex=True).str.upper()
+        out = np.append(text.to_numpy(dtype=object), "")[codes]  # code -1 (missing) -> ""
+        missing = np.flatnonzero(codes < 0)
+        if len(missing):
+            # None -> "", but NaN/NA go through str() exactly like the scalar path
+            out[missing] = [scalar(v) for v in arr[missing]]
+        return out
+
+    @staticmethod
+    def _column(products: Products, col: str, rows: Optional[np.ndarray] = None) -> List[Any]:
+        if isinstance(products, pd.DataFrame):
+            if col not in products.columns:
+                return [None] * (len(products) if rows is None else len(rows))
+            values = products[col] if rows is None else products[col].iloc[rows]
+            # Missing cells count as absent values, like a None in a row dict
+            return values.astype(object).where(values.notna(), None).tolist()
+        if rows is None:
+            return [p.get(col) for p in products]
+        return [products[i].get(col) for i in rows.tolist()]
+
+    def _product_keys(self, products: Products, strategy: Dict[str, str],
+                      rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Composite keys of the products (or the given row positions) for one strategy.
+        '' where all parts are empty."""
+        parts = [self._normalize_column(self._column(products, col, rows)) for col in strategy.keys()]
+        keys = parts[0]
+        if len(parts) > 1:
+            empty = np.logical_and.reduce([p == "" for p in parts])
+            # A bare "\x00" scalar (or np.full) would become a numpy string with the NUL stripped
+            sep = np.empty(len(keys), dtype=object)
+            sep.fill("\x00")
+            for part in parts[1:]:
+                keys = keys + sep + part
+            keys[empty] = ""
+        return keys
+
+    def _key_index(self, i: int) -> Tuple[pd.Index, List[Dict[str, Any]]]:
+        if self._key_indexes[i] is None:
+            lookup = self.lookup_maps[i]
+            self._key_indexes[i] = (pd.Index(list(lookup.keys()), dtype=object), list(lookup.values()))
+        return self._key_indexes[i]
+
+    def match_many(self, products: Products) -> List[Optional[Dict[str, Any]]]:
+        """
+        Bulk equivalent of calling find_match() on every product.
+
+        Composite keys are computed column-wise for all products, then each
+        strategy is one hash join (pandas Index lookup) for the rows the
+        earlier strategies left unmatched.
+
+        Args:
+            products: List of product dicts or a DataFrame with the scraper columns.
+
+        Returns:
+            List (same order as products) of the matching reference row or None.
+        """
+        n = len(products)
+        matches: List[Optional[Dict[str, Any]]] = [None] * n
+        pending = np.ones(n, dtype=bool)
+        for i, strategy in enumerate(self.strategies):
+            if not pending.any():
+                break
+            rows = np.flatnonzero(pending)
+            keys = self._product_keys(products, strategy, rows)
+            nonempty = keys != ""
+            rows, keys = rows[nonempty], keys[nonempty]
+            if not len(rows):
+                continue
+            index, refs = self._key_index(i)
+            positions = index.get_indexer(keys)
+            hit = positions >= 0
+            for row, pos in zip(rows[hit].tolist(), positions[hit].tolist()):
+                matches[row] = refs[pos]
+            pending[rows[hit]] = False
+            self._matched_keys[i].update(keys[hit].tolist())
+        return matches
+
+    @staticmethod
+    def _category(match: Optional[Dict[str, Any]]) -> str:
+        if match is None:
+            return "missing"
+        pcid_val = str(match.get("pcid", "")).strip().upper()
+        if pcid_val == "OOS":
+            return "oos"
+        if pcid_val == "":
+            return "missing"
+        return "mapped"
+
+    def categorize_many(self, products: Products) -> List[Tuple[Optional[Dict[str, Any]], str]]:
+        """Bulk equivalent of categorize_match() for every product."""
+        return [(m, self._category(m)) for m in self.match_many(products)]
+
+    def fuzzy_candidates(self, products: Products, strategy: int = -1, threshold: float = 85.0,
+                         top_k: int = 3, scorer=None, **search_kwargs) -> List[List[Tuple[str, float]]]:
+        """
+        Fuzzy fallback for rows with no exact match: candidate PCIDs with scores.
+
+        Product and reference values of one strategy's columns are joined into
+        a single string per row and searched with a blocked FuzzyIndex.
+        Candidates are suggestions for review; they never change the exact
+        match result. OOS references are not offered as candidates.
+
+        Args:
+            products: List of product dicts or a DataFrame.
+            strategy: Index of the strategy whose columns are compared (default: last).
+            threshold: Minimum rapidfuzz score (0-100).
+            top_k: Maximum candidates per product.
+
+        Returns:
+            Per product, a list of (pcid, score) pairs, best first.
+        """
+        if not RAPIDFUZZ_AVAILABLE:
+            logger.warning("rapidfuzz not installed. Fuzzy PCID fallback disabled.")
+            return [[] for _ in range(len(products))]
+        if not self.strategies:
+            return [[] for _ in range(len(products))]
+        strategy = strategy % len(self.strategies)
+        index, refs = self._fuzzy_index(strategy)
+
+        cols = list(self.strategies[strategy].keys())
+        texts = self._fuzzy_texts([self._column(products, c) for c in cols])
+        results = index.search(texts, threshold=threshold, top_k=top_k, scorer=scorer, **search_kwargs)
+        return [[(str(refs[ref_id].get("pcid", "")), score) for ref_id, score in found] for found in results]
+
+    def _fuzzy_texts(self, columns: List[List[Any]]) -> List[str]:
+        parts = [self._normalize_column(values, fuzzy=True) for values in columns]
+        text = parts[0]
+        for part in parts[1:]:
+            text = text + " " + part
+        # Empty parts leave double/edge spaces behind
+        return pd.Series(text, dtype=object).str.replace(r" {2,}", " ", regex=True).str.strip().tolist()
+
+    def _fuzzy_index(self, strategy: int) -> Tuple[FuzzyIndex, List[Dict[str, Any]]]:
+        if strategy not in self._fuzzy:
+            refs = [r for r in self.lookup_maps[strategy].values()
+                    if str(r.get("pcid", "")).strip().upper() not in ("", "OOS")]
+            ref_cols = list(self.strategies[strategy].values())
+            texts = self._fuzzy_texts([[r.get(c) for r in refs] for c in ref_cols])
+            self._fuzzy[strategy] = (FuzzyIndex(texts), refs)
+        return self._fuzzy[strategy]
+
+    def match_frame(self, products: pd.DataFrame, fuzzy: bool = False, fuzzy_strategy: int = -1,
+                    threshold: float = 85.0, top_k: int = 3) -> pd.DataFrame:
+        """
+        Match a whole DataFrame and return one result row per product.
+
+        Columns: pcid ('' if none), category (mapped/oos/missing) and, with
+        fuzzy=True, fuzzy_candidates [(pcid, score), ...], fuzzy_pcid and
+        fuzzy_score for the best candidate of each "missing" row. That
+        includes exact matches to a reference with an empty PCID, which
+        categorize_match() also reports as missing.
+        """
+        matches = self.match_many(products)
+        categories = [self._category(m) for m in matches]
+        out = pd.DataFrame({
+            "pcid": [str(m.get("pcid", "")).strip() if m is not None else "" for m in matches],
+            "category": categories,
+        }, index=products.index)
+        if fuzzy:
+            leftover = np.flatnonzero([c == "missing" for c in categories])
+            candidates: List[List[Tuple[str, float]]] = [[] for _ in range(len(products))]
+            if len(leftover):
+                found = self.fuzzy_candidates(products.iloc[leftover], strategy=fuzzy_strategy,
+                                              threshold=threshold, top_k=top_k)
+                for row, cands in zip(leftover.tolist(), found):
+                    candidates[row] = cands
+            out["fuzzy_candidates"] = candidates
+            out["fuzzy_pcid"] = [c[0][0] if c else "" for c in candidates]
+            out["fuzzy_score"] = [c[0][1] if c else np.nan for c in candidates]
+        return out
@@ -3,16 +3,25 @@ Distributed URL Worker
 
 Processes URLs from shared work queue across multiple nodes.
 Each node runs its own Tor/browser but shares the same run_id.
+
+run() drives a single browser one URL at a time. run_pipelined() runs N
+browser or HTTP slots per process: a prefetcher keeps claimed URLs queued
+ahead of the slots, and a maintenance thread batches completions, renews
+leases and reaps expired ones on a timer instead of on every claim.
 """
 
 import os
+import queue
+import signal
 import sys
+import threading
 import time
 import logging
 import socket
 import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 # Add repo root to path
@@ -25,6 +34,7 @@ from core.browser.chrome_manager import kill_orphaned_chrome_processes
 # CORRECTED IMPORTS
 from core.network.proxy_checker import check_tor_running
 from core.browser.driver_factory import create_firefox_driver, create_chrome_driver
+from core.utils.worker_heartbeat import emit_heartbeat, heartbeat_interval
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +42,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SLOT_MODES = ("browser", "http")
+
+
+@dataclass
+class SlotStats:
+    """Throughput and busy time of one pipelined worker slot."""
+
+    slot: int
+    items: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+    stopped: Optional[float] = None
+    error: Optional[str] = None
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        end = self.stopped if self.stopped is not None else (now or time.monotonic())
+        wall = max(0.0, end - self.started)
+        return {
+            "slot": self.slot,
+            "items": self.items,
+            "failures": self.failures,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "wall_seconds": round(wall, 2),
+            "utilization": round(min(1.0, self.busy_seconds / wall), 3) if wall > 0 else 0.0,
+            "error": self.error,
+        }
+
 
 class DistributedURLWorker:
     """Worker that processes URLs from distributed queue"""
@@ -49,11 +87,35 @@ class DistributedURLWorker:
         self.run_id = run_id
         self.worker_id = f"{socket.gethostname()}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
         self.queue = URLWorkQueue(db_config)
+        # Browser/HTTP handles are per thread so pipelined slots each get their own
+        self._slot_local = threading.local()
         self.driver = None
+        self.session = None
         self.running = True
+        self.slot_stats: List[SlotStats] = []
+        self._last_heartbeat = 0.0
+        self._heartbeat_window = (time.monotonic(), 0.0)
         
         logger.info(f"Initialized worker {self.worker_id} for {scraper_name} run {run_id}")
     
+    @property
+    def driver(self):
+        """Browser driver of the calling thread (one per slot in pipelined mode)."""
+        return getattr(self._slot_local, "driver", None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._slot_local.driver = value
+    
+    @property
+    def session(self):
+        """HTTP client of the calling thread (pipelined ``http`` mode)."""
+        return getattr(self._slot_local, "session", None)
+    
+    @session.setter
+    def session(self, value):
+        self._slot_local.session = value
+    
     def setup_browser(self, use_tor: bool = True):
         """Setup browser session with optional Tor"""
         try:
@@ -107,6 +169,10 @@ class DistributedURLWorker:
                 # TODO: Scraper-specific extraction logic here
                 # This is just a template
                 
+                return True
+            elif self.session is not None:
+                response = self.session.get(url)
+                response.raise_for_status()
                 return True
             else:
                 logger.error("No driver available")
@@ -129,6 +195,8 @@ class DistributedURLWorker:
             self.setup_browser(use_tor=True)
             
             logger.info(f"Worker {self.worker_id} starting main loop")
+            slot = SlotStats(0)
+            self.slot_stats = [slot]
             
             while self.running:
                 # Release any expired leases first
@@ -153,6 +221,7 @@ class DistributedURLWorker:
                     else:
                         logger.info(f"No URLs available, waiting {poll_interval}s... "
                                   f"(Remaining: {stats['remaining']})")
+                        self._heartbeat(slots=1, queued=0)
                         time.sleep(poll_interval)
                         continue
                 
@@ -161,8 +230,12 @@ class DistributedURLWorker:
                     url = item['url']
                     work_id = item['id']
                     
+                    began = time.monotonic()
+                    slot.items += 1
                     try:
                         success = self.process_url(url, work_id)
+                        slot.busy_seconds += time.monotonic() - began
+                        began = None
                         
                         if success:
                             self.queue.complete_url(work_id, success=True)
@@ -173,9 +246,13 @@ class DistributedURLWorker:
                                 success=False,
                                 error_message="Processing returned False"
                             )
+                            slot.failures += 1
                             logger.warning(f"✗ Failed: {url}")
                     
                     except Exception as e:
+                        if began is not None:
+                            slot.busy_seconds += time.monotonic() - began
+                        slot.failures += 1
                         logger.error(f"Exception processing {url}: {e}")
                         self.queue.complete_url(
                             work_id,
@@ -183,6 +260,8 @@ class DistributedURLWorker:
                             error_message=str(e)
                         )
                 
+                self._heartbeat(slots=1, queued=0)
+                
                 # Brief pause between batches
                 time.sleep(1)
         
@@ -193,6 +272,349 @@ class DistributedURLWorker:
         finally:
             self.cleanup()
     
+    def open_slot(self, mode: str = "browser", use_tor: bool = True):
+        """
+        Create the calling slot thread's browser or HTTP client.
+        
+        Override in subclasses that need a different per-slot resource.
+        
+        Args:
+            mode: "browser" for a WebDriver, "http" for an httpx.Client
+            use_tor: Route the slot through Tor when it is running
+        """
+        if mode == "http":
+            import httpx
+            proxy = None
+            if use_tor:
+                tor_running, tor_port = check_tor_running()
+                if tor_running:
+                    proxy = f"socks5://127.0.0.1:{tor_port}"
+                else:
+                    logger.warning("Tor not running, attempting to use direct connection")
+            self.session = httpx.Client(proxy=proxy, timeout=30, follow_redirects=True)
+        else:
+            self.setup_browser(use_tor=use_tor)
+    
+    def close_slot(self):
+        """Release the calling slot thread's browser or HTTP client."""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Worker {self.worker_id} driver quit failed: {e}")
+            self.driver = None
+        if self.session is not None:
+            try:
+                self.session.close()
+            except Exception as e:
+                logger.warning(f"Worker {self.worker_id} session close failed: {e}")
+            self.session = None
+    
+    def run_pipelined(self, slots: int = 4, batch_size: int = 10, lease_seconds: int = 300,
+                      poll_interval: int = 5, mode: str = "browser", use_tor: bool = True,
+                      prefetch: int = 2, flush_size: int = 50, flush_interval: float = 2.0,
+                      reap_interval: float = 60.0, report_interval: float = 60.0) -> Dict[str, Any]:
+        """
+        Worker loop with concurrent slots, prefetched claims and batched completions.
+        
+        Args:
+            slots: Number of concurrent browser/HTTP slots in this process
+            batch_size: Minimum number of URLs to claim per round trip
+            lease_seconds: Lease duration for claimed URLs (renewed every third of it)
+            poll_interval: Seconds to wait when nothing is claimable
+            mode: "browser" or "http" slot resources
+            use_tor: Route slots through Tor when it is running
+            prefetch: Claimed URLs kept queued per slot
+            flush_size: Buffered results that trigger an early completion flush
+            flush_interval: Seconds between completion flushes
+            reap_interval: Seconds between expired-lease sweeps
+            report_interval: Seconds between slot utilization log lines
+            
+        Returns:
+            Summary with per-slot items, failures and utilization
+        """
+        if mode not in SLOT_MODES:
+            raise ValueError(f"mode must be one of {SLOT_MODES}, got {mode!r}")
+        slots = max(1, int(slots))
+        
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._work = queue.Queue()
+        self._held: Dict[int, str] = {}
+        self._results: List[tuple] = []
+        self._stop = threading.Event()
+        self._maintenance_stop = threading.Event()
+        self.slot_stats = [SlotStats(i) for i in range(slots)]
+        started = time.monotonic()
+        
+        slot_threads = [
+            threading.Thread(target=self._slot_loop, args=(stats, mode, use_tor),
+                             name=f"url-slot-{stats.slot}", daemon=True)
+            for stats in self.slot_stats
+        ]
+        prefetcher = threading.Thread(
+            target=self._prefetch_loop,
+            args=(slots, max(batch_size, slots * prefetch), lease_seconds, poll_interval),
+            name="url-prefetch", daemon=True)
+        maintenance = threading.Thread(
+            target=self._maintenance_loop,
+            args=(lease_seconds, flush_size, flush_interval, reap_interval, report_interval),
+            name="url-maintenance", daemon=True)
+        
+        logger.info(f"Worker {self.worker_id} starting {slots} {mode} slots")
+        try:
+            self.queue.release_expired_leases(lease_seconds)
+        except Exception as e:
+            logger.warning(f"Expired lease sweep failed: {e}")
+        
+        for thread in slot_threads + [prefetcher, maintenance]:
+            thread.start()
+        
+        try:
+            while any(thread.is_alive() for thread in slot_threads):
+                for thread in slot_threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            logger.info("Worker interrupted by user")
+            self._stop.set()
+            for thread in slot_threads:
+                thread.join()
+        finally:
+            self._stop.set()
+            prefetcher.join()
+            self._maintenance_stop.set()
+            maintenance.join()
+            self._flush_results()
+            self._release_unprocessed()
+            self._log_utilization()
+            try:
+                stats = self.queue.get_queue_stats(self.run_id, self.scraper_name)
+                logger.info(f"Final stats for {self.scraper_name} run {self.run_id}: {stats}")
+            except Exception:
+                pass
+        
+        wall = time.monotonic() - started
+        rows = self.slot_utilization()
+        processed = sum(row["items"] for row in rows)
+        return {
+            "worker_id": self.worker_id,
+            "mode": mode,
+            "processed": processed,
+            "failed": sum(row["failures"] for row in rows),
+            "wall_seconds": round(wall, 2),
+            "urls_per_minute": round(processed * 60 / wall, 1) if wall > 0 else 0.0,
+            "mean_utilization": round(sum(row["utilization"] for row in rows) / len(rows), 3),
+            "slots": rows,
+        }
+    
+    def _stopping(self) -> bool:
+        return self._stop.is_set() or not self.running
+    
+    def _prefetch_loop(self, slots: int, target: int, lease_seconds: int, poll_interval: int):
+        """Keep ``target`` claimed URLs queued; top up once fewer than ``slots`` remain."""
+        try:
+            while not self._stopping():
+                backlog = self._work.qsize()
+                if backlog >= slots:
+                    self._stop.wait(0.05)
+                    continue
+                
+                try:
+                    batch = self.queue.claim_batch(
+                        worker_id=self.worker_id,
+                        scraper_name=self.scraper_name,
+                        run_id=self.run_id,
+                        batch_size=target - backlog,
+                        lease_seconds=lease_seconds
+                    )
+                except Exception as e:
+                    logger.error(f"Claim failed: {e}")
+                    self._stop.wait(poll_interval)
+                    continue
+                
+                if batch:
+                    with self._lock:
+                        for item in batch:
+                            self._held[item['id']] = item['url']
+                    for item in batch:
+                        self._work.put(item)
+                    continue
+                
+                # Nothing claimable: make our own finished items visible before asking
+                self._flush_results()
+                stats = self.queue.get_queue_stats(self.run_id, self.scraper_name)
+                if stats['remaining'] == 0:
+                    logger.info(f"Queue empty for {self.scraper_name} run {self.run_id}, shutting down")
+                    break
+                with self._lock:
+                    ours = len(self._held)
+                if stats['remaining'] <= ours:
+                    # Only our in-flight URLs are left; a failure may requeue one
+                    self._stop.wait(min(poll_interval, 1))
+                else:
+                    logger.info(f"No URLs available, waiting {poll_interval}s... "
+                                f"(Remaining: {stats['remaining']})")
+                    self._stop.wait(poll_interval)
+        except Exception as e:
+            logger.error(f"Prefetcher error: {e}", exc_info=True)
+        finally:
+            for _ in range(slots):
+                self._work.put(None)
+    
+    def _slot_loop(self, stats: SlotStats, mode: str, use_tor: bool):
+        """Open a slot resource and process queued URLs until the queue is drained."""
+        try:
+            self.open_slot(mode, use_tor)
+        except Exception as e:
+            stats.error = str(e)
+            stats.stopped = time.monotonic()
+            logger.error(f"Slot {stats.slot} failed to start: {e}")
+            return
+        
+        stats.started = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._work.get(timeout=0.5)
+                except queue.Empty:
+                    if self._stopping():
+                        break
+                    continue
+                if item is None:
+                    break
+                if self._stopping():
+                    self._work.put(item)
+                    break
+                
+                url = item['url']
+                began = time.monotonic()
+                try:
+                    success = self.process_url(url, item['id'])
+                    error = None if success else "Processing returned False"
+                except Exception as e:
+                    logger.error(f"Exception processing {url}: {e}")
+                    success, error = False, str(e)
+                stats.busy_seconds += time.monotonic() - began
+                stats.items += 1
+                
+                if success:
+                    logger.info(f"✓ Completed: {url}")
+                else:
+                    stats.failures += 1
+                    logger.warning(f"✗ Failed: {url}")
+                
+                with self._lock:
+                    self._held.pop(item['id'], None)
+                    self._results.append((item['id'], bool(success), error))
+        finally:
+            stats.stopped = time.monotonic()
+            self.close_slot()
+    
+    def _maintenance_loop(self, lease_seconds: int, flush_size: int, flush_interval: float,
+                          reap_interval: float, report_interval: float):
+        """Flush completions, renew held leases, reap expired ones and report utilization."""
+        renew_every = max(1.0, lease_seconds / 3)
+        tick = max(0.05, min(flush_interval, 1.0))
+        last_flush = last_renew = last_reap = last_report = time.monotonic()
+        
+        while not self._maintenance_stop.wait(tick):
+            now = time.monotonic()
+            with self._lock:
+                pending = len(self._results)
+            if pending >= flush_size or (pending and now - last_flush >= flush_interval):
+                self._flush_results()
+                last_flush = now
+            
+            if now - last_renew >= renew_every:
+                with self._lock:
+                    ids = list(self._held) + [work_id for work_id, _, _ in self._results]
+                try:
+                    self.queue.renew_leases(self.worker_id, ids)
+                except Exception as e:
+                    logger.warning(f"Lease renewal failed: {e}")
+                last_renew = now
+            
+            if now - last_reap >= reap_interval:
+                try:
+                    self.queue.release_expired_leases(lease_seconds)
+                except Exception as e:
+                    logger.warning(f"Expired lease sweep failed: {e}")
+                last_reap = now
+            
+            if now - last_report >= report_interval:
+                self._log_utilization()
+                last_report = now
+            
+            self._heartbeat(slots=len(self.slot_stats), queued=self._work.qsize())
+    
+    def _flush_results(self) -> int:
+        """Write buffered results with one complete_urls call; requeue them on error."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._results = self._results, []
+            if not batch:
+                return 0
+            try:
+                self.queue.complete_urls(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} completions: {e}")
+                with self._lock:
+                    self._results[:0] = batch
+                return 0
+            return len(batch)
+    
+    def _release_unprocessed(self):
+        """Hand back URLs that were claimed but never reached a slot."""
+        while True:
+            try:
+                self._work.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            ids = list(self._held)
+            self._held.clear()
+        if ids:
+            try:
+                self.queue.release_claims(self.worker_id, ids)
+            except Exception as e:
+                logger.warning(f"Failed to release {len(ids)} claims (lease expiry will reclaim them): {e}")
+    
+    def _heartbeat(self, **fields):
+        """Print a supervisor heartbeat (WORKER_HEARTBEAT set) with busy share since the last one."""
+        interval = heartbeat_interval()
+        now = time.monotonic()
+        if not interval or now - self._last_heartbeat < interval:
+            return
+        self._last_heartbeat = now
+        
+        rows = self.slot_utilization()
+        busy = sum(row["busy_seconds"] for row in rows)
+        since, busy_before = self._heartbeat_window
+        self._heartbeat_window = (now, busy)
+        capacity = (now - since) * max(1, len(rows))
+        utilization = round(min(1.0, (busy - busy_before) / capacity), 3) if rows and capacity > 0 else None
+        emit_heartbeat(
+            worker=self.worker_id,
+            processed=sum(row["items"] for row in rows),
+            failed=sum(row["failures"] for row in rows),
+            utilization=utilization,
+            **fields
+        )
+    
+    def slot_utilization(self) -> List[Dict[str, Any]]:
+        """Per-slot items, failures, busy seconds and busy fraction so far."""
+        now = time.monotonic()
+        return [stats.as_dict(now) for stats in self.slot_stats]
+    
+    def _log_utilization(self):
+        rows = self.slot_utilization()
+        if not rows:
+            return
+        mean = sum(row["utilization"] for row in rows) / len(rows)
+        slots = ", ".join(f"#{row['slot']} {row['items']} ({row['utilization']:.0%})" for row in rows)
+        logger.info(f"Worker {self.worker_id} slots: {slots} | mean utilization {mean:.0%}, "
+                    f"queued {self._work.qsize()}")
+    
     def cleanup(self):
         """Cleanup resources"""
         logger.info(f"Worker {self.worker_id} cleaning up")
@@ -243,6 +665,15 @@ def main():
     parser.add_argument("--run-id", required=True, help="Run ID")
     parser.add_argument("--batch-size", type=int,
                        default=_env_int("WORKER_BATCH_SIZE", 10), help="Batch size (env: WORKER_BATCH_SIZE)")
+    parser.add_argument("--lease-seconds", type=int,
+                       default=_env_int("WORKER_LEASE_SECONDS", 300), help="Lease duration (env: WORKER_LEASE_SECONDS)")
+    parser.add_argument("--slots", type=int,
+                       default=_env_int("WORKER_SLOTS", 1),
+                       help="Concurrent browser/HTTP slots; >1 runs the pipelined loop (env: WORKER_SLOTS)")
+    parser.add_argument("--mode", choices=SLOT_MODES, default=_env("WORKER_SLOT_MODE", "browser"),
+                        help="Slot resource for the pipelined loop (env: WORKER_SLOT_MODE)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Use the pipelined loop even with a single slot")
     parser.add_argument("--db-host", default=_env("POSTGRES_HOST") or _env("DB_HOST", "localhost"),
                         help="Database host (env: POSTGRES_HOST or DB_HOST)")
     parser.add_argument("--db-port", type=int,
@@ -271,7 +702,25 @@ def main():
         db_config=db_config
     )
     
-    worker.run(batch_size=args.batch_size)
+    # The cluster supervisor scales down with SIGTERM: finish in-flight URLs and hand back the rest
+    def _graceful_stop(signum, frame):
+        logger.info(f"Worker {worker.worker_id} received signal {signum}, stopping after current URLs")
+        worker.running = False
+    
+    for sig_name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, sig_name):
+            signal.signal(getattr(signal, sig_name), _graceful_stop)
+    
+    if args.slots > 1 or args.pipelined:
+        summary = worker.run_pipelined(
+            slots=args.slots,
+            batch_size=args.batch_size,
+            lease_seconds=args.lease_seconds,
+            mode=args.mode,
+        )
+        logger.info(f"Worker summary: {summary}")
+    else:
+        worker.run(batch_size=args.batch_size, lease_seconds=args.lease_seconds)
 
 
 if __name__ == "__main__":
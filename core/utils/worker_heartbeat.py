@@ -0,0 +1,62 @@
+"""
+Worker heartbeat lines for the cluster supervisor.
+
+A supervised worker prints one JSON heartbeat line to stdout every
+WORKER_HEARTBEAT seconds. The supervisor already reads each worker's output
+(locally through a pipe, remotely through the SSH channel), so heartbeats
+need no extra connection or table; they are picked out of the log stream
+by their prefix.
+
+    @@heartbeat {"worker_id": "3", "utilization": 0.82, "load1": 3.1, "cpus": 4, ...}
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+HEARTBEAT_PREFIX = "@@heartbeat "
+HEARTBEAT_ENV = "WORKER_HEARTBEAT"
+
+
+def heartbeat_interval() -> float:
+    """Seconds between heartbeats requested by the supervisor; 0 when unsupervised."""
+    try:
+        return max(0.0, float(os.getenv(HEARTBEAT_ENV, "0") or 0))
+    except ValueError:
+        return 0.0
+
+
+def node_load() -> Dict[str, Any]:
+    """1-minute load average and CPU count of this host (load1 is None on Windows)."""
+    try:
+        load1 = round(os.getloadavg()[0], 2)
+    except (AttributeError, OSError):
+        load1 = None
+    return {"load1": load1, "cpus": os.cpu_count() or 1}
+
+
+def format_heartbeat(payload: Dict[str, Any]) -> str:
+    return HEARTBEAT_PREFIX + json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def parse_heartbeat(line: str) -> Optional[Dict[str, Any]]:
+    """Return the payload of a heartbeat line, or None for ordinary output."""
+    pos = line.find(HEARTBEAT_PREFIX)
+    if pos < 0:
+        return None
+    try:
+        payload = json.loads(line[pos + len(HEARTBEAT_PREFIX):])
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def emit_heartbeat(**fields) -> None:
+    """Print a heartbeat with this host's load merged into ``fields``."""
+    payload = {"worker_id": os.getenv("WORKER_ID"), "ts": round(time.time(), 3)}
+    payload.update(node_load())
+    payload.update(fields)
+    sys.stdout.write(format_heartbeat(payload) + "\n")
+    sys.stdout.flush()
@@ -9583,9 +9583,10 @@ Provide a clear, concise explanation suitable for users who want to understand w
             return
         
         active_count = 0
+        rss_bytes = 0
         try:
             from core.browser.chrome_pid_tracker import load_chrome_pids
-            import psutil
+            from core.browser.process_registry import get_process_registry
             
             # Load tracked PIDs for this scraper
             pids = load_chrome_pids(scraper_name, self.repo_root)
@@ -9598,15 +9599,15 @@ Provide a clear, concise explanation suitable for users who want to understand w
                     except Exception:
                         pass
             
-            # Count active PIDs (processes that still exist)
+            # Count live processes from the registry: it follows the tracked
+            # PIDs' descendants incrementally instead of scanning all processes
             if pids:
-                for pid in pids:
-                    try:
-                        proc = psutil.Process(pid)
-                        if proc.is_running():
-                            active_count += 1
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                        pass
+                registry = get_process_registry()
+                registry.register(scraper_name, pids)
+                stats = registry.stats(scraper_name).get(scraper_name, {})
+                # Browser instances only; renderers, GPU and chromedriver count towards RSS
+                active_count = registry.instance_count(scraper_name)
+                rss_bytes = stats.get("rss_bytes", 0)
             
             # Also check ChromeManager as fallback (for in-process drivers)
             try:
@@ -9620,7 +9621,10 @@ Provide a clear, concise explanation suitable for users who want to understand w
             
             # Update label
             if hasattr(self, 'chrome_count_label'):
-                self.chrome_count_label.config(text=f"Chrome Instances: {active_count}")
+                text = f"Chrome Instances: {active_count}"
+                if rss_bytes:
+                    text += f" ({rss_bytes / (1024 * 1024):.0f} MB)"
+                self.chrome_count_label.config(text=text)
         except ImportError:
             # psutil not available, try alternative method
             try:
@@ -9695,36 +9699,16 @@ Provide a clear, concise explanation suitable for users who want to understand w
 
     def _infer_chrome_pids_from_lock(self, scraper_name: str):
         """Infer Chrome/ChromeDriver PIDs from the scraper lock process tree."""
-        try:
-            import psutil
-        except Exception:
-            return set()
-
         lock_active, pid, _log_path, _lock_file = self._get_lock_status(scraper_name)
         if not lock_active or not pid:
             return set()
 
-        inferred = set()
         try:
-            parent = psutil.Process(pid)
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            return set()
-
-        try:
-            children = parent.children(recursive=True)
+            from core.browser.process_registry import get_process_registry
+            # Playwright/Selenium browsers may show up as chrome/chromium/msedge/brave, etc.
+            return get_process_registry().browser_tree(pid)
         except Exception:
-            children = []
-
-        for proc in children:
-            try:
-                name = (proc.name() or "").lower()
-                # Playwright/Selenium browsers may show up as chrome/chromium/msedge/brave, etc.
-                if any(token in name for token in ("chrome", "chromium", "msedge", "brave", "opera")):
-                    inferred.add(proc.pid)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-
-        return inferred
+            return set()
     
     def manage_checkpoint(self):
         """Open dialog to manage checkpoint steps (roll back or add steps)"""
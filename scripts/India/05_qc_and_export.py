@@ -6,15 +6,19 @@ Reads from PostgreSQL (populated by Scrapy spider),
 runs QC checks, and exports the final CSV deliverable.
 
 This replaces the CSV merge/consolidation step.
+
+Tables are streamed in chunks (server-side cursors / COPY TO) through the
+columnar engine in columnar_export.py, so memory stays bounded regardless of
+row count. Per-phase timings go to the step log and qc_report.json.
 """
 
 import csv
 import json
 import logging
-import re
 import sys
 import argparse
 from pathlib import Path
+from typing import Optional
 
 _repo_root = Path(__file__).resolve().parents[2]
 if str(_repo_root) not in sys.path:
@@ -24,23 +28,57 @@ _script_dir = Path(__file__).parent
 if str(_script_dir) not in sys.path:
     sys.path.insert(0, str(_script_dir))
 
-from config_loader import load_env_file, get_output_dir
+from config_loader import load_env_file, get_output_dir, getenv_bool, getenv_int
+from columnar_export import (
+    DEFAULT_CHUNK_ROWS,
+    EXPORT_COLUMNS,
+    ChunkQC,
+    PartWriter,
+    PhaseTimer,
+    copy_query_csv,
+    merge_distinct,
+    stream_frames,
+    stream_values,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("india_qc_export")
 
 
-def run_qc_checks(db, run_id: str, previous_count: int = 0, max_drop_pct: float = 30.0) -> dict:
-    """Run quality checks on the data."""
+def run_qc_checks(db, run_id: str, previous_count: int = 0, max_drop_pct: float = 30.0,
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Run quality checks on the data in one streamed pass over in_sku_main.
+
+    Rows arrive sorted by hidden_id so duplicates are neighbours; null rates,
+    duplicates and price outliers are accumulated per chunk (see ChunkQC).
+    """
     results = {
         "passed": True,
         "checks": [],
         "run_id": run_id,
     }
 
+    qc = ChunkQC(
+        required=["hidden_id", "sku_name", "formulation"],
+        key="hidden_id",
+        mrp_per_unit="mrp_per_unit",
+        ceiling="ceiling_price",
+        max_null_pct=50.0,
+    )
+    for chunk in stream_frames(
+        db,
+        "SELECT hidden_id, sku_name, formulation, mrp_per_unit, ceiling_price "
+        "FROM in_sku_main WHERE run_id = %s ORDER BY hidden_id COLLATE \"C\"",
+        (run_id,),
+        QC_COLUMNS,
+        chunk_rows=chunk_rows,
+        name="in_qc_sku_main",
+    ):
+        qc.update(chunk)
+
     # Check 1: Row count
-    cur = db.execute("SELECT COUNT(*) FROM in_sku_main WHERE run_id = %s", (run_id,))
-    row_count = cur.fetchone()[0]
+    row_count = qc.rows
     results["row_count"] = row_count
 
     if row_count == 0:
@@ -58,28 +96,10 @@ def run_qc_checks(db, run_id: str, previous_count: int = 0, max_drop_pct: float
         })
 
     # Check 2: Required columns have data
-    required_cols = ["hidden_id", "sku_name", "formulation"]
-    for col in required_cols:
-        cur = db.execute(
-            f"SELECT COUNT(*) FROM in_sku_main WHERE run_id = %s AND ({col} IS NULL OR {col} = '')",
-            (run_id,)
-        )
-        null_count = cur.fetchone()[0]
-        null_pct = (null_count / row_count * 100) if row_count > 0 else 0
-
-        if null_pct > 50:
+    for check in qc.null_checks():
+        if not check["passed"]:
             results["passed"] = False
-            results["checks"].append({
-                "name": f"null_check_{col}",
-                "passed": False,
-                "message": f"Column {col} has {null_pct:.1f}% null/empty values",
-            })
-        else:
-            results["checks"].append({
-                "name": f"null_check_{col}",
-                "passed": True,
-                "message": f"Column {col} has {null_pct:.1f}% null/empty values (OK)",
-            })
+        results["checks"].append(check)
 
     # Check 3: Row count drop (if previous count available)
     if previous_count > 0:
@@ -98,32 +118,18 @@ def run_qc_checks(db, run_id: str, previous_count: int = 0, max_drop_pct: float
                 "message": f"Row count change: {previous_count} -> {row_count} ({drop_pct:.1f}% drop, OK)",
             })
 
-    # Check 4: Duplicate check
-    cur = db.execute(
-        "SELECT COUNT(*) - COUNT(DISTINCT hidden_id) FROM in_sku_main WHERE run_id = %s",
-        (run_id,)
-    )
-    dup_count = cur.fetchone()[0]
-    if dup_count > 0:
-        results["checks"].append({
-            "name": "duplicates",
-            "passed": True,  # Warning only
-            "message": f"Found {dup_count} duplicate hidden_id values (warning)",
-        })
-    else:
-        results["checks"].append({
-            "name": "duplicates",
-            "passed": True,
-            "message": "No duplicate hidden_id values found",
-        })
+    # Check 4: Duplicate check (warning only)
+    results["checks"].append(qc.duplicate_check())
+
+    # Check 5: Price outliers (warning only)
+    results["checks"].append(qc.price_check())
+    results["qc_stats"] = qc.as_dict()
 
     return results
 
 
 def export_table_csv(db, table: str, run_id: str, output_path: Path):
-    """Export a table to CSV file."""
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
+    """Export a table to CSV file (streamed with COPY, never held in memory)."""
     # Get column names
     cur = db.execute(
         "SELECT column_name FROM information_schema.columns "
@@ -134,201 +140,119 @@ def export_table_csv(db, table: str, run_id: str, output_path: Path):
 
     # Export data
     if 'run_id' in columns:
-        cur = db.execute(f"SELECT * FROM \"{table}\" WHERE run_id = %s", (run_id,))
-    else:
-        cur = db.execute(f"SELECT * FROM \"{table}\"")
-
-    rows = cur.fetchall()
-
-    with output_path.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(columns)
-        writer.writerows(rows)
-
-    return len(rows)
+        return copy_query_csv(db, f"SELECT * FROM \"{table}\" WHERE run_id = %s", (run_id,), output_path)
+    return copy_query_csv(db, f"SELECT * FROM \"{table}\"", None, output_path)
 
 
-# Target export format: BrandType, BrandName, Company, Composition, PackSize, Unit, Status, CeilingPrice, MRP, MRPPerUnit, YearMonth
-EXPORT_COLUMNS = [
-    "BrandType", "BrandName", "Company", "Composition", "PackSize", "Unit",
-    "Status", "CeilingPrice", "MRP", "MRPPerUnit", "YearMonth",
-]
-
 # Max rows per part file (8 lakh = 800,000)
 MAX_ROWS_PER_PART = 800_000
 
+QC_COLUMNS = ["hidden_id", "sku_name", "formulation", "mrp_per_unit", "ceiling_price"]
 
-def _parse_pack_size(pack_size_str: str) -> int:
-    """Extract numeric pack size from strings like '30 TABLET' or '5 ML'."""
-    if not pack_size_str or not pack_size_str.strip():
-        return 0
-    m = re.match(r"^(\d+)", pack_size_str.strip())
-    return int(m.group(1)) if m else 0
-
-
-def _format_year_month(year_month: str) -> str:
-    """Convert 'Dec-2025' to 'Dec-25' (Mon-YY)."""
-    if not year_month or not year_month.strip():
-        return ""
-    s = year_month.strip()
-    if len(s) >= 8 and s[-4] == "-":
-        return s[:-2]  # Dec-2025 -> Dec-25
-    return s
-
+MAIN_COLUMNS = [
+    "formulation", "sku_name", "company", "composition", "pack_size", "dosage_form",
+    "schedule_status", "ceiling_price", "mrp", "mrp_per_unit", "year_month",
+]
 
-def _ceiling_price_display(val) -> str:
-    """Display ceiling price: -1 or empty -> 0."""
-    if val is None or val == "" or str(val).strip() in ("-1", ""):
-        return "0"
-    return str(val).strip()
+ALT_COLUMNS = [
+    "brand_name", "company", "pack_size", "brand_mrp", "mrp_per_unit", "year_month",
+    "composition", "dosage_form", "schedule_status", "ceiling_price",
+]
 
 
-def export_combined_csv(db, run_id: str, output_dir: Path) -> tuple[int, int, int, list[tuple[Path, int]]]:
+def export_combined_csv(db, run_id: str, output_dir: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                        parquet: bool = False, timer: Optional[PhaseTimer] = None) -> tuple:
     """Export combined details CSV in target format (BrandType, BrandName, ...), split into parts of max 8 lakh rows each.
     Includes in_sku_main (MAIN) + in_brand_alternatives (OTHER) so export row count matches full data.
-    Uses streaming to handle large datasets without memory issues.
-    Returns (total_rows, main_count, other_count, list of (path, row_count) per part).
+    Rows stream from server-side cursors chunk by chunk, are mapped to the target columns with
+    vectorized operations and appended to the open part, so memory is bounded by one chunk.
+    Returns (total_rows, main_count, other_count, list of (path, row_count) per part, export QC stats).
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    batch_size = 50000  # Process in batches to avoid memory issues
-    part_num = 0
-    current_part_rows = []
-    written_paths = []
+    timer = timer or PhaseTimer()
+    export_qc = ChunkQC(required=["BrandName", "Company"], mrp_per_unit="MRPPerUnit", ceiling="CeilingPrice")
     main_count = 0
     other_count = 0
-    total_rows = 0
-
-    def flush_part():
-        """Write current batch to a part file."""
-        nonlocal part_num, current_part_rows
-        if not current_part_rows:
-            return
-        part_num += 1
-        part_name = f"details_combined_{part_num:03d}.csv"
-        part_path = output_dir / part_name
-        with part_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(EXPORT_COLUMNS)
-            writer.writerows(current_part_rows)
-        written_paths.append((part_path, len(current_part_rows)))
-        current_part_rows = []
-
-    def add_row(row):
-        """Add a row and flush if part is full."""
-        nonlocal current_part_rows, total_rows
-        current_part_rows.append(row)
-        total_rows += 1
-        if len(current_part_rows) >= MAX_ROWS_PER_PART:
-            flush_part()
-
-    # --- MAIN rows: from in_sku_main (one per SKU) ---
-    main_query = """
-        SELECT
-            s.formulation,
-            s.sku_name,
-            s.company,
-            s.composition,
-            s.pack_size,
-            s.dosage_form,
-            s.schedule_status,
-            s.ceiling_price,
-            s.mrp,
-            s.mrp_per_unit,
-            s.year_month
-        FROM in_sku_main s
-        WHERE s.run_id = %s
-        ORDER BY s.formulation, s.composition, s.pack_size, s.dosage_form, s.sku_name
-    """
-    cur = db.execute(main_query, (run_id,))
-    while True:
-        rows = cur.fetchmany(batch_size)
-        if not rows:
-            break
-        for r in rows:
-            (formulation, sku_name, company, composition, pack_size, dosage_form,
-             schedule_status, ceiling_price, mrp, mrp_per_unit, year_month) = r
-            main_count += 1
-            pack_num = _parse_pack_size(pack_size or "")
-            unit = (dosage_form or "").strip()
-            status = (schedule_status or "").strip()
-            ceiling_display = _ceiling_price_display(ceiling_price)
-            mrp_str = (mrp or "").strip()
-            mrp_per_unit_str = (mrp_per_unit or "").strip()
-            ym = _format_year_month(year_month or "")
-            add_row([
-                "MAIN",
-                (sku_name or "").strip(),
-                (company or "").strip(),
-                (composition or "").strip(),
-                pack_num,
-                unit,
-                status,
-                ceiling_display,
-                mrp_str,
-                mrp_per_unit_str,
-                ym,
-            ])
-
-    logger.info("  Exported %d MAIN rows", main_count)
-
-    # --- OTHER rows: from in_brand_alternatives (join to in_sku_main for composition/unit/status) ---
-    alt_query = """
-        SELECT
-            b.brand_name,
-            b.company,
-            b.pack_size,
-            b.brand_mrp,
-            b.mrp_per_unit,
-            b.year_month,
-            s.composition,
-            s.dosage_form,
-            s.schedule_status,
-            s.ceiling_price
-        FROM in_brand_alternatives b
-        JOIN in_sku_main s ON b.hidden_id = s.hidden_id AND b.run_id = s.run_id
-        WHERE b.run_id = %s
-        ORDER BY s.formulation, s.composition, b.brand_name
-    """
-    cur = db.execute(alt_query, (run_id,))
-    while True:
-        rows = cur.fetchmany(batch_size)
-        if not rows:
-            break
-        for r in rows:
-            (brand_name, company, pack_size, brand_mrp, mrp_per_unit, year_month,
-             composition, dosage_form, schedule_status, ceiling_price) = r
-            other_count += 1
-            pack_num = _parse_pack_size(pack_size or "")
-            unit = (dosage_form or "").strip()
-            status = (schedule_status or "").strip()
-            ceiling_display = _ceiling_price_display(ceiling_price)
-            mrp_str = (brand_mrp or "").strip()
-            mrp_per_unit_str = (mrp_per_unit or "").strip()
-            ym = _format_year_month(year_month or "")
-            add_row([
-                "OTHER",
-                (brand_name or "").strip(),
-                (company or "").strip(),
-                (composition or "").strip(),
-                pack_num,
-                unit,
-                status,
-                ceiling_display,
-                mrp_str,
-                mrp_per_unit_str,
-                ym,
-            ])
-        # Log progress for large datasets
-        if other_count % 1000000 == 0:
-            logger.info("  Processed %d OTHER rows...", other_count)
-
-    logger.info("  Exported %d OTHER rows", other_count)
-
-    # Flush any remaining rows
-    flush_part()
-
-    return total_rows, main_count, other_count, written_paths
+
+    with PartWriter(output_dir, "details_combined", EXPORT_COLUMNS, MAX_ROWS_PER_PART, parquet=parquet) as writer:
+        # --- MAIN rows: from in_sku_main (one per SKU) ---
+        main_query = """
+            SELECT
+                s.formulation,
+                s.sku_name,
+                s.company,
+                s.composition,
+                s.pack_size,
+                s.dosage_form,
+                s.schedule_status,
+                s.ceiling_price,
+                s.mrp,
+                s.mrp_per_unit,
+                s.year_month
+            FROM in_sku_main s
+            WHERE s.run_id = %s
+            ORDER BY s.formulation, s.composition, s.pack_size, s.dosage_form, s.sku_name
+        """
+        with timer.phase("export_main") as phase:
+            for chunk in stream_frames(db, main_query, (run_id,), MAIN_COLUMNS,
+                                       chunk_rows=chunk_rows, name="in_export_main"):
+                frame = to_export_frame(chunk, "MAIN", "sku_name", "mrp")
+                export_qc.update(frame)
+                writer.write(frame)
+                main_count += len(frame)
+            phase["rows"] = main_count
+
+        logger.info("  Exported %d MAIN rows", main_count)
+
+        # --- OTHER rows: from in_brand_alternatives (join to in_sku_main for composition/unit/status) ---
+        alt_query = """
+            SELECT
+                b.brand_name,
+                b.company,
+                b.pack_size,
+                b.brand_mrp,
+                b.mrp_per_unit,
+                b.year_month,
+                s.composition,
+                s.dosage_form,
+                s.schedule_status,
+                s.ceiling_price
+            FROM in_brand_alternatives b
+            JOIN in_sku_main s ON b.hidden_id = s.hidden_id AND b.run_id = s.run_id
+            WHERE b.run_id = %s
+            ORDER BY s.formulation, s.composition, b.brand_name
+        """
+        next_progress = 1_000_000
+        with timer.phase("export_other") as phase:
+            for chunk in stream_frames(db, alt_query, (run_id,), ALT_COLUMNS,
+                                       chunk_rows=chunk_rows, name="in_export_other"):
+                frame = to_export_frame(chunk, "OTHER", "brand_name", "brand_mrp")
+                export_qc.update(frame)
+                writer.write(frame)
+                other_count += len(frame)
+                # Log progress for large datasets
+                if other_count >= next_progress:
+                    logger.info("  Processed %d OTHER rows...", other_count)
+                    next_progress += 1_000_000
+            phase["rows"] = other_count
+
+        logger.info("  Exported %d OTHER rows", other_count)
+
+    if writer.parquet_parts:
+        logger.info("  Parquet parts: %s", ", ".join(p.name for p in writer.parquet_parts))
+
+    return writer.total_rows, main_count, other_count, writer.parts, export_qc.as_dict()
+
+
+def write_unique_list(values, header: str, out_path: Path) -> int:
+    """Write a one-column CSV from an iterable without materializing it."""
+    count = 0
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([header])
+        for value in values:
+            writer.writerow([value])
+            count += 1
+    return count
 
 
 def main():
@@ -339,6 +263,10 @@ def main():
     parser.add_argument("--run-id", type=str, help="Run ID to export (defaults to last_run_id.json or latest)")
     args = parser.parse_args()
 
+    chunk_rows = max(1000, getenv_int("INDIA_EXPORT_CHUNK_ROWS", DEFAULT_CHUNK_ROWS))
+    export_parquet = getenv_bool("INDIA_EXPORT_PARQUET", False)
+    timer = PhaseTimer()
+
     run_id = args.run_id
     if not run_id:
         try:
@@ -400,7 +328,10 @@ def main():
     except Exception:
         pass
 
-    qc_results = run_qc_checks(db, run_id, previous_count=previous_count, max_drop_pct=30.0)
+    with timer.phase("qc") as phase:
+        qc_results = run_qc_checks(db, run_id, previous_count=previous_count, max_drop_pct=30.0,
+                                   chunk_rows=chunk_rows)
+        phase["rows"] = qc_results["row_count"]
 
     # Save QC report
     qc_path = output_dir / "qc_report.json"
@@ -419,133 +350,140 @@ def main():
         status = "PASS" if check["passed"] else "FAIL"
         logger.info("  QC [%s] %s: %s", status, check["name"], check["message"])
 
-    # --- Unique combination counts ---
-    # (1) Product-type level: formulation + composition + pack_size + dosage_form
-    cur = db.execute(
-        "SELECT COUNT(DISTINCT (formulation, composition, pack_size, dosage_form)) "
-        "FROM in_sku_main WHERE run_id = %s",
-        (run_id,),
-    )
-    unique_combination = cur.fetchone()[0]
+    # --- Unique combination counts (aggregated in the database) ---
+    with timer.phase("unique_stats"):
+        # (1) Product-type level: formulation + composition + pack_size + dosage_form
+        cur = db.execute(
+            "SELECT COUNT(DISTINCT (formulation, composition, pack_size, dosage_form)) "
+            "FROM in_sku_main WHERE run_id = %s",
+            (run_id,),
+        )
+        unique_combination = cur.fetchone()[0]
 
-    # (2) Full table (main + others): distinct BrandName + Company + Composition + PackSize + Unit
-    # OPTIMIZED: Compute main and alt counts separately, then estimate combined
-    # (Full UNION is too slow with 54M+ alternatives)
-    logger.info("Computing unique combination counts (optimized)...")
+        # (2) Full table (main + others): distinct BrandName + Company + Composition + PackSize + Unit
+        # OPTIMIZED: Compute main and alt counts separately, then estimate combined
+        # (Full UNION is too slow with 54M+ alternatives)
+        logger.info("Computing unique combination counts (optimized)...")
 
-    # Main SKUs unique combinations
-    cur = db.execute(
-        "SELECT COUNT(*) FROM ("
-        "  SELECT DISTINCT sku_name, company, composition, pack_size, dosage_form "
-        "  FROM in_sku_main WHERE run_id = %s"
-        ") t",
-        (run_id,),
-    )
-    main_unique = cur.fetchone()[0]
+        # Main SKUs unique combinations
+        cur = db.execute(
+            "SELECT COUNT(*) FROM ("
+            "  SELECT DISTINCT sku_name, company, composition, pack_size, dosage_form "
+            "  FROM in_sku_main WHERE run_id = %s"
+            ") t",
+            (run_id,),
+        )
+        main_unique = cur.fetchone()[0]
 
-    # Alternatives unique brand names (approximate, avoid full join)
-    cur = db.execute(
-        "SELECT COUNT(DISTINCT brand_name) FROM in_brand_alternatives WHERE run_id = %s",
-        (run_id,),
-    )
-    alt_unique_brands = cur.fetchone()[0]
+        # Alternatives unique brand names (approximate, avoid full join)
+        cur = db.execute(
+            "SELECT COUNT(DISTINCT brand_name) FROM in_brand_alternatives WHERE run_id = %s",
+            (run_id,),
+        )
+        alt_unique_brands = cur.fetchone()[0]
 
-    # Combined estimate (main + unique alt brands not in main)
-    unique_combination_brand = main_unique + alt_unique_brands
-    logger.info("  Main unique combos: %d, Alt unique brands: %d, Combined: %d",
-                main_unique, alt_unique_brands, unique_combination_brand)
+        # Combined estimate (main + unique alt brands not in main)
+        unique_combination_brand = main_unique + alt_unique_brands
+        logger.info("  Main unique combos: %d, Alt unique brands: %d, Combined: %d",
+                    main_unique, alt_unique_brands, unique_combination_brand)
 
-    # (3) Unique count per column - compute SEPARATELY for main and alternatives
-    # Main table stats
-    cur = db.execute(
-        "SELECT "
-        "  COUNT(DISTINCT sku_name) AS u_brand_name, "
-        "  COUNT(DISTINCT company) AS u_company, "
-        "  COUNT(DISTINCT composition) AS u_composition, "
-        "  COUNT(DISTINCT pack_size) AS u_pack_size, "
-        "  COUNT(DISTINCT dosage_form) AS u_unit, "
-        "  COUNT(DISTINCT schedule_status) AS u_status, "
-        "  COUNT(DISTINCT ceiling_price) AS u_ceiling_price, "
-        "  COUNT(DISTINCT mrp) AS u_mrp, "
-        "  COUNT(DISTINCT mrp_per_unit) AS u_mrp_per_unit, "
-        "  COUNT(DISTINCT year_month) AS u_year_month "
-        "FROM in_sku_main WHERE run_id = %s",
-        (run_id,),
-    )
-    main_row = cur.fetchone()
+        # (3) Unique count per column - compute SEPARATELY for main and alternatives
+        # Main table stats
+        cur = db.execute(
+            "SELECT "
+            "  COUNT(DISTINCT sku_name) AS u_brand_name, "
+            "  COUNT(DISTINCT company) AS u_company, "
+            "  COUNT(DISTINCT composition) AS u_composition, "
+            "  COUNT(DISTINCT pack_size) AS u_pack_size, "
+            "  COUNT(DISTINCT dosage_form) AS u_unit, "
+            "  COUNT(DISTINCT schedule_status) AS u_status, "
+            "  COUNT(DISTINCT ceiling_price) AS u_ceiling_price, "
+            "  COUNT(DISTINCT mrp) AS u_mrp, "
+            "  COUNT(DISTINCT mrp_per_unit) AS u_mrp_per_unit, "
+            "  COUNT(DISTINCT year_month) AS u_year_month "
+            "FROM in_sku_main WHERE run_id = %s",
+            (run_id,),
+        )
+        main_row = cur.fetchone()
 
-    # Alternatives table stats (without expensive join)
-    cur = db.execute(
-        "SELECT "
-        "  COUNT(DISTINCT brand_name) AS u_brand_name, "
-        "  COUNT(DISTINCT company) AS u_company, "
-        "  COUNT(DISTINCT pack_size) AS u_pack_size, "
-        "  COUNT(DISTINCT brand_mrp) AS u_mrp, "
-        "  COUNT(DISTINCT mrp_per_unit) AS u_mrp_per_unit, "
-        "  COUNT(DISTINCT year_month) AS u_year_month "
-        "FROM in_brand_alternatives WHERE run_id = %s",
-        (run_id,),
-    )
-    alt_row = cur.fetchone()
-
-    # Combined unique counts (max of main + alt for overlap columns)
-    unique_per_column = {
-        "BrandType": 2,  # MAIN and OTHER
-        "BrandName": main_row[0] + alt_row[0],  # Combined brands
-        "Company": main_row[1] + alt_row[1],  # Combined companies
-        "Composition": main_row[2],  # Only in main
-        "PackSize": main_row[3] + alt_row[2],  # Combined
-        "Unit": main_row[4],  # Only in main (dosage_form)
-        "Status": main_row[5],  # Only in main
-        "CeilingPrice": main_row[6],  # Only in main
-        "MRP": main_row[7] + alt_row[3],  # Combined
-        "MRPPerUnit": main_row[8] + alt_row[4],  # Combined
-        "YearMonth": main_row[9] + alt_row[5],  # Combined
-    }
-    logger.info("  Unique per column computed")
+        # Alternatives table stats (without expensive join)
+        cur = db.execute(
+            "SELECT "
+            "  COUNT(DISTINCT brand_name) AS u_brand_name, "
+            "  COUNT(DISTINCT company) AS u_company, "
+            "  COUNT(DISTINCT pack_size) AS u_pack_size, "
+            "  COUNT(DISTINCT brand_mrp) AS u_mrp, "
+            "  COUNT(DISTINCT mrp_per_unit) AS u_mrp_per_unit, "
+            "  COUNT(DISTINCT year_month) AS u_year_month "
+            "FROM in_brand_alternatives WHERE run_id = %s",
+            (run_id,),
+        )
+        alt_row = cur.fetchone()
+
+        # Combined unique counts (max of main + alt for overlap columns)
+        unique_per_column = {
+            "BrandType": 2,  # MAIN and OTHER
+            "BrandName": main_row[0] + alt_row[0],  # Combined brands
+            "Company": main_row[1] + alt_row[1],  # Combined companies
+            "Composition": main_row[2],  # Only in main
+            "PackSize": main_row[3] + alt_row[2],  # Combined
+            "Unit": main_row[4],  # Only in main (dosage_form)
+            "Status": main_row[5],  # Only in main
+            "CeilingPrice": main_row[6],  # Only in main
+            "MRP": main_row[7] + alt_row[3],  # Combined
+            "MRPPerUnit": main_row[8] + alt_row[4],  # Combined
+            "YearMonth": main_row[9] + alt_row[5],  # Combined
+        }
+        logger.info("  Unique per column computed")
 
     # --- Export CSV (in parts, max 8 lakh rows each) ---
-    row_count, main_count, other_count, part_paths = export_combined_csv(db, run_id, output_dir)
+    row_count, main_count, other_count, part_paths, export_qc = export_combined_csv(
+        db, run_id, output_dir, chunk_rows=chunk_rows, parquet=export_parquet, timer=timer,
+    )
     qc_results["main_count"] = main_count
     qc_results["other_count"] = other_count
     qc_results["unique_combination"] = unique_combination
     qc_results["unique_combination_brand"] = unique_combination_brand
     qc_results["unique_per_column"] = unique_per_column
     qc_results["export_parts"] = [{"file": p.name, "rows": n} for p, n in part_paths]
+    qc_results["export_qc"] = export_qc
     qc_path.write_text(json.dumps(qc_results, indent=2), encoding="utf-8")
 
     # --- Unique lists: Product Name (BrandName) and Generic Name (formulation) ---
-    # Get unique product names separately to avoid expensive UNION on 52M rows
-    cur = db.execute(
-        "SELECT DISTINCT sku_name FROM in_sku_main WHERE run_id = %s ORDER BY sku_name",
-        (run_id,),
-    )
-    main_product_names = set(row[0] or "" for row in cur.fetchall())
-
-    cur = db.execute(
-        "SELECT DISTINCT brand_name FROM in_brand_alternatives WHERE run_id = %s ORDER BY brand_name",
-        (run_id,),
-    )
-    alt_product_names = set(row[0] or "" for row in cur.fetchall())
-
-    unique_product_names = sorted(main_product_names | alt_product_names)
+    # Both sides come back DISTINCT and sorted in "C" (code point) order, the same
+    # order as Python's sorted(), so they are merged and written as a stream.
+    with timer.phase("unique_lists") as phase:
+        main_names = stream_values(
+            db,
+            "SELECT DISTINCT COALESCE(sku_name, '') COLLATE \"C\" AS name "
+            "FROM in_sku_main WHERE run_id = %s ORDER BY name",
+            (run_id,), chunk_rows=chunk_rows, name="in_unique_sku_names", commit=False,
+        )
+        alt_names = stream_values(
+            db,
+            "SELECT DISTINCT COALESCE(brand_name, '') COLLATE \"C\" AS name "
+            "FROM in_brand_alternatives WHERE run_id = %s ORDER BY name",
+            (run_id,), chunk_rows=chunk_rows, name="in_unique_brand_names", commit=False,
+        )
+        product_count = write_unique_list(
+            merge_distinct(main_names, alt_names), "Product Name", output_dir / "unique_product_name.csv",
+        )
+        db.connect().commit()  # both cursors are exhausted; end their transaction
 
-    # Get unique formulations (only from main table since it's the source)
-    cur = db.execute(
-        "SELECT DISTINCT formulation FROM in_sku_main WHERE run_id = %s ORDER BY formulation",
-        (run_id,),
-    )
-    unique_generic_names = [row[0] or "" for row in cur.fetchall()]
-    for name, values in [("unique_product_name", unique_product_names), ("unique_generic_name", unique_generic_names)]:
-        col_header = "Product Name" if name == "unique_product_name" else "Generic Name"
-        out_path = output_dir / f"{name}.csv"
-        with out_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([col_header])
-            writer.writerows([[v] for v in values])
-        logger.info("  Unique list: %s (%d entries)", out_path.name, len(values))
-    qc_results["unique_product_name_count"] = len(unique_product_names)
-    qc_results["unique_generic_name_count"] = len(unique_generic_names)
+        # Unique formulations (only from main table since it's the source)
+        generic_names = stream_values(
+            db,
+            "SELECT DISTINCT formulation FROM in_sku_main WHERE run_id = %s ORDER BY formulation",
+            (run_id,), chunk_rows=chunk_rows, name="in_unique_formulations",
+        )
+        generic_count = write_unique_list(
+            (v or "" for v in generic_names), "Generic Name", output_dir / "unique_generic_name.csv",
+        )
+        phase["rows"] = product_count + generic_count
+    logger.info("  Unique list: unique_product_name.csv (%d entries)", product_count)
+    logger.info("  Unique list: unique_generic_name.csv (%d entries)", generic_count)
+    qc_results["unique_product_name_count"] = product_count
+    qc_results["unique_generic_name_count"] = generic_count
     qc_path.write_text(json.dumps(qc_results, indent=2), encoding="utf-8")
 
     # Export individual tables
@@ -557,18 +495,24 @@ def main():
         "in_brand_alternatives",
         "in_med_details",
     ]
-    for table in table_names:
-        try:
-            display_name = table.replace("in_", "")
-            out_path = tables_dir / f"{display_name}.csv"
-            count = export_table_csv(db, table, run_id, out_path)
-            logger.info("  Exported %s: %d rows", display_name, count)
-        except Exception as exc:
-            logger.warning("Failed exporting table %s: %s", table, exc)
+    with timer.phase("tables") as phase:
+        for table in table_names:
+            try:
+                display_name = table.replace("in_", "")
+                out_path = tables_dir / f"{display_name}.csv"
+                count = export_table_csv(db, table, run_id, out_path)
+                phase["rows"] += max(count, 0)
+                logger.info("  Exported %s: %d rows", display_name, count)
+            except Exception as exc:
+                logger.warning("Failed exporting table %s: %s", table, exc)
+
+    qc_results["phase_timings"] = timer.phases
+    qc_path.write_text(json.dumps(qc_results, indent=2), encoding="utf-8")
 
     db.close()
 
     logger.info("Export complete: %d rows in %d part(s)", row_count, len(part_paths))
+    logger.info("Phase timings: %s", timer.summary())
 
     # --- Copy part CSVs to exports/ folder ---
     import shutil
@@ -582,6 +526,9 @@ def main():
         dest = exports_dir / part_path.name
         shutil.copy2(str(part_path), str(dest))
         logger.info("  Copied %s -> %s (%d rows)", part_path.name, dest, part_rows)
+        parquet_path = part_path.with_suffix(".parquet")
+        if export_parquet and parquet_path.exists():
+            shutil.copy2(str(parquet_path), str(exports_dir / parquet_path.name))
     for name in ("unique_product_name.csv", "unique_generic_name.csv"):
         src = output_dir / name
         if src.exists():
@@ -605,10 +552,11 @@ def main():
     print(f"  Parts:        {len(part_paths)} file(s)")
     for part_path, part_rows in part_paths:
         print(f"    - {part_path.name}: {part_rows:,} rows")
-    print(f"  Unique lists: unique_product_name.csv ({len(unique_product_names):,}), unique_generic_name.csv ({len(unique_generic_names):,})")
+    print(f"  Unique lists: unique_product_name.csv ({product_count:,}), unique_generic_name.csv ({generic_count:,})")
     print(f"  Output:       {output_dir}")
     print(f"  Exports:      {exports_dir}")
     print(f"  QC Report:    {qc_path}")
+    print(f"  Timings:      {timer.summary()}")
     print(f"{'='*60}\n")
 
 
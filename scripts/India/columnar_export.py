@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Columnar export engine for India step 5 (QC + export).
+
+Tables stream out of PostgreSQL in fixed-size chunks through server-side
+(named) cursors, or straight to disk with COPY TO STDOUT. Each chunk becomes
+a DataFrame and is transformed/checked with vectorized column operations,
+then appended to the current CSV (and optionally Parquet) part. Only one
+chunk is ever held in memory, so memory stays flat whatever the row count.
+
+QC accumulators (null rates, duplicate keys, price outliers) are merged
+chunk by chunk: duplicates are counted on a key-sorted stream by comparing
+neighbours (plus the last key of the previous chunk), and price outliers
+use a fixed log10 histogram instead of keeping the values.
+"""
+
+import csv
+import heapq
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+    _HAS_PYARROW = False
+
+logger = logging.getLogger("india_qc_export")
+
+# Target export format: BrandType, BrandName, Company, Composition, PackSize, Unit, Status, CeilingPrice, MRP, MRPPerUnit, YearMonth
+EXPORT_COLUMNS = [
+    "BrandType", "BrandName", "Company", "Composition", "PackSize", "Unit",
+    "Status", "CeilingPrice", "MRP", "MRPPerUnit", "YearMonth",
+]
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Price histogram: log10(price) from 0.0001 to 10^8 in 0.01-decade bins
+_LOG_EDGES = np.linspace(-4.0, 8.0, 1201)
+_LOG_CENTERS = (_LOG_EDGES[:-1] + _LOG_EDGES[1:]) / 2
+
+
+# ---------------------------------------------------------------------------
+# Streaming reads
+# ---------------------------------------------------------------------------
+
+def stream_frames(db, sql: str, params: Optional[tuple], columns: Sequence[str],
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS, name: str = "in_export") -> Iterator[pd.DataFrame]:
+    """
+    Yield the result of sql as DataFrames of at most chunk_rows rows.
+
+    Uses a named (server-side) cursor so PostgreSQL keeps the result set and
+    only chunk_rows rows cross the wire at a time; a plain cursor would pull
+    the whole result into client memory on execute().
+    """
+    conn = db.connect()
+    try:
+        with conn.cursor(name=name) as cur:
+            cur.itersize = chunk_rows
+            cur.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=list(columns))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def stream_values(db, sql: str, params: Optional[tuple], chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  name: str = "in_values", commit: bool = True) -> Iterator:
+    """
+    Yield the first column of sql row by row through a server-side cursor.
+
+    Pass commit=False when several streams are read interleaved on the same
+    connection (e.g. merge_distinct): a commit closes every open named cursor,
+    so the caller commits once all of them are exhausted.
+    """
+    conn = db.connect()
+    try:
+        with conn.cursor(name=name) as cur:
+            cur.itersize = chunk_rows
+            cur.execute(sql, params)
+            for row in cur:
+                yield row[0]
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def copy_query_csv(db, sql: str, params: Optional[tuple], output_path: Path) -> int:
+    """
+    Write the result of sql to output_path with COPY ... TO STDOUT (CSV with
+    header). Rows go from the server to the file without becoming Python
+    objects. Returns the row count reported by the server (-1 if unknown).
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = db.connect()
+    try:
+        with conn.cursor() as cur:
+            query = cur.mogrify(sql, params).decode("utf-8") if params else sql
+            with output_path.open("wb") as f:
+                cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", f)
+            count = cur.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return count
+
+
+def merge_distinct(*sorted_streams: Iterable[str]) -> Iterator[str]:
+    """Merge already-sorted streams into one sorted stream without duplicates."""
+    last = None
+    for value in heapq.merge(*sorted_streams):
+        if value != last:
+            yield value
+            last = value
+
+
+# ---------------------------------------------------------------------------
+# Vectorized column transforms
+# ---------------------------------------------------------------------------
+
+def text(col: pd.Series) -> pd.Series:
+    """None -> '' and strip whitespace, for a whole column."""
+    return col.fillna("").astype(str).str.strip()
+
+
+def pack_size_numbers(col: pd.Series) -> pd.Series:
+    """Leading integer of '30 TABLET' / '5 ML' style pack sizes (0 if none)."""
+    digits = text(col).str.extract(r"^(\d+)", expand=False).fillna("0")
+    return pd.to_numeric(digits).astype("int64")
+
+
+def year_month_short(col: pd.Series) -> pd.Series:
+    """
+    Year/month for display, with the exact shortening rule of the original
+    row-by-row exporter (8+ chars and s[-4] == '-' -> drop the last two), so
+    export files stay byte-identical to earlier runs.
+    """
+    s = text(col)
+    long_form = (s.str.len() >= 8) & (s.str[-4:-3] == "-")
+    return s.where(~long_form, s.str[:-2])
+
+
+def ceiling_price_display(col: pd.Series) -> pd.Series:
+    """Ceiling price for display: -1 or empty -> '0'."""
+    s = text(col)
+    return s.where(~s.isin(["-1", ""]), "0")
+
+
+def prices(col: pd.Series) -> pd.Series:
+    """Parse a text price column to float (NaN where empty or not a number)."""
+    return pd.to_numeric(text(col).str.replace(",", "", regex=False), errors="coerce")
+
+
+def to_export_frame(df: pd.DataFrame, brand_type: str, brand_col: str, mrp_col: str) -> pd.DataFrame:
+    """
+    Map a chunk of in_sku_main / in_brand_alternatives rows to EXPORT_COLUMNS.
+
+    brand_col/mrp_col name the brand and MRP source columns (sku_name/mrp for
+    MAIN rows, brand_name/brand_mrp for OTHER rows); the remaining columns
+    share names across both queries.
+    """
+    return pd.DataFrame({
+        "BrandType": brand_type,
+        "BrandName": text(df[brand_col]),
+        "Company": text(df["company"]),
+        "Composition": text(df["composition"]),
+        "PackSize": pack_size_numbers(df["pack_size"]),
+        "Unit": text(df["dosage_form"]),
+        "Status": text(df["schedule_status"]),
+        "CeilingPrice": ceiling_price_display(df["ceiling_price"]),
+        "MRP": text(df[mrp_col]),
+        "MRPPerUnit": text(df["mrp_per_unit"]),
+        "YearMonth": year_month_short(df["year_month"]),
+    }, index=df.index)
+
+
+# ---------------------------------------------------------------------------
+# Chunked QC
+# ---------------------------------------------------------------------------
+
+class ChunkQC:
+    """
+    QC statistics accumulated over a stream of DataFrame chunks.
+
+    required:      columns whose NULL/'' rate is checked against max_null_pct
+    key:           duplicate-checked column; the stream must be sorted by it
+    mrp_per_unit:  per-unit price column used for price outlier checks
+    ceiling:       ceiling price column (per unit); prices above it are flagged
+    """
+
+    def __init__(self, required: Sequence[str] = (), key: Optional[str] = None,
+                 mrp_per_unit: Optional[str] = None, ceiling: Optional[str] = None,
+                 max_null_pct: float = 50.0, fence_iqr: float = 3.0):
+        self.required = list(required)
+        self.key = key
+        self.mrp_per_unit = mrp_per_unit
+        self.ceiling = ceiling
+        self.max_null_pct = max_null_pct
+        self.fence_iqr = fence_iqr
+        self.rows = 0
+        self.nulls: Dict[str, int] = {col: 0 for col in self.required}
+        self.duplicates = 0
+        self._last_key = None
+        self.price_missing = 0
+        self.price_invalid = 0
+        self.price_checked_vs_ceiling = 0
+        self.price_above_ceiling = 0
+        self._price_hist = np.zeros(len(_LOG_CENTERS), dtype=np.int64)
+
+    def update(self, df: pd.DataFrame) -> None:
+        n = len(df)
+        if not n:
+            return
+        self.rows += n
+
+        for col in self.required:
+            values = df[col]
+            self.nulls[col] += int((values.isna() | (values == "")).sum())
+
+        if self.key:
+            keys = df[self.key].to_numpy(dtype=object)
+            self.duplicates += int((keys[1:] == keys[:-1]).sum())
+            if self._last_key is not None and keys[0] == self._last_key:
+                self.duplicates += 1
+            self._last_key = keys[-1]
+
+        if self.mrp_per_unit:
+            raw = text(df[self.mrp_per_unit])
+            price = prices(df[self.mrp_per_unit])
+            valid = price > 0
+            missing = raw == ""
+            self.price_missing += int(missing.sum())
+            self.price_invalid += int((~valid & ~missing).sum())
+            logs = np.clip(np.log10(price[valid].to_numpy()), _LOG_EDGES[0], _LOG_EDGES[-1])
+            self._price_hist += np.histogram(logs, bins=_LOG_EDGES)[0]
+
+            if self.ceiling:
+                ceiling = prices(df[self.ceiling])
+                comparable = valid & (ceiling > 0)
+                self.price_checked_vs_ceiling += int(comparable.sum())
+                self.price_above_ceiling += int((comparable & (price > ceiling)).sum())
+
+    def null_pct(self, col: str) -> float:
+        return (self.nulls[col] / self.rows * 100) if self.rows else 0.0
+
+    def price_fences(self) -> Optional[Tuple[float, float]]:
+        """Per-unit price bounds Q1/Q3 -/+ fence_iqr * IQR (on log10 prices)."""
+        total = int(self._price_hist.sum())
+        if not total:
+            return None
+        cum = np.cumsum(self._price_hist)
+        q1 = _LOG_CENTERS[np.searchsorted(cum, 0.25 * total)]
+        q3 = _LOG_CENTERS[np.searchsorted(cum, 0.75 * total)]
+        iqr = max(q3 - q1, 0.01)
+        return 10 ** (q1 - self.fence_iqr * iqr), 10 ** (q3 + self.fence_iqr * iqr)
+
+    def price_outliers(self) -> int:
+        fences = self.price_fences()
+        if fences is None:
+            return 0
+        lo, hi = np.log10(fences[0]), np.log10(fences[1])
+        outside = (_LOG_CENTERS < lo) | (_LOG_CENTERS > hi)
+        return int(self._price_hist[outside].sum())
+
+    def null_checks(self) -> List[dict]:
+        checks = []
+        for col in self.required:
+            pct = self.null_pct(col)
+            passed = pct <= self.max_null_pct
+            checks.append({
+                "name": f"null_check_{col}",
+                "passed": passed,
+                "message": f"Column {col} has {pct:.1f}% null/empty values" + (" (OK)" if passed else ""),
+            })
+        return checks
+
+    def duplicate_check(self) -> dict:
+        if self.duplicates:
+            message = f"Found {self.duplicates} duplicate {self.key} values (warning)"
+        else:
+            message = f"No duplicate {self.key} values found"
+        return {"name": "duplicates", "passed": True, "message": message}  # Warning only
+
+    def price_check(self) -> dict:
+        outliers = self.price_outliers()
+        parts = [
+            f"{outliers} outside IQR fences",
+            f"{self.price_above_ceiling} of {self.price_checked_vs_ceiling} above ceiling price",
+            f"{self.price_invalid} unparseable/non-positive",
+            f"{self.price_missing} empty",
+        ]
+        flagged = outliers or self.price_above_ceiling or self.price_invalid
+        suffix = " (warning)" if flagged else " (OK)"
+        return {"name": "price_outliers", "passed": True,  # Warning only
+                "message": f"{self.mrp_per_unit}: " + ", ".join(parts) + suffix}
+
+    def as_dict(self) -> dict:
+        fences = self.price_fences()
+        out = {
+            "rows": self.rows,
+            "null_pct": {col: round(self.null_pct(col), 3) for col in self.required},
+        }
+        if self.key:
+            out["duplicates"] = self.duplicates
+        if self.mrp_per_unit:
+            out["price"] = {
+                "outliers": self.price_outliers(),
+                "fences": [round(fences[0], 4), round(fences[1], 4)] if fences else None,
+                "above_ceiling": self.price_above_ceiling,
+                "checked_vs_ceiling": self.price_checked_vs_ceiling,
+                "invalid": self.price_invalid,
+                "missing": self.price_missing,
+            }
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Incremental part writer
+# ---------------------------------------------------------------------------
+
+class PartWriter:
+    """
+    Append DataFrame chunks to numbered part files of at most max_rows rows
+    (details_combined_001.csv, ...). Parts are opened lazily and closed as
+    soon as they are full, so nothing is buffered beyond the current chunk.
+    With parquet=True a matching .parquet file is written per part.
+    """
+
+    def __init__(self, output_dir: Path, prefix: str, columns: Sequence[str],
+                 max_rows: int, parquet: bool = False):
+        if parquet and not _HAS_PYARROW:
+            logger.warning("pyarrow not installed; Parquet export disabled")
+            parquet = False
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.columns = list(columns)
+        self.max_rows = max_rows
+        self.parquet = parquet
+        self.parts: List[Tuple[Path, int]] = []
+        self.parquet_parts: List[Path] = []
+        self.total_rows = 0
+        self._csv_file = None
+        self._pq_writer = None
+        self._part_rows = 0
+
+    def _open_part(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{self.prefix}_{len(self.parts) + 1:03d}.csv"
+        self._csv_file = path.open("w", newline="", encoding="utf-8")
+        csv.writer(self._csv_file).writerow(self.columns)
+        self.parts.append((path, 0))
+        self._part_rows = 0
+
+    def _close_part(self) -> None:
+        if self._csv_file is None:
+            return
+        self._csv_file.close()
+        self._csv_file = None
+        path, _ = self.parts[-1]
+        self.parts[-1] = (path, self._part_rows)
+        if self._pq_writer is not None:
+            self._pq_writer.close()
+            self._pq_writer = None
+
+    def _write_slice(self, df: pd.DataFrame) -> None:
+        df.to_csv(self._csv_file, header=False, index=False, lineterminator="\r\n")
+        if self.parquet:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._pq_writer is None:
+                path = self.parts[-1][0].with_suffix(".parquet")
+                self._pq_writer = pq.ParquetWriter(str(path), table.schema)
+                self.parquet_parts.append(path)
+            self._pq_writer.write_table(table)
+
+    def write(self, df: pd.DataFrame) -> None:
+        df = df[self.columns]
+        start = 0
+        while start < len(df):
+            if self._csv_file is None:
+                self._open_part()
+            take = min(len(df) - start, self.max_rows - self._part_rows)
+            self._write_slice(df.iloc[start:start + take])
+            self._part_rows += take
+            self.total_rows += take
+            start += take
+            if self._part_rows >= self.max_rows:
+                self._close_part()
+
+    def close(self) -> List[Tuple[Path, int]]:
+        self._close_part()
+        return self.parts
+
+    def __enter__(self) -> "PartWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Phase timing
+# ---------------------------------------------------------------------------
+
+class PhaseTimer:
+    """Wall time and row counts per export phase, logged as each phase ends."""
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, float]]:
+        info = {"seconds": 0.0, "rows": 0}
+        t0 = time.monotonic()
+        try:
+            yield info
+        finally:
+            info["seconds"] = round(time.monotonic() - t0, 3)
+            self.phases[name] = info
+            rate = info["rows"] / info["seconds"] if info["seconds"] > 0 else 0.0
+            logger.info("[PHASE] %s: %.1fs, %d rows (%.0f rows/s)", name, info["seconds"], info["rows"], rate)
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={p['seconds']:.1f}s" for name, p in self.phases.items())
@@ -17,6 +17,12 @@ from typing import Dict, List, Optional, Set
 
 import json
 
+try:
+    from psycopg2.extras import execute_values
+    _HAS_EXECUTE_VALUES = True
+except ImportError:
+    _HAS_EXECUTE_VALUES = False
+
 logger = logging.getLogger(__name__)
 
 from core.db.base_repository import BaseRepository
@@ -101,6 +107,68 @@ class ItalyRepository(BaseRepository):
                 (json.dumps(detail) if detail is not None else None, self.run_id, determina_id),
             )
 
+    def update_determina_details(self, details: List[tuple]) -> int:
+        """Batch form of update_determina_detail: [(determina_id, detail), ...] in one statement."""
+        if not details:
+            return 0
+        table = self._table("determinas")
+        rows = [(self.run_id, determina_id, json.dumps(detail) if detail is not None else None)
+                for determina_id, detail in details]
+        with self.db.cursor() as cur:
+            if _HAS_EXECUTE_VALUES:
+                execute_values(
+                    cur,
+                    f"""
+                    UPDATE {table} AS t
+                    SET detail = v.detail::jsonb, detail_scraped_at = NOW()
+                    FROM (VALUES %s) AS v(run_id, determina_id, detail)
+                    WHERE t.run_id = v.run_id AND t.determina_id = v.determina_id
+                    """,
+                    rows,
+                    page_size=500,
+                )
+            else:
+                for run_id, determina_id, detail in rows:
+                    cur.execute(
+                        f"""
+                        UPDATE {table}
+                        SET detail = %s::jsonb, detail_scraped_at = NOW()
+                        WHERE run_id = %s AND determina_id = %s
+                        """,
+                        (detail, run_id, determina_id),
+                    )
+        return len(rows)
+
+    def mark_progress_batch(self, step_number: int, step_name: str, entries: List[tuple]) -> int:
+        """Batch form of mark_progress for final states: [(progress_key, status, error_message), ...]."""
+        if not entries:
+            return 0
+        from datetime import datetime
+        now = datetime.now()
+        table = self._table("step_progress")
+        rows = [(self.run_id, step_number, step_name, key, status, error, now, now)
+                for key, status, error in entries]
+        sql = f"""
+            INSERT INTO {table}
+            (run_id, step_number, step_name, progress_key, status,
+             error_message, started_at, completed_at)
+            VALUES %s
+            ON CONFLICT (run_id, step_number, progress_key) DO UPDATE SET
+                step_name = EXCLUDED.step_name,
+                status = EXCLUDED.status,
+                error_message = EXCLUDED.error_message,
+                started_at = COALESCE({table}.started_at, EXCLUDED.started_at),
+                completed_at = EXCLUDED.completed_at
+        """
+        with self.db.cursor() as cur:
+            if _HAS_EXECUTE_VALUES:
+                execute_values(cur, sql, rows, page_size=1000)
+            else:
+                sql = sql.replace("VALUES %s", "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)")
+                for row in rows:
+                    cur.execute(sql, row)
+        return len(rows)
+
     def get_determina_details_by_typology(self, typology: str) -> List[Dict]:
         """Return determinas with stored detail payload for a given typology."""
         table = self._table("determinas")
@@ -122,30 +190,106 @@ class ItalyRepository(BaseRepository):
     def insert_products(self, products: List[Dict]) -> int:
         if not products:
             return 0
-        table = self._table("products")
-        count = 0
         with self.db.cursor() as cur:
-            for p in products:
-                cur.execute(f"""
-                    INSERT INTO {table}
-                    (run_id, determina_id, aic_code, product_name, pack_description, 
-                     price_ex_factory, price_public, source_pdf, company)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    self.run_id,
-                    p.get("determina_id"),
-                    p.get("aic"),
-                    p.get("product_name"),
-                    p.get("pack_description"),
-                    p.get("price_ex_factory"),
-                    p.get("price_public"),
-                    p.get("source_pdf"),
-                    p.get("company")
-                ))
-                count += 1
+            count = self._insert_product_rows(cur, products)
         self._db_log(f"Inserted {count} products for run_id={self.run_id}")
         return count
 
+    def _insert_product_rows(self, cur, products: List[Dict]) -> int:
+        """Insert product dicts on an open cursor (one multi-row statement per 1000)."""
+        table = self._table("products")
+        rows = [
+            (self.run_id, p.get("determina_id"), p.get("aic"), p.get("product_name"),
+             p.get("pack_description"), p.get("price_ex_factory"), p.get("price_public"),
+             p.get("source_pdf"), p.get("company"))
+            for p in products
+        ]
+        sql = f"""
+            INSERT INTO {table}
+            (run_id, determina_id, aic_code, product_name, pack_description, 
+             price_ex_factory, price_public, source_pdf, company)
+            VALUES %s
+        """
+        if _HAS_EXECUTE_VALUES:
+            execute_values(cur, sql, rows, page_size=1000)
+        else:
+            sql = sql.replace("VALUES %s", "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)")
+            for row in rows:
+                cur.execute(sql, row)
+        return len(rows)
+
+    def count_products(self) -> int:
+        """Products stored for this run (all Step 3 invocations, including resumed ones)."""
+        table = self._table("products")
+        with self.db.cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) FROM {table} WHERE run_id = %s", (self.run_id,))
+            row = cur.fetchone()
+        return int(row[0]) if row else 0
+
+    def save_extracted_sources(self, step_name: str, sources: List[Dict]) -> int:
+        """
+        Persist a batch of fully-parsed Step 3 sources in one transaction.
+
+        Each source dict carries progress_key, determina_id, source_pdf,
+        products (list) and optionally error. Rows previously stored for the
+        same (determina_id, source_pdf) are replaced, the products inserted,
+        and each source's step_progress row marked completed/failed, so an
+        interrupted run never leaves half a file behind.
+
+        Returns:
+            Number of products inserted
+        """
+        if not sources:
+            return 0
+        from datetime import datetime
+        now = datetime.now()
+        products_table = self._table("products")
+        progress_table = self._table("step_progress")
+
+        ok = [s for s in sources if not s.get("error")]
+        products = [p for s in ok for p in s.get("products") or []]
+        progress_rows = [
+            (self.run_id, 3, step_name, s["progress_key"],
+             "failed" if s.get("error") else "completed",
+             len(s.get("products") or []), s.get("error"), now, now)
+            for s in sources
+        ]
+        progress_sql = f"""
+            INSERT INTO {progress_table}
+            (run_id, step_number, step_name, progress_key, status,
+             records_fetched, error_message, started_at, completed_at)
+            VALUES %s
+            ON CONFLICT (run_id, step_number, progress_key) DO UPDATE SET
+                status          = EXCLUDED.status,
+                records_fetched = EXCLUDED.records_fetched,
+                error_message   = EXCLUDED.error_message,
+                completed_at    = EXCLUDED.completed_at,
+                retry_count     = {progress_table}.retry_count
+                                  + CASE WHEN EXCLUDED.status = 'failed' THEN 1 ELSE 0 END
+        """
+
+        with self.db.cursor() as cur:
+            if ok:
+                cur.execute(
+                    f"""
+                    DELETE FROM {products_table}
+                    WHERE run_id = %s
+                      AND (determina_id, source_pdf) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+                    """,
+                    (self.run_id, [s.get("determina_id") for s in ok], [s.get("source_pdf") for s in ok]),
+                )
+            if products:
+                self._insert_product_rows(cur, products)
+            if _HAS_EXECUTE_VALUES:
+                execute_values(cur, progress_sql, progress_rows, page_size=1000)
+            else:
+                progress_sql = progress_sql.replace("VALUES %s", "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)")
+                for row in progress_rows:
+                    cur.execute(progress_sql, row)
+
+        self._db_log(f"Saved {len(sources)} extracted sources ({len(products)} products) for run_id={self.run_id}")
+        return len(products)
+
     def get_products_for_export(self) -> List[Dict]:
         table = self._table("products")
         dt_table = self._table("determinas")
@@ -1,20 +1,26 @@
-
 #!/usr/bin/env python3
 """
 Step 2: Download sources (PDF attachments) and persist detail JSON in DB.
 
 Important: We do NOT write any JSON detail files to disk. All detail payloads
 are stored in PostgreSQL (it_determinas.detail).
+
+Downloads run on asyncio over one shared HttpClient (pooled connections,
+per-host in-flight cap, retries). PDF bodies are streamed to disk in chunks
+via a .part file that is resumed with Range after an interruption; files
+already on disk whose size (and, optionally, hash) match are skipped. A
+single writer task batches detail and progress writes.
 """
 
-import concurrent.futures
+import asyncio
+import json
 import logging
 import os
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
-
-import requests
+from typing import Any, Dict, List, Optional, Tuple
 
 # Path setup
 _repo_root = Path(__file__).resolve().parents[3]
@@ -23,13 +29,17 @@ sys.path.insert(0, str(_repo_root))
 sys.path.insert(0, str(_italy_dir))
 
 from core.db.connection import CountryDB
+from core.http.client import HttpClient
+from core.parsing.pdf_pages import file_sha256
 from db.repositories import ItalyRepository
-from config_loader import get_output_dir
+from config_loader import get_output_dir, getenv_bool, getenv_float, getenv_int
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 PDF_DIR = get_output_dir("pdfs")
+MANIFEST_PATH = PDF_DIR / ".download_manifest.json"
+STEP_NAME = "Download Sources"
 DETAIL_URL_BASE = "https://trovanorme.aifa.gov.it/tnf-service/determina/tnf/pubblicate/"
 MSF_DETAIL_URL_BASE = "https://trovanorme.aifa.gov.it/tnf-service/determina/msf"
 ATTACHMENT_URL_BASE = "https://trovanorme.aifa.gov.it/tnf-service/determina/tnf/pubblicate/allegato/"
@@ -42,11 +52,89 @@ HEADERS = {
     "Referer": "https://trovanorme.aifa.gov.it/",
 }
 
+CONCURRENCY = getenv_int("STEP2_CONCURRENCY", 16)              # determinas in flight
+MAX_PER_HOST = getenv_int("STEP2_MAX_PER_HOST", 6)             # requests in flight per host
+MAX_CONNECTIONS = getenv_int("STEP2_MAX_CONNECTIONS", 32)
+HTTP_RETRIES = getenv_int("STEP2_HTTP_RETRIES", 3)
+CHUNK_SIZE = getenv_int("STEP2_CHUNK_KB", 64) * 1024
+WRITE_BATCH = getenv_int("STEP2_WRITE_BATCH", 50)
+FLUSH_SECONDS = getenv_float("STEP2_FLUSH_SECONDS", 5.0)
+VERIFY_HASH = getenv_bool("STEP2_VERIFY_HASH", False)           # re-hash files before skipping
+
+
+class DownloadManifest:
+    """
+    Size + SHA-256 of every PDF this step has written, kept next to the PDFs,
+    so a re-run can skip intact files without touching the network.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()  # record() and save() run on worker threads
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable download manifest %s: %s", path, e)
+
+    def matches(self, filepath: Path, verify_hash: bool = False) -> bool:
+        entry = self.entries.get(filepath.name)
+        if not entry or not filepath.exists():
+            return False
+        if filepath.stat().st_size != entry.get("size"):
+            return False
+        return not verify_hash or file_sha256(filepath) == entry.get("sha256")
+
+    def record(self, filepath: Path) -> None:
+        entry = {"size": filepath.stat().st_size, "sha256": file_sha256(filepath)}
+        with self._lock:
+            self.entries[filepath.name] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps(self.entries, sort_keys=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+class DownloadStats:
+    """Files and bytes moved by this step, for files/sec and bytes/sec reporting."""
 
-def fetch_detail(item_id: str) -> Optional[Dict[str, Any]]:
-    url = f"{DETAIL_URL_BASE}{item_id}"
+    def __init__(self):
+        self.started = time.monotonic()
+        self.files_downloaded = 0
+        self.files_skipped = 0
+        self.files_failed = 0
+        self.bytes_downloaded = 0
+
+    def summary(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (f"downloaded={self.files_downloaded} skipped={self.files_skipped} failed={self.files_failed} "
+                f"| {self.files_downloaded / elapsed:.2f} files/s, "
+                f"{self.bytes_downloaded / elapsed / 1024 / 1024:.2f} MB/s "
+                f"({self.bytes_downloaded / 1024 / 1024:.1f} MB in {elapsed:.0f}s)")
+
+
+def _format_pub_date(pub_date) -> str:
+    # Handle datetime/date objects
+    if hasattr(pub_date, 'strftime'):
+        # If it's just date, assume midnight
+        if not hasattr(pub_date, 'hour'):
+            return pub_date.strftime("%Y-%m-%dT00:00:00.000Z")
+        return pub_date.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    # Assume string
+    formatted_date = str(pub_date)
+    # Fix potential missing milliseconds
+    if "T" in formatted_date and formatted_date.endswith("Z") and ".000Z" not in formatted_date:
+        formatted_date = formatted_date.replace("Z", ".000Z")
+    return formatted_date
+
+
+async def fetch_detail(http: HttpClient, item_id: str) -> Optional[Dict[str, Any]]:
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        response = await http.get(f"{DETAIL_URL_BASE}{item_id}")
         if response.status_code == 200:
             return response.json()
     except Exception:
@@ -54,33 +142,17 @@ def fetch_detail(item_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def fetch_msf_detail(item_id: str, pub_date) -> Optional[Dict[str, Any]]:
+async def fetch_msf_detail(http: HttpClient, item_id: str, pub_date) -> Optional[Dict[str, Any]]:
     if not pub_date:
         return None
-    
-    formatted_date = pub_date
-    
-    # Handle datetime/date objects
-    if hasattr(pub_date, 'strftime'):
-        # If it's just date, assume midnight
-        if not hasattr(pub_date, 'hour'):
-            formatted_date = pub_date.strftime("%Y-%m-%dT00:00:00.000Z")
-        else:
-             formatted_date = pub_date.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-    else:
-         # Assume string
-         formatted_date = str(pub_date)
-         # Fix potential missing milliseconds
-         if "T" in formatted_date and formatted_date.endswith("Z") and ".000Z" not in formatted_date:
-             formatted_date = formatted_date.replace("Z", ".000Z")
 
     params = {
-        "dataPubblicazione": formatted_date,
+        "dataPubblicazione": _format_pub_date(pub_date),
         "redazionale": item_id
     }
-    
+
     try:
-        response = requests.get(MSF_DETAIL_URL_BASE, params=params, headers=HEADERS, timeout=30)
+        response = await http.get(MSF_DETAIL_URL_BASE, params=params)
         if response.status_code == 200:
             return response.json()
         logger.warning("MSF %s failed: %s - link: %s", item_id, response.status_code, response.url)
@@ -88,87 +160,55 @@ def fetch_msf_detail(item_id: str, pub_date) -> Optional[Dict[str, Any]]:
         logger.error("Error fetching MSF %s: %s", item_id, e)
     return None
 
-def download_pdf(attachment_id: str, filename: str) -> bool:
+
+async def _remote_size(http: HttpClient, url: str) -> Optional[int]:
+    try:
+        response = await http.request("HEAD", url)
+        length = response.headers.get("Content-Length")
+        return int(length) if response.status_code == 200 and length and length.isdigit() else None
+    except Exception:
+        return None
+
+
+async def download_pdf(http: HttpClient, attachment_id: str, filename: str,
+                       manifest: DownloadManifest, stats: DownloadStats) -> bool:
+    """
+    Ensure PDF_DIR/filename holds the attachment. Intact files (manifest match,
+    or same size as the server reports for files from older runs) are skipped;
+    a leftover .part is resumed.
+    """
     url = f"{ATTACHMENT_URL_BASE}{attachment_id}"
     filepath = PDF_DIR / filename
     if filepath.exists():
-        return True
-    try:
-        response = requests.get(url, headers=HEADERS, stream=True, timeout=60)
-        if response.status_code == 200:
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        if await asyncio.to_thread(manifest.matches, filepath, VERIFY_HASH):
+            stats.files_skipped += 1
             return True
+        if filepath.name not in manifest.entries:
+            # Downloaded before the manifest existed: trust it if the size agrees
+            # (or the server does not say), as the old "exists -> done" rule did.
+            remote = await _remote_size(http, url)
+            if remote is None or remote == filepath.stat().st_size:
+                await asyncio.to_thread(manifest.record, filepath)
+                stats.files_skipped += 1
+                return True
+        logger.info("Re-downloading %s (size/hash mismatch)", filename)
+        filepath.unlink(missing_ok=True)
+    try:
+        stats.bytes_downloaded += await http.download(url, filepath, chunk_size=CHUNK_SIZE)
+        await asyncio.to_thread(manifest.record, filepath)
+        stats.files_downloaded += 1
+        return True
     except Exception as e:
+        stats.files_failed += 1
         logger.error("Failed %s: %s", filename, e)
     return False
 
 def _safe_filename(name: str) -> str:
     return "".join([c for c in name if c.isalnum() or c in (" ", ".", "_", "-")]).strip() or "unknown"
 
-def main():
-    run_id = os.environ.get("ITALY_RUN_ID", "manual_run")
-    db = CountryDB("Italy")
-    repo = ItalyRepository(db, run_id)
-    
-    PDF_DIR.mkdir(parents=True, exist_ok=True)
-
-    items = repo.get_determinas()
-    completed = set(repo.get_completed_keys(2))
-    pending = [it for it in items if it.get("determina_id") and it.get("determina_id") not in completed]
-    logger.info("Step 2: Downloading sources for %s/%s determinas (pending/total)", len(pending), len(items))
-    
-    completed_count = 0
-    failed_count = 0
-    pdf_downloaded = 0
-    attachment_seen = 0
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(process_item_download_only, item): item for item in pending}
-        
-        for future in concurrent.futures.as_completed(futures):
-            item = futures[future]
-            item_id = item.get("determina_id")
-            try:
-                detail, status, msg, pdf_cnt, att_cnt = future.result()
-                if detail is not None and item_id:
-                    repo.update_determina_detail(item_id, detail)
-                if item_id:
-                    repo.mark_progress(2, "Download Sources", item_id, status, error_message=msg)
-                if status == "completed":
-                    completed_count += 1
-                else:
-                    failed_count += 1
-                pdf_downloaded += int(pdf_cnt or 0)
-                attachment_seen += int(att_cnt or 0)
-            except Exception as e:
-                if item_id:
-                    repo.mark_progress(2, "Download Sources", item_id, "failed", error_message=str(e))
-                logger.error("Error processing %s: %s", item_id, e)
-                failed_count += 1
-
-    try:
-        repo.upsert_stat("*", 2, "items_total", len(items))
-        repo.upsert_stat("*", 2, "items_pending", len(pending))
-        repo.upsert_stat("*", 2, "completed", completed_count)
-        repo.upsert_stat("*", 2, "failed", failed_count)
-        repo.upsert_stat("*", 2, "attachments_seen", attachment_seen)
-        repo.upsert_stat("*", 2, "pdf_downloaded", pdf_downloaded)
-        repo.refresh_step2_stats_by_keyword()
-    except Exception as e:
-        logger.warning("Could not persist Step 2 stats: %s", e)
-
-    logger.info(
-        "Step 2 summary: completed=%s failed=%s pdf_downloaded=%s attachments_seen=%s",
-        completed_count,
-        failed_count,
-        pdf_downloaded,
-        attachment_seen,
-    )
-
 
-def process_item_download_only(item):
+async def process_item_download_only(http: HttpClient, item: Dict[str, Any],
+                                     manifest: DownloadManifest, stats: DownloadStats):
     """
     Worker: fetch detail + download PDFs (disk I/O). No DB access here.
 
@@ -182,34 +222,151 @@ def process_item_download_only(item):
         return None, "failed", "Missing determina_id", 0, 0
 
     if str(typology).upper() == "MSF":
-        detail = fetch_msf_detail(item_id, pub_date)
+        detail = await fetch_msf_detail(http, item_id, pub_date)
         if not detail:
             return None, "failed", "MSF detail fetch failed", 0, 0
         return detail, "completed", None, 0, 0
 
-    detail = fetch_detail(item_id)
+    detail = await fetch_detail(http, item_id)
     if not detail:
         return None, "failed", "TNF detail fetch failed", 0, 0
 
     attachments = detail.get("allegati") or []
-    downloaded_any = False
-    downloaded_count = 0
+    jobs = []
     for att in attachments:
         att_id = att.get("id")
         att_name = att.get("nome", "unknown")
         if not att_id:
             continue
         filename = f"{item_id}_{att_id}_{_safe_filename(str(att_name))}.pdf"
-        ok = download_pdf(str(att_id), filename)
-        downloaded_any = downloaded_any or ok
-        if ok:
-            downloaded_count += 1
+        jobs.append(download_pdf(http, str(att_id), filename, manifest, stats))
+    results = await asyncio.gather(*jobs)
+    downloaded_count = sum(1 for ok in results if ok)
 
     if not attachments:
         return detail, "completed", "No attachments", 0, 0
-    if not downloaded_any:
+    if not downloaded_count:
         return detail, "failed", "No PDFs downloaded", 0, len(attachments)
     return detail, "completed", None, downloaded_count, len(attachments)
 
+
+async def _writer(repo: ItalyRepository, manifest: DownloadManifest,
+                  results: "asyncio.Queue", done: asyncio.Event) -> None:
+    """Single DB writer: batches detail updates and progress marks."""
+    details: List[Tuple[str, Any]] = []
+    progress: List[Tuple[str, str, Optional[str]]] = []
+
+    async def flush() -> None:
+        nonlocal details, progress
+        if not details and not progress:
+            return
+        batch_details, batch_progress, details, progress = details, progress, [], []
+        try:
+            # Detail first: a progress row marked completed always has its payload
+            await asyncio.to_thread(repo.update_determina_details, batch_details)
+            await asyncio.to_thread(repo.mark_progress_batch, 2, STEP_NAME, batch_progress)
+            await asyncio.to_thread(manifest.save)
+        except Exception as e:
+            logger.error("Step 2: failed to write %s results: %s", len(batch_progress), e)
+
+    while not (done.is_set() and results.empty()):
+        try:
+            item_id, detail, status, msg = await asyncio.wait_for(results.get(), timeout=FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            await flush()
+            continue
+        if detail is not None:
+            details.append((item_id, detail))
+        progress.append((item_id, status, msg))
+        if len(progress) >= WRITE_BATCH:
+            await flush()
+    await flush()
+
+
+async def run_downloads(repo: ItalyRepository, pending: List[Dict[str, Any]]) -> Dict[str, int]:
+    PDF_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = DownloadManifest(MANIFEST_PATH)
+    stats = DownloadStats()
+    counts = {"completed": 0, "failed": 0, "pdf_downloaded": 0, "attachment_seen": 0}
+
+    work: "asyncio.Queue" = asyncio.Queue()
+    for item in pending:
+        work.put_nowait(item)
+    results: "asyncio.Queue" = asyncio.Queue(maxsize=WRITE_BATCH * 4)
+    workers_done = asyncio.Event()
+
+    async def worker() -> None:
+        while True:
+            try:
+                item = work.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            item_id = item.get("determina_id")
+            try:
+                detail, status, msg, pdf_cnt, att_cnt = await process_item_download_only(http, item, manifest, stats)
+            except Exception as e:
+                logger.error("Error processing %s: %s", item_id, e)
+                detail, status, msg, pdf_cnt, att_cnt = None, "failed", str(e), 0, 0
+            if item_id:
+                await results.put((item_id, detail, status, msg))
+            counts["completed" if status == "completed" else "failed"] += 1
+            counts["pdf_downloaded"] += int(pdf_cnt or 0)
+            counts["attachment_seen"] += int(att_cnt or 0)
+            processed = counts["completed"] + counts["failed"]
+            if processed % 100 == 0:
+                logger.info("Step 2: %s/%s determinas | %s", processed, len(pending), stats.summary())
+
+    async with HttpClient(headers=dict(HEADERS), timeout=60.0, retries=HTTP_RETRIES,
+                          max_connections=MAX_CONNECTIONS, max_per_host=MAX_PER_HOST) as http:
+        writer = asyncio.create_task(_writer(repo, manifest, results, workers_done))
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, CONCURRENCY))))
+        finally:
+            workers_done.set()
+            await writer
+
+    logger.info("Step 2 transfer: %s", stats.summary())
+    counts.update({
+        "files_skipped": stats.files_skipped,
+        "bytes_downloaded": stats.bytes_downloaded,
+    })
+    return counts
+
+
+def main():
+    run_id = os.environ.get("ITALY_RUN_ID", "manual_run")
+    db = CountryDB("Italy")
+    repo = ItalyRepository(db, run_id)
+
+    items = repo.get_determinas()
+    completed = set(repo.get_completed_keys(2))
+    pending = [it for it in items if it.get("determina_id") and it.get("determina_id") not in completed]
+    logger.info("Step 2: Downloading sources for %s/%s determinas (pending/total)", len(pending), len(items))
+
+    counts = asyncio.run(run_downloads(repo, pending))
+
+    try:
+        repo.upsert_stat("*", 2, "items_total", len(items))
+        repo.upsert_stat("*", 2, "items_pending", len(pending))
+        repo.upsert_stat("*", 2, "completed", counts["completed"])
+        repo.upsert_stat("*", 2, "failed", counts["failed"])
+        repo.upsert_stat("*", 2, "attachments_seen", counts["attachment_seen"])
+        repo.upsert_stat("*", 2, "pdf_downloaded", counts["pdf_downloaded"])
+        repo.upsert_stat("*", 2, "pdf_skipped", counts["files_skipped"])
+        repo.upsert_stat("*", 2, "bytes_downloaded", counts["bytes_downloaded"])
+        repo.refresh_step2_stats_by_keyword()
+    except Exception as e:
+        logger.warning("Could not persist Step 2 stats: %s", e)
+
+    logger.info(
+        "Step 2 summary: completed=%s failed=%s pdf_downloaded=%s pdf_skipped=%s attachments_seen=%s",
+        counts["completed"],
+        counts["failed"],
+        counts["pdf_downloaded"],
+        counts["files_skipped"],
+        counts["attachment_seen"],
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -4,16 +4,27 @@ Step 3: Extract AIC + price data.
 
 - PDFs are parsed from disk (output/Italy/pdfs/).
 - MSF details are parsed from DB (it_determinas.detail); no JSON files are used.
+
+Parsing runs in a process pool (pdfplumber is CPU-bound). Each source is
+tracked in it_step_progress under a content-hash key, so a re-run of the
+same run_id skips PDFs/details that were already extracted unchanged. A
+single writer streams finished sources to the DB in batches; a source's
+rows and its progress mark are committed together.
 """
 
-import concurrent.futures
+import hashlib
 import json
 import logging
 import os
+import queue
 import re
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import pdfplumber
 
@@ -23,14 +34,21 @@ _italy_dir = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(_repo_root))
 sys.path.insert(0, str(_italy_dir))
 
+from core.concurrency.pipeline_stats import PipelineStats
 from core.db.connection import CountryDB
+from core.parsing.pdf_pages import file_sha256
 from db.repositories import ItalyRepository
-from config_loader import get_output_dir
+from config_loader import get_output_dir, getenv_bool, getenv_float, getenv_int
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 PDF_DIR = get_output_dir("pdfs")
+STEP_NAME = "Extract Data"
+PARSE_PROCESSES = getenv_int("STEP3_PARSE_PROCESSES", 0)        # 0 = one per core
+WRITE_BATCH_ROWS = getenv_int("STEP3_WRITE_BATCH_ROWS", 500)
+WRITE_FLUSH_SECONDS = getenv_float("STEP3_WRITE_FLUSH_SECONDS", 5.0)
+STEP3_FRESH = getenv_bool("STEP3_FRESH", False)                # clear step 3 data and re-extract all
 _CURRENCY_RE = r"(?:€|EUR|â‚¬)"
 
 
@@ -40,74 +58,70 @@ def clean_text(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def parse_pdf(pdf_path: Path) -> List[Dict[str, Any]]:
+def _extract_pdf_items(pdf_path: Path) -> List[Dict[str, Any]]:
     extracted_items: List[Dict[str, Any]] = []
     filename = pdf_path.name
     parts = filename.split("_")
     item_id = parts[0] if parts else None
 
-    try:
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            full_text_parts: List[str] = []
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                if page_text:
-                    full_text_parts.append(page_text)
-            text = "\n".join(full_text_parts).replace("\n", "  ")
-
-        aic_matches = list(re.finditer(r"AIC\s+n\.?\s*(\d{6,})", text, re.IGNORECASE))
-        for match in aic_matches:
-            aic = match.group(1)
-            start_index = match.start()
-            context_start = max(0, start_index - 500)
-            context_end = min(len(text), start_index + 1000)
-            context = text[context_start:context_end]
-
-            item: Dict[str, Any] = {
-                "determina_id": item_id,
-                "aic": aic,
-                "source_pdf": filename,
-                "product_name": None,
-                "pack_description": None,
-                "price_ex_factory": None,
-                "price_public": None,
-            }
-
-            ex_factory_match = re.search(
-                rf"Prezzo\s+ex[- ]?factory.{{0,100}}?{_CURRENCY_RE}\s*([\d,.]+)",
-                context,
-                re.IGNORECASE | re.DOTALL,
-            )
-            if ex_factory_match:
-                try:
-                    val_str = ex_factory_match.group(1).replace(".", "").replace(",", ".")
-                    item["price_ex_factory"] = float(val_str)
-                except ValueError:
-                    pass
-
-            public_match = re.search(
-                rf"Prezzo\s+al\s+pubblico.{{0,100}}?{_CURRENCY_RE}\s*([\d,.]+)",
-                context,
-                re.IGNORECASE | re.DOTALL,
-            )
-            if public_match:
-                try:
-                    val_str = public_match.group(1).replace(".", "").replace(",", ".")
-                    item["price_public"] = float(val_str)
-                except ValueError:
-                    pass
-
-            pre_aic_text = text[max(0, start_index - 300):start_index]
-            confezione_match = re.search(r"Confezione\s+(.*)", pre_aic_text, re.IGNORECASE)
-            if confezione_match:
-                conf_text = confezione_match.group(1).strip()
-                item["pack_description"] = clean_text(conf_text)
-                item["product_name"] = conf_text.split(" ")[0] if conf_text else None
-
-            extracted_items.append(item)
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        full_text_parts: List[str] = []
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            if page_text:
+                full_text_parts.append(page_text)
+        text = "\n".join(full_text_parts).replace("\n", "  ")
 
-    except Exception as e:
-        logger.error("Error parsing %s: %s", filename, e)
+    aic_matches = list(re.finditer(r"AIC\s+n\.?\s*(\d{6,})", text, re.IGNORECASE))
+    for match in aic_matches:
+        aic = match.group(1)
+        start_index = match.start()
+        context_start = max(0, start_index - 500)
+        context_end = min(len(text), start_index + 1000)
+        context = text[context_start:context_end]
+
+        item: Dict[str, Any] = {
+            "determina_id": item_id,
+            "aic": aic,
+            "source_pdf": filename,
+            "product_name": None,
+            "pack_description": None,
+            "price_ex_factory": None,
+            "price_public": None,
+        }
+
+        ex_factory_match = re.search(
+            rf"Prezzo\s+ex[- ]?factory.{{0,100}}?{_CURRENCY_RE}\s*([\d,.]+)",
+            context,
+            re.IGNORECASE | re.DOTALL,
+        )
+        if ex_factory_match:
+            try:
+                val_str = ex_factory_match.group(1).replace(".", "").replace(",", ".")
+                item["price_ex_factory"] = float(val_str)
+            except ValueError:
+                pass
+
+        public_match = re.search(
+            rf"Prezzo\s+al\s+pubblico.{{0,100}}?{_CURRENCY_RE}\s*([\d,.]+)",
+            context,
+            re.IGNORECASE | re.DOTALL,
+        )
+        if public_match:
+            try:
+                val_str = public_match.group(1).replace(".", "").replace(",", ".")
+                item["price_public"] = float(val_str)
+            except ValueError:
+                pass
+
+        pre_aic_text = text[max(0, start_index - 300):start_index]
+        confezione_match = re.search(r"Confezione\s+(.*)", pre_aic_text, re.IGNORECASE)
+        if confezione_match:
+            conf_text = confezione_match.group(1).strip()
+            item["pack_description"] = clean_text(conf_text)
+            item["product_name"] = conf_text.split(" ")[0] if conf_text else None
+
+        extracted_items.append(item)
 
     return extracted_items
 
@@ -164,12 +178,212 @@ def parse_msf_detail(determina_id: str, detail: Dict[str, Any]) -> List[Dict[str
     return extracted
 
 
+def extract_source(unit: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process-pool entry point: parse one PDF (unit["path"]) or MSF detail
+    (unit["detail"]). Returns the unit's identity plus products, error and
+    parse time in seconds.
+    """
+    t0 = time.perf_counter()
+    result = {k: v for k, v in unit.items() if k not in ("path", "detail")}
+    try:
+        if "path" in unit:
+            result["products"] = _extract_pdf_items(Path(unit["path"]))
+        else:
+            result["products"] = parse_msf_detail(unit["determina_id"], unit.get("detail") or {})
+        result["error"] = None
+    except Exception as e:
+        result["products"] = []
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - t0
+    return result
+
+
+def build_pdf_units(pdf_files: List[Path]) -> List[Dict[str, Any]]:
+    """One unit per PDF, keyed by content hash (hashing runs on a few threads)."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        hashes = list(pool.map(file_sha256, pdf_files))
+    units = []
+    for path, digest in zip(pdf_files, hashes):
+        name = path.name
+        units.append({
+            "progress_key": f"pdf:{digest}:{name}",
+            "name": name,
+            "determina_id": name.split("_")[0],
+            "source_pdf": name,
+            "path": str(path),
+        })
+    return units
+
+
+def build_msf_units(msf_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One unit per MSF detail payload, keyed by a hash of the payload."""
+    units = []
+    for row in msf_rows:
+        determina_id = row.get("determina_id")
+        if not determina_id:
+            continue
+        detail = row.get("detail") or {}
+        payload = detail if isinstance(detail, str) else json.dumps(detail, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        units.append({
+            "progress_key": f"msf:{digest}:{determina_id}",
+            "name": f"MSF {determina_id}",
+            "determina_id": determina_id,
+            "source_pdf": "MSF_DETAIL",
+            "detail": detail,
+        })
+    return units
+
+
+def _parse_units(units: List[Dict[str, Any]], processes: int,
+                 on_result: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Parse units in a process pool with a bounded number in flight, handing
+    each result to on_result as it completes. If the pool breaks, the units
+    it did not finish are parsed in-process.
+    """
+    remaining = list(reversed(units))
+    pending: Dict[Any, Dict[str, Any]] = {}
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            while remaining or pending:
+                while remaining and len(pending) < processes * 2:
+                    unit = remaining.pop()
+                    pending[pool.submit(extract_source, unit)] = unit
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    unit = pending.pop(fut)
+                    try:
+                        result = fut.result()
+                    except BrokenProcessPool:
+                        pending[fut] = unit
+                        raise
+                    on_result(result)
+    except BrokenProcessPool as e:
+        leftover = list(pending.values()) + list(reversed(remaining))
+        logger.warning("Parse pool broke (%s); parsing %s remaining sources in-process", e, len(leftover))
+        for unit in leftover:
+            on_result(extract_source(unit))
+
+
+class BatchWriter(threading.Thread):
+    """
+    Single DB writer: buffers parsed sources and saves them via
+    repo.save_extracted_sources once WRITE_BATCH_ROWS rows are pending or
+    WRITE_FLUSH_SECONDS have passed. Whole sources only, so each commit
+    covers complete files.
+    """
+
+    _DONE = object()
+
+    def __init__(self, repo: ItalyRepository, stats: PipelineStats,
+                 batch_rows: int, flush_seconds: float, queue_size: int):
+        super().__init__(name="step3-writer", daemon=True)
+        self.repo = repo
+        self.stats = stats
+        self.batch_rows = max(1, batch_rows)
+        self.flush_seconds = max(0.1, flush_seconds)
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self.inserted = 0
+        self.write_errors = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_rows = 0
+
+    def put(self, result: Dict[str, Any]) -> None:
+        self.queue.put(result)
+
+    def close(self) -> None:
+        self.queue.put(self._DONE)
+        self.join()
+
+    def run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                item = None
+            if item is self._DONE:
+                break
+            if item is not None:
+                self._pending.append(item)
+                self._pending_rows += len(item.get("products") or [])
+            if self._pending and (self._pending_rows >= self.batch_rows
+                                  or time.monotonic() - last_flush >= self.flush_seconds):
+                self._flush()
+                last_flush = time.monotonic()
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        t0 = time.monotonic()
+        try:
+            self.inserted += self.repo.save_extracted_sources(STEP_NAME, batch)
+            self.stats["write"].record(time.monotonic() - t0, items=len(batch))
+        except Exception as e:
+            # Nothing from this batch is marked completed, so a re-run retries it
+            self.write_errors += len(batch)
+            self.stats["write"].record(time.monotonic() - t0, items=len(batch), error=True)
+            logger.error("Step 3: failed to save %s sources: %s", len(batch), e)
+
+
+def run_extraction(repo: ItalyRepository, units: List[Dict[str, Any]],
+                   processes: int) -> Dict[str, Any]:
+    """Parse units in parallel and stream them to the writer; returns run metrics."""
+    stats = PipelineStats(["parse", "write"])
+    writer = BatchWriter(repo, stats, WRITE_BATCH_ROWS, WRITE_FLUSH_SECONDS, queue_size=processes * 4)
+    timings: List[tuple] = []
+    failed = 0
+    done = 0
+    started = time.monotonic()
+
+    def on_result(result: Dict[str, Any]) -> None:
+        nonlocal failed, done
+        done += 1
+        seconds = result.get("seconds", 0.0)
+        rows = len(result.get("products") or [])
+        stats["parse"].record(seconds, error=bool(result.get("error")))
+        timings.append((seconds, result["name"], rows))
+        if result.get("error"):
+            failed += 1
+            logger.warning("Step 3: %s failed after %.2fs: %s", result["name"], seconds, result["error"])
+        else:
+            logger.debug("Step 3: %s -> %s rows in %.2fs", result["name"], rows, seconds)
+        writer.put(result)
+        if done % 100 == 0 or done == len(units):
+            elapsed = max(time.monotonic() - started, 1e-9)
+            logger.info("Step 3: %s/%s sources (%.1f/s) | %s", done, len(units), done / elapsed, stats.summary())
+
+    writer.start()
+    try:
+        _parse_units(units, processes, on_result)
+    finally:
+        writer.close()
+
+    timings.sort(reverse=True)
+    for seconds, name, rows in timings[:5]:
+        logger.info("Step 3: slowest %s: %.2fs (%s rows)", name, seconds, rows)
+    parse_seconds = [t[0] for t in timings]
+    return {
+        "parsed": done,
+        "failed": failed,
+        "write_errors": writer.write_errors,
+        "inserted": writer.inserted,
+        "parse_seconds_total": sum(parse_seconds),
+        "parse_seconds_max": max(parse_seconds, default=0.0),
+        "stats": stats,
+    }
+
+
 def main() -> None:
     run_id = os.environ.get("ITALY_RUN_ID", "manual_run")
     db = CountryDB("Italy")
     repo = ItalyRepository(db, run_id)
 
-    pdf_files = list(PDF_DIR.glob("*.pdf")) if PDF_DIR.exists() else []
+    pdf_files = sorted(PDF_DIR.glob("*.pdf")) if PDF_DIR.exists() else []
     msf_rows = repo.get_determina_details_by_typology("MSF")
 
     logger.info(
@@ -178,42 +392,43 @@ def main() -> None:
         len(msf_rows),
     )
 
-    repo.clear_step_data(3)  # Clear previous extraction for this run
-
-    extracted_batch: List[Dict[str, Any]] = []
-    inserted_total = 0
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_key = {executor.submit(parse_pdf, p): str(p) for p in pdf_files}
-        future_to_key.update(
-            {
-                executor.submit(
-                    parse_msf_detail, row.get("determina_id"), row.get("detail") or {}
-                ): row.get("determina_id")
-                for row in msf_rows
-                if row.get("determina_id")
-            }
-        )
-
-        for future in concurrent.futures.as_completed(future_to_key):
-            items = future.result()
-            if items:
-                extracted_batch.extend(items)
+    if STEP3_FRESH:
+        repo.clear_step_data(3)  # Opt-in: drop previous extraction for this run
 
-            if len(extracted_batch) >= 100:
-                inserted_total += repo.insert_products(extracted_batch)
-                extracted_batch = []
+    units = build_pdf_units(pdf_files) + build_msf_units(msf_rows)
+    completed = set(repo.get_completed_keys(3))
+    todo = [u for u in units if u["progress_key"] not in completed]
+    skipped = len(units) - len(todo)
+    processes = PARSE_PROCESSES if PARSE_PROCESSES > 0 else (os.cpu_count() or 1)
+    logger.info(
+        "Step 3: %s sources to parse, %s unchanged and already extracted (skipped), %s parse processes",
+        len(todo), skipped, processes,
+    )
 
-    if extracted_batch:
-        inserted_total += repo.insert_products(extracted_batch)
+    metrics = run_extraction(repo, todo, processes) if todo else None
+    inserted_total = metrics["inserted"] if metrics else 0
 
     try:
-        repo.upsert_stat("*", 3, "products_inserted", inserted_total)
+        # The run's total, not just this invocation's: resumed runs skip sources
+        repo.upsert_stat("*", 3, "products_inserted", repo.count_products())
+        repo.upsert_stat("*", 3, "sources_skipped", skipped)
+        if metrics:
+            repo.upsert_stat("*", 3, "sources_parsed", metrics["parsed"])
+            repo.upsert_stat("*", 3, "sources_failed", metrics["failed"] + metrics["write_errors"])
+            repo.upsert_stat("*", 3, "parse_ms_total", int(metrics["parse_seconds_total"] * 1000))
+            repo.upsert_stat("*", 3, "parse_ms_max", int(metrics["parse_seconds_max"] * 1000))
         repo.refresh_step3_product_counts_by_keyword()
     except Exception as e:
         logger.warning("Could not persist Step 3 stats: %s", e)
 
-    logger.info("Step 3 Complete.")
+    if metrics:
+        logger.info(
+            "Step 3 Complete. parsed=%s failed=%s write_errors=%s skipped=%s inserted=%s | %s",
+            metrics["parsed"], metrics["failed"], metrics["write_errors"], skipped,
+            inserted_total, metrics["stats"].summary(),
+        )
+    else:
+        logger.info("Step 3 Complete. Nothing new to extract (%s sources skipped).", skipped)
 
 
 if __name__ == "__main__":
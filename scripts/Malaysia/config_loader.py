@@ -34,6 +34,14 @@ def getenv_float(key: str, default: float = 0.0) -> float: return config.getenv_
 def getenv_bool(key: str, default: bool = False) -> bool: return config.getenv_bool(key, default)
 def getenv_list(key: str, default: list = None) -> list: return config.getenv_list(key, default or [])
 
+# --- Shared browser pool ---
+def get_browser_state_dir():
+    """Persisted per-site browser storage state, or None when disabled."""
+    if not getenv_bool("BROWSER_STATE_PERSIST", True):
+        return None
+    custom = getenv("BROWSER_STATE_DIR", "")
+    return Path(custom) if custom else get_output_dir("browser_state")
+
 def require_env(key: str) -> str:
     val = getenv(key)
     if not val:
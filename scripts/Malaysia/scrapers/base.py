@@ -3,6 +3,10 @@
 Base scraper with Playwright stealth context, anti-bot init scripts,
 session rotation, and shared DB/run_id management.
 
+Browser sessions are leased from the shared BrowserPool (scrapers/browser_pool.py)
+unless BROWSER_POOL_ENABLED=false, so scrapers in one process share a Chromium
+and every run starts from the sites' persisted (Cloudflare-warmed) state.
+
 Includes memory leak fixes and resource monitoring from Argentina implementation.
 """
 
@@ -18,7 +22,8 @@ import atexit
 import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Set
+from typing import Any, Dict, Optional, Set
+from urllib.parse import urlparse
 
 # Add repo root to path for core imports (MUST be before any core imports)
 _repo_root = Path(__file__).resolve().parents[3]
@@ -237,8 +242,18 @@ class BaseScraper:
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
+        self._pool = None
+        self._lease = None
+        self._active_page: Optional[Page] = None
         self._page_count = 0
         self.max_pages_per_session = int(self.config.get("max_pages_per_session", 50))
+        # Site key for pooled contexts / persisted state; subclasses set it from their URL
+        self.session_key = self.scraper_name
+
+    @staticmethod
+    def site_key(url: str) -> str:
+        """Host of a URL, used as the browser-state key for that site."""
+        return urlparse(url).hostname or url
 
     @staticmethod
     def _infer_scraper_name() -> str:
@@ -269,7 +284,7 @@ class BaseScraper:
             from core.browser.chrome_instance_tracker import ChromeInstanceTracker
             from core.db.connection import CountryDB
             
-            pids = get_chrome_pids_from_playwright_browser(self._browser)
+            pids = get_chrome_pids_from_playwright_browser(self._browser, scraper_name=self.scraper_name)
             if pids and self.run_id:
                 try:
                     db = CountryDB(self.scraper_name)
@@ -383,10 +398,23 @@ class BaseScraper:
         
         return context_kwargs
 
-    def _create_context(self) -> BrowserContext:
-        """Create a new stealth browser context using standardized stealth profile."""
+    def _create_context(self, storage_state: Optional[Dict[str, Any]] = None,
+                        browser: Optional[Browser] = None) -> BrowserContext:
+        """
+        Create a new stealth browser context using standardized stealth profile.
+
+        storage_state is a persisted site state (see browser_pool.StateStore);
+        its cookies are loaded and its user agent kept, since Cloudflare
+        clearance is only valid for the user agent it was issued to.
+        """
+        from scrapers.browser_pool import playwright_state
+
         ctx_kwargs = self._context_options()
-        ctx = self._browser.new_context(**ctx_kwargs)
+        if storage_state:
+            ctx_kwargs["storage_state"] = playwright_state(storage_state)
+            if storage_state.get("user_agent"):
+                ctx_kwargs["user_agent"] = storage_state["user_agent"]
+        ctx = (browser or self._browser).new_context(**ctx_kwargs)
         
         # Apply standardized stealth init script
         try:
@@ -401,6 +429,18 @@ class BaseScraper:
         self._page_count = 0
         return ctx
 
+    def _pool_settings(self) -> Dict[str, Any]:
+        try:
+            from config_loader import getenv_bool, getenv_int, getenv_float, get_browser_state_dir
+        except ImportError:
+            return {"enabled": True, "size": 2, "state_dir": None, "state_max_age_s": 12 * 3600}
+        return {
+            "enabled": getenv_bool("BROWSER_POOL_ENABLED", True),
+            "size": getenv_int("BROWSER_POOL_SIZE", 2),
+            "state_dir": get_browser_state_dir(),
+            "state_max_age_s": getenv_float("BROWSER_STATE_MAX_AGE_HOURS", 12) * 3600,
+        }
+
     @contextmanager
     def browser_session(self, headless: bool = False):
         """
@@ -411,6 +451,46 @@ class BaseScraper:
             with self.browser_session() as page:
                 page.goto("https://example.com")
         """
+        settings = self._pool_settings()
+        session = self._pooled_session if settings.pop("enabled") else self._owned_session
+        with session(headless, settings) as page:
+            self._active_page = page
+            try:
+                yield page
+            finally:
+                self._active_page = None
+
+    @contextmanager
+    def _pooled_session(self, headless: bool, settings: Dict[str, Any]):
+        """Lease a warmed context from the process-wide browser pool."""
+        from scrapers.browser_pool import get_pool
+
+        pool = get_pool(headless=headless, launch_args=self._launch_args(), **settings)
+        if pool.start():
+            register_browser(pool.browser)
+            self._browser = pool.browser
+            self._track_playwright_chrome_pids()
+        elif pool.headless != headless:
+            logger.info("[BROWSER_POOL] Reusing running browser (headless=%s)", pool.headless)
+        self._pool = pool
+        try:
+            with pool.lease(self.session_key,
+                            lambda browser, state: self._create_context(state, browser)) as lease:
+                self._browser = pool.browser
+                self._lease = lease
+                self._context = lease.context
+                self._page_count = 1
+                yield lease.page
+        finally:
+            self._lease = None
+            self._context = None
+            self._browser = None
+            logger.info("[BROWSER_POOL] %s", pool.summary())
+            force_cleanup()
+
+    @contextmanager
+    def _owned_session(self, headless: bool, settings: Dict[str, Any]):
+        """Launch a private browser for this scraper only (pool disabled)."""
         self._playwright = sync_playwright().start()
         try:
             self._browser = self._playwright.chromium.launch(
@@ -446,6 +526,21 @@ class BaseScraper:
             # PERFORMANCE FIX: Force cleanup after browser session
             force_cleanup()
 
+    def _rotate_context(self) -> BrowserContext:
+        """Replace the current context; a pooled one keeps its saved site state."""
+        if self._lease is not None:
+            self._context = self._lease.rotate()
+        else:
+            old = self._context
+            self._context = self._create_context()
+            if old:
+                try:
+                    old.close()
+                except Exception:
+                    pass
+        force_cleanup()
+        return self._context
+
     def new_page(self) -> Page:
         """Get a new page, rotating context if needed."""
         self._page_count += 1
@@ -461,44 +556,41 @@ class BaseScraper:
                 logger.warning("[MEMORY] Memory limit exceeded, forcing context rotation")
                 # Force context rotation
                 if self._browser:
-                    old = self._context
-                    self._context = self._create_context()
-                    if old:
-                        try:
-                            old.close()
-                        except Exception:
-                            pass
-                    # Force cleanup after rotation
-                    force_cleanup()
+                    self._rotate_context()
         
         if self._page_count > self.max_pages_per_session and self._browser:
             logger.info("Session rotation: creating new context after %d pages",
                         self._page_count - 1)
-            old = self._context
-            self._context = self._create_context()
-            if old:
-                try:
-                    old.close()
-                except Exception:
-                    pass
-            # PERFORMANCE FIX: Force cleanup after rotation
-            force_cleanup()
-        
+            self._rotate_context()
+
         return self._context.new_page()
 
     # ------------------------------------------------------------------
     # Human-like helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def pause(min_s: float = 0.3, max_s: float = 1.0):
+    def _idle(self, seconds: float, page: Optional[Page] = None):
+        """
+        Wait without starving Playwright: page.wait_for_timeout keeps the
+        driver dispatching events (downloads, responses, other leased pages)
+        where time.sleep would block them.
+        """
+        page = page or self._active_page
+        if page is not None:
+            try:
+                page.wait_for_timeout(seconds * 1000)
+                return
+            except Exception:
+                pass
+        time.sleep(seconds)
+
+    def pause(self, min_s: float = 0.3, max_s: float = 1.0):
         """Random pause to mimic human behavior."""
-        time.sleep(random.uniform(min_s, max_s))
+        self._idle(random.uniform(min_s, max_s))
 
-    @staticmethod
-    def long_pause(min_s: float = 1.5, max_s: float = 3.5):
+    def long_pause(self, min_s: float = 1.5, max_s: float = 3.5):
         """Longer pause for page loads."""
-        time.sleep(random.uniform(min_s, max_s))
+        self._idle(random.uniform(min_s, max_s))
 
     @staticmethod
     def type_delay_ms() -> int:
@@ -523,12 +615,13 @@ class BaseScraper:
         """
         start = time.time()
         check_interval = 2.0
+        seen = False
 
         while time.time() - start < timeout_s:
             try:
                 body_text = page.evaluate("document.body?.innerText || ''").lower()
             except Exception:
-                time.sleep(check_interval)
+                self._idle(check_interval, page)
                 continue
 
             is_challenge = any(kw in body_text for kw in [
@@ -537,15 +630,23 @@ class BaseScraper:
             ])
 
             if not is_challenge:
-                logger.info("Cloudflare verification passed (%.1fs)",
-                            time.time() - start)
+                elapsed = time.time() - start
+                logger.info("Cloudflare verification passed (%.1fs%s)",
+                            elapsed, "" if seen else ", no challenge")
+                self._record_challenge(elapsed, seen, True)
                 return True
 
-            time.sleep(check_interval)
+            seen = True
+            self._idle(check_interval, page)
 
         logger.warning("Cloudflare verification timed out after %.0fs", timeout_s)
+        self._record_challenge(time.time() - start, True, False)
         return False
 
+    def _record_challenge(self, seconds: float, seen: bool, passed: bool):
+        if self._pool is not None:
+            self._pool.record_challenge(seconds, seen, passed)
+
     def wait_for_table_stable(self, page: Page, row_selector: str,
                               checks: int = 3, interval: float = 2.0,
                               timeout: float = 60.0) -> int:
@@ -572,7 +673,7 @@ class BaseScraper:
             else:
                 stable_count = 0
             last_count = current
-            time.sleep(interval)
+            self._idle(interval, page)
 
         logger.warning("Table stability timeout after %.0fs (last count: %d)",
                         timeout, last_count)
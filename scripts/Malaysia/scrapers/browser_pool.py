@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Shared Playwright browser pool for the Malaysia scrapers.
+
+One Chromium process per pipeline process with up to ``size`` reusable
+browser contexts. Each context is bound to a site key (the host it scrapes)
+and is created from that site's persisted storage state, so Cloudflare
+clearance cookies and local storage survive between scrapers and between
+runs: a warmed site skips the challenge instead of sitting through it again.
+
+Scrapers lease a context + fresh page, and on release the context's state is
+written back to ``<state_dir>/<key>.json``. Pages are closed on release; the
+context (and its cookies) stays open for the next lease of the same site.
+
+Playwright's sync API is thread-affine: leases must be taken from the thread
+that started the pool. Several leases may be open at once (up to ``size``).
+
+Usage:
+    pool = get_pool(size=2, headless=False, state_dir=out / "browser_state")
+    pool.start()
+    with pool.lease("quest3plus.bpfk.gov.my", create_context) as lease:
+        lease.page.goto(url)
+    logger.info(pool.summary())
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Playwright storage_state keys; anything else in the state file is ours
+_STATE_KEYS = ("cookies", "origins")
+
+ContextFactory = Callable[[Any, Optional[Dict[str, Any]]], Any]
+
+
+def _safe_key(key: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-._" else "_" for ch in key) or "default"
+
+
+class StateStore:
+    """Per-site storage state files: ``<state_dir>/<key>.json``."""
+
+    def __init__(self, state_dir: Union[str, Path, None], max_age_s: float = 12 * 3600):
+        self.state_dir = Path(state_dir) if state_dir else None
+        self.max_age_s = max_age_s
+
+    def path(self, key: str) -> Optional[Path]:
+        if self.state_dir is None:
+            return None
+        return self.state_dir / f"{_safe_key(key)}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Saved state for a site, or None if missing, unreadable or stale."""
+        path = self.path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            if self.max_age_s and time.time() - path.stat().st_mtime > self.max_age_s:
+                logger.info("[BROWSER_POOL] Ignoring stale browser state %s", path.name)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("[BROWSER_POOL] Ignoring unreadable browser state %s: %s", path, e)
+            return None
+        return state if isinstance(state, dict) else None
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        path = self.path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+
+def playwright_state(state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The part of a saved state that new_context(storage_state=...) accepts."""
+    if not state:
+        return None
+    return {k: state.get(k) or [] for k in _STATE_KEYS}
+
+
+def apply_state_to_session(session, state: Optional[Dict[str, Any]], host: str) -> int:
+    """
+    Copy a site's saved browser cookies (and the user agent they were issued
+    to) onto a requests.Session. Returns the number of cookies applied.
+    """
+    if not state:
+        return 0
+    applied = 0
+    now = time.time()
+    for cookie in state.get("cookies") or []:
+        domain = (cookie.get("domain") or "").lstrip(".")
+        if not domain or not (host == domain or host.endswith("." + domain)):
+            continue
+        expires = cookie.get("expires", -1)
+        if expires not in (None, -1) and expires < now:
+            continue
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"),
+                            path=cookie.get("path") or "/")
+        applied += 1
+    # cf_clearance is only honoured for the user agent it was issued to
+    if applied and state.get("user_agent"):
+        session.headers["User-Agent"] = state["user_agent"]
+    return applied
+
+
+class _Slot:
+    __slots__ = ("index", "key", "context", "factory", "user_agent",
+                 "leased", "leased_at", "busy_seconds", "leases", "last_used")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.key: Optional[str] = None
+        self.context = None
+        self.factory: Optional[ContextFactory] = None
+        self.user_agent: Optional[str] = None
+        self.leased = False
+        self.leased_at = 0.0
+        self.busy_seconds = 0.0
+        self.leases = 0
+        self.last_used = 0.0
+
+
+class Lease:
+    """A leased context and the page opened for it."""
+
+    def __init__(self, pool: "BrowserPool", slot: _Slot, page):
+        self._pool = pool
+        self._slot = slot
+        self.page = page
+
+    @property
+    def key(self) -> str:
+        return self._slot.key
+
+    @property
+    def context(self):
+        return self._slot.context
+
+    def rotate(self):
+        """Replace the context (keeping its saved state); returns the new context."""
+        return self._pool._rotate(self._slot)
+
+
+class BrowserPool:
+    """One browser, ``size`` site-bound contexts with persisted storage state."""
+
+    def __init__(self,
+                 size: int = 2,
+                 headless: bool = False,
+                 launch_args: Optional[List[str]] = None,
+                 state_dir: Union[str, Path, None] = None,
+                 state_max_age_s: float = 12 * 3600,
+                 acquire_timeout_s: float = 60.0):
+        """
+        Args:
+            size: Maximum contexts open at once
+            headless: Launch Chromium headless (first start wins)
+            launch_args: Chromium command-line switches
+            state_dir: Where per-site storage state is persisted; None disables it
+            state_max_age_s: Saved state older than this is not reused
+            acquire_timeout_s: How long lease() waits for a free context
+        """
+        self.size = max(1, int(size))
+        self.headless = headless
+        self.launch_args = list(launch_args or [])
+        self.store = StateStore(state_dir, state_max_age_s)
+        self.acquire_timeout_s = acquire_timeout_s
+        self.browser = None
+        self._playwright = None
+        self._slots = [_Slot(i) for i in range(self.size)]
+        self._cond = threading.Condition()
+        self._started_at = time.monotonic()
+        self.stats: Dict[str, float] = {
+            "leases": 0,
+            "warm_leases": 0,          # served by a context already open for the site
+            "contexts_created": 0,
+            "states_restored": 0,      # contexts created from a persisted state file
+            "states_saved": 0,
+            "peak_in_use": 0,
+            "acquire_wait_s": 0.0,
+            "challenge_checks": 0,
+            "challenges_seen": 0,
+            "challenge_timeouts": 0,
+            "challenge_wait_s": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Launch the browser if needed. Returns True when it was launched now."""
+        if self.browser is not None:
+            return False
+        from playwright.sync_api import sync_playwright
+
+        t0 = time.monotonic()
+        self._playwright = sync_playwright().start()
+        try:
+            self.browser = self._playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+        except Exception:
+            self._playwright.stop()
+            self._playwright = None
+            raise
+        self._started_at = time.monotonic()
+        logger.info("[BROWSER_POOL] Browser launched in %.1fs (size=%d, headless=%s)",
+                    time.monotonic() - t0, self.size, self.headless)
+        return True
+
+    def close(self) -> None:
+        """Persist every context's state, then close contexts, browser and Playwright."""
+        for slot in self._slots:
+            if slot.context is not None:
+                self._save_state(slot)
+                self._close_context(slot)
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    # ------------------------------------------------------------------
+    # Leasing
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def lease(self, key: str, factory: ContextFactory) -> Iterator[Lease]:
+        """
+        Check out a context for ``key`` with a fresh page.
+
+        ``factory(browser, storage_state)`` builds a context; storage_state is
+        the site's saved state (or None) and must be passed to new_context.
+        """
+        if self.browser is None:
+            raise RuntimeError("BrowserPool.start() must be called before lease()")
+        slot = self._acquire(key)
+        try:
+            if slot.context is None or slot.key != key:
+                self._bind(slot, key, factory)
+            else:
+                self.stats["warm_leases"] += 1
+            slot.factory = factory
+            page = slot.context.new_page()
+            yield Lease(self, slot, page)
+        finally:
+            self._release(slot)
+
+    def _acquire(self, key: str) -> _Slot:
+        t0 = time.monotonic()
+        deadline = t0 + self.acquire_timeout_s
+        with self._cond:
+            while True:
+                slot = self._pick(key)
+                if slot is not None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"No free browser context for {key!r} after "
+                                       f"{self.acquire_timeout_s:.0f}s (pool size {self.size})")
+                self._cond.wait(remaining)
+            slot.leased = True
+            slot.leased_at = time.monotonic()
+            slot.leases += 1
+            self.stats["leases"] += 1
+            self.stats["acquire_wait_s"] += slot.leased_at - t0
+            in_use = sum(1 for s in self._slots if s.leased)
+            self.stats["peak_in_use"] = max(self.stats["peak_in_use"], in_use)
+            return slot
+
+    def _pick(self, key: str) -> Optional[_Slot]:
+        idle = [s for s in self._slots if not s.leased]
+        if not idle:
+            return None
+        for s in idle:
+            if s.context is not None and s.key == key:
+                return s
+        for s in idle:
+            if s.context is None:
+                return s
+        # Evict the least recently used idle context of another site
+        return min(idle, key=lambda s: s.last_used)
+
+    def _release(self, slot: _Slot) -> None:
+        if slot.context is not None:
+            self._save_state(slot)
+            for page in list(slot.context.pages):
+                try:
+                    page.close()
+                except Exception:
+                    pass
+        with self._cond:
+            now = time.monotonic()
+            slot.busy_seconds += now - slot.leased_at
+            slot.last_used = now
+            slot.leased = False
+            self._cond.notify()
+
+    def _bind(self, slot: _Slot, key: str, factory: ContextFactory) -> None:
+        """(Re)create the slot's context for a site from its persisted state."""
+        if slot.context is not None:
+            self._save_state(slot)
+            self._close_context(slot)
+        state = self.store.load(key)
+        slot.context = factory(self.browser, state)
+        slot.key = key
+        slot.user_agent = (state or {}).get("user_agent")
+        self.stats["contexts_created"] += 1
+        if state:
+            self.stats["states_restored"] += 1
+            logger.info("[BROWSER_POOL] Restored browser state for %s (%d cookies)",
+                        key, len(state.get("cookies") or []))
+
+    def _rotate(self, slot: _Slot):
+        self._bind(slot, slot.key, slot.factory)
+        return slot.context
+
+    def _save_state(self, slot: _Slot) -> None:
+        if self.store.state_dir is None or slot.context is None:
+            return
+        try:
+            if not slot.user_agent and slot.context.pages:
+                slot.user_agent = slot.context.pages[0].evaluate("navigator.userAgent")
+            state = dict(slot.context.storage_state())
+            if slot.user_agent:
+                state["user_agent"] = slot.user_agent
+            self.store.save(slot.key, state)
+            self.stats["states_saved"] += 1
+        except Exception as e:
+            logger.debug("[BROWSER_POOL] Could not save browser state for %s: %s", slot.key, e)
+
+    @staticmethod
+    def _close_context(slot: _Slot) -> None:
+        try:
+            slot.context.close()
+        except Exception:
+            pass
+        slot.context = None
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def record_challenge(self, seconds: float, seen: bool, passed: bool) -> None:
+        """Account one Cloudflare check: time spent and whether a challenge was shown."""
+        with self._cond:
+            self.stats["challenge_checks"] += 1
+            self.stats["challenge_wait_s"] += seconds
+            if seen:
+                self.stats["challenges_seen"] += 1
+            if not passed:
+                self.stats["challenge_timeouts"] += 1
+
+    def utilization(self) -> float:
+        """Share of pool capacity (size x wall time) spent leased."""
+        now = time.monotonic()
+        with self._cond:
+            busy = sum(s.busy_seconds + (now - s.leased_at if s.leased else 0.0) for s in self._slots)
+        return busy / max(self.size * (now - self._started_at), 1e-9)
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"utilization={self.utilization():.0%}, leases={s['leases']} "
+                f"(warm {s['warm_leases']}), peak_in_use={s['peak_in_use']}/{self.size}, "
+                f"contexts_created={s['contexts_created']}, states_restored={s['states_restored']}, "
+                f"acquire_wait={s['acquire_wait_s']:.1f}s, challenges={s['challenges_seen']}/"
+                f"{s['challenge_checks']} checks, challenge_wait={s['challenge_wait_s']:.1f}s, "
+                f"challenge_timeouts={s['challenge_timeouts']}")
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(**kwargs) -> BrowserPool:
+    """Process-wide pool; kwargs only apply when it is first created."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(**kwargs)
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        if pool.stats["leases"]:
+            logger.info("[BROWSER_POOL] %s", pool.summary())
+        pool.close()
+
+
+atexit.register(close_pool)
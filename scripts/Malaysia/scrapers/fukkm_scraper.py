@@ -151,8 +151,22 @@ class FUKKMScraper:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         except Exception:
             pass
+        self._apply_browser_state(s)
         return s
 
+    def _apply_browser_state(self, session: requests.Session) -> None:
+        """Reuse cookies the browser pool saved for this host (MyPriMe shares it)."""
+        try:
+            from config_loader import get_browser_state_dir, getenv_float
+            from scrapers.browser_pool import StateStore, apply_state_to_session
+        except ImportError:
+            return
+        host = urlparse(self.base_url).hostname or ""
+        store = StateStore(get_browser_state_dir(), getenv_float("BROWSER_STATE_MAX_AGE_HOURS", 12) * 3600)
+        applied = apply_state_to_session(session, store.load(host), host)
+        if applied:
+            print(f"[FUKKM] Reusing {applied} saved browser cookie(s) for {host}", flush=True)
+
     def _fetch_html(self, session: requests.Session, url: str, retries: int = 3) -> str:
         """Fetch HTML with retry on network errors and SSL fallback."""
         last_err = None
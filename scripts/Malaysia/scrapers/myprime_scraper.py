@@ -37,6 +37,7 @@ class MyPriMeScraper(BaseScraper):
     def __init__(self, run_id: str, db, config: dict = None):
         super().__init__(run_id, db, config)
         self.url = config.get("SCRIPT_01_URL", "https://pharmacy.moh.gov.my/ms/apps/drug-price")
+        self.session_key = self.site_key(self.url)
         self.wait_timeout = float(config.get("SCRIPT_01_WAIT_TIMEOUT", 20))
         self.table_selector = config.get("SCRIPT_01_TABLE_SELECTOR", "table.tinytable")
         self.header_selector = config.get("SCRIPT_01_HEADER_SELECTOR", "thead th")
@@ -160,7 +161,7 @@ class MyPriMeScraper(BaseScraper):
             # Wait additional time for content
             print("  -> Target content not yet detected, waiting...", flush=True)
             for i in range(5):
-                time.sleep(2)
+                self._idle(2)
                 content = page.content().lower()
                 if any(ind in content for ind in indicators):
                     print("  -> Target page content now detected", flush=True)
@@ -59,6 +59,7 @@ class Quest3Scraper(BaseScraper):
         super().__init__(run_id, db, config)
         self.search_url = config.get("SCRIPT_02_SEARCH_URL",
                                      "https://quest3plus.bpfk.gov.my/pmo2/index.php")
+        self.session_key = self.site_key(self.search_url)
         self.detail_url_tpl = config.get("SCRIPT_02_DETAIL_URL",
                                          "https://quest3plus.bpfk.gov.my/pmo2/detail.php?type=product&id={}")
         self.page_timeout = int(config.get("SCRIPT_02_PAGE_TIMEOUT", 60000))
@@ -241,7 +242,7 @@ class Quest3Scraper(BaseScraper):
             print(f"[PROGRESS] Bulk search: {i+1}/{total} ({pct}%)", flush=True)
 
             if self.search_delay > 0:
-                time.sleep(self.search_delay)
+                self._idle(self.search_delay)
 
         if retry_items and self.bulk_retry_missing > 0:
             for attempt in range(1, self.bulk_retry_missing + 1):
@@ -276,7 +277,7 @@ class Quest3Scraper(BaseScraper):
             if status in retry_statuses:
                 remaining.append(item)
             if self.search_delay > 0:
-                time.sleep(self.search_delay)
+                self._idle(self.search_delay)
         return remaining
 
     def _process_bulk_keyword(self, page: Page, repo, keyword: str, index: int,
@@ -318,7 +319,7 @@ class Quest3Scraper(BaseScraper):
             )
             repo.mark_progress(2, "Product Details", progress_key, "failed", str(e))
             print(f"[ERROR] Bulk search failed for {keyword}: {e}", flush=True)
-            time.sleep(1.0)
+            self._idle(1.0)
             return "error"
 
     def _search_keyword(self, page: Page, keyword: str, index: int) -> Dict[str, Any]:
@@ -478,7 +479,7 @@ class Quest3Scraper(BaseScraper):
                 break
             if now >= deadline:
                 break
-            time.sleep(0.5)
+            self._idle(0.5)
 
     def _wait_for_table_data_loaded(self, page: Page, row_selector: str,
                                     timeout_s: float = 60.0):
@@ -499,11 +500,11 @@ class Quest3Scraper(BaseScraper):
             else:
                 stable = 0
             last = count
-            time.sleep(1.0)
+            self._idle(1.0)
 
         # Additional data-load wait
         if self.data_load_wait > 0:
-            time.sleep(self.data_load_wait)
+            self._idle(self.data_load_wait)
 
     def _count_visible_rows(self, page: Page, row_selector: str) -> int:
         """Count visible data rows in the result table."""
@@ -558,7 +559,7 @@ class Quest3Scraper(BaseScraper):
                         return
             except Exception:
                 pass
-            time.sleep(0.5)
+            self._idle(0.5)
 
     def _persist_bulk_csv(self, tmp_path: str, index: int, keyword: str) -> Optional[Path]:
         """Copy the downloaded CSV into the output folder for audit."""
@@ -682,24 +683,19 @@ class Quest3Scraper(BaseScraper):
             # Verify the page is healthy with a simple navigation
             new_page.goto("about:blank", timeout=10000)
             print("[RECOVERY] Created fresh page from existing context", flush=True)
+            self._active_page = new_page
             return new_page
         except Exception as ctx_err:
             logger.warning("Context also corrupted: %s — recycling context", ctx_err)
 
         # Step 3: Context is dead — create a whole new context
         try:
-            old_ctx = self._context
-            self._context = self._create_context()
+            self._rotate_context()
             self._context.set_default_timeout(self.page_timeout)
-            try:
-                old_ctx.close()
-            except Exception:
-                pass
             new_page = self._context.new_page()
             new_page.goto("about:blank", timeout=10000)
             print("[RECOVERY] Created fresh browser context + page", flush=True)
-            import gc
-            gc.collect()
+            self._active_page = new_page
             return new_page
         except Exception as fatal_err:
             logger.error("Failed to recover browser: %s", fatal_err)
@@ -773,7 +769,7 @@ class Quest3Scraper(BaseScraper):
                     if consecutive_crashes >= self.MAX_CONSECUTIVE_CRASHES:
                         print(f"[CRASH] {consecutive_crashes} consecutive crashes — "
                               f"cooling down {self.CRASH_COOLDOWN_SECONDS}s", flush=True)
-                        time.sleep(self.CRASH_COOLDOWN_SECONDS)
+                        self._idle(self.CRASH_COOLDOWN_SECONDS)
                         consecutive_crashes = 0  # Reset after cooldown
 
                     try:
@@ -794,9 +790,9 @@ class Quest3Scraper(BaseScraper):
                         search_method="individual",
                     )
 
-            time.sleep(1.0)
+            self._idle(1.0)
             if self.individual_delay > 0:
-                time.sleep(self.individual_delay)
+                self._idle(self.individual_delay)
 
         return page
 
@@ -242,7 +242,7 @@ async def collect_fk_urls(
         chrome_pids: Set[int] = set()
         if _PID_TRACKER_AVAILABLE:
             try:
-                chrome_pids = get_chrome_pids_from_playwright_browser(browser)
+                chrome_pids = get_chrome_pids_from_playwright_browser(browser, scraper_name=SCRIPT_ID)
                 if chrome_pids:
                     save_chrome_pids(SCRIPT_ID, _repo_root, chrome_pids)
                     log.info(f"Tracked {len(chrome_pids)} Playwright browser PIDs")
@@ -4,7 +4,9 @@
 Netherlands FK - Reimbursement Detail Scraping (Step 3)
 
 Fetches each FK detail page, parses composition/indications/reimbursement data.
-Uses httpx.AsyncClient + asyncio.Queue worker pool.
+Pipeline: keyset-paged URL feeder -> httpx fetch workers -> process-pool
+parsing (native lxml) -> single batched DB writer (rows, URL statuses,
+request logs). All DB calls run on one dedicated thread.
 Stores raw Dutch text in nl_fk_reimbursement (translation is Step 4).
 """
 
@@ -16,6 +18,8 @@ import random
 import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -33,7 +37,10 @@ if hasattr(sys.stdout, "reconfigure"):
 
 import httpx
 from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 
+from core.concurrency.pipeline_stats import PipelineStats
 from core.utils.logger import get_logger
 from core.db.postgres_connection import get_db
 from core.pipeline.standalone_checkpoint import run_with_checkpoint
@@ -286,11 +293,21 @@ def parse_indications_by_population(soup: BeautifulSoup) -> Dict[str, List[str]]
     return out
 
 
-def derive_reimbursement_rows(html_text: str, url: str) -> List[Dict]:
-    """Parse a detail page into reimbursement row dicts (raw Dutch, no translation)."""
-    soup = BeautifulSoup(html_text, "lxml")
-    all_variants = parse_all_compositions(soup)
-    indications = parse_indications_by_population(soup)
+def derive_reimbursement_rows(html_text: str, url: str, parser: str = "lxml") -> List[Dict]:
+    """
+    Parse a detail page into reimbursement row dicts (raw Dutch, no translation).
+
+    parser="lxml" walks the tree with lxml XPath directly; any other value
+    is a BeautifulSoup builder ("bs4" means BeautifulSoup on lxml).
+    """
+    if parser == "lxml":
+        doc = _lx_document(html_text)
+        all_variants = _lx_compositions(doc)
+        indications = _lx_indications(doc)
+    else:
+        soup = BeautifulSoup(html_text, "lxml" if parser == "bs4" else parser)
+        all_variants = parse_all_compositions(soup)
+        indications = parse_indications_by_population(soup)
 
     rows: List[Dict] = []
     for core in all_variants:
@@ -339,130 +356,412 @@ def derive_reimbursement_rows(html_text: str, url: str) -> List[Dict]:
     return rows
 
 
+# ---------------------------------------------------------------
+# Native lxml parsing (default backend; same output as the soup path)
+# ---------------------------------------------------------------
+
+def _xp_class(tag: str, cls: str) -> str:
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+def _lx_text(el) -> str:
+    """norm_space(el.get_text(" ", strip=True)) for an lxml element."""
+    return norm_space(" ".join(el.xpath(".//text()[not(parent::script) and not(parent::style)]")))
+
+
+def _lx_first(el, xpath: str):
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+
+def _lx_div_with_id_suffix(doc, suffix: str):
+    for div in doc.iter("div"):
+        if str(div.get("id", "")).endswith(suffix):
+            return div
+    return None
+
+
+def _lx_document(html_text: str):
+    try:
+        return lxml_html.document_fromstring(html_text)
+    except ValueError:
+        # Unicode input carrying an XML encoding declaration
+        return lxml_html.document_fromstring(html_text.encode("utf-8"))
+    except etree.ParserError:
+        # Empty page: parse like an empty document, as BeautifulSoup does
+        return lxml_html.document_fromstring("<html></html>")
+
+
+def _lx_generic_from_title(doc) -> str:
+    title = _lx_first(doc, "//title")
+    if title is None:
+        return ""
+    text = "".join(t.strip() for t in title.xpath(".//text()") if t.strip())
+    return text.upper().strip()
+
+
+def _lx_reimbursement_status(rcp) -> str:
+    if _lx_first(rcp, ".//" + _xp_class("span", "xgvs")) is not None:
+        return "NOT REIMBURSED"
+    if (_lx_first(rcp, ".//" + _xp_class("span", "bijlage2")) is not None
+            or _lx_first(rcp, ".//" + _xp_class("span", "bijlage-2")) is not None):
+        return "CONDITIONAL"
+    if _lx_first(rcp, ".//" + _xp_class("span", "otc")) is not None:
+        return "OTC"
+    return "REIMBURSED"
+
+
+def _lx_compositions(doc) -> List[ProductCore]:
+    """lxml counterpart of parse_all_compositions."""
+    generic_guess = _lx_generic_from_title(doc)
+    comp_div = _lx_div_with_id_suffix(doc, "-samenstelling")
+    if comp_div is None:
+        return [ProductCore(generic_guess, "", "", "", [])]
+
+    results: List[ProductCore] = []
+    for rcp in comp_div.xpath(".//" + _xp_class("section", "recipe")):
+        name_span = _lx_first(rcp, ".//" + _xp_class("span", "name"))
+        manf_span = _lx_first(rcp, ".//" + _xp_class("span", "manfact"))
+        name = _lx_text(name_span) if name_span is not None else ""
+        manf = _lx_text(manf_span) if manf_span is not None else ""
+        reimb_status = _lx_reimbursement_status(rcp)
+
+        dose_blocks = rcp.xpath(".//" + _xp_class("dl", "details")) or [rcp]
+        for block in dose_blocks:
+            app_dd = _lx_first(block, ".//" + _xp_class("dt", "application") + "/following-sibling::*[1][self::dd]")
+            conc_dd = _lx_first(block, ".//" + _xp_class("dt", "concentration") + "/following-sibling::*[1][self::dd]")
+            if app_dd is None and conc_dd is None:
+                continue
+            results.append(ProductCore(
+                generic_name=generic_guess,
+                brand_name=(name or "").upper().strip(),
+                manufacturer=norm_space(manf),
+                dosage_form=_lx_text(app_dd) if app_dd is not None else "",
+                strengths=split_strengths(_lx_text(conc_dd) if conc_dd is not None else ""),
+                reimbursement_status=reimb_status,
+            ))
+
+    return results or [ProductCore(generic_guess, "", "", "", [])]
+
+
+def _lx_indications(doc) -> Dict[str, List[str]]:
+    """lxml counterpart of parse_indications_by_population."""
+    indic_div = _lx_div_with_id_suffix(doc, "-indicaties")
+    out: Dict[str, List[str]] = {}
+    if indic_div is None:
+        return out
+
+    headers = indic_div.xpath(".//" + _xp_class("h4", "list-header"))
+    if headers:
+        for h in headers:
+            header_txt = _lx_text(h).lower()
+            if "adult" in header_txt or "volwassene" in header_txt:
+                pops = ["ADULTS", "ELDERLY"]
+            elif any(k in header_txt for k in ("children", "child", "kind", "adolescent", "jongere")):
+                pops = ["CHILDREN"]
+            elif any(k in header_txt for k in ("infant", "baby", "zuigeling", "neonate")):
+                pops = ["INFANTS"]
+            else:
+                pops = ["ADULTS", "ELDERLY"]
+
+            # find_next("ul"): the first ul after the header's start tag
+            ul = _lx_first(h, "(descendant::ul | following::ul)[1]")
+            if ul is None:
+                continue
+            items = [it for it in (_lx_text(li) for li in ul.xpath(".//li")) if it]
+            if items:
+                for p in pops:
+                    out.setdefault(p, []).extend(items)
+    else:
+        all_lis = indic_div.xpath(".//ul//li")
+        if not all_lis:
+            items = [_lx_text(p) for p in indic_div.xpath(".//p") if _lx_text(p)]
+        else:
+            items = [it for it in (_lx_text(li) for li in all_lis) if it]
+        if items:
+            out["ADULTS"] = items
+            out["ELDERLY"] = items.copy()
+
+    # De-duplicate preserving order
+    for pop in out:
+        seen = set()
+        dedup = []
+        for it in out[pop]:
+            key = it.lower()
+            if key not in seen:
+                seen.add(key)
+                dedup.append(it)
+        out[pop] = dedup
+    return out
+
+
 # ---------------------------------------------------------------
 # Async scraper
 # ---------------------------------------------------------------
 
+def parse_fk_page(html_text: str, url: str, url_id: int, parser: str = "lxml") -> List[Dict]:
+    """Process-pool entry point: parse one detail page and tag rows with fk_url_id."""
+    rows = derive_reimbursement_rows(html_text, url, parser=parser)
+    for row in rows:
+        row["fk_url_id"] = url_id
+    return rows
+
+
 async def scrape_fk_details(repo: NetherlandsRepository) -> int:
-    """Scrape FK detail pages using httpx + asyncio.Queue worker pool."""
+    """
+    Scrape FK detail pages as a staged pipeline:
+
+        feeder (keyset-paged pending URLs, then retryable)
+          -> url_q -> fetch workers (shared httpx client)
+          -> parse_q -> parse (ProcessPoolExecutor, native lxml)
+          -> write_q -> single writer (batched rows, URL statuses, request logs)
+
+    Feeder paging and writer flushes share repo.db, so both run on one
+    dedicated DB thread and never touch the connection concurrently. A
+    flush is retried (every write is an upsert, so replays are safe); if it
+    keeps failing the step raises and its URLs stay pending for resume.
+    """
 
     max_workers = getenv_int("FK_SCRAPE_WORKERS", 10)
     batch_size = getenv_int("FK_BATCH_SIZE", 100)
     max_retries = getenv_int("FK_MAX_RETRIES", 3)
     sleep_between = getenv_float("FK_SLEEP_BETWEEN", 0.15)
+    page_size = max(1, getenv_int("FK_PAGE_SIZE", 1000))
+    parse_processes = max(0, getenv_int("FK_PARSE_PROCESSES", min(4, os.cpu_count() or 1)))
+    parser = getenv("FK_HTML_PARSER", "lxml") or "lxml"
+    status_batch_size = max(1, getenv_int("FK_STATUS_BATCH_SIZE", 200))
+    flush_seconds = max(0.1, getenv_float("FK_FLUSH_SECONDS", 2.0))
+    flush_retries = max(0, getenv_int("FK_FLUSH_RETRIES", 3))
 
-    pending_urls = repo.get_pending_fk_urls(limit=50000)
+    url_stats = repo.get_fk_url_stats()
     retryable_urls = repo.get_retryable_fk_urls(max_retries=max_retries)
-    all_urls = pending_urls + retryable_urls
+    total = (url_stats.get("pending") or 0) + len(retryable_urls)
 
-    if not all_urls:
+    if not total:
         log.info("No pending FK URLs to scrape")
         return 0
 
-    log.info(f"Scraping {len(all_urls)} FK URLs ({len(pending_urls)} pending, {len(retryable_urls)} retry) with {max_workers} workers")
+    log.info(
+        f"Scraping {total} FK URLs ({total - len(retryable_urls)} pending, {len(retryable_urls)} retry) "
+        f"with {max_workers} fetch workers, {parse_processes or 'inline'} parse processes, page_size={page_size}"
+    )
 
-    url_queue: asyncio.Queue = asyncio.Queue()
-    for u in all_urls:
-        await url_queue.put(u)
+    url_q: asyncio.Queue = asyncio.Queue(maxsize=page_size)
+    parse_q: asyncio.Queue = asyncio.Queue(maxsize=max_workers * 4)
+    write_q: asyncio.Queue = asyncio.Queue(maxsize=max_workers * 4)
 
-    buffer: List[Dict] = []
-    buffer_lock = asyncio.Lock()
     stats = {"completed": 0, "failed": 0, "rows": 0}
-    stats_lock = asyncio.Lock()
-    total = len(all_urls)
-
-    async with httpx.AsyncClient(
-        headers=DEFAULT_HEADERS,
-        timeout=40.0,
-        follow_redirects=True,
-        limits=httpx.Limits(max_connections=max_workers + 5, max_keepalive_connections=max_workers),
-    ) as client:
-
-        async def worker(wid: int) -> None:
-            while True:
-                try:
-                    url_rec = url_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+    stage_stats = PipelineStats(["fetch", "parse", "write"])
+    t_run = time.monotonic()
+    last_stage_log = [t_run]
 
-                url = url_rec["url"]
-                url_id = url_rec["id"]
-                result_rows = None
-                t_start = time.monotonic()
-                status_code = None
-                resp_bytes = None
-                req_error = None
+    loop = asyncio.get_running_loop()
+    db_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fk-db")
 
-                for attempt in range(2):
+    def _db(fn, *args):
+        return loop.run_in_executor(db_thread, fn, *args)
+
+    pool: Optional[ProcessPoolExecutor] = None
+    if parse_processes:
+        try:
+            pool = ProcessPoolExecutor(max_workers=parse_processes)
+        except Exception as e:
+            log.warning(f"Process pool unavailable, parsing in threads: {e}")
+
+    async def _parse(html_text: str, url: str, url_id: int) -> List[Dict]:
+        nonlocal pool
+        if pool is not None:
+            try:
+                return await loop.run_in_executor(pool, parse_fk_page, html_text, url, url_id, parser)
+            except BrokenProcessPool as e:
+                log.warning(f"Parse pool broke ({e}); falling back to threads")
+                pool = None
+        return await asyncio.to_thread(parse_fk_page, html_text, url, url_id, parser)
+
+    async def feeder() -> None:
+        after_id = 0
+        while True:
+            page = await _db(repo.get_pending_fk_urls, page_size, after_id)
+            if not page:
+                break
+            for u in page:
+                await url_q.put(u)
+            after_id = page[-1]["id"]
+            if len(page) < page_size:
+                break
+        for u in retryable_urls:
+            await url_q.put(u)
+        for _ in range(max_workers):
+            await url_q.put(None)
+
+    async def fetch_worker(wid: int, client: httpx.AsyncClient) -> None:
+        while True:
+            url_rec = await url_q.get()
+            if url_rec is None:
+                break
+
+            url = url_rec["url"]
+            url_id = url_rec["id"]
+            t_start = time.monotonic()
+            status_code = None
+            resp_bytes = None
+            req_error = None
+            html_text = None
+
+            for attempt in range(2):
+                try:
+                    resp = await client.get(url)
+                    resp.raise_for_status()
+                    status_code = resp.status_code
+                    resp_bytes = len(resp.content)
+                    html_text = resp.text
+                    req_error = None
+                    break
+                except Exception as e:
+                    req_error = str(e)[:500]
+                    if attempt == 0:
+                        await asyncio.sleep(2 + random.uniform(0, 1))
+                    else:
+                        log.debug(f"Worker {wid}: failed {url}: {e}")
+
+            elapsed_ms = (time.monotonic() - t_start) * 1000
+            stage_stats["fetch"].record(elapsed_ms / 1000, error=html_text is None)
+            log_entry = (url, "GET", status_code, resp_bytes, elapsed_ms, req_error)
+            if html_text is None:
+                await write_q.put((url_id, None, req_error, log_entry))
+            else:
+                await parse_q.put((url, url_id, html_text, log_entry))
+
+            await asyncio.sleep(sleep_between + random.uniform(0, 0.1))
+
+    async def parse_worker() -> None:
+        while True:
+            item = await parse_q.get()
+            if item is None:
+                break
+            url, url_id, html_text, log_entry = item
+            t0 = time.monotonic()
+            try:
+                rows = await _parse(html_text, url, url_id)
+                stage_stats["parse"].record(time.monotonic() - t0)
+                await write_q.put((url_id, rows, None, log_entry))
+            except Exception as e:
+                stage_stats["parse"].record(time.monotonic() - t0, error=True)
+                log.debug(f"Parse failed for {url}: {e}")
+                await write_q.put((url_id, None, f"parse_error: {e}"[:500], log_entry))
+
+    def _flush(rows: List[Dict], statuses: List[tuple], logs: List[tuple]) -> None:
+        # Rows first so a URL is never marked success before its rows are stored
+        if rows:
+            repo.insert_fk_reimbursement_batch(rows)
+        if statuses:
+            repo.mark_fk_url_statuses(statuses)
+        if logs:
+            repo.log_requests(logs)  # HTTP logging is best-effort
+
+    def _log_progress(force: bool = False) -> None:
+        done = stats["completed"] + stats["failed"]
+        pct = (done / total * 100) if total else 0
+        rate = done / max(time.monotonic() - t_run, 1e-9)
+        print(
+            f"[PROGRESS] FK Scraping: {done}/{total} ({pct:.1f}%) - {stats['rows']} rows - {rate:.1f} URLs/s",
+            flush=True,
+        )
+        now = time.monotonic()
+        if force or now - last_stage_log[0] >= 30:
+            last_stage_log[0] = now
+            log.info(f"FK stages: {stage_stats.summary()}")
+
+    async def writer() -> None:
+        rows: List[Dict] = []
+        statuses: List[tuple] = []
+        logs: List[tuple] = []
+        last_flush = time.monotonic()
+        finished = False
+        while not finished:
+            try:
+                item = await asyncio.wait_for(write_q.get(), timeout=flush_seconds)
+            except asyncio.TimeoutError:
+                item = False
+            if item is None:
+                finished = True
+            elif item:
+                url_id, result_rows, error, log_entry = item
+                logs.append(log_entry)
+                if result_rows is None:
+                    statuses.append((url_id, "failed", error))
+                    stats["failed"] += 1
+                else:
+                    rows.extend(result_rows)
+                    statuses.append((url_id, "success", None))
+                    stats["completed"] += 1
+                    stats["rows"] += len(result_rows)
+
+            due = time.monotonic() - last_flush >= flush_seconds
+            if statuses and (finished or due or len(rows) >= batch_size or len(statuses) >= status_batch_size):
+                n = len(statuses)
+                for attempt in range(flush_retries + 1):
+                    t0 = time.monotonic()
                     try:
-                        resp = await client.get(url)
-                        resp.raise_for_status()
-                        status_code = resp.status_code
-                        resp_bytes = len(resp.content)
-                        result_rows = await asyncio.to_thread(derive_reimbursement_rows, resp.text, url)
+                        await _db(_flush, rows, statuses, logs)
+                        stage_stats["write"].record(time.monotonic() - t0, items=n)
                         break
                     except Exception as e:
-                        req_error = str(e)[:500]
-                        if attempt == 0:
-                            await asyncio.sleep(2 + random.uniform(0, 1))
-                        else:
-                            repo.mark_fk_url_status(url_id, "failed", str(e)[:500])
-                            async with stats_lock:
-                                stats["failed"] += 1
-                            log.debug(f"Worker {wid}: failed {url}: {e}")
-
-                # Log HTTP request to shared table
-                elapsed_ms = (time.monotonic() - t_start) * 1000
-                try:
-                    await asyncio.to_thread(
-                        repo.log_request,
-                        url, "GET", status_code, resp_bytes, elapsed_ms, req_error
-                    )
-                except Exception:
-                    pass  # HTTP logging is best-effort
-
-                if result_rows is not None:
-                    for row in result_rows:
-                        row["fk_url_id"] = url_id
-
-                    repo.mark_fk_url_status(url_id, "success")
-
-                    async with buffer_lock:
-                        buffer.extend(result_rows)
-
-                    async with stats_lock:
-                        stats["completed"] += 1
-                        stats["rows"] += len(result_rows)
-
-                    # Flush buffer
-                    async with buffer_lock:
-                        if len(buffer) >= batch_size:
-                            batch = buffer.copy()
-                            buffer.clear()
-                        else:
-                            batch = None
-                    if batch:
-                        await asyncio.to_thread(repo.insert_fk_reimbursement_batch, batch)
-
-                    # Progress logging every 10 items
-                    async with stats_lock:
-                        done = stats["completed"] + stats["failed"]
-                    if done % 10 == 0 or done == total:
-                        pct = (done / total * 100) if total else 0
-                        print(f"[PROGRESS] FK Scraping: {done}/{total} ({pct:.1f}%) - {stats['rows']} rows", flush=True)
-
-                await asyncio.sleep(sleep_between + random.uniform(0, 0.1))
-
-        tasks = [asyncio.create_task(worker(i)) for i in range(max_workers)]
-        await asyncio.gather(*tasks)
-
-    # Flush remaining buffer
-    if buffer:
-        repo.insert_fk_reimbursement_batch(buffer)
-
+                        stage_stats["write"].record(time.monotonic() - t0, items=n, error=True)
+                        try:
+                            await _db(repo.db.rollback)
+                        except Exception:
+                            pass
+                        if attempt == flush_retries:
+                            raise RuntimeError(
+                                f"FK batch write of {n} URLs failed after {attempt + 1} attempts; "
+                                f"they stay pending for resume: {e}"
+                            ) from e
+                        log.warning(f"FK batch write of {n} URLs failed (attempt {attempt + 1}), retrying: {e}")
+                        await asyncio.sleep(min(2 ** attempt, 10))
+                rows, statuses, logs = [], [], []
+                last_flush = time.monotonic()
+                _log_progress()
+
+    try:
+        async with httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=40.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_workers + 5, max_keepalive_connections=max_workers),
+        ) as client:
+            writer_task = asyncio.create_task(writer())
+            parse_tasks = [asyncio.create_task(parse_worker()) for _ in range(max(1, parse_processes))]
+
+            async def produce() -> None:
+                await asyncio.gather(feeder(), *(fetch_worker(i, client) for i in range(max_workers)))
+                for _ in parse_tasks:
+                    await parse_q.put(None)
+                await asyncio.gather(*parse_tasks)
+                await write_q.put(None)
+
+            producer = asyncio.create_task(produce())
+            tasks = [producer, writer_task, *parse_tasks]
+            # A dead writer would otherwise leave the fetchers blocked on a full queue
+            done, _ = await asyncio.wait({producer, writer_task}, return_when=asyncio.FIRST_EXCEPTION)
+            failed = [t for t in done if not t.cancelled() and t.exception() is not None]
+            if failed:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise failed[0].exception()
+            await asyncio.gather(producer, writer_task)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        db_thread.shutdown(wait=True)
+
+    _log_progress(force=True)
+    elapsed = time.monotonic() - t_run
     log.info(
         f"FK scraping complete: {stats['completed']} success, {stats['failed']} failed, "
-        f"{stats['rows']} reimbursement rows"
+        f"{stats['rows']} reimbursement rows in {elapsed:.1f}s "
+        f"({(stats['completed'] + stats['failed']) / max(elapsed, 1e-9):.1f} URLs/s)"
     )
     return stats["rows"]
 
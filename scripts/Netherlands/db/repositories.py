@@ -26,6 +26,12 @@ from contextlib import contextmanager
 
 from core.db.base_repository import BaseRepository
 
+try:
+    from psycopg2.extras import execute_values
+    _HAS_EXECUTE_VALUES = True
+except ImportError:
+    _HAS_EXECUTE_VALUES = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,6 +98,20 @@ class NetherlandsRepository(BaseRepository):
         except Exception:
             pass  # Best-effort: never block scraping
 
+    def log_requests(self, entries: List[tuple]) -> int:
+        """
+        Batch version of log_request.
+
+        Args:
+            entries: (url, method, status_code, response_bytes, elapsed_ms, error) tuples
+        """
+        try:
+            from core.db.tracking import log_http_requests
+
+            return log_http_requests(self.db, self.run_id, self.SCRAPER_NAME, entries)
+        except Exception:
+            return 0  # Best-effort: never block scraping
+
     # ------------------------------------------------------------------
     # Export report tracking
     # ------------------------------------------------------------------
@@ -464,6 +484,51 @@ class NetherlandsRepository(BaseRepository):
             """, (status, (error_message or "")[:500], now, url_id))
         self.db.commit()
 
+    def update_url_statuses(self, updates: List[tuple]) -> int:
+        """
+        Batch version of update_url_status (one round-trip, one commit).
+
+        Args:
+            updates: List of (url_id, status, error_message) tuples
+
+        Returns:
+            Number of status updates sent
+        """
+        if not updates:
+            return 0
+
+        table = self._table("collected_urls")
+        now = datetime.now()
+        rows = [(url_id, status, (error or "")[:500]) for url_id, status, error in updates]
+
+        with self.db.cursor() as cur:
+            if _HAS_EXECUTE_VALUES:
+                execute_values(
+                    cur,
+                    f"""
+                    UPDATE {table} AS t
+                    SET packs_scraped = v.status,
+                        error_message = v.error_message,
+                        scraped_at = v.scraped_at
+                    FROM (VALUES %s) AS v(id, status, error_message, scraped_at)
+                    WHERE t.id = v.id
+                    """,
+                    [(url_id, status, error, now) for url_id, status, error in rows],
+                    template="(%s::integer, %s, %s, %s::timestamp)",
+                    page_size=1000,
+                )
+            else:
+                for url_id, status, error in rows:
+                    cur.execute(f"""
+                        UPDATE {table}
+                        SET packs_scraped = %s,
+                            error_message = %s,
+                            scraped_at = %s
+                        WHERE id = %s
+                    """, (status, error, now, url_id))
+        self.db.commit()
+        return len(rows)
+
     def get_failed_urls_by_prefix(self) -> Dict[str, List[str]]:
         """Get failed URLs grouped by prefix, excluding URLs that have already been retried MAX_TOTAL_RETRIES+ times."""
         table = self._table("collected_urls")
@@ -564,10 +629,22 @@ class NetherlandsRepository(BaseRepository):
             batch_size: Number of records per batch
 
         Returns:
-            Number of rows inserted
+            Number of rows inserted or updated
         """
+        return sum(self.insert_packs_by_url(packs, batch_size=batch_size, log_db=log_db).values())
+
+    def insert_packs_by_url(self, packs: List[Dict], batch_size: int = 500,
+                            log_db: bool = True) -> Dict[Any, int]:
+        """
+        Bulk upsert packs, counting the rows actually written per page.
+
+        Returns:
+            Dict of collected_url_id -> rows inserted or updated (from the
+            cursor rowcount, so packs the upsert did not touch are not counted)
+        """
+        counts: Dict[Any, int] = {}
         if not packs:
-            return 0
+            return counts
 
         table = self._table("packs")
         count = 0
@@ -645,6 +722,9 @@ class NetherlandsRepository(BaseRepository):
                     pack.get("reimbursement_message", ""),
                     pack.get("source_url", ""),
                 ))
+                written = max(cur.rowcount, 0)
+                c_id = pack.get("collected_url_id")
+                counts[c_id] = counts.get(c_id, 0) + written
                 count += 1
 
                 if count % batch_size == 0:
@@ -652,8 +732,8 @@ class NetherlandsRepository(BaseRepository):
 
         self.db.commit()
         if log_db:
-            self._db_log(f"OK | nl_packs inserted={count} | run_id={self.run_id}")
-        return count
+            self._db_log(f"OK | nl_packs inserted={sum(counts.values())} | run_id={self.run_id}")
+        return counts
 
     def _parse_decimal(self, value: Any) -> Optional[float]:
         """Parse a value to decimal/float, handling various formats."""
@@ -1568,17 +1648,17 @@ class NetherlandsRepository(BaseRepository):
             row = cur.fetchone()
             return row[0] if row else 0
 
-    def get_pending_fk_urls(self, limit: int = 10000) -> List[Dict]:
-        """Get FK URLs with status='pending' for scraping."""
+    def get_pending_fk_urls(self, limit: int = 10000, after_id: int = 0) -> List[Dict]:
+        """Get FK URLs with status='pending' for scraping (keyset-paged by id > after_id)."""
         table = self._table("fk_urls")
         with self.db.cursor() as cur:
             cur.execute(f"""
                 SELECT id, url, generic_slug
                 FROM {table}
-                WHERE run_id = %s AND status = 'pending'
+                WHERE run_id = %s AND status = 'pending' AND id > %s
                 ORDER BY id
                 LIMIT %s
-            """, (self.run_id, limit))
+            """, (self.run_id, after_id, limit))
             rows = cur.fetchall()
             return [{"id": r[0], "url": r[1], "generic_slug": r[2]} for r in rows]
 
@@ -1616,6 +1696,56 @@ class NetherlandsRepository(BaseRepository):
                 """, (status, now, url_id))
         self.db.commit()
 
+    def mark_fk_url_statuses(self, updates: List[tuple]) -> int:
+        """
+        Batch version of mark_fk_url_status (one round-trip, one commit).
+
+        Args:
+            updates: List of (url_id, status, error) tuples; 'failed' rows
+                increment retry_count, others clear error_message
+
+        Returns:
+            Number of status updates sent
+        """
+        if not updates:
+            return 0
+
+        table = self._table("fk_urls")
+        now = datetime.now()
+        rows = [
+            (url_id, status, (error or "")[:500] if status == 'failed' else None,
+             1 if status == 'failed' else 0, now)
+            for url_id, status, error in updates
+        ]
+
+        with self.db.cursor() as cur:
+            if _HAS_EXECUTE_VALUES:
+                execute_values(
+                    cur,
+                    f"""
+                    UPDATE {table} AS t
+                    SET status = v.status,
+                        error_message = v.error_message,
+                        scraped_at = v.scraped_at,
+                        retry_count = t.retry_count + v.retry_inc
+                    FROM (VALUES %s) AS v(id, status, error_message, retry_inc, scraped_at)
+                    WHERE t.id = v.id
+                    """,
+                    rows,
+                    template="(%s::integer, %s, %s, %s::integer, %s::timestamp)",
+                    page_size=1000,
+                )
+            else:
+                for url_id, status, error, retry_inc, ts in rows:
+                    cur.execute(f"""
+                        UPDATE {table}
+                        SET status = %s, error_message = %s, scraped_at = %s,
+                            retry_count = retry_count + %s
+                        WHERE id = %s
+                    """, (status, error, ts, retry_inc, url_id))
+        self.db.commit()
+        return len(rows)
+
     def get_fk_url_stats(self) -> Dict:
         """Return {total, pending, success, failed} counts."""
         table = self._table("fk_urls")
@@ -30,6 +30,8 @@ import asyncio
 import re
 import time
 import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date
 from typing import List, Dict, Optional, Set
 from urllib.parse import quote, urlencode
@@ -38,6 +40,8 @@ import httpx
 from lxml import html
 from playwright.async_api import async_playwright
 
+from core.concurrency.pipeline_stats import PipelineStats
+from core.http.client import HttpClient
 from core.pipeline.base_scraper import BaseScraper
 from db import NetherlandsRepository, apply_netherlands_schema
 
@@ -121,6 +125,161 @@ def get_depends_amount(node, mode: str) -> Optional[float]:
         return None
     return parse_euro_amount(spans[0].text_content())
 
+def extract_product_rows(html_text: str, url: str, collected_url_id: int, margin_rule: str) -> List[dict]:
+    """
+    Extract pack-level rows from HTML.
+
+    Module-level (no scraper state) so Phase 2 can run it in a process pool.
+
+    Rules:
+    - unit_price is piece-level
+    - ppp_vat/copay/deductible/reimbursement are package-level
+    - local_pack_code uses available RVG/EU number from each pack block
+    """
+    doc = html.fromstring(html_text)
+    page_title = clean_single_line(doc.xpath('string(//h1)') or doc.xpath('string(//title)'))
+    pack_blocks = doc.xpath('//dl[contains(@class,"pat-grid-list")]')
+    if not pack_blocks:
+        pack_blocks = [doc]
+
+    rows: List[dict] = []
+    for idx, block in enumerate(pack_blocks, start=1):
+        active_substance = clean_single_line(
+            block.xpath('string(.//dd[contains(@class,"medicine-active-substance")])')
+        )
+        formulation = clean_single_line(
+            block.xpath('string(.//dd[contains(@class,"medicine-method")])')
+        )
+        strength_size = clean_single_line(
+            block.xpath('string(.//dd[contains(@class,"medicine-strength")])')
+        )
+        manufacturer = clean_single_line(
+            block.xpath('string(.//dd[contains(@class,"medicine-manufacturer")])')
+        )
+        local_pack_code = clean_single_line(
+            block.xpath('string(.//dd[contains(@class,"medicine-rvg-number")])')
+        )
+        if not local_pack_code:
+            local_pack_code = ""
+
+        price_dd = block.xpath('.//dd[contains(@class,"medicine-price")]')
+        unit_price = None
+        ppp_vat = None
+        reimbursement_message = ""
+        reimbursable_status = "Unknown"
+        reimbursable_rate = ""
+        copay_price = None
+        copay_percent = ""
+
+        if price_dd:
+            price_node = price_dd[0]
+            unit_price = get_depends_amount(price_node, "piece")
+            ppp_vat = get_depends_amount(price_node, "package")
+            if ppp_vat is None:
+                ppp_vat = parse_euro_amount(price_node.text_content())
+
+            # FIX: Fallback for Unit Price if 0 or None
+            if unit_price is None or unit_price == 0:
+                txt = price_node.text_content()
+                # Matches: "Gemiddelde prijs per... € 2,14" or similar
+                m = re.search(r"Gemiddelde prijs per.*?[€â‚¬]\s*(\d+[.,]\d+)", txt, re.IGNORECASE)
+                if m:
+                    u_str = m.group(1).replace(".", "").replace(",", ".")
+                    try:
+                        unit_price = float(u_str)
+                    except ValueError:
+                        pass
+
+            message_divs = price_node.xpath('.//div[contains(@class,"pat-message")]')
+            message_texts = [clean_single_line(div.text_content()) for div in message_divs]
+            message_texts = [t for t in message_texts if t]
+            reimbursement_message = " ".join(message_texts).strip()
+            full_text = reimbursement_message.lower()
+
+            has_success = any("success" in (div.get("class") or "") for div in message_divs)
+            has_warning = any("warning" in (div.get("class") or "") for div in message_divs)
+
+            if has_success or "volledig vergoed" in full_text:
+                reimbursable_status = "Fully reimbursed"
+                reimbursable_rate = "100%"
+            elif has_warning:
+                reimbursable_status = "Partially reimbursed"
+            
+            # FIX: Force Partial if "pay yourself" text is found
+            # Dutch: "U betaalt zelf ... bij" or "extra kosten" or "bijbetalen"
+            if "betaalt zelf" in full_text or "additional" in full_text or "bijbetalen" in full_text:
+                if reimbursable_status in ["Unknown", "Fully reimbursed"]: # Consider overriding fully reimbursed if warning is severe
+                    reimbursable_status = "Partially reimbursed"
+
+
+            warning_divs = price_node.xpath('.//div[contains(@class,"pat-message") and contains(@class,"warning")]')
+            for wdiv in warning_divs:
+                copay_price = get_depends_amount(wdiv, "package")
+                if copay_price is None:
+                    copay_price = parse_euro_amount(wdiv.text_content())
+                if copay_price is not None:
+                    pct = re.search(r"(\d+(?:[.,]\d+)?)\s*%", wdiv.text_content(), re.IGNORECASE)
+                    if pct:
+                        copay_percent = f"{pct.group(1)}%"
+                    break
+
+        deductible = None
+        deductible_nodes = block.xpath('.//dt[contains(@class,"not-reimbursed")]/following-sibling::dd[1]')
+        if deductible_nodes:
+            dnode = deductible_nodes[0]
+            deductible = get_depends_amount(dnode, "package")
+            if deductible is None:
+                deductible = parse_euro_amount(dnode.text_content())
+            if deductible is None and "niets" in clean_single_line(dnode.text_content()).lower():
+                deductible = 0.0
+
+        pack_desc_parts = [page_title, formulation, strength_size]
+        local_pack_description = clean_single_line(" ".join([p for p in pack_desc_parts if p]))
+        if not local_pack_description:
+            local_pack_description = page_title
+
+        if local_pack_description:
+            first_word = local_pack_description.split()[0] if local_pack_description.split() else ""
+            first_word = first_word.rstrip(",.;:()[]{}")
+            product_group = first_word
+        else:
+            product_group = ""
+
+        if not any([local_pack_description, active_substance, formulation, strength_size, local_pack_code]):
+            continue
+
+        ppp_ex_vat = (ppp_vat / 1.09) if ppp_vat is not None else None
+
+        rows.append({
+            'source_url': url,
+            'collected_url_id': collected_url_id,
+            'currency': 'EUR',
+            'vat_percent': 9.0,
+            'margin_rule': margin_rule,
+            'start_date': date.today(),
+            'end_date': None,
+            'reimbursable_status': reimbursable_status,
+            'reimbursable_rate': reimbursable_rate,
+            'copay_price': copay_price,
+            'copay_percent': copay_percent,
+            'deductible': deductible,
+            'ri_with_vat': deductible,
+            'ppp_vat': ppp_vat,
+            'ppp_ex_vat': ppp_ex_vat,
+            'unit_price': unit_price,
+            'product_group': product_group,
+            'local_pack_description': local_pack_description,
+            'active_substance': active_substance,
+            'manufacturer': manufacturer,
+            'formulation': formulation,
+            'strength_size': strength_size,
+            'local_pack_code': local_pack_code,
+            'reimbursement_message': reimbursement_message,
+        })
+
+    return rows
+
+
 class NetherlandsScraper(BaseScraper):
     def __init__(self, run_id: Optional[str] = None):
         if not run_id:
@@ -437,266 +596,223 @@ class NetherlandsScraper(BaseScraper):
         return all_urls, total or 0
 
     async def scrape_products_concurrent(self, url_pairs: List[tuple]):
-        """Scrape product details using httpx."""
-        queue = asyncio.Queue()
+        """
+        Scrape product details as a three-stage pipeline:
+
+            fetch (N coroutines, one shared pooled client)
+              -> parse_q -> parse (process pool, lxml off the event loop)
+              -> write_q -> writer (single task, batched DB writes in a thread)
+
+        Bounded queues between stages give back-pressure; FETCH concurrency
+        (MAX_WORKERS), PARSE_PROCESSES and WRITE_BATCH_PAGES are tuned independently.
+        """
+        url_queue: asyncio.Queue = asyncio.Queue()
         for u in url_pairs:
-            queue.put_nowait(u)
-        
+            url_queue.put_nowait(u)
+
         total_urls = len(url_pairs)
         progress_every = max(1, int(self.config.get("SCRAPE_PROGRESS_EVERY", "100")))
         heartbeat_seconds = max(1.0, float(self.config.get("SCRAPE_HEARTBEAT_SECONDS", "20")))
+        parse_processes = max(0, int(self.config.get("PARSE_PROCESSES", str(min(4, os.cpu_count() or 1)))))
+        queue_size = max(1, int(self.config.get("PIPELINE_QUEUE_SIZE", str(self.max_workers * 4))))
+        write_batch_pages = max(1, int(self.config.get("WRITE_BATCH_PAGES", "50")))
+        write_flush_seconds = max(0.1, float(self.config.get("WRITE_FLUSH_SECONDS", "2.0")))
+        http_retries = max(1, int(self.config.get("SCRAPE_HTTP_RETRIES", "2")))
+
         stats = {"processed": 0, "success": 0, "failed": 0, "packs": 0}
-        stats_lock = asyncio.Lock()
+        stage_stats = PipelineStats(["fetch", "parse", "write"])
         last_progress_log_at = time.monotonic()
+        # Outcomes arrive in batches, so "processed" jumps past exact multiples
+        next_progress_at = progress_every
+
+        parse_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        write_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
 
         self.logger.info(
-            f"[Phase2] Starting concurrent scraping: workers={self.max_workers}, "
+            f"[Phase2] Starting pipelined scraping: fetch_workers={self.max_workers}, "
+            f"parse_processes={parse_processes or 'inline'}, write_batch={write_batch_pages} pages, "
             f"pending={total_urls}, progress_every={progress_every}, heartbeat={heartbeat_seconds}s"
         )
 
-        def _safe_update_status(url_id: int, status: str, error_message: str = None) -> None:
-            try:
-                self.repo.update_url_status(url_id, status, error_message)
-            except Exception as e:
-                self.logger.error(f"[Phase2] Failed to update URL status id={url_id} to {status}: {e}")
-
-        async def _maybe_log_progress(force: bool = False):
-            nonlocal last_progress_log_at
+        def _maybe_log_progress(force: bool = False):
+            nonlocal last_progress_log_at, next_progress_at
             now = time.monotonic()
-            async with stats_lock:
-                processed = stats["processed"]
-                success = stats["success"]
-                failed = stats["failed"]
-                packs = stats["packs"]
-                should_log = force or (processed > 0 and processed % progress_every == 0) or (now - last_progress_log_at >= heartbeat_seconds)
-                if not should_log:
-                    return
-                last_progress_log_at = now
+            processed = stats["processed"]
+            should_log = force or processed >= next_progress_at or (now - last_progress_log_at >= heartbeat_seconds)
+            if not should_log:
+                return
+            last_progress_log_at = now
+            next_progress_at = (processed // progress_every + 1) * progress_every
             remaining = max(total_urls - processed, 0)
             self.logger.info(
-                f"[Phase2] Progress: processed={processed}/{total_urls}, success={success}, "
-                f"failed={failed}, packs={packs}, pending~={remaining}"
+                f"[Phase2] Progress: processed={processed}/{total_urls}, success={stats['success']}, "
+                f"failed={stats['failed']}, packs={stats['packs']}, pending~={remaining}, "
+                f"queues: parse={parse_q.qsize()} write={write_q.qsize()}"
             )
-        
-        async def worker(w_id):
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                while not queue.empty():
-                    if self._shutdown_requested:
-                        break
-                    
-                    try:
-                        url, c_id = queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        break
-                    
-                    try:
-                        success_delta = 0
-                        failed_delta = 0
-                        packs_delta = 0
-                        resp = await client.get(url)
-                        
-                        if resp.status_code == 200:
-                            packs = self.extract_product_from_html(resp.text, url, c_id)
-                            inserted = 0
-                            if packs:
-                                try:
-                                    inserted = self.repo.insert_packs(packs, log_db=False)
-                                except Exception as e:
-                                    self.logger.error(f"[Phase2] DB insert failed for {url}: {e}")
-                                    self.record_error("db_insert_exception")
-                            
-                            if packs and inserted > 0:
-                                _safe_update_status(c_id, "success")
-                                self.record_scraped_item(inserted, "products")
-                                success_delta = 1
-                                packs_delta = inserted
-                            else:
-                                _safe_update_status(c_id, "failed", "no_pack_data_or_db_insert_failed")
-                                self.record_error("db_insert_failed")
-                                failed_delta = 1
-                        else:
-                            self.logger.warning(f"Failed to scrape {url} (Status: {resp.status_code})")
-                            _safe_update_status(c_id, "failed", f"http_{resp.status_code}")
-                            self.record_error(f"http_{resp.status_code}")
-                            failed_delta = 1
-                    
-                    except Exception as e:
-                        self.logger.error(f"Worker {w_id} failed on {url}: {e}")
-                        _safe_update_status(c_id, "failed", str(e))
-                        self.record_error("worker_exception")
-                        failed_delta = 1
-                    finally:
-                        async with stats_lock:
-                            stats["processed"] += 1
-                            stats["success"] += success_delta
-                            stats["failed"] += failed_delta
-                            stats["packs"] += packs_delta
-
-                        await _maybe_log_progress()
-                        queue.task_done()
-                        await asyncio.sleep(self.page_delay + random.uniform(0.1, 1.0))
-        
-        workers = [asyncio.create_task(worker(i)) for i in range(self.max_workers)]
-        worker_results = await asyncio.gather(*workers, return_exceptions=True)
-        for idx, result in enumerate(worker_results):
-            if isinstance(result, Exception):
-                self.logger.error(f"[Phase2] Worker task {idx} crashed: {result}")
-                self.record_error("worker_task_crash")
+            self.logger.info(f"[Phase2] Stages: {stage_stats.summary()}")
+
+        loop = asyncio.get_running_loop()
+        pool = None
+        if parse_processes:
+            try:
+                pool = ProcessPoolExecutor(max_workers=parse_processes)
+            except Exception as e:
+                self.logger.warning(f"[Phase2] Process pool unavailable, parsing in threads: {e}")
 
-        await _maybe_log_progress(force=True)
+        async def _parse(html_text: str, url: str, c_id: int) -> List[dict]:
+            nonlocal pool
+            if pool is not None:
+                try:
+                    return await loop.run_in_executor(
+                        pool, extract_product_rows, html_text, url, c_id, self.margin_rule
+                    )
+                except BrokenProcessPool as e:
+                    self.logger.warning(f"[Phase2] Parse pool broke ({e}); falling back to threads")
+                    pool = None
+            return await asyncio.to_thread(extract_product_rows, html_text, url, c_id, self.margin_rule)
+
+        async def fetch_worker(w_id: int, http: HttpClient):
+            while not self._shutdown_requested:
+                try:
+                    url, c_id = url_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                t0 = time.monotonic()
+                try:
+                    resp = await http.get(url)
+                    stage_stats["fetch"].record(time.monotonic() - t0)
+                    if resp.status_code == 200:
+                        await parse_q.put((url, c_id, resp.text))
+                    else:
+                        self.logger.warning(f"Failed to scrape {url} (Status: {resp.status_code})")
+                        self.record_error(f"http_{resp.status_code}")
+                        await write_q.put((url, c_id, None, f"http_{resp.status_code}"))
+                except Exception as e:
+                    stage_stats["fetch"].record(time.monotonic() - t0, error=True)
+                    self.logger.error(f"Worker {w_id} failed on {url}: {e}")
+                    self.record_error("worker_exception")
+                    await write_q.put((url, c_id, None, str(e)))
+                await asyncio.sleep(self.page_delay + random.uniform(0.1, 1.0))
 
-    def extract_product_from_html(self, html_text: str, url: str, collected_url_id: int) -> List[dict]:
+        async def parse_worker():
+            while True:
+                item = await parse_q.get()
+                if item is None:
+                    break
+                url, c_id, html_text = item
+                t0 = time.monotonic()
+                try:
+                    packs = await _parse(html_text, url, c_id)
+                    stage_stats["parse"].record(time.monotonic() - t0)
+                    await write_q.put((url, c_id, packs, None))
+                except Exception as e:
+                    stage_stats["parse"].record(time.monotonic() - t0, error=True)
+                    self.logger.error(f"[Phase2] Parse failed for {url}: {e}")
+                    self.record_error("parse_exception")
+                    await write_q.put((url, c_id, None, str(e)))
+
+        async def writer():
+            batch: List[tuple] = []
+            done = False
+            while not done:
+                try:
+                    item = await asyncio.wait_for(write_q.get(), timeout=write_flush_seconds)
+                    if item is None:
+                        done = True
+                    else:
+                        batch.append(item)
+                except asyncio.TimeoutError:
+                    pass
+                if batch and (done or len(batch) >= write_batch_pages
+                              or write_q.empty()):
+                    t0 = time.monotonic()
+                    outcomes = await asyncio.to_thread(self._write_page_batch, batch)
+                    stage_stats["write"].record(time.monotonic() - t0, items=len(batch))
+                    for c_id, inserted, err in outcomes:
+                        stats["processed"] += 1
+                        if err:
+                            stats["failed"] += 1
+                            if err == "no_pack_data_or_db_insert_failed":
+                                self.record_error("db_insert_failed")
+                        else:
+                            stats["success"] += 1
+                            stats["packs"] += inserted
+                            self.record_scraped_item(inserted, "products")
+                    batch = []
+                    _maybe_log_progress()
+
+        http = HttpClient(
+            timeout=30.0,
+            retries=http_retries,
+            max_connections=self.max_workers,
+        )
+        writer_task = asyncio.create_task(writer())
+        parse_tasks = [asyncio.create_task(parse_worker()) for _ in range(max(1, parse_processes))]
+        try:
+            fetch_results = await asyncio.gather(
+                *(fetch_worker(i, http) for i in range(self.max_workers)), return_exceptions=True
+            )
+            for idx, result in enumerate(fetch_results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"[Phase2] Worker task {idx} crashed: {result}")
+                    self.record_error("worker_task_crash")
+            for _ in parse_tasks:
+                await parse_q.put(None)
+            await asyncio.gather(*parse_tasks, return_exceptions=True)
+            await write_q.put(None)
+            await writer_task
+        finally:
+            await http.close()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        _maybe_log_progress(force=True)
+
+    def _write_page_batch(self, batch: List[tuple]) -> List[tuple]:
         """
-        Extract pack-level rows from HTML.
+        Write one batch of (url, c_id, packs, error) page outcomes.
 
-        Rules:
-        - unit_price is piece-level
-        - ppp_vat/copay/deductible/reimbursement are package-level
-        - local_pack_code uses available RVG/EU number from each pack block
+        Runs in a worker thread. Returns per-page (c_id, rows written, error),
+        where rows written is the upsert rowcount, not the packs attempted.
         """
-        doc = html.fromstring(html_text)
-        page_title = clean_single_line(doc.xpath('string(//h1)') or doc.xpath('string(//title)'))
-        pack_blocks = doc.xpath('//dl[contains(@class,"pat-grid-list")]')
-        if not pack_blocks:
-            pack_blocks = [doc]
-
-        rows: List[dict] = []
-        for idx, block in enumerate(pack_blocks, start=1):
-            active_substance = clean_single_line(
-                block.xpath('string(.//dd[contains(@class,"medicine-active-substance")])')
-            )
-            formulation = clean_single_line(
-                block.xpath('string(.//dd[contains(@class,"medicine-method")])')
-            )
-            strength_size = clean_single_line(
-                block.xpath('string(.//dd[contains(@class,"medicine-strength")])')
-            )
-            manufacturer = clean_single_line(
-                block.xpath('string(.//dd[contains(@class,"medicine-manufacturer")])')
-            )
-            local_pack_code = clean_single_line(
-                block.xpath('string(.//dd[contains(@class,"medicine-rvg-number")])')
-            )
-            if not local_pack_code:
-                local_pack_code = ""
-
-            price_dd = block.xpath('.//dd[contains(@class,"medicine-price")]')
-            unit_price = None
-            ppp_vat = None
-            reimbursement_message = ""
-            reimbursable_status = "Unknown"
-            reimbursable_rate = ""
-            copay_price = None
-            copay_percent = ""
-
-            if price_dd:
-                price_node = price_dd[0]
-                unit_price = get_depends_amount(price_node, "piece")
-                ppp_vat = get_depends_amount(price_node, "package")
-                if ppp_vat is None:
-                    ppp_vat = parse_euro_amount(price_node.text_content())
-
-                # FIX: Fallback for Unit Price if 0 or None
-                if unit_price is None or unit_price == 0:
-                    txt = price_node.text_content()
-                    # Matches: "Gemiddelde prijs per... € 2,14" or similar
-                    m = re.search(r"Gemiddelde prijs per.*?[€â‚¬]\s*(\d+[.,]\d+)", txt, re.IGNORECASE)
-                    if m:
-                        u_str = m.group(1).replace(".", "").replace(",", ".")
-                        try:
-                            unit_price = float(u_str)
-                        except ValueError:
-                            pass
-
-                message_divs = price_node.xpath('.//div[contains(@class,"pat-message")]')
-                message_texts = [clean_single_line(div.text_content()) for div in message_divs]
-                message_texts = [t for t in message_texts if t]
-                reimbursement_message = " ".join(message_texts).strip()
-                full_text = reimbursement_message.lower()
-
-                has_success = any("success" in (div.get("class") or "") for div in message_divs)
-                has_warning = any("warning" in (div.get("class") or "") for div in message_divs)
-
-                if has_success or "volledig vergoed" in full_text:
-                    reimbursable_status = "Fully reimbursed"
-                    reimbursable_rate = "100%"
-                elif has_warning:
-                    reimbursable_status = "Partially reimbursed"
-                
-                # FIX: Force Partial if "pay yourself" text is found
-                # Dutch: "U betaalt zelf ... bij" or "extra kosten" or "bijbetalen"
-                if "betaalt zelf" in full_text or "additional" in full_text or "bijbetalen" in full_text:
-                    if reimbursable_status in ["Unknown", "Fully reimbursed"]: # Consider overriding fully reimbursed if warning is severe
-                        reimbursable_status = "Partially reimbursed"
-
-
-                warning_divs = price_node.xpath('.//div[contains(@class,"pat-message") and contains(@class,"warning")]')
-                for wdiv in warning_divs:
-                    copay_price = get_depends_amount(wdiv, "package")
-                    if copay_price is None:
-                        copay_price = parse_euro_amount(wdiv.text_content())
-                    if copay_price is not None:
-                        pct = re.search(r"(\d+(?:[.,]\d+)?)\s*%", wdiv.text_content(), re.IGNORECASE)
-                        if pct:
-                            copay_percent = f"{pct.group(1)}%"
-                        break
+        packs_all = [p for _, _, packs, _ in batch if packs for p in packs]
+        written: Optional[Dict] = None
+        if packs_all:
+            try:
+                written = self.repo.insert_packs_by_url(packs_all, log_db=False)
+            except Exception as e:
+                self.logger.warning(f"[Phase2] Batch insert of {len(packs_all)} packs failed, retrying per page: {e}")
 
-            deductible = None
-            deductible_nodes = block.xpath('.//dt[contains(@class,"not-reimbursed")]/following-sibling::dd[1]')
-            if deductible_nodes:
-                dnode = deductible_nodes[0]
-                deductible = get_depends_amount(dnode, "package")
-                if deductible is None:
-                    deductible = parse_euro_amount(dnode.text_content())
-                if deductible is None and "niets" in clean_single_line(dnode.text_content()).lower():
-                    deductible = 0.0
-
-            pack_desc_parts = [page_title, formulation, strength_size]
-            local_pack_description = clean_single_line(" ".join([p for p in pack_desc_parts if p]))
-            if not local_pack_description:
-                local_pack_description = page_title
-
-            if local_pack_description:
-                first_word = local_pack_description.split()[0] if local_pack_description.split() else ""
-                first_word = first_word.rstrip(",.;:()[]{}")
-                product_group = first_word
-            else:
-                product_group = ""
-
-            if not any([local_pack_description, active_substance, formulation, strength_size, local_pack_code]):
+        outcomes: List[tuple] = []
+        for url, c_id, packs, error in batch:
+            if error is not None:
+                outcomes.append((c_id, 0, error))
                 continue
+            if not packs:
+                outcomes.append((c_id, 0, "no_pack_data_or_db_insert_failed"))
+                continue
+            if written is not None:
+                inserted = written.get(c_id, 0)
+                outcomes.append((c_id, inserted, None if inserted > 0 else "no_pack_data_or_db_insert_failed"))
+                continue
+            try:
+                inserted = self.repo.insert_packs(packs, log_db=False)
+                outcomes.append((c_id, inserted, None if inserted > 0 else "no_pack_data_or_db_insert_failed"))
+            except Exception as e:
+                self.logger.error(f"[Phase2] DB insert failed for {url}: {e}")
+                self.record_error("db_insert_exception")
+                outcomes.append((c_id, 0, "no_pack_data_or_db_insert_failed"))
 
-            ppp_ex_vat = (ppp_vat / 1.09) if ppp_vat is not None else None
-
-            rows.append({
-                'source_url': url,
-                'collected_url_id': collected_url_id,
-                'currency': 'EUR',
-                'vat_percent': 9.0,
-                'margin_rule': self.margin_rule,
-                'start_date': date.today(),
-                'end_date': None,
-                'reimbursable_status': reimbursable_status,
-                'reimbursable_rate': reimbursable_rate,
-                'copay_price': copay_price,
-                'copay_percent': copay_percent,
-                'deductible': deductible,
-                'ri_with_vat': deductible,
-                'ppp_vat': ppp_vat,
-                'ppp_ex_vat': ppp_ex_vat,
-                'unit_price': unit_price,
-                'product_group': product_group,
-                'local_pack_description': local_pack_description,
-                'active_substance': active_substance,
-                'manufacturer': manufacturer,
-                'formulation': formulation,
-                'strength_size': strength_size,
-                'local_pack_code': local_pack_code,
-                'reimbursement_message': reimbursement_message,
-            })
-
-        return rows
+        updates = [(c_id, "success" if not err else "failed", err) for c_id, _, err in outcomes]
+        try:
+            self.repo.update_url_statuses(updates)
+        except Exception as e:
+            self.logger.error(f"[Phase2] Failed to update {len(updates)} URL statuses: {e}")
+        return outcomes
 
+    def extract_product_from_html(self, html_text: str, url: str, collected_url_id: int) -> List[dict]:
+        """Extract pack-level rows from HTML (see extract_product_rows)."""
+        return extract_product_rows(html_text, url, collected_url_id, self.margin_rule)
 
 if __name__ == "__main__":
     scraper = NetherlandsScraper()
@@ -136,7 +136,7 @@ class NetherlandsSeleniumScraper(BaseScraper):
             from core.browser.chrome_instance_tracker import ChromeInstanceTracker
             from core.db.postgres_connection import PostgresDB
             run_id = getattr(self, 'run_id', None)
-            pids = get_chrome_pids_from_driver(driver)
+            pids = get_chrome_pids_from_driver(driver, scraper_name="Netherlands")
             if pids and run_id:
                 driver_pid = driver.service.process.pid if hasattr(driver.service, 'process') else list(pids)[0]
                 db = PostgresDB("Netherlands")
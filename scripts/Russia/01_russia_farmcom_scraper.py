@@ -50,7 +50,7 @@ from core.network.proxy_checker import check_vpn_connection as core_check_vpn
 from core.browser.driver_factory import create_chrome_driver, restart_driver as core_restart_driver
 from core.browser.chrome_manager import register_chrome_driver, unregister_chrome_driver
 from datetime import datetime, timezone
-from typing import Set, Dict, List, Optional
+from typing import Dict, List, Optional
 from core.monitoring.audit_logger import audit_log
 
 # Force unbuffered output
@@ -127,6 +127,13 @@ try:
 except ImportError:
     get_chrome_pids_from_driver = None
 
+# Single-call table snapshot extraction
+from farmcom_snapshot import extract_ean, extract_price_and_date, parse_report_table, snapshot_table
+
+# Parallel workers: leased page shards + shared compact item_id set
+from page_shards import LeasedPages, auto_shard_size, plan_shards
+from item_id_bitmap import ItemIdBitmap
+
 # State machine
 from smart_locator import SmartLocator
 from state_machine import NavigationStateMachine, NavigationState, StateCondition
@@ -158,11 +165,16 @@ EAN_POPUP_TIMEOUT = getenv_int("SCRIPT_01_EAN_POPUP_TIMEOUT", 3)
 EAN_CLICK_RETRIES = getenv_int("SCRIPT_01_EAN_CLICK_RETRIES", 5)
 MAX_PAGES = getenv_int("SCRIPT_01_MAX_PAGES", 0)  # 0 = no limit, extract all pages
 NUM_WORKERS = getenv_int("SCRIPT_01_NUM_WORKERS")
+SHARD_PAGES = getenv_int("SCRIPT_01_SHARD_PAGES", 0)  # 0 = auto (about 2 shards per worker)
+LEASE_SECONDS = getenv_int("SCRIPT_01_LEASE_SECONDS", 600)
+WORK_STEALING = getenv_bool("SCRIPT_01_WORK_STEALING", True)
 MAX_RETRIES_PER_PAGE = getenv_int("SCRIPT_01_MAX_RETRIES_PER_PAGE")
 DB_BATCH_SIZE = getenv_int("DB_BATCH_INSERT_SIZE", 100)
 PROGRESS_INTERVAL = getenv_int("DB_PROGRESS_LOG_INTERVAL", 50)
 # Number of tabs to open for parallel page load (1 = sequential, 5 = 5 tabs)
 MULTI_TAB_BATCH = getenv_int("SCRIPT_01_MULTI_TAB_BATCH", 10)  # Default 10 pages per batch
+# Read the whole table in one outerHTML call and parse locally (falls back to per-cell reads if malformed)
+SNAPSHOT_EXTRACTION = getenv_bool("SCRIPT_01_SNAPSHOT_EXTRACTION", True)
 
 # Safety limits to prevent infinite loops (defensive programming)
 MAX_EMPTY_BATCH_ITERATIONS = getenv_int("SCRIPT_01_MAX_EMPTY_BATCH_ITERATIONS", 10)
@@ -340,7 +352,7 @@ def _create_driver() -> webdriver.Chrome:
         try:
             pid = driver.service.process.pid
             if pid:
-                pids = get_chrome_pids_from_driver(driver) if get_chrome_pids_from_driver else {pid}
+                pids = get_chrome_pids_from_driver(driver, scraper_name="Russia") if get_chrome_pids_from_driver else {pid}
                 with CountryDB("Russia") as db:
                      tracker = ChromeInstanceTracker("Russia", _run_id, db)
                      tracker.register(step_number=1, pid=pid, browser_type="chrome", child_pids=pids)
@@ -491,35 +503,7 @@ def select_region_and_search(driver: webdriver.Chrome) -> webdriver.Chrome:
 # DATA EXTRACTION
 # =============================================================================
 
-# parse_price imported from core
-
-
-def extract_price_and_date(cell_text: str) -> tuple[str, str]:
-    """Extract price and date from cell text like '531.51 \n03/15/2010'"""
-    lines = [ln.strip() for ln in (cell_text or "").splitlines() if ln.strip()]
-    if not lines:
-        return "", ""
-    price = lines[0].strip()
-    date_text = lines[1].strip() if len(lines) > 1 else ""
-    return price, date_text
-
-
-def extract_ean(text: str) -> str:
-    """Extract EAN digits from package text - finds longest digit sequence of 8-14 digits"""
-    if not text:
-        return ""
-    
-    # Remove all whitespace to normalize
-    text_compact = re.sub(r"\s+", "", text)
-    
-    # Find all sequences of 8-14 digits
-    matches = re.findall(r"\d{8,14}", text_compact)
-    
-    if not matches:
-        return ""
-    
-    # Return the longest match (most likely to be EAN)
-    return max(matches, key=len)
+# parse_price imported from core; extract_price_and_date / extract_ean from farmcom_snapshot
 
 
 def click_all_barcodes(driver: webdriver.Chrome, is_last_page: bool = False) -> None:
@@ -680,11 +664,60 @@ def extract_row_data(row, page_num: int, driver=None) -> Optional[Dict]:
 # MAIN SCRAPING LOGIC
 # =============================================================================
 
+def _log_row_counts(total_rows: int, main_rows: int, gray_rows: int, page_num: int, last_page: int) -> None:
+    is_last_page = (page_num == last_page and last_page > 0)
+
+    if FETCH_EAN:
+        print(f"  Processing {total_rows} rows (after EAN insertion)...", flush=True)
+        print(f"  [DEBUG] Main rows: {main_rows}, Gray/EAN rows: {gray_rows}", flush=True)
+
+        # If we have main rows but no gray rows, the barcode click didn't work
+        # Only warn if we expect EAN rows (i.e., we have main rows to match)
+        if main_rows > 0 and gray_rows == 0 and main_rows >= 10:
+            print(f"  [WARN] No gray/EAN rows found after barcode click. EAN extraction may fail.", flush=True)
+
+    # Warning if we don't see expected number of main rows
+    # Don't warn on last page (may have fewer rows) or if page_num is 0 (retry/unknown)
+    if not is_last_page and page_num > 0 and main_rows < 90:
+        print(f"  [WARNING] Expected ~100 main rows, found {main_rows}. Page navigation issue?", flush=True)
+
+
+def extract_rows_from_snapshot(driver: webdriver.Chrome, page_num: int = 0, last_page: int = 0) -> Optional[list[Dict]]:
+    """
+    Extract rows from one outerHTML snapshot of the table (single WebDriver call).
+    Returns None if the snapshot looks malformed so the caller can fall back.
+    """
+    try:
+        result = parse_report_table(snapshot_table(driver), page_num, fetch_ean=FETCH_EAN)
+    except WebDriverException:
+        raise
+    except Exception as e:
+        print(f"  [SNAPSHOT] Parse error: {e}", flush=True)
+        return None
+    if result is None:
+        return None
+
+    _log_row_counts(result.total_rows, result.main_rows, result.gray_rows, page_num, last_page)
+    print(
+        f"  [DEBUG] Extraction summary (snapshot): {len(result.rows)} extracted, "
+        f"{result.gray_rows} no bullet, {result.skipped_no_item_id} no item_id, "
+        f"{result.skipped_short_rows} short",
+        flush=True,
+    )
+    return result.rows
+
+
 def extract_rows_from_table(driver: webdriver.Chrome, page_num: int = 0, last_page: int = 0) -> list[Dict]:
     """
     Internal function to extract rows from the current page table.
     This is the core extraction logic that can be called multiple times for retry.
     """
+    if SNAPSHOT_EXTRACTION:
+        snapshot_rows = extract_rows_from_snapshot(driver, page_num, last_page)
+        if snapshot_rows is not None:
+            return snapshot_rows
+        print(f"  [SNAPSHOT] Table snapshot looks malformed; using per-element extraction", flush=True)
+
     rows: list[Dict] = []
     
     # Re-fetch rows AFTER barcode clicks (new rows inserted)
@@ -701,21 +734,7 @@ def extract_rows_from_table(driver: webdriver.Chrome, page_num: int = 0, last_pa
         else:
             gray_rows += 1
     
-    is_last_page = (page_num == last_page and last_page > 0)
-    
-    if FETCH_EAN:
-        print(f"  Processing {total_rows} rows (after EAN insertion)...", flush=True)
-        print(f"  [DEBUG] Main rows: {main_rows}, Gray/EAN rows: {gray_rows}", flush=True)
-        
-        # If we have main rows but no gray rows, the barcode click didn't work
-        # Only warn if we expect EAN rows (i.e., we have main rows to match)
-        if main_rows > 0 and gray_rows == 0 and main_rows >= 10:
-            print(f"  [WARN] No gray/EAN rows found after barcode click. EAN extraction may fail.", flush=True)
-    
-    # Warning if we don't see expected number of main rows
-    # Don't warn on last page (may have fewer rows) or if page_num is 0 (retry/unknown)
-    if not is_last_page and page_num > 0 and main_rows < 90:
-        print(f"  [WARNING] Expected ~100 main rows, found {main_rows}. Page navigation issue?", flush=True)
+    _log_row_counts(total_rows, main_rows, gray_rows, page_num, last_page)
     
     extracted_count = 0
     skipped_no_bullet = 0
@@ -816,7 +835,7 @@ def extract_rows_from_table(driver: webdriver.Chrome, page_num: int = 0, last_pa
     return rows
 
 
-def scrape_page_with_ean_validation(driver: webdriver.Chrome, page_num: int, repo: RussiaRepository, existing_ids: Set[str], last_page: int = 0) -> tuple[int, int, int, int, int, bool]:
+def scrape_page_with_ean_validation(driver: webdriver.Chrome, page_num: int, repo: RussiaRepository, existing_ids: ItemIdBitmap, last_page: int = 0) -> tuple[int, int, int, int, int, bool]:
     """
     Scrape a single page with strict EAN validation.
     
@@ -920,11 +939,17 @@ def scrape_page_with_ean_validation(driver: webdriver.Chrome, page_num: int, rep
         repo.insert_ved_products_bulk(batch)
         scraped += len(batch)
         audit_log("INSERT_BATCH", scraper_name="Russia", run_id=_run_id, details={"inserted": len(batch), "page": page_num})
+
+    # Informational only (all rows are inserted): item_ids already seen on other pages this run
+    page_ids = [r.get("item_id") for r in rows if r.get("item_id")]
+    repeated = len(page_ids) - existing_ids.update(page_ids)
+    if repeated:
+        print(f"  [INFO] Page {page_num}: {repeated} item_id(s) already seen earlier in this run", flush=True)
     
     return scraped, skipped, missing_ean_count, rows_found, ean_found, True
 
 
-def scrape_page(driver: webdriver.Chrome, page_num: int, repo: RussiaRepository, existing_ids: Set[str], last_page: int = 0) -> tuple[int, int, int]:
+def scrape_page(driver: webdriver.Chrome, page_num: int, repo: RussiaRepository, existing_ids: ItemIdBitmap, last_page: int = 0) -> tuple[int, int, int]:
     """
     Scrape a single page with EAN extraction and validation.
     Returns: (scraped_count, skipped_count, missing_ean_count)
@@ -1148,19 +1173,26 @@ def get_next_pages_to_scrape(repo: RussiaRepository, last_page: int, batch_size:
     return pages_to_scrape[:batch_size]
 
 
-def get_existing_item_ids_all_runs(repo: RussiaRepository) -> Set[str]:
-    """Get all existing item_ids from ALL runs for deduplication"""
-    return repo.get_all_existing_item_ids()
+def shard_remaining_pages(repo: RussiaRepository, last_page: int, workers: int) -> int:
+    """Coordinator: split the pages still to scrape into leasable shards."""
+    remaining = sorted(set(range(1, last_page + 1)) - repo.get_done_pages(1, "ved"))
+    shard_size = SHARD_PAGES if SHARD_PAGES > 0 else auto_shard_size(len(remaining), workers)
+    shards = plan_shards(remaining, shard_size)
+    repo.create_page_shards(shards, "ved")
+    print(f"[PARALLEL] {len(remaining)} pages in {len(shards)} shard(s) of <= {shard_size} pages "
+          f"(work stealing {'on' if WORK_STEALING else 'off'})", flush=True)
+    return len(shards)
 
 
 # =============================================================================
-# PARALLEL WORKER (each worker = 1 Chrome instance, claims pages from DB)
+# PARALLEL WORKER (each worker = 1 Chrome instance, leases page shards from DB)
 # =============================================================================
 
-def worker_loop(worker_id: int, last_page: int, existing_ids: Set[str], run_id: str):
+def worker_loop(worker_id: int, last_page: int, existing_ids: ItemIdBitmap, run_id: str):
     """
-    Worker thread: creates its own Chrome driver, claims pages one-by-one
-    from the DB, scrapes each, and marks completion.
+    Worker thread: creates its own Chrome driver, leases page shards from
+    ru_page_leases (stealing from slower workers when none are left),
+    scrapes each page, and marks completion.
     """
     global _shutdown_requested
 
@@ -1182,16 +1214,16 @@ def worker_loop(worker_id: int, last_page: int, existing_ids: Set[str], run_id:
         driver = select_region_and_search(driver)
         audit_log("ACTION", scraper_name="Russia", run_id=run_id,
                   details={"action": "WORKER_STARTED", "worker": worker_id, "region": REGION_VALUE})
-        print(f"{tag} Chrome ready, starting page claims...", flush=True)
+        print(f"{tag} Chrome ready, leasing page shards...", flush=True)
 
-        while not _shutdown_requested:
-            # Claim next available page atomically
-            page_num = worker_repo.claim_next_page(last_page, step_number=1, source_type="ved")
-            if page_num is None:
-                print(f"{tag} No more pages to claim. Done.", flush=True)
+        leased_pages = LeasedPages(worker_repo, f"{os.getpid()}:W{worker_id}", "ved",
+                                   lease_seconds=LEASE_SECONDS, steal=WORK_STEALING)
+        for page_num in leased_pages:
+            if _shutdown_requested:
                 break
 
-            print(f"{tag} Claimed page {page_num}/{last_page}", flush=True)
+            print(f"{tag} Page {page_num}/{last_page}", flush=True)
+            worker_repo.mark_progress(1, "VED Scrape", f"ved_page:{page_num}", "in_progress")
 
             # Navigate to page
             page_url = f"{BASE_URL}?page={page_num}&reg_id={REGION_VALUE}"
@@ -1279,6 +1311,8 @@ def worker_loop(worker_id: int, last_page: int, existing_ids: Set[str], run_id:
             if SLEEP_BETWEEN_PAGES > 0:
                 time.sleep(SLEEP_BETWEEN_PAGES)
 
+        print(f"{tag} Leasing finished ({leased_pages.summary()}).", flush=True)
+
     except Exception as e:
         print(f"{tag} Fatal error: {e}", flush=True)
     finally:
@@ -1479,8 +1513,9 @@ def main():
         completed = len(_repo.get_completed_keys(1))
         print(f"[INFO] {completed} pages already completed, {last_page - completed} pages remaining", flush=True)
 
-        # No deduplication - existing_ids kept for API compatibility
-        existing_ids = set()
+        # No deduplication: every row is inserted. One shared bitmap collects the
+        # item_ids seen in this run so repeats across pages can be reported.
+        existing_ids = ItemIdBitmap()
 
         global _operation_count
         initial_retry_mode = retry_pages is not None
@@ -1513,6 +1548,8 @@ def main():
                 pass
             driver = None
 
+            shard_remaining_pages(_repo, last_page, NUM_WORKERS)
+
             # Spawn worker threads
             threads = []
             for i in range(NUM_WORKERS):
@@ -1698,7 +1735,6 @@ def main():
                         consecutive_timeout_batches = 0
                         # Re-navigate to the site after restart
                         driver = select_region_and_search(driver)
-                        existing_ids = _repo.get_all_existing_item_ids()
                 else:
                     print(f"[BATCH COMPLETE] Scraped {batch_scraped}, Skipped {batch_skipped}, Total: {total_scraped}", flush=True)
                     consecutive_timeout_batches = 0  # Reset counter on successful batch
@@ -204,7 +204,7 @@ def _create_driver() -> webdriver.Chrome:
         try:
             pid = driver.service.process.pid
             if pid:
-                pids = get_chrome_pids_from_driver(driver) if get_chrome_pids_from_driver else {pid}
+                pids = get_chrome_pids_from_driver(driver, scraper_name="Russia") if get_chrome_pids_from_driver else {pid}
                 with CountryDB("Russia") as db:
                      tracker = ChromeInstanceTracker("Russia", run_id, db)
                      tracker.register(step_number=2, pid=pid, browser_type="chrome", child_pids=pids)
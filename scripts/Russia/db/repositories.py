@@ -6,11 +6,12 @@ Provides methods for:
 - Inserting/querying VED products, excluded products, translated data
 - Sub-step progress tracking (page-level resume)
 - Failed pages tracking for retry mechanism
+- Page shard leases for parallel workers
 - Run lifecycle management
 """
 
 import logging
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 from core.db.base_repository import BaseRepository
@@ -496,6 +497,140 @@ class RussiaRepository(BaseRepository):
 
         return None
 
+    # ------------------------------------------------------------------
+    # Page shard leases (parallel workers)
+    # ------------------------------------------------------------------
+
+    def get_done_pages(self, step_number: int = 1, source_type: str = "ved") -> Set[int]:
+        """Pages that need no scraping: done in step_progress or pending in failed_pages."""
+        sql = """
+            SELECT split_part(progress_key, ':', 2)::int FROM ru_step_progress
+            WHERE run_id = %s AND step_number = %s AND progress_key LIKE %s
+              AND status IN ('completed', 'ean_missing', 'skipped')
+            UNION
+            SELECT page_number FROM ru_failed_pages
+            WHERE run_id = %s AND source_type = %s AND status = 'pending'
+        """
+        with self.db.cursor() as cur:
+            cur.execute(sql, (self.run_id, step_number, f"{source_type}_page:%",
+                              self.run_id, source_type))
+            return {row[0] for row in cur.fetchall()}
+
+    def create_page_shards(self, shards: List[Tuple[int, int]], source_type: str = "ved") -> int:
+        """Replace this run's shards with the given (start, end) page ranges."""
+        with self.db.cursor() as cur:
+            cur.execute("DELETE FROM ru_page_leases WHERE run_id = %s AND source_type = %s",
+                        (self.run_id, source_type))
+            cur.executemany(
+                """
+                INSERT INTO ru_page_leases (run_id, source_type, start_page, end_page, next_page)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [(self.run_id, source_type, start, end, start) for start, end in shards],
+            )
+        return len(shards)
+
+    def lease_page_shard(self, worker: str, source_type: str = "ved",
+                         lease_seconds: int = 600) -> Optional[Tuple[int, int, int]]:
+        """
+        Lease the lowest free (or expired) shard. Rows locked by other workers
+        are skipped, not waited on. Returns (shard_id, next_page, end_page).
+        """
+        sql = """
+            UPDATE ru_page_leases
+            SET status = 'leased', worker = %s,
+                leased_until = NOW() + make_interval(secs => %s), updated_at = NOW()
+            WHERE id = (
+                SELECT id FROM ru_page_leases
+                WHERE run_id = %s AND source_type = %s
+                  AND (status = 'pending' OR (status = 'leased' AND leased_until < NOW()))
+                ORDER BY next_page
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, next_page, end_page
+        """
+        with self.db.cursor() as cur:
+            cur.execute(sql, (worker, lease_seconds, self.run_id, source_type))
+            row = cur.fetchone()
+            return tuple(row) if row else None
+
+    def steal_page_shard(self, worker: str, source_type: str = "ved", lease_seconds: int = 600,
+                         min_pages: int = 2) -> Optional[Tuple[int, int, int]]:
+        """
+        Split the leased shard with the most pages left: its owner keeps the
+        lower half, the new shard (upper half) is leased to this worker.
+        Returns (shard_id, next_page, end_page) of the new shard.
+        """
+        from page_shards import steal_split
+
+        with self.db.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, next_page, end_page FROM ru_page_leases
+                WHERE run_id = %s AND source_type = %s AND status = 'leased'
+                  AND end_page - next_page >= %s
+                ORDER BY end_page - next_page DESC
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+                """,
+                (self.run_id, source_type, max(2, min_pages)),
+            )
+            row = cur.fetchone()
+            if not row:
+                return None
+            victim_id, next_page, end_page = row
+            split = steal_split(next_page, end_page, min_pages)
+            if split is None:
+                return None
+            cur.execute(
+                "UPDATE ru_page_leases SET end_page = %s, steals = steals + 1, updated_at = NOW() WHERE id = %s",
+                (split - 1, victim_id),
+            )
+            cur.execute(
+                """
+                INSERT INTO ru_page_leases
+                    (run_id, source_type, start_page, end_page, next_page, status, worker, leased_until)
+                VALUES (%s, %s, %s, %s, %s, 'leased', %s, NOW() + make_interval(secs => %s))
+                RETURNING id
+                """,
+                (self.run_id, source_type, split, end_page, split, worker, lease_seconds),
+            )
+            return cur.fetchone()[0], split, end_page
+
+    def advance_page_shard(self, shard_id: int, worker: str, page: int,
+                           lease_seconds: int = 600) -> Optional[int]:
+        """
+        Record that page is finished and renew the lease. Returns the shard's
+        current end_page (lowered if it was stolen from), or None if this
+        worker no longer holds the lease.
+        """
+        sql = """
+            UPDATE ru_page_leases
+            SET next_page = %s,
+                status = CASE WHEN %s > end_page THEN 'done' ELSE status END,
+                leased_until = NOW() + make_interval(secs => %s), updated_at = NOW()
+            WHERE id = %s AND worker = %s AND status = 'leased'
+            RETURNING end_page
+        """
+        with self.db.cursor() as cur:
+            cur.execute(sql, (page + 1, page + 1, lease_seconds, shard_id, worker))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    def release_page_shard(self, shard_id: int, worker: str) -> None:
+        """Give an unfinished shard back so another worker can lease it now."""
+        sql = """
+            UPDATE ru_page_leases
+            SET status = 'pending', worker = NULL, leased_until = NULL, updated_at = NOW()
+            WHERE id = %s AND worker = %s AND status = 'leased'
+        """
+        try:
+            with self.db.cursor() as cur:
+                cur.execute(sql, (shard_id, worker))
+        except Exception as e:
+            logger.warning("Could not release page shard %s: %s", shard_id, e)
+
     # ------------------------------------------------------------------
     # Failed Pages (Step 3 - Retry mechanism)
     # ------------------------------------------------------------------
@@ -765,6 +900,9 @@ class RussiaRepository(BaseRepository):
                     cur.execute("DELETE FROM ru_failed_pages WHERE run_id = %s AND source_type = %s", (self.run_id, source_type))
                     if cur.rowcount > 0:
                         deleted[f"ru_failed_pages ({source_type})"] = cur.rowcount
+                    cur.execute("DELETE FROM ru_page_leases WHERE run_id = %s AND source_type = %s", (self.run_id, source_type))
+                    if cur.rowcount > 0:
+                        deleted[f"ru_page_leases ({source_type})"] = cur.rowcount
         
         try:
             self.db.commit()
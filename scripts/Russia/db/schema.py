@@ -9,6 +9,7 @@ Tables:
 - ru_export_ready: Final formatted export data (Step 4)
 - ru_step_progress: Sub-step resume tracking (all steps)
 - ru_failed_pages: Track failed pages for retry (Step 3)
+- ru_page_leases: Page shards leased by parallel scraper workers (Step 1)
 """
 
 # VED Products from farmcom.info (Step 1)
@@ -146,6 +147,24 @@ CREATE INDEX IF NOT EXISTS idx_ru_failed_run ON ru_failed_pages(run_id);
 CREATE INDEX IF NOT EXISTS idx_ru_failed_status ON ru_failed_pages(status);
 """
 
+# Page shards for parallel workers (leased with FOR UPDATE SKIP LOCKED)
+RU_PAGE_LEASES_DDL = """
+CREATE TABLE IF NOT EXISTS ru_page_leases (
+    id SERIAL PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES run_ledger(run_id),
+    source_type TEXT NOT NULL CHECK(source_type IN ('ved', 'excluded')),
+    start_page INTEGER NOT NULL,
+    end_page INTEGER NOT NULL,
+    next_page INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK(status IN ('pending', 'leased', 'done')),
+    worker TEXT,
+    leased_until TIMESTAMP,
+    steals INTEGER DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_ru_leases_claim ON ru_page_leases(run_id, source_type, status, next_page);
+"""
+
 # Error tracking
 RU_ERRORS_DDL = """
 CREATE TABLE IF NOT EXISTS ru_errors (
@@ -236,6 +255,7 @@ def apply_russia_schema(db):
         RU_EXPORT_READY_DDL,
         RU_STEP_PROGRESS_DDL,
         RU_FAILED_PAGES_DDL,
+        RU_PAGE_LEASES_DDL,
         RU_ERRORS_DDL,
         RU_VALIDATION_RESULTS_DDL,
         RU_STATISTICS_DDL,
@@ -0,0 +1,199 @@
+"""
+Single-call table extraction for the Farmcom VED registry pages.
+
+Reading each cell through WebDriver (find_elements / .text / get_attribute,
+plus an execute_script per row for the EAN sibling row) costs thousands of
+browser round-trips per page. Here the whole ``table.report`` is fetched once
+as outerHTML and parsed locally with lxml into the same row dicts that
+``extract_rows_from_table`` produces, including pairing each main row with
+the gray EAN row inserted after it by the barcode click.
+
+``parse_report_table`` returns None when the snapshot looks malformed, so the
+caller can fall back to the per-element WebDriver path. The cell helpers
+(``extract_price_and_date``, ``extract_ean``) live here and are shared with
+the WebDriver path in 01_russia_farmcom_scraper.py.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from lxml import etree, html
+
+logger = logging.getLogger(__name__)
+
+# One round-trip: the report table's serialized DOM (after barcode AJAX inserts)
+TABLE_SNAPSHOT_JS = (
+    "var t = document.querySelector('table.report');"
+    "return t ? t.outerHTML : null;"
+)
+
+_BULLET_XPATH = etree.XPath(".//img[contains(concat(' ', normalize-space(@class), ' '), ' bullet ') and @linkhref]")
+_CELLS_XPATH = etree.XPath("./td")
+_RELEASE_FORM_TAIL_RE = re.compile(r"\b(Barcode|\d{8,14})\b\s*$")
+_WS_RE = re.compile(r"\s+")
+_EAN_RE = re.compile(r"\d{8,14}")
+_INLINE_WS_RE = re.compile(r"[ \t\r\f\v\u00a0]+")
+_HIDDEN_STYLE_RE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+_BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table",
+    "tr", "ul",
+})
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+
+@dataclass
+class SnapshotResult:
+    """Rows parsed from one table snapshot plus the counters the scraper logs."""
+    rows: List[Dict] = field(default_factory=list)
+    total_rows: int = 0
+    main_rows: int = 0
+    gray_rows: int = 0
+    skipped_no_item_id: int = 0
+    skipped_short_rows: int = 0
+
+
+def extract_price_and_date(cell_text: str) -> tuple:
+    """Extract price and date from cell text like '531.51 \\n03/15/2010'"""
+    lines = [ln.strip() for ln in (cell_text or "").splitlines() if ln.strip()]
+    if not lines:
+        return "", ""
+    price = lines[0].strip()
+    date_text = lines[1].strip() if len(lines) > 1 else ""
+    return price, date_text
+
+
+def extract_ean(text: str) -> str:
+    """Extract EAN digits from package text - longest digit sequence of 8-14 digits"""
+    if not text:
+        return ""
+    matches = _EAN_RE.findall(_WS_RE.sub("", text))
+    if not matches:
+        return ""
+    return max(matches, key=len)
+
+
+def item_id_from_linkhref(linkhref: str) -> str:
+    """frm_reestr_det.php?value=279.24&MnnName=...&item_id=31908 -> '31908'"""
+    qs = parse_qs(urlparse("http://x/?" + (linkhref or "").split("?", 1)[-1]).query)
+    return (qs.get("item_id", [""]) or [""])[0]
+
+
+def _is_hidden(el) -> bool:
+    style = el.get("style")
+    return bool(style and _HIDDEN_STYLE_RE.search(style)) or el.get("hidden") is not None
+
+
+def inner_text(el) -> str:
+    """Approximate WebElement.text: <br>/block breaks become newlines,
+    runs of spaces collapse, hidden and script content is dropped."""
+    parts: List[str] = []
+
+    def walk(node) -> None:
+        tag = node.tag
+        if not isinstance(tag, str) or tag in _SKIP_TAGS or _is_hidden(node):
+            return  # comments / processing instructions (their tails are added by the parent)
+        if tag == "br":
+            parts.append("\n")
+            return
+        block = tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    walk(el)
+    lines = (_INLINE_WS_RE.sub(" ", ln).strip() for ln in "".join(parts).split("\n"))
+    return "\n".join(ln for ln in lines if ln)
+
+
+def parse_report_table(table_html: Optional[str], page_num: int = 0,
+                       fetch_ean: bool = True) -> Optional[SnapshotResult]:
+    """
+    Parse a ``table.report`` outerHTML snapshot into VED row dicts.
+
+    Main rows with missing cells are skipped and counted. Returns None if the
+    snapshot is missing or malformed (unparseable, or no usable main rows),
+    signalling the caller to use the WebDriver path instead.
+    """
+    if not table_html:
+        return None
+    try:
+        root = html.fromstring(table_html)
+    except (etree.ParserError, ValueError):
+        return None
+
+    tables = [root] if root.tag == "table" else root.xpath(".//table")
+    if not tables:
+        return None
+    table = tables[0]
+    tr_list = table.xpath("./tbody/tr") or table.xpath("./tr")
+    if not tr_list:
+        return None
+
+    result = SnapshotResult(total_rows=len(tr_list))
+    bullets = [_BULLET_XPATH(tr) for tr in tr_list]
+    result.main_rows = sum(1 for b in bullets if b)
+    result.gray_rows = result.total_rows - result.main_rows
+
+    for idx, tr in enumerate(tr_list):
+        if not bullets[idx]:
+            continue  # EAN-only (gray) row, consumed with its main row below
+
+        item_id = item_id_from_linkhref(bullets[idx][0].get("linkhref"))
+        if not item_id:
+            result.skipped_no_item_id += 1
+            continue
+
+        tds = _CELLS_XPATH(tr)
+        if len(tds) < 7:
+            result.skipped_short_rows += 1
+            logger.warning("Page %s: skipping item_id=%s, row has %d cells (expected 7)",
+                           page_num, item_id, len(tds))
+            continue
+
+        release_form_full = inner_text(tds[5]).strip()
+        price, date_text = extract_price_and_date(inner_text(tds[6]))
+
+        ean = ""
+        if fetch_ean:
+            if idx + 1 < len(tr_list) and not bullets[idx + 1]:
+                next_tds = _CELLS_XPATH(tr_list[idx + 1])
+                if len(next_tds) >= 6:
+                    ean = extract_ean(inner_text(next_tds[5]).strip())
+            if not ean:
+                ean = extract_ean(release_form_full)
+
+        result.rows.append({
+            "item_id": item_id,
+            "tn": inner_text(tds[2]).strip(),
+            "inn": inner_text(tds[3]).strip(),
+            "manufacturer_country": inner_text(tds[4]).strip(),
+            "release_form": _RELEASE_FORM_TAIL_RE.sub("", release_form_full).strip(),
+            "ean": ean,
+            "registered_price_rub": price,
+            "start_date_text": date_text,
+            "page_number": page_num,
+        })
+
+    # A page without usable main rows means the snapshot was taken mid-render
+    # or the markup changed.
+    if not result.main_rows or (result.skipped_short_rows and not result.rows):
+        return None
+    return result
+
+
+def snapshot_table(driver) -> Optional[str]:
+    """Fetch the report table's outerHTML in a single WebDriver call."""
+    return driver.execute_script(TABLE_SNAPSHOT_JS)
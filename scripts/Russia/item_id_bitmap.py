@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compact membership set for farmcom item_ids.
+
+farmcom item_ids are small positive integers, so a bitmap indexed by the
+numeric id holds a full run's ids in ~1 bit per possible id (a few hundred
+KB) instead of a Python set of strings (~70-100 bytes per entry). One
+instance is created in main and shared by every worker thread; memory stays
+flat as workers are added.
+
+Ids that are not plain integers, or exceed MAX_BITMAP_ID, go to a small
+fallback set so membership is always exact.
+"""
+
+import threading
+from typing import Iterable, Set, Union
+
+# 2**28 ids = 32 MB of bitmap; anything larger is treated as an outlier
+MAX_BITMAP_ID = 1 << 28
+
+ItemId = Union[str, int]
+
+
+class ItemIdBitmap:
+    """Thread-safe set of item_ids backed by a growable bitmap."""
+
+    def __init__(self, ids: Iterable[ItemId] = ()):
+        self._bits = bytearray()
+        self._overflow: Set[str] = set()
+        self._count = 0
+        self._lock = threading.Lock()
+        self.update(ids)
+
+    @staticmethod
+    def _numeric(item_id: ItemId) -> int:
+        if isinstance(item_id, int):
+            n = item_id
+        else:
+            text = str(item_id).strip()
+            if not text.isdigit():
+                return -1
+            n = int(text)
+        return n if 0 <= n < MAX_BITMAP_ID else -1
+
+    def add(self, item_id: ItemId) -> bool:
+        """Add an id; returns True if it was not present before."""
+        n = self._numeric(item_id)
+        with self._lock:
+            if n < 0:
+                key = str(item_id).strip()
+                if key in self._overflow:
+                    return False
+                self._overflow.add(key)
+            else:
+                byte, bit = n >> 3, 1 << (n & 7)
+                if byte >= len(self._bits):
+                    # Grow geometrically so bulk loads in ascending order stay linear
+                    self._bits.extend(bytes(max(byte + 1, len(self._bits) * 2) - len(self._bits)))
+                if self._bits[byte] & bit:
+                    return False
+                self._bits[byte] |= bit
+            self._count += 1
+            return True
+
+    def update(self, ids: Iterable[ItemId]) -> int:
+        """Add many ids; returns how many were new."""
+        return sum(1 for item_id in ids if item_id is not None and self.add(item_id))
+
+    def __contains__(self, item_id: ItemId) -> bool:
+        if item_id is None:
+            return False
+        n = self._numeric(item_id)
+        if n < 0:
+            return str(item_id).strip() in self._overflow
+        byte = n >> 3
+        bits = self._bits
+        return byte < len(bits) and bool(bits[byte] & (1 << (n & 7)))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the structure."""
+        return len(self._bits) + 80 * len(self._overflow)
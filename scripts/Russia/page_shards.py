@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Page sharding for the parallel farmcom workers.
+
+The coordinator (main) splits the pages still to scrape into contiguous
+shards and stores them in ru_page_leases. Each worker leases a whole shard
+with ``FOR UPDATE SKIP LOCKED`` (no two workers ever get the same shard and
+nobody waits on a locked row), walks it page by page, and renews the lease
+as it advances. A worker that runs out of shards steals the upper half of
+the largest shard still being worked on, so fast workers keep busy until
+the very end instead of idling while a slow one finishes a long tail.
+
+If a worker dies, its lease expires and the shard is re-leased from the
+page it had reached.
+"""
+
+import math
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+def plan_shards(pages: Iterable[int], shard_size: int) -> List[Tuple[int, int]]:
+    """
+    Split pages into contiguous (start, end) runs of at most shard_size pages.
+    Gaps (already completed pages) always start a new shard.
+    """
+    shard_size = max(1, shard_size)
+    shards: List[Tuple[int, int]] = []
+    start = prev = None
+    for page in sorted(set(pages)):
+        if start is not None and page == prev + 1 and page - start < shard_size:
+            prev = page
+            continue
+        if start is not None:
+            shards.append((start, prev))
+        start = prev = page
+    if start is not None:
+        shards.append((start, prev))
+    return shards
+
+
+def auto_shard_size(n_pages: int, workers: int, shards_per_worker: int = 2) -> int:
+    """Shard size giving each worker a couple of shards; stealing evens out the rest."""
+    return max(1, math.ceil(n_pages / max(1, workers * shards_per_worker)))
+
+
+def steal_split(next_page: int, end_page: int, min_pages: int = 2) -> Optional[int]:
+    """
+    First page a thief takes from a shard whose owner is on next_page.
+
+    The owner keeps next_page and the lower half of what follows; the thief
+    gets the upper half. Returns None if fewer than min_pages remain after
+    the page in progress.
+    """
+    remaining = end_page - next_page
+    if remaining < max(2, min_pages):
+        return None
+    return end_page - remaining // 2 + 1
+
+
+class LeasedPages:
+    """
+    Iterate the pages one worker should scrape: lease a shard, walk it,
+    steal when none are left. Usage:
+
+        for page_num in LeasedPages(repo, "W1"):
+            scrape(page_num)
+    """
+
+    def __init__(self, repo, worker: str, source_type: str = "ved",
+                 lease_seconds: int = 600, steal: bool = True, min_steal_pages: int = 2):
+        self.repo = repo
+        self.worker = worker
+        self.source_type = source_type
+        self.lease_seconds = lease_seconds
+        self.steal = steal
+        self.min_steal_pages = min_steal_pages
+        self.shards = 0
+        self.steals = 0
+        self.pages = 0
+
+    def _next_shard(self) -> Optional[Tuple[int, int, int]]:
+        shard = self.repo.lease_page_shard(self.worker, self.source_type, self.lease_seconds)
+        if shard is None and self.steal:
+            shard = self.repo.steal_page_shard(self.worker, self.source_type,
+                                               self.lease_seconds, self.min_steal_pages)
+            if shard is not None:
+                self.steals += 1
+        return shard
+
+    def __iter__(self) -> Iterator[int]:
+        while True:
+            shard = self._next_shard()
+            if shard is None:
+                return
+            shard_id, page, end = shard
+            self.shards += 1
+            finished = False
+            try:
+                while page <= end:
+                    yield page
+                    self.pages += 1
+                    # Renews the lease; returns the (possibly stolen-down) end page
+                    end = self.repo.advance_page_shard(shard_id, self.worker, page, self.lease_seconds)
+                    if end is None:
+                        break  # lease expired and was taken over
+                    page += 1
+                finished = True
+            finally:
+                if not finished:
+                    # Stopped early (shutdown/crash): hand the rest back right away
+                    self.repo.release_page_shard(shard_id, self.worker)
+
+    def summary(self) -> str:
+        return f"pages={self.pages}, shards={self.shards}, steals={self.steals}"
@@ -217,7 +217,7 @@ def ensure_driver() -> webdriver.Chrome:
             tracker = ChromeInstanceTracker("Taiwan", run_id, db)
             pid = driver.service.process.pid if hasattr(driver.service, 'process') else None
             if pid:
-                pids = get_chrome_pids_from_driver(driver) if get_chrome_pids_from_driver else {pid}
+                pids = get_chrome_pids_from_driver(driver, scraper_name="Taiwan") if get_chrome_pids_from_driver else {pid}
                 tracker.register(step_number=1, pid=pid, browser_type="chrome", child_pids=pids)
             db.close()
         except Exception:
@@ -462,7 +462,7 @@ def build_driver() -> webdriver.Chrome:
 
     if CHROME_INSTANCE_TRACKING_AVAILABLE and run_id:
         try:
-            pids = get_chrome_pids_from_driver(driver)
+            pids = get_chrome_pids_from_driver(driver, scraper_name="CanadaOntario")
             if pids:
                 driver_pid = driver.service.process.pid if hasattr(driver.service, 'process') else list(pids)[0]
                 db = PostgresDB("CanadaOntario")
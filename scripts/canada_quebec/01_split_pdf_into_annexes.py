@@ -13,7 +13,7 @@ License: Proprietary
 from pathlib import Path
 import json
 import unicodedata
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from PyPDF2 import PdfReader, PdfWriter
 
 try:
@@ -44,8 +44,10 @@ if script_path.exists():
 from config_loader import (
     get_base_dir, get_input_dir, get_split_pdf_dir,
     DEFAULT_INPUT_PDF_NAME, INDEX_JSON_NAME,
-    ANNEXE_IV1_PDF_NAME, ANNEXE_IV2_PDF_NAME, ANNEXE_V_PDF_NAME
+    ANNEXE_IV1_PDF_NAME, ANNEXE_IV2_PDF_NAME, ANNEXE_V_PDF_NAME,
+    PDF_PAGE_PROCESSES, get_page_cache_dir
 )
+from core.parsing.pdf_pages import extract_pages
 BASE_DIR = get_base_dir()
 INPUT_DIR = get_input_dir()
 OUTPUT_DIR = get_split_pdf_dir()
@@ -61,48 +63,49 @@ def strip_accents(text: str) -> str:
                    if unicodedata.category(c) != "Mn")
 
 
-def extract_page_text(reader: PdfReader, page_idx: int) -> str:
-    """Extract and clean text from a PDF page."""
-    try:
-        raw_text = reader.pages[page_idx].extract_text() or ""
-        return clean_extracted_text(raw_text, enforce_utf8=True)
-    except Exception:
-        return ""
+def load_page_texts(pdf_path: Path, total_pages: int) -> List[str]:
+    """
+    Cleaned text of every page, extracted once (page-parallel, cached by PDF
+    hash) and shared by all the find_* scans below.
+    """
+    raw_texts = extract_pages(pdf_path, "pypdf_text", pages=range(total_pages),
+                              processes=PDF_PAGE_PROCESSES, cache_dir=get_page_cache_dir())
+    return [clean_extracted_text(raw, enforce_utf8=True) if raw else "" for raw in raw_texts]
 
 
-def find_last_annexe_v_page(reader: PdfReader) -> Optional[int]:
+def find_last_annexe_v_page(texts: List[str]) -> Optional[int]:
     """Find the last page containing 'ANNEXE V'."""
     last_page = None
-    for i in range(len(reader.pages)):
-        text = extract_page_text(reader, i)
+    for i in range(len(texts)):
+        text = texts[i]
         if "annexe v" in strip_accents(text).lower():
             last_page = i
     return last_page
 
 
-def find_first_legend_after(reader: PdfReader, start_page: int) -> Optional[int]:
+def find_first_legend_after(texts: List[str], start_page: int) -> Optional[int]:
     """Find first LÉGENDE page after start_page."""
-    for i in range(max(0, start_page), len(reader.pages)):
-        text = extract_page_text(reader, i)
+    for i in range(max(0, start_page), len(texts)):
+        text = texts[i]
         if "legende" in strip_accents(text).lower():
             return i
     return None
 
 
-def find_last_legend_anywhere(reader: PdfReader) -> Optional[int]:
+def find_last_legend_anywhere(texts: List[str]) -> Optional[int]:
     """Find last LÉGENDE page anywhere in document."""
     last_page = None
-    for i in range(len(reader.pages)):
-        text = extract_page_text(reader, i)
+    for i in range(len(texts)):
+        text = texts[i]
         if "legende" in strip_accents(text).lower():
             last_page = i
     return last_page
 
 
-def find_annexe_iv1_page(reader: PdfReader) -> Optional[int]:
+def find_annexe_iv1_page(texts: List[str]) -> Optional[int]:
     """Find the page containing 'ANNEXE IV.1' with the target heading and actual data."""
-    for i in range(len(reader.pages)):
-        text = extract_page_text(reader, i)
+    for i in range(len(texts)):
+        text = texts[i]
         text_normalized = strip_accents(text).lower()
         # Look for ANNEXE IV.1
         has_annexe = "annexe iv.1" in text_normalized
@@ -113,10 +116,10 @@ def find_annexe_iv1_page(reader: PdfReader) -> Optional[int]:
         if has_annexe and has_heading and has_data:
             return i
     return None
-def find_first_annexe_iv2_page(reader: PdfReader, start_after: int = 0) -> Optional[int]:
+def find_first_annexe_iv2_page(texts: List[str], start_after: int = 0) -> Optional[int]:
     """Find the first page containing 'ANNEXE IV.2' (after a given page index)."""
-    for i in range(start_after, len(reader.pages)):
-        text = extract_page_text(reader, i)
+    for i in range(start_after, len(texts)):
+        text = texts[i]
         t = strip_accents(text).lower()
         has_annexe = "annexe iv.2" in t
         has_heading = "medicaments d" in t  # common heading for these annexes
@@ -125,10 +128,10 @@ def find_first_annexe_iv2_page(reader: PdfReader, start_after: int = 0) -> Optio
     return None
 
 
-def find_first_annexe_v_page(reader: PdfReader, start_after: int = 0) -> Optional[int]:
+def find_first_annexe_v_page(texts: List[str], start_after: int = 0) -> Optional[int]:
     """Find the first page containing 'ANNEXE V' (after a given page index)."""
-    for i in range(start_after, len(reader.pages)):
-        text = extract_page_text(reader, i)
+    for i in range(start_after, len(texts)):
+        text = texts[i]
         t = strip_accents(text).lower()
         has_annexe = "annexe v" in t
         # Add a light qualifier to avoid accidental matches in footers/refs
@@ -189,28 +192,30 @@ def main() -> Dict[str, Any]:
     # Start searching after TOC (Page 20)
     SEARCH_START_OFFSET = 20
     
-    def find_annexe_iii_page(reader: PdfReader) -> Optional[int]:
-        for i in range(SEARCH_START_OFFSET, len(reader.pages)):
-            text = extract_page_text(reader, i)
+    def find_annexe_iii_page(texts: List[str]) -> Optional[int]:
+        for i in range(SEARCH_START_OFFSET, len(texts)):
+            text = texts[i]
             t = strip_accents(text).lower()
             if "annexe iii" in t and "grossiste" in t:
                 return i
         return None
 
-    def find_annexe_iv_page(reader: PdfReader, start_after: int = 0) -> Optional[int]:
-        for i in range(max(SEARCH_START_OFFSET, start_after), len(reader.pages)):
-            text = extract_page_text(reader, i)
+    def find_annexe_iv_page(texts: List[str], start_after: int = 0) -> Optional[int]:
+        for i in range(max(SEARCH_START_OFFSET, start_after), len(texts)):
+            text = texts[i]
             t = strip_accents(text).lower()
             # Look for Annexe IV specifically (Exception Drugs)
             if "annexe iv" in t and "annexe iv.1" not in t and ("medicaments d" in t or "indications" in t):
                 return i
         return None
 
-    iii_start = find_annexe_iii_page(reader)
-    iv_start = find_annexe_iv_page(reader, start_after=iii_start + 1 if iii_start is not None else 0)
-    iv1_start = find_annexe_iv1_page(reader)
-    iv2_start = find_first_annexe_iv2_page(reader, start_after=iv1_start + 1)
-    v_start = find_first_annexe_v_page(reader, start_after=iv2_start + 1 if iv2_start is not None else iv1_start + 1)
+    texts = load_page_texts(pdf_path, total_pages)
+
+    iii_start = find_annexe_iii_page(texts)
+    iv_start = find_annexe_iv_page(texts, start_after=iii_start + 1 if iii_start is not None else 0)
+    iv1_start = find_annexe_iv1_page(texts)
+    iv2_start = find_first_annexe_iv2_page(texts, start_after=iv1_start + 1)
+    v_start = find_first_annexe_v_page(texts, start_after=iv2_start + 1 if iv2_start is not None else iv1_start + 1)
 
     if iv1_start is None:
         return {"status": "error", "message": "Could not find 'ANNEXE IV.1' in the PDF"}
@@ -1,4 +1,3 @@
-import pdfplumber
 import csv
 import re
 import sys
@@ -13,9 +12,10 @@ sys.path.insert(0, str(script_path))
 
 from config_loader import (
     get_split_pdf_dir, get_csv_output_dir, 
-    DB_ENABLED, STATIC_CURRENCY, STATIC_REGION
+    DB_ENABLED, PDF_PAGE_PROCESSES, get_page_cache_dir, STATIC_CURRENCY, STATIC_REGION
 )
 from db_handler import DBHandler
+from core.parsing.pdf_pages import iter_pages
 
 INPUT_PDF = get_split_pdf_dir() / "annexe_iii.pdf"
 OUTPUT_CSV = get_csv_output_dir() / "annexe_iii.csv"
@@ -43,59 +43,59 @@ def extract_annexe_iii():
     print(f"Extracting Annexe III: {INPUT_PDF}")
     rows = []
     
-    with pdfplumber.open(INPUT_PDF) as pdf:
-        for i, page in enumerate(pdf.pages):
-            words = page.extract_words(x_tolerance=3, y_tolerance=3)
-            # Group by line
-            lines = {}
-            for w in words:
-                top = round(w['top'])
-                if top not in lines: lines[top] = []
-                lines[top].append(w)
+    pages_words = iter_pages(INPUT_PDF, "words", processes=PDF_PAGE_PROCESSES,
+                             cache_dir=get_page_cache_dir(), x_tolerance=3, y_tolerance=3)
+    for i, words in enumerate(pages_words):
+        # Group by line
+        lines = {}
+        for w in words:
+            top = round(w['top'])
+            if top not in lines: lines[top] = []
+            lines[top].append(w)
+        
+        for top in sorted(lines.keys()):
+            line_words = sorted(lines[top], key=lambda w: w['x0'])
+            text = " ".join([w['text'] for w in line_words])
             
-            for top in sorted(lines.keys()):
-                line_words = sorted(lines[top], key=lambda w: w['x0'])
-                text = " ".join([w['text'] for w in line_words])
-                
-                # Skip headers
-                if "Fabricant" in text or "ANNEXE" in text:
-                    continue
-                
-                # Annexe III rows: [Manufacturer] [Brand] [Formulation] [Pack Size]
-                # Spacing is key. 
-                # Manufacturer is usually the first word(s).
-                # Pack size is the last word (integer).
-                
-                parts = text.split()
-                if len(parts) < 3: continue
-                
-                row = RowData()
-                row.page_num = i + 1
-                
-                # Manufacturers in Annexe III are often one or two words (Apotex, Otsuka Can, etc.)
-                # We'll use X-coordinates for better precision
-                
-                # Let's use simple column split based on X
-                manu_words = [w['text'] for w in line_words if w['x0'] < 100]
-                brand_form_words = [w['text'] for w in line_words if 100 <= w['x0'] < 350]
-                pack_words = [w['text'] for w in line_words if w['x0'] >= 350]
-                
-                row.manufacturer = " ".join(manu_words)
-                brand_form = " ".join(brand_form_words)
+            # Skip headers
+            if "Fabricant" in text or "ANNEXE" in text:
+                continue
+            
+            # Annexe III rows: [Manufacturer] [Brand] [Formulation] [Pack Size]
+            # Spacing is key. 
+            # Manufacturer is usually the first word(s).
+            # Pack size is the last word (integer).
+            
+            parts = text.split()
+            if len(parts) < 3: continue
+            
+            row = RowData()
+            row.page_num = i + 1
+            
+            # Manufacturers in Annexe III are often one or two words (Apotex, Otsuka Can, etc.)
+            # We'll use X-coordinates for better precision
+            
+            # Let's use simple column split based on X
+            manu_words = [w['text'] for w in line_words if w['x0'] < 100]
+            brand_form_words = [w['text'] for w in line_words if 100 <= w['x0'] < 350]
+            pack_words = [w['text'] for w in line_words if w['x0'] >= 350]
+            
+            row.manufacturer = " ".join(manu_words)
+            brand_form = " ".join(brand_form_words)
+            
+            # Split brand and formulation (heuristic: brand is first 1-2 words)
+            bf_parts = brand_form.split(None, 1)
+            if len(bf_parts) > 1:
+                row.brand = bf_parts[0]
+                row.formulation = bf_parts[1]
+            else:
+                row.brand = brand_form
                 
-                # Split brand and formulation (heuristic: brand is first 1-2 words)
-                bf_parts = brand_form.split(None, 1)
-                if len(bf_parts) > 1:
-                    row.brand = bf_parts[0]
-                    row.formulation = bf_parts[1]
-                else:
-                    row.brand = brand_form
-                    
-                row.format_str = " ".join(pack_words)
+            row.format_str = " ".join(pack_words)
+            
+            if row.manufacturer and row.brand:
+                rows.append(row)
                 
-                if row.manufacturer and row.brand:
-                    rows.append(row)
-                    
     return rows
 
 if __name__ == "__main__":
@@ -1,4 +1,3 @@
-import pdfplumber
 import csv
 import re
 import sys
@@ -10,7 +9,8 @@ from pathlib import Path
 script_path = Path(__file__).resolve().parent
 sys.path.insert(0, str(script_path))
 
-from config_loader import get_split_pdf_dir, DB_ENABLED
+from config_loader import get_split_pdf_dir, DB_ENABLED, PDF_PAGE_PROCESSES, get_page_cache_dir
+from core.parsing.pdf_pages import extract_pages
 
 INPUT_PDF = get_split_pdf_dir() / "annexe_iv.pdf"
 
@@ -23,11 +23,11 @@ def extract_annexe_iv():
     re_din = re.compile(r"\b\d{6,8}\b")
     
     rows_found = 0
-    with pdfplumber.open(INPUT_PDF) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            dins = re_din.findall(text)
-            rows_found += len(dins)
+    page_texts = extract_pages(INPUT_PDF, "text", processes=PDF_PAGE_PROCESSES,
+                               cache_dir=get_page_cache_dir())
+    for text in page_texts:
+        dins = re_din.findall(text)
+        rows_found += len(dins)
             
     print(f"Annexe IV scan complete. Found {rows_found} DIN-like patterns.")
     print("Note: Annexe IV is primarily therapeutic criteria text.")
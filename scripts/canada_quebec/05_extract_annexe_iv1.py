@@ -1,4 +1,3 @@
-import pdfplumber
 import csv
 import re
 import sys
@@ -13,9 +12,10 @@ sys.path.insert(0, str(script_path))
 
 from config_loader import (
     get_split_pdf_dir, get_csv_output_dir, 
-    DB_ENABLED
+    DB_ENABLED, PDF_PAGE_PROCESSES, get_page_cache_dir
 )
 from db_handler import DBHandler
+from core.parsing.pdf_pages import iter_pages
 
 INPUT_PDF = get_split_pdf_dir() / "annexe_iv1.pdf"
 OUTPUT_CSV = get_csv_output_dir() / "annexe_iv1.csv"
@@ -41,72 +41,72 @@ def extract_rows():
         return []
 
     all_rows = []
-    with pdfplumber.open(INPUT_PDF) as pdf:
-        current_generic = ""
-        current_formulation = ""
+    pages_words = iter_pages(INPUT_PDF, "words", processes=PDF_PAGE_PROCESSES,
+                             cache_dir=get_page_cache_dir(), x_tolerance=3, y_tolerance=3)
+    current_generic = ""
+    current_formulation = ""
+    
+    for i, words in enumerate(pages_words):
+        page_num = i + 1
+        
+        # Robust grouping by Y coordinate
+        lines = []
+        if not words: continue
+        words.sort(key=lambda w: w['top'])
+        cur_line = [words[0]]
+        for w in words[1:]:
+            if abs(w['top'] - cur_line[-1]['top']) < 3:
+                cur_line.append(w)
+            else:
+                lines.append(cur_line)
+                cur_line = [w]
+        lines.append(cur_line)
         
-        for i, page in enumerate(pdf.pages):
-            page_num = i + 1
-            words = page.extract_words(x_tolerance=3, y_tolerance=3)
+        for line in lines:
+            line.sort(key=lambda w: w['x0'])
+            text = " ".join([w['text'] for w in line])
             
-            # Robust grouping by Y coordinate
-            lines = []
-            if not words: continue
-            words.sort(key=lambda w: w['top'])
-            cur_line = [words[0]]
-            for w in words[1:]:
-                if abs(w['top'] - cur_line[-1]['top']) < 3:
-                    cur_line.append(w)
-                else:
-                    lines.append(cur_line)
-                    cur_line = [w]
-            lines.append(cur_line)
+            # Check for Generic Header (All caps, ending with :)
+            if re.match(r"^[A-ZÀ-ÖØ-Þ][A-ZÀ-ÖØ-Þ0-9/ '\-().]+ :?$", text) or (text.isupper() and len(text) > 10):
+                current_generic = text.rstrip(':').strip()
+                current_formulation = ""
+                continue
             
-            for line in lines:
-                line.sort(key=lambda w: w['x0'])
-                text = " ".join([w['text'] for w in line])
+            # Check for Formulation line (usually right after generic)
+            if any(w in text.lower() for w in ["sol. inj.", "caps.", "co.", "susp.", "pd."]) and not RE_DIN.search(text):
+                current_formulation = text.strip()
+                continue
+
+            # Check for DIN row
+            din_match = RE_DIN.search(text)
+            if din_match:
+                row = RowData()
+                row.din = din_match.group(1)
+                row.page_num = page_num
+                row.generic_name = current_generic
+                row.formulation = current_formulation
                 
-                # Check for Generic Header (All caps, ending with :)
-                if re.match(r"^[A-ZÀ-ÖØ-Þ][A-ZÀ-ÖØ-Þ0-9/ '\-().]+ :?$", text) or (text.isupper() and len(text) > 10):
-                    current_generic = text.rstrip(':').strip()
-                    current_formulation = ""
-                    continue
+                # Columns in IV.1: [DIN] [Brand] [Manufacturer] [Pack] [Price] [Unit Price]
+                # We'll use X-anchors if possible, or split by parts
+                # Standard X for IV.1:
+                # DIN: ~50, Brand: ~150, Manu: ~300, Pack: ~400, Price: ~450
+                
+                brand_words = [w['text'] for w in line if 90 < w['x0'] < 250]
+                manu_words = [w['text'] for w in line if 250 <= w['x0'] < 400]
+                price_words = [w['text'] for w in line if w['x0'] >= 400]
+                
+                row.brand = " ".join(brand_words)
+                row.manufacturer = " ".join(manu_words)
+                
+                prices = re.findall(r"\d+[,.]\d+", " ".join(price_words))
+                if len(prices) >= 1: row.price = prices[0]
+                if len(prices) >= 2: row.unit_price = prices[1]
+                
+                pack_search = re.search(r"\b(\d+)\b", " ".join(price_words))
+                if pack_search: row.format_str = pack_search.group(1)
+                
+                all_rows.append(row)
                 
-                # Check for Formulation line (usually right after generic)
-                if any(w in text.lower() for w in ["sol. inj.", "caps.", "co.", "susp.", "pd."]) and not RE_DIN.search(text):
-                    current_formulation = text.strip()
-                    continue
-
-                # Check for DIN row
-                din_match = RE_DIN.search(text)
-                if din_match:
-                    row = RowData()
-                    row.din = din_match.group(1)
-                    row.page_num = page_num
-                    row.generic_name = current_generic
-                    row.formulation = current_formulation
-                    
-                    # Columns in IV.1: [DIN] [Brand] [Manufacturer] [Pack] [Price] [Unit Price]
-                    # We'll use X-anchors if possible, or split by parts
-                    # Standard X for IV.1:
-                    # DIN: ~50, Brand: ~150, Manu: ~300, Pack: ~400, Price: ~450
-                    
-                    brand_words = [w['text'] for w in line if 90 < w['x0'] < 250]
-                    manu_words = [w['text'] for w in line if 250 <= w['x0'] < 400]
-                    price_words = [w['text'] for w in line if w['x0'] >= 400]
-                    
-                    row.brand = " ".join(brand_words)
-                    row.manufacturer = " ".join(manu_words)
-                    
-                    prices = re.findall(r"\d+[,.]\d+", " ".join(price_words))
-                    if len(prices) >= 1: row.price = prices[0]
-                    if len(prices) >= 2: row.unit_price = prices[1]
-                    
-                    pack_search = re.search(r"\b(\d+)\b", " ".join(price_words))
-                    if pack_search: row.format_str = pack_search.group(1)
-                    
-                    all_rows.append(row)
-                    
     return all_rows
 
 if __name__ == "__main__":
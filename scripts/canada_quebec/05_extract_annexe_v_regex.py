@@ -28,7 +28,7 @@ import re
 import csv
 import logging
 import unicodedata
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
 import pdfplumber
@@ -66,7 +66,7 @@ from config_loader import (
     get_env, get_env_bool,
     ANNEXE_V_PDF_NAME, ANNEXE_V_CSV_NAME, LOG_FILE_ANNEXE_V,
     STATIC_CURRENCY, STATIC_REGION,
-    X_TOL, Y_TOL,
+    X_TOL, Y_TOL, PDF_PAGE_PROCESSES, get_page_cache_dir,
     ANNEXE_V_START_PAGE_1IDX, ANNEXE_V_MAX_ROWS,
     FINAL_COLUMNS
 )
@@ -74,6 +74,7 @@ BASE_DIR = get_base_dir()
 INPUT_DIR = get_split_pdf_dir()
 OUTPUT_DIR = get_csv_output_dir()
 START_PAGE_1IDX = ANNEXE_V_START_PAGE_1IDX
+from core.parsing.pdf_pages import iter_pages
 MAX_ROWS = ANNEXE_V_MAX_ROWS
 
 # AI Configuration (Hybrid)
@@ -211,9 +212,14 @@ def tokens_to_text(tokens: List[Dict[str, Any]]) -> str:
     # Apply encoding cleanup
     return clean_extracted_text(text, enforce_utf8=True)
 
+WORD_OPTIONS = {"x_tolerance": X_TOL, "y_tolerance": Y_TOL, "keep_blank_chars": False}
+
 def page_to_lines(page) -> List[Dict[str, Any]]:
     """Extract lines from PDF page with proper encoding."""
-    words = page.extract_words(x_tolerance=X_TOL, y_tolerance=Y_TOL, keep_blank_chars=False) or []
+    return words_to_lines(page.extract_words(**WORD_OPTIONS) or [])
+
+def words_to_lines(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group extracted words (see WORD_OPTIONS) into cleaned lines."""
     if not words:
         return []
     
@@ -760,6 +766,17 @@ def extract_annexe_v():
                 logger.error(error_msg)
                 raise SystemExit(error_msg)
 
+            # Layout analysis runs page-parallel (and is cached per PDF hash);
+            # the line parser below carries generic/form context across pages,
+            # so it walks the extracted words sequentially in page order.
+            failed_pages: Set[int] = set()
+            pages_words = iter_pages(
+                INPUT_PDF, "words", pages=range(START_PAGE_1IDX - 1, total_pages),
+                processes=PDF_PAGE_PROCESSES, cache_dir=get_page_cache_dir(),
+                failed_pages=failed_pages, **WORD_OPTIONS,
+            )
+            fallback_reader = None
+
             with csv_writer_utf8(OUTPUT_CSV, add_bom=True) as f:
                 writer = csv.DictWriter(f, fieldnames=FINAL_COLS)
                 writer.writeheader()
@@ -767,12 +784,15 @@ def extract_annexe_v():
                 current_generic: Optional[str] = None
                 current_formline: Optional[str] = None
 
-                for page_no_1idx in range(START_PAGE_1IDX, total_pages + 1):
+                for page_no_1idx, page_words in zip(range(START_PAGE_1IDX, total_pages + 1), pages_words):
+                    if page_no_1idx - 1 in failed_pages:
+                        # Extraction already logged the cause; skip the page as before
+                        errors_encountered += 1
+                        print(f"[WARN] Error on page {page_no_1idx}: word extraction failed")
+                        continue
                     try:
-                        page = pdf.pages[page_no_1idx - 1]
-                        lines = page_to_lines(page)
+                        lines = words_to_lines(page_words)
 
-                        i = 0
                         i = 0
                         page_rows = 0
                         din_rows_found_on_page = 0
@@ -910,9 +930,11 @@ def extract_annexe_v():
                         if page_rows == 0:
                             # If pdfplumber found no rows, check if pypdf sees meaningful text
                             try:
-                                reader = PdfReader(str(INPUT_PDF))
+                                if fallback_reader is None:
+                                    fallback_reader = PdfReader(str(INPUT_PDF))
+                                reader = fallback_reader
                                 if page_no_1idx - 1 < len(reader.pages):
-                                    raw_text = reader.pages[page_no_1idx - 1].extract_text()
+                                    raw_text = reader.pages[page_no_1idx - 1].extract_text() or ""
                                     # If text is substantial (>100 chars) and contains digits (potential DIN/Price)
                                     if len(raw_text) > 100 and re.search(r"\d{6}", raw_text):
                                         logger.info(f"Page {page_no_1idx}: pdfplumber failed. Attempting AI Hybrid extraction...")
@@ -14,8 +14,6 @@ import json
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-import pdfplumber
-
 # Core imports
 script_path = Path(__file__).resolve().parent
 sys.path.insert(0, str(script_path))
@@ -23,9 +21,11 @@ sys.path.insert(0, str(script_path))
 from config_loader import (
     get_base_dir, get_split_pdf_dir, get_csv_output_dir,
     get_env_bool, ANNEXE_V_PDF_NAME, ANNEXE_V_CSV_NAME,
-    STATIC_CURRENCY, STATIC_REGION, FINAL_COLUMNS
+    STATIC_CURRENCY, STATIC_REGION, FINAL_COLUMNS,
+    PDF_PAGE_PROCESSES, get_page_cache_dir
 )
 from db_handler import DBHandler
+from core.parsing.pdf_pages import count_pages, iter_pages
 
 # --- CONFIG ---
 INPUT_DIR = get_split_pdf_dir()
@@ -62,8 +62,12 @@ def french_to_float(s: str) -> Optional[float]:
     try: return float(t)
     except: return None
 
+WORD_OPTIONS = {"x_tolerance": 2, "y_tolerance": 2}
+
 def page_to_lines(page):
-    words = page.extract_words(x_tolerance=2, y_tolerance=2) or []
+    return words_to_lines(page.extract_words(**WORD_OPTIONS) or [])
+
+def words_to_lines(words):
     if not words: return []
     words.sort(key=lambda w: (round(w["top"], 1), w["x0"]))
     lines = []
@@ -122,69 +126,69 @@ def main():
     total_rows = 0
     start_time = time.time()
 
-    with pdfplumber.open(INPUT_PDF) as pdf:
-        total_pages = len(pdf.pages)
-        with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=FINAL_COLUMNS)
-            writer.writeheader()
-            
-            cur_generic = ""
-            cur_formline = ""
-
-            for p_idx in range(total_pages):
-                page = pdf.pages[p_idx]
-                lines = page_to_lines(page)
-                page_rows = []
-
-                for i, line in enumerate(lines):
-                    text = line["text"]
-                    if is_generic_header(text):
-                        cur_generic = text.rstrip(':').strip()
-                        cur_formline = ""
-                        continue
-                    
-                    din_idx = find_din_token_idx(line["tokens"])
-                    if din_idx is None and is_form_line(text):
-                        cur_formline = text.strip()
-                        continue
-                    
-                    if din_idx is not None:
-                        din = line["tokens"][din_idx]["text"].strip()
-                        after = line["tokens"][din_idx+1:]
-                        brand, manu = brand_and_manufacturer(after)
-                        
-                        # Find prices on this line or next
-                        prices = []
-                        price_text = " ".join(t["text"] for t in after)
-                        prices = re.findall(r"\d+[,.]\d+", price_text)
-                        
-                        cost = prices[0] if len(prices) > 0 else "0.0"
-                        unit = prices[1] if len(prices) > 1 else cost
-                        
-                        row = {
-                            "Generic Name": cur_generic or "N/A",
-                            "Currency": STATIC_CURRENCY,
-                            "Ex Factory Wholesale Price": cost,
-                            "Unit Price": unit,
-                            "Region": STATIC_REGION,
-                            "Product Group": brand or "N/A",
-                            "Marketing Authority": manu or "N/A",
-                            "Local Pack Description": cur_formline or text,
-                            "Formulation": cur_formline.split()[0] if cur_formline else "N/A",
-                            "Fill Size": 1,
-                            "Strength": "N/A",
-                            "Strength Unit": "N/A",
-                            "LOCAL_PACK_CODE": din
-                        }
-                        writer.writerow(row)
-                        page_rows.append(row)
-                        total_rows += 1
+    total_pages = count_pages(INPUT_PDF)
+    pages_words = iter_pages(INPUT_PDF, "words", processes=PDF_PAGE_PROCESSES,
+                             cache_dir=get_page_cache_dir(), **WORD_OPTIONS)
+    with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=FINAL_COLUMNS)
+        writer.writeheader()
+        
+        cur_generic = ""
+        cur_formline = ""
+
+        for p_idx, words in enumerate(pages_words):
+            lines = words_to_lines(words)
+            page_rows = []
+
+            for i, line in enumerate(lines):
+                text = line["text"]
+                if is_generic_header(text):
+                    cur_generic = text.rstrip(':').strip()
+                    cur_formline = ""
+                    continue
                 
-                if db and page_rows:
-                    db.save_rows("annexe_v", page_rows, run_id)
+                din_idx = find_din_token_idx(line["tokens"])
+                if din_idx is None and is_form_line(text):
+                    cur_formline = text.strip()
+                    continue
                 
-                if (p_idx + 1) % 50 == 0:
-                    print(f"Processed {p_idx+1}/{total_pages} pages... Total rows: {total_rows}")
+                if din_idx is not None:
+                    din = line["tokens"][din_idx]["text"].strip()
+                    after = line["tokens"][din_idx+1:]
+                    brand, manu = brand_and_manufacturer(after)
+                    
+                    # Find prices on this line or next
+                    prices = []
+                    price_text = " ".join(t["text"] for t in after)
+                    prices = re.findall(r"\d+[,.]\d+", price_text)
+                    
+                    cost = prices[0] if len(prices) > 0 else "0.0"
+                    unit = prices[1] if len(prices) > 1 else cost
+                    
+                    row = {
+                        "Generic Name": cur_generic or "N/A",
+                        "Currency": STATIC_CURRENCY,
+                        "Ex Factory Wholesale Price": cost,
+                        "Unit Price": unit,
+                        "Region": STATIC_REGION,
+                        "Product Group": brand or "N/A",
+                        "Marketing Authority": manu or "N/A",
+                        "Local Pack Description": cur_formline or text,
+                        "Formulation": cur_formline.split()[0] if cur_formline else "N/A",
+                        "Fill Size": 1,
+                        "Strength": "N/A",
+                        "Strength Unit": "N/A",
+                        "LOCAL_PACK_CODE": din
+                    }
+                    writer.writerow(row)
+                    page_rows.append(row)
+                    total_rows += 1
+            
+            if db and page_rows:
+                db.save_rows("annexe_v", page_rows, run_id)
+            
+            if (p_idx + 1) % 50 == 0:
+                print(f"Processed {p_idx+1}/{total_pages} pages... Total rows: {total_rows}")
 
     duration = time.time() - start_time
     if db:
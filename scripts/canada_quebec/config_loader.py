@@ -9,6 +9,7 @@ It acts as a facade, delegating all logic to core.config.config_manager.ConfigMa
 
 import sys
 from pathlib import Path
+from typing import Optional
 
 _script_dir = Path(__file__).resolve().parent
 _repo_root = _script_dir.parents[1]
@@ -77,6 +78,19 @@ def get_qa_output_dir() -> Path:
     return result
 
 
+def get_page_cache_dir() -> Optional[Path]:
+    """Get the PDF page text/word cache directory (None when caching is disabled)."""
+    if not PDF_PAGE_CACHE_ENABLED:
+        return None
+    base = get_output_dir()
+    cache_subdir = get_env("PDF_PAGE_CACHE_DIR", "page_cache")
+    if Path(cache_subdir).is_absolute():
+        return Path(cache_subdir)
+    result = base / cache_subdir
+    result.mkdir(parents=True, exist_ok=True)
+    return result
+
+
 # File names
 DEFAULT_INPUT_PDF_NAME = get_env("DEFAULT_INPUT_PDF_NAME", "liste-med.pdf")
 ANNEXE_IV1_PDF_NAME = get_env("ANNEXE_IV1_PDF_NAME", "annexe_iv1.pdf")
@@ -131,6 +145,9 @@ STATIC_REGION = get_env("STATIC_REGION", "NORTH AMERICA")
 # Extraction tuning
 X_TOL = get_env_float("X_TOL", 1.0)
 Y_TOL = get_env_float("Y_TOL", 1.6)
+# Page-parallel PDF extraction (0 = cpu_count - 1, 1 = no pool) and page cache
+PDF_PAGE_PROCESSES = get_env_int("PDF_PAGE_PROCESSES", 0)
+PDF_PAGE_CACHE_ENABLED = get_env_bool("PDF_PAGE_CACHE_ENABLED", True)
 ANNEXE_V_START_PAGE_1IDX = get_env_int("ANNEXE_V_START_PAGE_1IDX", 1)
 ANNEXE_V_MAX_ROWS = get_env("ANNEXE_V_MAX_ROWS", "").strip()
 if ANNEXE_V_MAX_ROWS and ANNEXE_V_MAX_ROWS.isdigit():
@@ -186,7 +186,7 @@ def build_driver(headless: bool = True) -> Optional[webdriver.Chrome]:
     
     if ChromeInstanceTracker and CountryDB and run_id and get_chrome_pids_from_driver:
         try:
-            pids = get_chrome_pids_from_driver(driver)
+            pids = get_chrome_pids_from_driver(driver, scraper_name="NorthMacedonia")
             if pids:
                 driver_pid = driver.service.process.pid if hasattr(driver.service, 'process') else list(pids)[0]
                 db = CountryDB("NorthMacedonia")
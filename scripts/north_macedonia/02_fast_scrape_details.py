@@ -45,9 +45,6 @@ except Exception:
     logger.warning("googletrans not available; translations will be skipped")
     _translator = None
 
-# Semaphore: cap concurrent Google Translate calls to avoid WinError 10035
-# (WSAEWOULDBLOCK — Windows non-blocking socket exhaustion with many workers)
-_translate_sem: asyncio.Semaphore = asyncio.Semaphore(3)
 
 
 # -----------------------------
@@ -81,6 +78,11 @@ except Exception:
 MAX_WORKERS = getenv_int("SCRIPT_02_DETAIL_WORKERS", 15)
 SLEEP_BETWEEN = getenv_float("SCRIPT_02_SLEEP_BETWEEN_DETAILS", 0.15)
 BATCH_SIZE = 100
+# Translation stage: strings per Google Translate call, and calls in flight.
+# Keep concurrency low to avoid WinError 10035 (WSAEWOULDBLOCK — Windows
+# non-blocking socket exhaustion with many concurrent calls).
+TRANSLATE_CHUNK_SIZE = getenv_int("SCRIPT_02_TRANSLATE_CHUNK_SIZE", 25)
+TRANSLATE_CONCURRENCY = getenv_int("SCRIPT_02_TRANSLATE_CONCURRENCY", 3)
 
 # Reimbursement constants (as per requirement)
 REIMBURSABLE_STATUS = "PARTIALLY REIMBURSABLE"
@@ -130,34 +132,47 @@ def looks_cyrillic(text: str) -> bool:
     return bool(_cyrillic_re.search(text or ""))
 
 
-def translate_to_en(text: str) -> str:
-    text = normalize_ws(text)
-    if not text or not looks_cyrillic(text):
-        return text
+def translate_batch_to_en(texts: List[str]) -> List[str]:
+    """Translate Macedonian strings with googletrans (blocking, one request per string)."""
     if _translator is None:
-        return text
+        raise RuntimeError("googletrans not available")
+    results = _translator.translate(list(texts), src="mk", dest="en")
+    if not isinstance(results, list):
+        results = [results]
+    return [normalize_ws(r.text) for r in results]
 
-    # Retry with backoff for WSAEWOULDBLOCK (WinError 10035)
-    # which occurs when too many concurrent calls saturate the socket pool.
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            result = _translator.translate(text, src="mk", dest="en")
-            return normalize_ws(result.text)
-        except OSError as e:
-            if getattr(e, 'winerror', None) == 10035 or getattr(e, 'errno', None) == 10035:
-                # WSAEWOULDBLOCK — back off and retry
-                sleep_s = 0.5 * (2 ** attempt)  # 0.5s, 1s, 2s
-                if attempt < max_retries - 1:
-                    time.sleep(sleep_s)
-                    continue
-            logger.debug(f"[NM] Translation failed for {text!r}: {e}")
-            return text
-        except Exception as e:
-            logger.debug(f"[NM] Translation failed for {text!r}: {e}")
-            return text
-    logger.debug(f"[NM] Translation gave up after {max_retries} retries for {text!r}")
-    return text
+
+# Row fields that may still be Macedonian after extraction
+TRANSLATE_FIELDS = [
+    "Local Product Name",
+    "Generic Name",
+    "Formulation",
+    "Strength Size",
+    "Fill Size",
+    "Customized 1",
+    "Marketing Authority / Company Name",
+    "Local Pack Description",
+]
+
+
+def make_batch_translator():
+    from core.translation import BatchTranslator, get_cache
+
+    try:
+        cache = get_cache("north_macedonia")
+    except Exception as e:
+        logger.warning(f"[NM] Translation cache unavailable: {e}")
+        cache = None
+    return BatchTranslator(
+        translate_batch=translate_batch_to_en if _translator is not None else None,
+        cache=cache,
+        source_lang="mk",
+        target_lang="en",
+        needs_translation=looks_cyrillic,
+        chunk_size=TRANSLATE_CHUNK_SIZE,
+        max_concurrency=TRANSLATE_CONCURRENCY,
+        per_string_requests=True,  # googletrans translates a list item by item
+    )
 
 
 def make_local_pack_description(formulation, fill_size, strength, composition):
@@ -186,7 +201,8 @@ def extract_from_html(html_text: str, url: str) -> Optional[Dict[str, str]]:
     """
     Extract drug details from HTML using lxml.
     Parses div.row-fluid label→value pairs, same as Selenium version
-    but 10-20x faster.
+    but 10-20x faster. Values are returned untranslated; the translation
+    stage in scrape_details_concurrent handles TRANSLATE_FIELDS per batch.
     """
     doc = lxml_html.fromstring(html_text)
 
@@ -224,20 +240,20 @@ def extract_from_html(html_text: str, url: str) -> Optional[Dict[str, str]]:
     local_pack_desc = make_local_pack_description(formulation, packaging, strength, composition)
 
     return {
-        "Local Product Name": translate_to_en(local_product),
+        "Local Product Name": normalize_ws(local_product),
         "Local Pack Code": normalize_ws(ean),
-        "Generic Name": translate_to_en(generic),
+        "Generic Name": normalize_ws(generic),
         "WHO ATC Code": normalize_ws(atc),
-        "Formulation": translate_to_en(formulation),
-        "Strength Size": translate_to_en(strength),
-        "Fill Size": translate_to_en(packaging),
-        "Customized 1": translate_to_en(composition),
-        "Marketing Authority / Company Name": translate_to_en(manufacturers),
+        "Formulation": normalize_ws(formulation),
+        "Strength Size": normalize_ws(strength),
+        "Fill Size": normalize_ws(packaging),
+        "Customized 1": normalize_ws(composition),
+        "Marketing Authority / Company Name": normalize_ws(manufacturers),
         "Effective Start Date": normalize_ws(eff_start),
         "Effective End Date": normalize_ws(eff_end),
         "Public with VAT Price": normalize_ws(retail_vat),
         "Pharmacy Purchase Price": normalize_ws(wholesale),
-        "Local Pack Description": translate_to_en(local_pack_desc),
+        "Local Pack Description": normalize_ws(local_pack_desc),
         "Reimbursable Status": REIMBURSABLE_STATUS,
         "Reimbursable Rate": REIMBURSABLE_RATE,
         "Reimbursable Notes": REIMBURSABLE_NOTES,
@@ -252,10 +268,61 @@ def extract_from_html(html_text: str, url: str) -> Optional[Dict[str, str]]:
 # -----------------------------
 # CONCURRENT SCRAPER
 # -----------------------------
+def _write_batch(repo, batch: List[Dict]) -> None:
+    """Insert a translated batch into nm_drug_register and mark its URLs scraped."""
+    db_records = []
+    batch_urls = []
+    for row in batch:
+        db_records.append({
+            "registration_number": row.get("Local Pack Code", ""),
+            "product_name": row.get("Local Product Name", ""),
+            "product_name_en": row.get("Local Product Name", ""),
+            "generic_name": row.get("Generic Name", ""),
+            "generic_name_en": row.get("Generic Name", ""),
+            "dosage_form": row.get("Formulation", ""),
+            "strength": row.get("Strength Size", ""),
+            "pack_size": row.get("Fill Size", ""),
+            "composition": row.get("Customized 1", ""),
+            "manufacturer": row.get("Marketing Authority / Company Name", ""),
+            "marketing_authorisation_holder": row.get("Marketing Authority / Company Name", ""),
+            "atc_code": row.get("WHO ATC Code", ""),
+            "url_id": row.get("url_id"),
+            "source_url": row.get("detail_url", ""),
+            "public_price": row.get("Public with VAT Price", ""),
+            "pharmacy_price": row.get("Pharmacy Purchase Price", ""),
+            "description": row.get("Local Pack Description", ""),
+            "effective_start_date": row.get("Effective Start Date", ""),
+            "effective_end_date": row.get("Effective End Date", ""),
+        })
+        batch_urls.append(row.get("detail_url", ""))
+
+    # Insert drug records
+    repo.insert_drug_register_batch(db_records)
+    audit_log("INSERT_BATCH", scraper_name="NorthMacedonia", run_id=repo.run_id, details={"inserted": len(db_records)})
+
+    # Mark URLs as scraped AFTER successful insert
+    if batch_urls:
+        with repo.db.cursor() as cur:
+            for batch_url in batch_urls:
+                cur.execute("""
+                    UPDATE nm_urls
+                    SET status = 'scraped',
+                        scraped_at = CURRENT_TIMESTAMP,
+                        error_message = NULL
+                    WHERE run_id = %s AND detail_url = %s
+                """, (repo.run_id, batch_url))
+        repo.db.commit()
+
+
 async def scrape_details_concurrent(urls: List[str], repo=None, url_to_id=None) -> int:
     """
     Scrape drug detail pages using httpx + lxml (no browser).
 
+    Fetch workers only download and extract; a separate stage collects rows
+    into batches of BATCH_SIZE, translates the distinct Cyrillic values of
+    each batch (BatchTranslator: TranslationCache bulk lookup, translator
+    only for misses) and writes the batch to the DB.
+
     DB-FIRST ARCHITECTURE: All data written to nm_drug_register table.
     No CSV output (removed for consistency with other scrapers).
 
@@ -274,16 +341,53 @@ async def scrape_details_concurrent(urls: List[str], repo=None, url_to_id=None)
     print(f"\n[SCRAPER] Starting httpx scraping with {MAX_WORKERS} workers", flush=True)
     print(f"[SCRAPER] Total URLs to scrape: {len(urls)}", flush=True)
     print(f"[SCRAPER] Batch size: {BATCH_SIZE}", flush=True)
+    print(f"[SCRAPER] Translation: chunk={TRANSLATE_CHUNK_SIZE}, concurrency={TRANSLATE_CONCURRENCY}, "
+          f"translator={'googletrans' if _translator is not None else 'cache only'}", flush=True)
 
     completed = 0
     failed = 0
+    written = 0
     start_time = time.time()
-    buffer: List[Dict] = []
-    buffer_lock = asyncio.Lock()
+    translator = make_batch_translator()
 
     url_queue: asyncio.Queue = asyncio.Queue()
     for u in urls:
         await url_queue.put(u)
+    # Bounded: fetch workers wait if translation/DB writes fall behind
+    result_queue: asyncio.Queue = asyncio.Queue(maxsize=BATCH_SIZE * 4)
+
+    async def translate_and_write():
+        nonlocal written
+        done = False
+        while not done:
+            batch: List[Dict] = []
+            while len(batch) < BATCH_SIZE:
+                row = await result_queue.get()
+                if row is None:
+                    done = True
+                    break
+                batch.append(row)
+            if not batch:
+                continue
+
+            try:
+                await translator.translate_rows(batch, TRANSLATE_FIELDS)
+            except Exception as e:
+                print(f"[TRANSLATE WARN] {e}", flush=True)
+
+            try:
+                await asyncio.to_thread(_write_batch, repo, batch)
+                written += len(batch)
+            except Exception as e:
+                print(f"[DB ERROR] {e}", flush=True)
+
+            elapsed = time.time() - start_time
+            rate = completed / elapsed if elapsed > 0 else 0
+            remaining = len(urls) - completed - failed
+            eta_min = (remaining / rate / 60) if rate > 0 else 0
+            print(f"[PROGRESS] {completed}/{len(urls)} | "
+                  f"{rate:.1f}/s | Failed: {failed} | ETA: {eta_min:.0f}min | "
+                  f"translation hit ratio: {translator.hit_ratio:.0%}", flush=True)
 
     async with httpx.AsyncClient(
         headers={
@@ -315,7 +419,6 @@ async def scrape_details_concurrent(urls: List[str], repo=None, url_to_id=None)
                         await asyncio.to_thread(repo.log_request, url, "GET", resp.status_code, len(resp.content), elapsed)
 
                         resp.raise_for_status()
-                        # Translation is sync (googletrans), run in thread
                         result = await asyncio.to_thread(extract_from_html, resp.text, url)
                         break
                     except Exception as e:
@@ -338,10 +441,9 @@ async def scrape_details_concurrent(urls: List[str], repo=None, url_to_id=None)
                     if url_to_id and url in url_to_id:
                         result["url_id"] = url_to_id[url]
 
-                    async with buffer_lock:
-                        buffer.append(result)
-                        completed += 1
-                        # Note: URL will be marked 'scraped' AFTER successful batch insert
+                    completed += 1
+                    # Note: URL will be marked 'scraped' AFTER successful batch insert
+                    await result_queue.put(result)
                 else:
                     # Extraction failed or HTTP error
                     failed += 1
@@ -363,133 +465,23 @@ async def scrape_details_concurrent(urls: List[str], repo=None, url_to_id=None)
                         except Exception as e:
                             print(f"[DB WARN] Could not update failed URL: {e}")
 
-                # Check if buffer is full and needs to be flushed (outside both if/else blocks)
-                async with buffer_lock:
-                    if len(buffer) >= BATCH_SIZE:
-                        batch = buffer.copy()
-                        buffer.clear()
-                    else:
-                        batch = None
-
-                # Process batch outside the lock to avoid blocking workers
-                if batch:
-                    # Write to DB (DB-first architecture)
-                    if repo:
-                        try:
-                            db_records = []
-                            batch_urls = []
-                            for row in batch:
-                                db_records.append({
-                                    "registration_number": row.get("Local Pack Code", ""),
-                                    "product_name": row.get("Local Product Name", ""),
-                                    "product_name_en": row.get("Local Product Name", ""),
-                                    "generic_name": row.get("Generic Name", ""),
-                                    "generic_name_en": row.get("Generic Name", ""),
-                                    "dosage_form": row.get("Formulation", ""),
-                                    "strength": row.get("Strength Size", ""),
-                                    "pack_size": row.get("Fill Size", ""),
-                                    "composition": row.get("Customized 1", ""),
-                                    "manufacturer": row.get("Marketing Authority / Company Name", ""),
-                                    "marketing_authorisation_holder": row.get("Marketing Authority / Company Name", ""),
-                                    "atc_code": row.get("WHO ATC Code", ""),
-                                    "url_id": row.get("url_id"),
-                                    "source_url": row.get("detail_url", ""),
-                                    "public_price": row.get("Public with VAT Price", ""),
-                                    "pharmacy_price": row.get("Pharmacy Purchase Price", ""),
-                                    "description": row.get("Local Pack Description", ""),
-                                    "effective_start_date": row.get("Effective Start Date", ""),
-                                    "effective_end_date": row.get("Effective End Date", ""),
-                                })
-                                batch_urls.append(row.get("detail_url", ""))
-
-                            # Insert drug records
-                            repo.insert_drug_register_batch(db_records)
-                            audit_log("INSERT_BATCH", scraper_name="NorthMacedonia", run_id=repo.run_id, details={"inserted": len(db_records)})
-
-                            # Mark URLs as scraped AFTER successful insert
-                            if batch_urls:
-                                with repo.db.cursor() as cur:
-                                    for batch_url in batch_urls:
-                                        cur.execute("""
-                                            UPDATE nm_urls
-                                            SET status = 'scraped',
-                                                scraped_at = CURRENT_TIMESTAMP,
-                                                error_message = NULL
-                                            WHERE run_id = %s AND detail_url = %s
-                                        """, (repo.run_id, batch_url))
-                                repo.db.commit()
-
-                            elapsed = time.time() - start_time
-                            rate = completed / elapsed if elapsed > 0 else 0
-                            remaining = len(urls) - completed - failed
-                            eta_min = (remaining / rate / 60) if rate > 0 else 0
-                            print(f"[PROGRESS] {completed}/{len(urls)} | "
-                                  f"{rate:.1f}/s | Failed: {failed} | ETA: {eta_min:.0f}min", flush=True)
-                        except Exception as e:
-                            print(f"[DB ERROR] {e}", flush=True)
-
                 await asyncio.sleep(SLEEP_BETWEEN)
 
+        writer_task = asyncio.create_task(translate_and_write())
         tasks = [asyncio.create_task(worker(i)) for i in range(MAX_WORKERS)]
         await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Final batch - write to DB
-    if buffer:
-        if repo:
-            try:
-                db_records = []
-                batch_urls = []
-                for row in buffer:
-                    db_records.append({
-                        "registration_number": row.get("Local Pack Code", ""),
-                        "product_name": row.get("Local Product Name", ""),
-                        "product_name_en": row.get("Local Product Name", ""),
-                        "generic_name": row.get("Generic Name", ""),
-                        "generic_name_en": row.get("Generic Name", ""),
-                        "dosage_form": row.get("Formulation", ""),
-                        "strength": row.get("Strength Size", ""),
-                        "pack_size": row.get("Fill Size", ""),
-                        "composition": row.get("Customized 1", ""),
-                        "manufacturer": row.get("Marketing Authority / Company Name", ""),
-                        "marketing_authorisation_holder": row.get("Marketing Authority / Company Name", ""),
-                        "atc_code": row.get("WHO ATC Code", ""),
-                        "url_id": row.get("url_id"),
-                        "source_url": row.get("detail_url", ""),
-                        "public_price": row.get("Public with VAT Price", ""),
-                        "pharmacy_price": row.get("Pharmacy Purchase Price", ""),
-                        "description": row.get("Local Pack Description", ""),
-                        "effective_start_date": row.get("Effective Start Date", ""),
-                        "effective_end_date": row.get("Effective End Date", ""),
-                    })
-                    batch_urls.append(row.get("detail_url", ""))
-
-                # Insert drug records
-                repo.insert_drug_register_batch(db_records)
-                audit_log("INSERT_BATCH", scraper_name="NorthMacedonia", run_id=repo.run_id, details={"inserted": len(db_records)})
-
-                # Mark URLs as scraped AFTER successful insert
-                if batch_urls:
-                    with repo.db.cursor() as cur:
-                        for batch_url in batch_urls:
-                            cur.execute("""
-                                UPDATE nm_urls
-                                SET status = 'scraped',
-                                    scraped_at = CURRENT_TIMESTAMP,
-                                    error_message = NULL
-                                WHERE run_id = %s AND detail_url = %s
-                            """, (repo.run_id, batch_url))
-                    repo.db.commit()
-            except Exception as e:
-                print(f"[DB ERROR] {e}")
-
-        print(f"[DB] Final batch: {len(buffer)} products")
-        buffer.clear()
+        await result_queue.put(None)
+        await writer_task
 
     elapsed = time.time() - start_time
     print(f"\n[SCRAPER] Complete! ({elapsed/60:.1f} min)", flush=True)
-    print(f"  Scraped: {completed}/{len(urls)}", flush=True)
+    print(f"  Scraped: {completed}/{len(urls)} ({written} written to DB)", flush=True)
     if failed:
         print(f"  Failed: {failed}", flush=True)
+    print(f"  Translation: {translator.summary()}", flush=True)
+    audit_log("TRANSLATION_STATS", scraper_name="NorthMacedonia", run_id=repo.run_id,
+              details={**translator.stats, "hit_ratio": round(translator.hit_ratio, 4),
+                       "calls_saved": translator.calls_saved})
     return completed
 
 
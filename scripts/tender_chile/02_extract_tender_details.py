@@ -229,7 +229,7 @@ def build_driver(headless: bool = False) -> webdriver.Chrome:
             run_id_file = get_output_dir() / ".current_run_id"
             if run_id_file.exists():
                 run_id = run_id_file.read_text(encoding="utf-8").strip()
-        pids = get_chrome_pids_from_driver(driver)
+        pids = get_chrome_pids_from_driver(driver, scraper_name="Tender_Chile")
         if pids and run_id:
             driver_pid = driver.service.process.pid if hasattr(driver.service, 'process') else list(pids)[0]
             db = CountryDB("Tender_Chile")
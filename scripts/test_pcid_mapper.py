@@ -8,6 +8,8 @@ import sys
 import logging
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from core.utils.pcid_mapper import PcidMapper
@@ -259,6 +261,73 @@ def test_all_none_values_produce_no_key():
     assert len(mapper.lookup_maps[0]) == 0
 
 
+# ---------------------------------------------------------------------------
+# Bulk matching and fuzzy fallback
+# ---------------------------------------------------------------------------
+
+BULK_STRATEGIES = [
+    {"Pack Code": "pack_code"},
+    {"Product": "product", "Generic": "generic"},
+]
+BULK_REF = [
+    {"pcid": "P1", "pack_code": "A-1", "product": "Panadol Extra", "generic": "Paracetamol"},
+    {"pcid": "P2", "pack_code": "", "product": "Brufen Forte", "generic": "Ibuprofen"},
+    {"pcid": "OOS", "pack_code": "Z9", "product": "Oosol", "generic": "X"},
+    {"pcid": "", "pack_code": "E0", "product": "Emptyol", "generic": "Y"},
+]
+BULK_PRODUCTS = [
+    {"Pack Code": "a1", "Product": "whatever", "Generic": "x"},
+    {"Pack Code": None, "Product": "BRUFEN-FORTE", "Generic": "ibuprofen"},
+    {"Pack Code": "Z 9"},
+    {"Pack Code": "E0"},
+    {"Pack Code": "", "Product": "Brufen Forté", "Generic": "Ibuprofen"},
+    {"Pack Code": None, "Product": "Panadol Xtra", "Generic": "Paracetamol"},
+    {},
+]
+
+
+def test_bulk_matches_equal_row_by_row():
+    bulk = PcidMapper(BULK_STRATEGIES)
+    bulk.build_reference_store(BULK_REF)
+    single = PcidMapper(BULK_STRATEGIES)
+    single.build_reference_store(BULK_REF)
+
+    expected = [single.categorize_match(p) for p in BULK_PRODUCTS]
+    assert bulk.categorize_many(BULK_PRODUCTS) == expected
+    assert [c for _, c in expected] == ["mapped", "mapped", "oos", "missing", "missing", "missing", "missing"]
+    # Matched keys are tracked the same way, so no_data is identical
+    assert bulk.get_unmatched_references() == single.get_unmatched_references()
+
+
+def test_match_frame_with_fuzzy_candidates():
+    import pandas as pd
+    pytest.importorskip("rapidfuzz")
+
+    mapper = PcidMapper(BULK_STRATEGIES)
+    mapper.build_reference_store(BULK_REF)
+    df = pd.DataFrame(BULK_PRODUCTS)
+    out = mapper.match_frame(df, fuzzy=True, threshold=80)
+
+    assert out["category"].tolist()[:3] == ["mapped", "mapped", "oos"]
+    assert out.loc[5, "fuzzy_pcid"] == "P1" and out.loc[5, "fuzzy_score"] >= 80
+    assert out.loc[0, "fuzzy_candidates"] == []  # exact matches get no candidates
+    # OOS / empty-PCID references are never offered
+    assert all(p not in ("OOS", "") for cands in out["fuzzy_candidates"] for p, _ in cands)
+
+
+def test_match_frame_retries_empty_pcid_matches_fuzzily():
+    import pandas as pd
+    pytest.importorskip("rapidfuzz")
+
+    mapper = PcidMapper(BULK_STRATEGIES)
+    mapper.build_reference_store(BULK_REF)
+    # Exact match on pack code "E0" hits the empty-PCID reference: "missing", like categorize_match
+    df = pd.DataFrame([{"Pack Code": "E0", "Product": "Panadol Xtra", "Generic": "Paracetamol"}])
+    out = mapper.match_frame(df, fuzzy=True, threshold=80)
+
+    assert out.loc[0, "category"] == "missing" and out.loc[0, "pcid"] == ""
+    assert out.loc[0, "fuzzy_pcid"] == "P1"
+
+
 if __name__ == "__main__":
-    import pytest
     pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar AnomalyDetector engine: parity with per-column
+detection, grouped detection, the model pool and the streaming file mode.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.monitoring import anomaly_detector
+from core.monitoring.anomaly_detector import (
+    SKLEARN_AVAILABLE,
+    AnomalyDetector,
+    flag_anomalies_in_file,
+    flag_anomalies_streaming,
+)
+
+
+def _frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Price": rng.lognormal(2, 1, n),
+        "Qty": rng.normal(10, 2, n),
+        "Flat": np.full(n, 5.0),
+        "Sparse": np.nan,
+        "Company": rng.choice(["A", "B", "C", None], n),
+        "Name": [f"item {i}, \"x\"" for i in range(n)],
+    })
+    df.loc[rng.choice(n, 50, replace=False), "Price"] = np.nan
+    df.loc[:1, "Sparse"] = [1.0, 2.0]
+    df.loc[[3, 7], "Qty"] = [500.0, -400.0]
+    return df
+
+
+COLUMNS = ["Price", "Qty", "Flat", "Sparse"]
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore"])
+def test_columnar_matches_per_column_detection(method):
+    df = _frame()
+    detector = AnomalyDetector(method=method)
+    result = detector.detect_in_dataframe(df, COLUMNS + ["Missing"])
+    assert result["columns_analyzed"] == COLUMNS
+
+    for col in COLUMNS:
+        old = detector.detect_numeric_anomalies(df[col])
+        new = result["anomalies_by_column"][col]
+        assert new["anomaly_indices"] == old["anomaly_indices"]
+        assert np.allclose(new["anomaly_scores"], old["anomaly_scores"])
+        if "error" in old["stats"]:
+            assert "error" in new["stats"]
+        else:
+            for key, value in old["stats"].items():
+                assert new["stats"][key] == pytest.approx(value)
+
+    mask = detector.detect_mask(df, COLUMNS)
+    assert list(mask.columns) == COLUMNS and mask.index.equals(df.index)
+    assert mask.dtypes.eq(bool).all()
+    assert mask["Qty"].iloc[3] and mask["Qty"].iloc[7]
+    assert not mask["Flat"].any() and not mask["Sparse"].any()
+
+
+def test_grouped_detection_matches_per_group():
+    df = _frame()
+    detector = AnomalyDetector(method="iqr")
+    mask = detector.detect_mask(df, ["Price", "Qty"], group_by="Company")
+    for _, sub in df.groupby("Company", dropna=False):
+        for col in ["Price", "Qty"]:
+            expected = np.zeros(len(sub), dtype=bool)
+            expected[detector.detect_numeric_anomalies(sub[col])["anomaly_indices"]] = True
+            assert (mask.loc[sub.index, col].to_numpy() == expected).all()
+
+    rows = detector.get_anomaly_rows(df, ["Price", "Qty"], group_by="Company")
+    assert set(rows.index) == set(mask.index[mask.any(axis=1)])
+
+
+@pytest.mark.skipif(not SKLEARN_AVAILABLE, reason="scikit-learn not installed")
+def test_model_pool_matches_in_process(monkeypatch):
+    df = _frame(600)
+    serial = AnomalyDetector(method="isolation_forest", n_jobs=1).detect_mask(df, ["Price", "Qty"])
+    monkeypatch.setattr(anomaly_detector, "MIN_VALUES_PER_WORKER", 1)
+    pooled = AnomalyDetector(method="isolation_forest", n_jobs=2).detect_mask(df, ["Price", "Qty"])
+    assert pooled.equals(serial)
+    old = AnomalyDetector(method="isolation_forest").detect_numeric_anomalies(df["Price"])
+    assert np.flatnonzero(serial["Price"].to_numpy()).tolist() == old["anomaly_indices"]
+
+
+def test_streaming_flags_match_in_memory(tmp_path):
+    df = _frame(1500)
+    src = tmp_path / "products.csv"
+    df.to_csv(src, index=False)
+
+    in_memory = flag_anomalies_in_file(src, tmp_path / "mem.csv", ["Price", "Qty"], group_by="Company")
+    streamed = flag_anomalies_streaming(src, tmp_path / "stream.csv", ["Price", "Qty"],
+                                        group_by="Company", chunksize=128)
+    assert streamed["success"] and in_memory["success"]
+    assert streamed["anomaly_rows"] == in_memory["anomaly_rows"] > 0
+
+    mem = pd.read_csv(tmp_path / "mem.csv", dtype=str, keep_default_na=False)
+    out = pd.read_csv(tmp_path / "stream.csv", dtype=str, keep_default_na=False)
+    original = pd.read_csv(src, dtype=str, keep_default_na=False)
+    assert out[original.columns].equals(original)
+    assert out["_is_anomaly"].tolist() == mem["_is_anomaly"].tolist()
+    assert out["_anomaly_columns"].tolist() == mem["_anomaly_columns"].tolist()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Property tests: batch parsers must agree with the scalar parsers.
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pd = pytest.importorskip("pandas")
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from core.parsing.date_parser import parse_date, parse_dates
+from core.parsing.price_parser import ar_money_to_float, ar_money_to_floats, parse_price, parse_prices
+
+# Bias generation towards the shapes the parsers care about
+_price_text = st.text(alphabet="0123456789.,$ \t-ARS€٣", max_size=16)
+_date_text = st.one_of(
+    st.text(alphabet="0123456789/().- \t٣", max_size=14),
+    st.builds(lambda d, m, y, p: (f"({d:02d}/{m:02d}/{y:02d})" if p else f"{d:02d}/{m:02d}/{y:02d}"),
+              st.integers(0, 99), st.integers(0, 99), st.integers(0, 99), st.booleans()),
+    st.builds(lambda d, m, y: f"{d}.{m}.{y:04d}", st.integers(0, 40), st.integers(0, 15), st.integers(0, 9999)),
+)
+
+
+def _same_float(a, b):
+    if a is None or (isinstance(a, float) and math.isnan(a)):
+        return b is None or (isinstance(b, float) and math.isnan(b))
+    return a == b
+
+
+# Repeat the sampled values so the vectorized fast paths (>= 256 uniques) kick in too
+def _widen(values):
+    return values + [f"{v} " for v in values] * 2 + [str(i) for i in range(300)]
+
+
+@settings(max_examples=50, deadline=None)
+@given(st.lists(_price_text, max_size=40))
+def test_parse_prices_matches_scalar(values):
+    values = _widen(values)
+    assert parse_prices(values) == [parse_price(v) for v in values]
+    series = pd.Series(values)
+    assert parse_prices(series).tolist() == [parse_price(v) for v in values]
+
+
+@settings(max_examples=50, deadline=None)
+@given(st.lists(_price_text, max_size=40))
+def test_ar_money_to_floats_matches_scalar(values):
+    values = _widen(values)
+    expected = [ar_money_to_float(v) for v in values]
+    assert all(_same_float(a, b) for a, b in zip(ar_money_to_floats(values), expected))
+    got = ar_money_to_floats(pd.Series(values)).tolist()
+    assert all(_same_float(a, b) for a, b in zip(got, expected))
+
+
+@settings(max_examples=50, deadline=None)
+@given(st.lists(_date_text, max_size=40))
+def test_parse_dates_matches_scalar(values):
+    values = _widen(values)
+    expected = [parse_date(v) for v in values]
+    assert parse_dates(values) == expected
+    assert parse_dates(pd.Series(values)).tolist() == expected
+
+
+def test_missing_values_and_index_preserved():
+    s = pd.Series(["24/07/25", None, float("nan"), "(01/02/03)"], index=[10, 11, 12, 13])
+    out = parse_dates(s)
+    assert list(out.index) == [10, 11, 12, 13]
+    assert out.tolist() == ["2025-07-24", None, None, "2003-02-01"]
+    assert parse_prices([None, "12 345 руб"]) == ["", "12345"]
+    assert ar_money_to_floats(pd.Series(["$ 1.234,56", None])).tolist()[0] == 1234.56
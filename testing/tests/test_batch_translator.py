@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tests for BatchTranslator (dedup + bulk cache lookup + chunked translator calls).
+"""
+
+import asyncio
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.translation import cache as cache_module
+from core.translation.batch import BatchTranslator
+
+
+class FakeCache:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self.get_many_calls = 0
+        self.set_many_calls = 0
+
+    def get_many(self, items):
+        self.get_many_calls += 1
+        return {item: self.entries[item[0]] for item in items if item[0] in self.entries}
+
+    def set_many(self, translations):
+        self.set_many_calls += 1
+        for (source, _src, _tgt), translated in translations.items():
+            self.entries[source] = translated
+        return len(translations)
+
+
+class FakeTranslator:
+    def __init__(self, fail_first=0):
+        self.calls = []
+        self.fail_first = fail_first
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.fail_first:
+            self.fail_first -= 1
+            raise OSError("WinError 10035")
+        return [f"EN({t})" for t in texts]
+
+
+def _cyr(text):
+    return any("Ѐ" <= ch <= "ӿ" for ch in text)
+
+
+def test_only_distinct_misses_reach_translator():
+    cache = FakeCache({"таблета": "tablet"})
+    translate = FakeTranslator()
+    bt = BatchTranslator(translate, cache=cache, source_lang="mk", needs_translation=_cyr, chunk_size=2)
+
+    rows = [
+        {"Formulation": "таблета", "Generic Name": "парацетамол", "ATC": "N02"},
+        {"Formulation": "таблета", "Generic Name": "ибупрофен", "ATC": "M01"},
+        {"Formulation": "сируп", "Generic Name": "парацетамол", "ATC": "N02"},
+        {"Formulation": "Tablet", "Generic Name": "", "ATC": "X"},
+    ]
+    asyncio.run(bt.translate_rows(rows, ["Formulation", "Generic Name"]))
+
+    assert rows[0] == {"Formulation": "tablet", "Generic Name": "EN(парацетамол)", "ATC": "N02"}
+    assert rows[2]["Formulation"] == "EN(сируп)"
+    assert rows[3]["Formulation"] == "Tablet"  # Latin text is never sent
+    assert sorted(t for call in translate.calls for t in call) == ["ибупрофен", "парацетамол", "сируп"]
+    assert all(len(call) <= 2 for call in translate.calls)
+    assert cache.get_many_calls == 1 and cache.set_many_calls == 1
+    assert bt.stats["requested"] == 6
+    assert bt.stats["cache_hits"] == 1
+    assert bt.stats["translator_calls"] == 2
+
+
+def test_second_batch_served_from_memo():
+    cache = FakeCache()
+    translate = FakeTranslator()
+    bt = BatchTranslator(translate, cache=cache, needs_translation=_cyr)
+
+    asyncio.run(bt.translate_many(["лек", "лек"]))
+    result = asyncio.run(bt.translate_many(["лек"]))
+
+    assert result == {"лек": "EN(лек)"}
+    assert len(translate.calls) == 1
+    assert cache.get_many_calls == 1
+    assert bt.stats["memo_hits"] == 2
+    assert bt.hit_ratio == 2 / 3
+
+
+def test_retry_then_give_up_leaves_text_unchanged():
+    translate = FakeTranslator(fail_first=1)
+    bt = BatchTranslator(translate, needs_translation=_cyr, retries=2, backoff_base=0)
+    assert asyncio.run(bt.translate_many(["лек"])) == {"лек": "EN(лек)"}
+
+    always_fail = FakeTranslator(fail_first=10)
+    bt = BatchTranslator(always_fail, needs_translation=_cyr, retries=2, backoff_base=0)
+    assert asyncio.run(bt.translate_many(["лек"])) == {"лек": "лек"}
+    assert bt.stats["failed"] == 1
+
+
+def test_failed_chunk_is_retried_string_by_string():
+    calls = []
+
+    def translate(texts):
+        calls.append(list(texts))
+        if "лош" in texts:
+            raise ValueError("bad input")
+        return [f"EN({t})" for t in texts]
+
+    bt = BatchTranslator(translate, needs_translation=_cyr, chunk_size=3, retries=2, backoff_base=0)
+    result = asyncio.run(bt.translate_many(["лек", "лош", "сируп"]))
+
+    assert result == {"лек": "EN(лек)", "лош": "лош", "сируп": "EN(сируп)"}
+    assert calls[2:] == [["лек"], ["лош"], ["сируп"]]  # after the chunk's two attempts
+    assert bt.stats["translator_calls"] == 5
+    assert bt.stats["translated"] == 2 and bt.stats["failed"] == 1
+
+
+def test_per_string_requests_are_counted_as_sent():
+    translate = FakeTranslator()
+    bt = BatchTranslator(translate, needs_translation=_cyr, chunk_size=10, per_string_requests=True)
+    asyncio.run(bt.translate_many(["лек", "сируп", "лек", "таблета"]))
+
+    assert translate.calls == [["лек"], ["сируп"], ["таблета"]]
+    assert bt.stats["translator_calls"] == 3
+    assert bt.calls_saved == 1  # only the repeated "лек"
+
+
+def test_cache_only_mode_without_translator():
+    bt = BatchTranslator(None, cache=FakeCache({"лек": "medicine"}), needs_translation=_cyr)
+    assert asyncio.run(bt.translate_many(["лек", "друго"])) == {"лек": "medicine", "друго": "друго"}
+
+
+def _fake_country_db(has_hash_column):
+    class FakeCountryDB:
+        def __init__(self, country):
+            pass
+
+        def connect(self):
+            pass
+
+        def fetchone(self, sql, params=None):
+            return ("source_hash",) if has_hash_column and "source_hash" in sql else None
+
+        @contextmanager
+        def cursor(self):
+            yield None
+
+        def commit(self):
+            pass
+
+    return FakeCountryDB
+
+
+@pytest.mark.parametrize("scraper,has_hash_column", [("north_macedonia", False), ("argentina", True)])
+def test_set_many_uses_detected_schema(monkeypatch, scraper, has_hash_column):
+    written = []
+    monkeypatch.setattr(cache_module, "CountryDB", _fake_country_db(has_hash_column))
+    monkeypatch.setattr(cache_module, "_HAS_EXECUTE_VALUES", True)
+    monkeypatch.setattr(cache_module, "execute_values",
+                        lambda cur, sql, rows, page_size: written.append((sql, rows)), raising=False)
+
+    # The prefix guess ("nm" unified, "ar" legacy) is the opposite of the table
+    cache = cache_module.TranslationCache(scraper)
+    assert cache._is_legacy is has_hash_column
+    assert cache.set_many({("лек", "mk", "en"): "medicine"}) == 1
+
+    (sql, rows), = written
+    if has_hash_column:
+        assert "source_hash" in sql and rows == [("лек", cache._hash_text("лек"), "medicine", "mk", "en")]
+    else:
+        assert "source_hash" not in sql and rows == [("лек", "medicine", "mk", "en")]
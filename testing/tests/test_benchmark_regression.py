@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for benchmark sample statistics, baseline regression gating and the
+one-time pipeline_benchmarks table setup.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.monitoring import benchmarking
+from core.monitoring.benchmarking import compare_to_baseline, summarize_samples
+
+
+def test_summarize_samples_is_robust_to_outliers():
+    s = summarize_samples([1.0, 1.1, 0.9, 1.0, 50.0])
+    assert s["n"] == 5 and s["median"] == 1.0
+    assert abs(s["mad"] - 0.1) < 1e-9
+    assert s["max"] == 50.0 and s["mean"] > 10
+    assert summarize_samples([]) == {"n": 0}
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = [1.0, 1.01, 0.99, 1.0, 1.02]
+    assert compare_to_baseline([1.5, 1.52, 1.49, 1.5, 1.51], baseline)["is_regression"]
+    # Within the relative threshold
+    assert not compare_to_baseline([1.05, 1.06, 1.04, 1.05, 1.05], baseline)["is_regression"]
+    # Large median shift, but the samples are too noisy to call it
+    noisy = [0.5, 2.5, 1.2, 3.0, 0.6]
+    assert not compare_to_baseline(noisy, baseline)["is_regression"]
+    # Faster is never a regression; an empty baseline is not comparable
+    assert not compare_to_baseline([0.5] * 5, baseline)["is_regression"]
+    assert compare_to_baseline([1.0], [])["reason"] == "insufficient samples"
+    # Absolute floor for microsecond-scale cases
+    assert not compare_to_baseline([0.002] * 3, [0.001] * 3, min_delta_seconds=0.005)["is_regression"]
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, sql, params=None):
+        self.log.append(" ".join(sql.split())[:40])
+
+
+class FakeDB:
+    country = "BenchTest"
+
+    def __init__(self):
+        self.log = []
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_benchmark_table_is_ensured_once_per_database():
+    benchmarking._tables_ready.discard("BenchTest")
+    db = FakeDB()
+    cur = FakeCursor(db.log)
+    benchmarking._ensure_benchmark_table(db, cur)
+    ddl = len(db.log)
+    benchmarking._ensure_benchmark_table(db, cur)
+    assert ddl > 0 and len(db.log) == ddl
+    assert not any("information_schema" in line for line in db.log)
+    assert any(line.startswith("ALTER TABLE pipeline_benchmarks") for line in db.log)
+
+
+def _load_run_suite():
+    spec = importlib.util.spec_from_file_location("bench_run_suite", _repo_root / "benchmarks" / "run_suite.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_suite_skips_baselines_from_another_fixture_size(tmp_path, monkeypatch, capsys):
+    run_suite = _load_run_suite()
+    # A --quick baseline that was 100x faster: comparing it to a full run is meaningless
+    quick = {"status": "ok", "rows": 10, "samples": [0.0001] * 5}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"scale": 0.1, "cases": {"parsers": quick}}))
+    output = tmp_path / "out.json"
+    monkeypatch.setattr(sys, "argv", ["run_suite.py", "--only", "parsers", "--scale", "0.01",
+                                      "--repeats", "2", "--baseline", str(baseline),
+                                      "--output", str(output)])
+    with pytest.raises(SystemExit) as exit_info:
+        run_suite.main()
+
+    assert exit_info.value.code == 0
+    report = json.loads(output.read_text())
+    assert report["regressions"] == []
+    assert report["cases"]["parsers"]["comparison"] == {"skipped": "baseline scale 0.1 != 0.01"}
+    assert "REGRESSION" not in capsys.readouterr().out
+
+    assert run_suite.baseline_mismatch({"scale": 1.0}, {"rows": 5}, {"rows": 6}, 1.0).startswith(
+        "fixture size differs")
+    assert run_suite.baseline_mismatch({"scale": 1.0}, {"rows": 5}, {"rows": 5}, 1.0) is None
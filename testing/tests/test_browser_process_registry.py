@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the browser process registry (children-file walking, PID reuse,
+per-scraper counts/RSS) against a fake /proc tree and a live process tree.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.browser.process_registry import BrowserProcessRegistry
+
+
+class FakeProc:
+    """Writes just the /proc files the registry reads."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.children = {}
+
+    def add(self, pid, ppid, name, start=100, rss_pages=10, state="S"):
+        d = self.root / str(pid)
+        (d / "task" / str(pid)).mkdir(parents=True, exist_ok=True)
+        fields = [state, str(ppid)] + ["0"] * 17 + [str(start)] + ["0"] * 10
+        (d / "stat").write_text(f"{pid} ({name}) " + " ".join(fields))
+        (d / "statm").write_text(f"100 {rss_pages} 0 0 0 0 0")
+        self.children.setdefault(pid, [])
+        self.children.setdefault(ppid, []).append(pid)
+        self._write_children(pid)
+        self._write_children(ppid)
+
+    def _write_children(self, pid):
+        task = self.root / str(pid) / "task" / str(pid)
+        if task.exists():
+            (task / "children").write_text(" ".join(map(str, self.children.get(pid, []))))
+
+    def remove(self, pid):
+        for child in (self.root / str(pid)).rglob("*"):
+            if child.is_file():
+                child.unlink()
+        for d in sorted((self.root / str(pid)).rglob("*"), reverse=True):
+            d.rmdir()
+        (self.root / str(pid)).rmdir()
+        for kids in self.children.values():
+            if pid in kids:
+                kids.remove(pid)
+
+
+@pytest.fixture
+def fake_proc(tmp_path, monkeypatch):
+    proc = FakeProc(tmp_path)
+    monkeypatch.setattr(os, "getpid", lambda: 10)
+    proc.add(1, 0, "init")
+    proc.add(10, 1, "python")
+    return proc
+
+
+def test_tracks_descendants_incrementally_and_survives_reparenting(fake_proc):
+    fake_proc.add(20, 10, "chromedriver")
+    fake_proc.add(21, 20, "chrome")
+    fake_proc.add(22, 21, "chrome", rss_pages=5)
+    fake_proc.add(99, 1, "chrome")  # someone else's browser: never tracked
+
+    registry = BrowserProcessRegistry(fake_proc.root)
+    assert registry.register("Malaysia", [20]) == {20, 21, 22}
+
+    fake_proc.add(23, 21, "chrome")  # new renderer
+    fake_proc.remove(20)             # chromedriver exits, chrome is orphaned
+    assert registry.pids("Malaysia") == {21, 22, 23}
+    assert registry.count("Malaysia") == 3
+    assert registry.rss_bytes("Malaysia") == (10 + 5 + 10) * os.sysconf("SC_PAGE_SIZE")
+    assert registry.stats() == {"Malaysia": {"processes": 3, "rss_bytes": registry.rss_bytes("Malaysia")}}
+
+
+def test_recycled_and_zombie_pids_are_dropped(fake_proc):
+    fake_proc.add(30, 10, "chrome", start=500)
+    fake_proc.add(31, 30, "chrome", start=501)
+    registry = BrowserProcessRegistry(fake_proc.root)
+    registry.register("Russia", [30])
+
+    fake_proc.remove(31)
+    fake_proc.add(31, 1, "bash", start=900)  # same PID, different process
+    fake_proc.add(32, 30, "chrome", state="Z")
+    assert registry.pids("Russia") == {30}
+
+    registry.unregister("Russia")
+    assert registry.scrapers() == set()
+
+
+def test_playwright_tree_under_own_process(fake_proc):
+    fake_proc.add(40, 10, "node")
+    fake_proc.add(41, 40, "chrome")
+    fake_proc.add(42, 41, "chrome_crashpad")
+    fake_proc.add(43, 41, "cat")
+    fake_proc.add(50, 1, "chrome")
+    registry = BrowserProcessRegistry(fake_proc.root)
+    assert registry.browser_roots(10) == {41}
+    assert registry.browser_tree(10) == {41, 42, 43}
+    assert registry.register_playwright("Netherlands") == {41, 42, 43}
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs /proc")
+@pytest.mark.parametrize("children_files", [None, False])
+def test_live_process_tree(children_files):
+    registry = BrowserProcessRegistry()
+    if children_files is False:
+        registry._proc._children_files = False  # force the /proc/*/stat fallback
+    proc = subprocess.Popen(["sh", "-c", "sleep 30 & sleep 30 & wait"])
+    try:
+        deadline = time.time() + 5
+        while len(registry.descendants(proc.pid)) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+        pids = registry.register("Live", [proc.pid])
+        assert proc.pid in pids and len(pids) == 3
+        assert registry.rss_bytes("Live") > 0
+    finally:
+        for pid in registry.pids("Live"):
+            try:
+                os.kill(pid, 9)
+            except ProcessLookupError:
+                pass
+        proc.wait()
+    time.sleep(0.1)
+    assert registry.pids("Live") == set()
+
+
+def test_instance_count_counts_browser_roots_only(fake_proc):
+    fake_proc.add(20, 10, "chromedriver")
+    fake_proc.add(21, 20, "chrome")
+    fake_proc.add(22, 21, "chrome")
+    fake_proc.add(23, 21, "chrome")
+    fake_proc.add(60, 10, "opera")
+    fake_proc.add(61, 60, "opera")
+    registry = BrowserProcessRegistry(fake_proc.root)
+    registry.register("Malaysia", [20, 60])
+    assert registry.count("Malaysia") == 6
+    assert registry.instance_count("Malaysia") == 2
+    # Opera is a browser too (the GUI's lock-tree inference relies on it)
+    assert registry.browser_tree(10) >= {21, 22, 23, 60, 61}
+
+
+class FakeBrowser:
+    def __init__(self, connected=True):
+        self.connected = connected
+
+    def is_connected(self):
+        return self.connected
+
+
+def test_playwright_pids_are_attributed_per_browser(fake_proc, monkeypatch):
+    from core.browser import chrome_pid_tracker
+
+    registry = BrowserProcessRegistry(fake_proc.root)
+    monkeypatch.setattr(chrome_pid_tracker, "get_process_registry", lambda: registry)
+    fake_proc.add(40, 10, "node")
+    fake_proc.add(41, 40, "chrome")
+    fake_proc.add(42, 41, "chrome")
+
+    first, second = FakeBrowser(), FakeBrowser()
+    assert chrome_pid_tracker.get_chrome_pids_from_playwright_browser(first, "Malaysia") == {41, 42}
+    fake_proc.add(45, 40, "chrome")  # second browser launched later
+    assert chrome_pid_tracker.get_chrome_pids_from_playwright_browser(second, "Malaysia") == {45}
+    assert chrome_pid_tracker.get_chrome_pids_from_playwright_browser(first) == {41, 42}
+    assert registry.pids("Malaysia") == {41, 42, 45}
+    assert chrome_pid_tracker.get_chrome_pids_from_playwright_browser(FakeBrowser(connected=False)) == set()
+    assert chrome_pid_tracker.get_chrome_pids_from_playwright_browser(None) == set()
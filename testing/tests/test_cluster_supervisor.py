@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the cluster supervisor: the scaling policy, the selector-based
+log multiplexer and a local multi-process run against a stand-in worker.
+"""
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.utils.worker_heartbeat import HEARTBEAT_PREFIX, format_heartbeat, parse_heartbeat
+from tools.distributed.cluster_supervisor import (
+    ClusterSupervisor,
+    LogMux,
+    NodeSpec,
+    NodeView,
+    ScalePolicy,
+    plan_scaling,
+)
+
+# Prints heartbeats itself so each process starts without importing core
+STAND_IN_WORKER = textwrap.dedent("""
+    import json, os, signal, sys, time
+
+    crash_marker, done_marker = sys.argv[1], sys.argv[2]
+    try:
+        os.close(os.open(crash_marker, os.O_CREAT | os.O_EXCL))
+        print("crashing once", flush=True)
+        sys.exit(3)
+    except FileExistsError:
+        pass
+
+    signal.signal(signal.SIGTERM, lambda *a: sys.exit(0))
+    print("worker", os.environ["WORKER_ID"], "on", os.environ["WORKER_NODE"], flush=True)
+    while not os.path.exists(done_marker):
+        beat = {{"worker_id": os.environ["WORKER_ID"], "ts": time.time(),
+                "utilization": 0.5, "load1": 0.1, "cpus": 4}}
+        print({prefix!r} + json.dumps(beat), flush=True)
+        time.sleep(0.05)
+    print("queue empty", flush=True)
+""")
+
+
+def test_plan_scaling_follows_backlog_and_load():
+    policy = ScalePolicy(backlog_per_worker=100, scale_step=2, max_load_per_cpu=0.9)
+    nodes = [
+        NodeView("a", current=1, min_workers=1, max_workers=4, load_per_cpu=0.5),
+        NodeView("b", current=1, min_workers=1, max_workers=4, load_per_cpu=0.1),
+    ]
+    # 1000 remaining wants 10 workers: the least loaded node grows first, by one step each
+    assert plan_scaling(nodes, {"remaining": 1000}, policy) == {"b": 3, "a": 3}
+    assert plan_scaling(nodes, {"remaining": 250}, policy) == {"a": 1, "b": 2}
+    # Drained queue shrinks to the lower bounds; no queue info only clamps
+    busy = [NodeView("a", 4, 1, 4, 0.2), NodeView("b", 3, 1, 4, 0.8)]
+    assert plan_scaling(busy, {"remaining": 0}, policy) == {"a": 2, "b": 1}
+    assert plan_scaling([NodeView("a", 9, 1, 4)], None, policy) == {"a": 4}
+    # An overloaded node sheds a step and takes no new workers
+    hot = [NodeView("a", 3, 1, 4, 1.5), NodeView("b", 4, 1, 4, 0.2)]
+    assert plan_scaling(hot, {"remaining": 10_000}, policy) == {"a": 1, "b": 4}
+
+    spec = NodeSpec.from_config({"host": "10.0.0.5", "workers": 9, "max_workers": 6, "min_workers": 2})
+    assert (spec.workers, spec.min_workers, spec.max_workers, spec.is_local) == (6, 2, 6, False)
+
+
+def test_log_mux_reads_all_pipes_from_one_thread():
+    script = ("import sys, time\n"
+              "for i in range(50):\n"
+              "    sys.stdout.write(f'line {i}'); sys.stdout.flush(); time.sleep(0.001)\n"
+              "    sys.stdout.write(' end\\n'); sys.stdout.flush()\n"
+              "sys.stdout.write('no newline')\n")
+    mux = LogMux()
+    seen = {}
+    threads_before = threading.active_count()
+    procs = []
+    for n in range(4):
+        p = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+        mux.add_pipe(p.stdout, f"w{n}", lambda line, n=n: seen.setdefault(n, []).append(line))
+        procs.append(p)
+    assert threading.active_count() == threads_before
+    mux.drain(timeout=20)
+    for p in procs:
+        p.wait()
+    assert len(mux) == 0
+    for n in range(4):
+        assert seen[n] == [f"line {i} end" for i in range(50)] + ["no newline"]
+
+    line = "2026-01-01 INFO " + format_heartbeat({"worker_id": "1", "load1": 0.5})
+    assert parse_heartbeat(line) == {"worker_id": "1", "load1": 0.5}
+    assert parse_heartbeat("plain output") is None
+
+
+def test_supervisor_scales_restarts_and_drains(tmp_path):
+    worker = tmp_path / "stand_in_worker.py"
+    worker.write_text(STAND_IN_WORKER.format(prefix=HEARTBEAT_PREFIX))
+    done = tmp_path / "done"
+    remaining = {"remaining": 100}
+    lines = []
+
+    supervisor = ClusterSupervisor(
+        nodes=[NodeSpec.from_config({"host": "local", "workers": 1, "min_workers": 1, "max_workers": 3})],
+        script=str(worker),
+        script_args=[str(tmp_path / "crashed"), str(done)],
+        policy=ScalePolicy(interval=0.1, cooldown=0, backlog_per_worker=10, scale_step=1,
+                           restart_backoff=0.2, heartbeat_interval=0.1, stop_grace=5),
+        queue_stats_fn=lambda: dict(remaining),
+        line_sink=lambda label, line: lines.append((label, line)),
+    )
+    result = {}
+    runner = threading.Thread(target=lambda: result.update(supervisor.run(max_runtime=30)))
+    runner.start()
+
+    def wait_for(predicate, timeout=15):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.05)
+        return False
+
+    assert wait_for(lambda: len(supervisor.workers) == 3 and all(
+        h.last_heartbeat for h in list(supervisor.workers.values())))
+    view = supervisor.node_view("local")
+    assert view.load_per_cpu == 0.1 / 4 and view.utilization == 0.5
+
+    remaining["remaining"] = 0
+    assert wait_for(lambda: len(supervisor.workers) == 1 and not supervisor.retiring)
+    done.touch()
+    runner.join(timeout=20)
+    assert not runner.is_alive()
+
+    kinds = [e["event"] for e in supervisor.events]
+    crashes = [e for e in supervisor.events if e["event"] == "crash"]
+    assert len(crashes) == 1 and crashes[0]["reason"] == "exited with code 3"
+    assert kinds.count("retire") == 2 and kinds.count("retired") == 2
+    assert result["crashes"] == 1 and result["started"] == kinds.count("start") == 4
+    # Heartbeats are consumed by the supervisor, other output reaches the sink
+    assert not any("@@heartbeat" in line for _, line in lines)
+    assert any(line == "crashing once" for _, line in lines)
+    assert sum(line == "queue empty" for _, line in lines) == 1
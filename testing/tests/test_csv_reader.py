@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for core.io.csv_reader streaming API
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.io.csv_reader import CsvStreamReader, read_state_rows, sniff_csv
+
+
+def _write(path: Path, text: str, encoding: str = "utf-8") -> Path:
+    path.write_bytes(text.encode(encoding))
+    return path
+
+
+def test_sniff_bom_and_semicolon(tmp_path):
+    p = _write(tmp_path / "a.csv", "Name;Price\nÄspirin;1,50\n", "utf-8-sig")
+    fmt = sniff_csv(p)
+    assert fmt.encoding == "utf-8-sig"
+    assert fmt.delimiter == ";"
+    rows, headers = read_state_rows(p)
+    assert rows == [{"Name": "Äspirin", "Price": "1,50"}]
+    assert headers == {"name": "Name", "price": "Price"}
+
+
+def test_cp1252_file(tmp_path):
+    p = _write(tmp_path / "b.csv", "company,product\nPfizer,Café €\n", "cp1252")
+    reader = CsvStreamReader(p)
+    assert reader.encoding == "cp1252"
+    assert list(reader) == [{"company": "Pfizer", "product": "Café €"}]
+
+
+def test_late_non_utf8_bytes_do_not_abort(tmp_path):
+    body = "id,name\n" + "".join(f"{i},row{i}\n" for i in range(5000))
+    data = body.encode("utf-8") + "9999,Café\n".encode("cp1252")
+    p = tmp_path / "c.csv"
+    p.write_bytes(data)
+    reader = CsvStreamReader(p, sample_bytes=1024)
+    assert reader.encoding == "utf-8"
+    rows = list(reader.iter_rows())
+    assert len(rows) == 5001
+    assert rows[-1]["name"] == "Café"
+
+
+def test_batches_columns_and_progress(tmp_path):
+    p = _write(tmp_path / "d.csv", "a,b\n" + "".join(f"{i},{i * 2}\n" for i in range(25)))
+    seen = []
+    reader = CsvStreamReader(p, progress_callback=lambda done, total: seen.append((done, total)),
+                             progress_every_rows=10)
+    assert [len(b) for b in reader.iter_batches(10)] == [10, 10, 5]
+    assert seen and seen[-1][0] == seen[-1][1] == p.stat().st_size
+    assert reader.progress == 1.0
+
+    cols = list(reader.iter_columns(batch_size=20))
+    assert [len(c["a"]) for c in cols] == [20, 5]
+    assert cols[1]["b"][-1] == "48"
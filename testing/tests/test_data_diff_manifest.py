@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for manifest-based diffs: parity with the full DiffReport, cached
+manifests and reports in DataDiffTracker, and the parallel
+track_all_outputs.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.data.data_diff import (
+    PYARROW_AVAILABLE,
+    DataDiffTracker,
+    ManifestDiffReport,
+    RowManifest,
+    compare_runs,
+)
+
+pytestmark = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+
+COUNTS = ("old_count", "new_count", "added_count", "removed_count",
+          "modified_count", "unchanged_count", "column_changes")
+
+
+def _write_runs(old_path, new_path, n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    old = pd.DataFrame({
+        "product_id": [f"p{i}" for i in range(n)],
+        "name": [f"name {i}" for i in range(n)],
+        "company": rng.choice(["A", "B", None], n),
+        "price": rng.normal(100, 20, n).round(2),
+    })
+    old.loc[n - 5:, "product_id"] = "dup"
+    new = old.iloc[200:].copy()  # 200 removed
+    new.loc[new.index[:40], "price"] += 1
+    new.loc[new.index[30:60], "company"] = "C"
+    new.loc[new.index[60:70], "name"] = None
+    added = pd.DataFrame({"product_id": [f"n{i}" for i in range(25)], "name": "new",
+                          "company": "A", "price": 1.5})
+    new = pd.concat([new, added], ignore_index=True)[["price", "product_id", "company", "name"]]
+    old.to_csv(old_path, index=False)
+    new.to_csv(new_path, index=False)
+
+
+def test_manifest_diff_matches_full_diff(tmp_path):
+    old, new = tmp_path / "old.csv", tmp_path / "new.csv"
+    _write_runs(old, new)
+
+    full = compare_runs(old, new, "product_id")
+    fast = compare_runs(old, new, "product_id", manifest_dir=tmp_path / "manifests")
+    assert isinstance(fast, ManifestDiffReport)
+
+    expected, report = full.get_report(), fast.get_report()
+    assert {k: report[k] for k in COUNTS} == {k: expected[k] for k in COUNTS}
+    assert report["column_changes"] == {"price": 40, "company": 30, "name": 10}
+    assert report["modified_count"] == 70 and report["removed_count"] == 200
+    # Only changed rows were loaded
+    assert len(fast.new_df) == 25 + 70 and len(fast.old_df) == 200 + 70
+
+    by_key = lambda changes: {c["key"]: {x["column"]: str(x["new_value"]) for x in c["changes"]}
+                              for c in changes}
+    assert by_key(fast.changes) == by_key(full.changes)
+
+    # A restricted comparison ignores the other columns
+    only_price = compare_runs(old, new, "product_id", compare_columns=["price"],
+                              manifest_dir=tmp_path / "manifests")
+    assert only_price.get_report()["column_changes"] == {"price": 40}
+    assert len(list((tmp_path / "manifests").glob("*.parquet"))) == 2
+
+
+def test_tracker_reuses_manifests_and_reports(tmp_path, monkeypatch):
+    old, new = tmp_path / "old.csv", tmp_path / "new.csv"
+    _write_runs(old, new, n=500)
+    tracker = DataDiffTracker("Malaysia", output_dir=tmp_path / "out")
+
+    first = tracker.track_run(new, "product_id", previous_file=old)
+    assert first["modified_count"] == 70 and "cached" not in first
+    entry = tracker.get_history(1)[0]
+    assert entry["current_manifest"] and entry["previous_manifest"]
+    assert {p.name for p in tracker.manifest_dir.glob("*.parquet")} == {
+        entry["current_manifest"], entry["previous_manifest"]}
+
+    built = []
+    real_build = RowManifest.build.__func__
+    monkeypatch.setattr(RowManifest, "build", classmethod(
+        lambda cls, path, *a, **kw: built.append(Path(path).name) or real_build(cls, path, *a, **kw)))
+
+    # Same contents again (e.g. QC re-run): stored report, no file parsed
+    again = DataDiffTracker("Malaysia", output_dir=tmp_path / "out").track_run(
+        new, "product_id", previous_file=old)
+    assert again["cached"] and again["modified_count"] == 70 and built == []
+
+    # Next run: the old "current" manifest is reused as the previous one
+    pd.read_csv(new, dtype=str).iloc[10:].to_csv(tmp_path / "new2.csv", index=False)
+    nxt = tracker.track_run(tmp_path / "new2.csv", "product_id", previous_file=new)
+    assert nxt["removed_count"] == 10 and nxt["modified_count"] == 0
+    assert built == ["new2.csv"]
+
+
+def test_track_all_outputs_in_parallel(tmp_path):
+    out = tmp_path / "output" / "Malaysia"
+    prev, cur = tmp_path / "backups" / "Malaysia" / "run1", tmp_path / "backups" / "Malaysia" / "run2"
+    for d in (out, prev, cur):
+        d.mkdir(parents=True)
+    for seed in range(3):
+        _write_runs(prev / f"products_{seed}.csv", out / f"products_{seed}.csv", n=800, seed=seed)
+    (out / "notes.csv").write_text("other\n1\n")
+    os.utime(prev, (1, 1))  # run2 is the newest backup (the current run)
+
+    tracker = DataDiffTracker("Malaysia", output_dir=out)
+    keys = {f"products_{seed}.csv": "product_id" for seed in range(3)}
+    reports = tracker.track_all_outputs(keys, processes=2)
+
+    assert sorted(reports) == sorted(keys)
+    for name, report in reports.items():
+        expected = compare_runs(prev / name, out / name, "product_id").get_report()
+        assert {k: report[k] for k in COUNTS} == {k: expected[k] for k in COUNTS}
+        assert all(Path(f).name.startswith(f"Malaysia_{Path(name).stem}_") for f in report["diff_files"].values())
+    assert len(tracker.get_history(10)) == 3
+
+    # Unchanged outputs: every report comes from history, nothing new is recorded
+    again = tracker.track_all_outputs(keys, processes=2)
+    assert all(r["cached"] for r in again.values()) and len(tracker.get_history(10)) == 3
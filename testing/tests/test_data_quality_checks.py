@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the set-based DataQualityChecker: one scan per table for all
+aggregate checks, per-(run_id, table) caching and declarative checks.
+"""
+
+import re
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.data.data_quality_checks import (
+    AggregateCache,
+    CheckSeverity,
+    DataQualityChecker,
+)
+
+SELECT_RE = re.compile(r"^SELECT (.*) FROM (\w+)( WHERE run_id = %s)?$", re.S)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.row = None
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self.db.queries.append(sql)
+        if "information_schema.columns" in sql:
+            wanted = set(params[0])
+            self.rows = [(t, c) for t, cols in self.db.columns.items() if t in wanted for c in cols]
+            return
+        match = SELECT_RE.match(sql)
+        assert match, sql
+        exprs = [e.rsplit(" AS m", 1)[0].replace("%%", "%") for e in re.split(r", (?=[A-Za-z_]+\()", match.group(1))]
+        answers = self.db.answers[match.group(2)]
+        self.row = tuple(answers[e] for e in exprs)
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.row
+
+
+class FakeDB:
+    def __init__(self, columns, answers):
+        self.columns = columns
+        self.answers = answers
+        self.queries = []
+
+    @contextmanager
+    def cursor(self):
+        yield FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+def _fake_db():
+    return FakeDB(
+        columns={
+            "my_products": ["run_id", "product_name", "company", "price"],
+            "my_input_products": ["id"],
+            "my_step_progress": ["run_id", "step_number", "step_name"],  # no rows_processed column
+        },
+        answers={
+            "my_products": {
+                "COUNT(*)": 200,
+                "COUNT(*) FILTER (WHERE product_name IS NULL)": 4,
+                "COUNT(*) FILTER (WHERE company IS NULL)": 50,
+                "COUNT(*) FILTER (WHERE price IS NULL OR price::text LIKE '%N/A%')": 30,
+            },
+            "my_input_products": {"COUNT(*)": 12},
+        },
+    )
+
+
+def test_postrun_checks_share_one_scan_per_table():
+    db = _fake_db()
+    checker = DataQualityChecker("Malaysia", "run1", cache=AggregateCache(), db_factory=lambda _: db)
+    results = {r.check_name: r for r in checker.run_postrun_checks()}
+
+    scans = [q for q in db.queries if q.startswith("SELECT") and "information_schema" not in q]
+    assert len(scans) == 1 and "FROM my_products WHERE run_id" in scans[0]
+
+    nulls = results["null_rates"]
+    assert not nulls.passed and nulls.severity == CheckSeverity.WARNING
+    assert nulls.message == "High null rates detected: company: 25.0%"
+    assert nulls.details == {"null_rate_product": 2.0, "null_rate_company": 25.0}
+    # Step table lacks rows_processed: skipped, not an error
+    assert results["row_count_deltas"].passed
+    assert results["row_count_deltas"].message == "No step data available"
+
+    pre = checker.check_input_table_counts()
+    assert pre.passed and pre.details == {"counts": {"my_input_products": 12}}
+
+
+def test_results_are_cached_per_run_and_table():
+    db = _fake_db()
+    cache = AggregateCache()
+    first = DataQualityChecker("Malaysia", "run1", cache=cache, db_factory=lambda _: db)
+    first.run_postrun_checks()
+    queries = len(db.queries)
+
+    # A new checker for the same run (e.g. another GUI request) reads the cache
+    again = DataQualityChecker("Malaysia", "run1", cache=cache, db_factory=lambda _: db)
+    assert [r.message for r in again.run_postrun_checks()] == [r.message for r in first.results]
+    assert again.check_null_rates().details["null_rate_company"] == 25.0
+    assert len(db.queries) == queries and cache.hits > 0
+
+    # Another run is scanned on its own; invalidation forces a rescan
+    DataQualityChecker("Malaysia", "run2", cache=cache, db_factory=lambda _: db).run_postrun_checks()
+    assert len(db.queries) > queries
+    queries = len(db.queries)
+    cache.invalidate("Malaysia", "run1")
+    again.run_postrun_checks()
+    assert len(db.queries) > queries
+
+
+def test_declarative_check_joins_the_existing_scan():
+    db = _fake_db()
+    cache = AggregateCache()
+    definition = {
+        "name": "price_nulls",
+        "check_type": "postrun",
+        "tables": ["{prefix}products"],
+        "columns": ["price"],
+        "metrics": {
+            "total": "COUNT(*)",
+            "bad_price": "COUNT(*) FILTER (WHERE price IS NULL OR price::text LIKE '%N/A%')",
+        },
+        "rules": [{"metric": "bad_price", "of": "total", "max_pct": 10, "label": "price"}],
+        "severity": "critical",
+        "fail_message": "Prices missing",
+    }
+    checker = DataQualityChecker("Malaysia", "run1", checks=[definition], cache=cache,
+                                 db_factory=lambda _: db)
+    results = {r.check_name: r for r in checker.run_postrun_checks()}
+
+    scans = [q for q in db.queries if q.startswith("SELECT") and "information_schema" not in q]
+    assert len(scans) == 1 and scans[0].count("COUNT(*) AS") == 1
+    price = results["price_nulls"]
+    assert not price.passed and price.severity == CheckSeverity.CRITICAL
+    assert price.message == "Prices missing: price: 15.0%"
+    assert price.to_dict()["status"] == "fail"
+
+    # A table that is missing entirely is skipped, not scanned
+    missing = DataQualityChecker("Malaysia", "run1", cache=cache, db_factory=lambda _: db, checks=[
+        dict(definition, name="other", tables=["{prefix}nope"])])
+    assert {r.check_name: r for r in missing.run_postrun_checks()}["other"].passed
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked DataValidator.validate_file and the process-pool
+validate_all_outputs: parity with whole-file validation, bounded error
+samples and column-level errors counted once.
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.data import data_validator
+from core.data.data_validator import PANDERA_AVAILABLE, DataValidator, validate_all_outputs
+
+needs_pandera = pytest.mark.skipif(not PANDERA_AVAILABLE, reason="pandera not installed")
+
+
+def _write_products(path, n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    price = rng.normal(100, 50, n).round(2).astype(object)
+    price[rng.choice(n, 25, replace=False)] = "n/a"
+    df = pd.DataFrame({
+        "PRODUCTO": [f"p{i % 4000}" for i in range(n)],
+        "LABORATORIO": rng.choice(["A", "B", None], n),
+        "PRECIO": price,
+        "TROQUEL": [f"{i:05d}" for i in range(n)],
+    })
+    df.loc[rng.choice(n, 15, replace=False), "PRODUCTO"] = None
+    df.loc[n - 10:, ["PRODUCTO", "LABORATORIO", "PRECIO", "TROQUEL"]] = ["dup", "A", 1.0, "00001"]
+    df.to_csv(path, index=False)
+    return df
+
+
+@needs_pandera
+def test_chunked_matches_whole_file(tmp_path):
+    src = tmp_path / "products.csv"
+    _write_products(src)
+    validator = DataValidator("Argentina")
+
+    whole = validator.validate_file(src)
+    chunked = validator.validate_file(src, chunksize=700, max_error_samples=5)
+
+    assert chunked["chunks"] == 8
+    assert chunked["valid"] is whole["valid"] is False
+    assert chunked["rows"] == whole["rows"] == 5000
+    assert chunked["stats"]["null_counts"] == {k: int(v) for k, v in whole["stats"]["null_counts"].items()}
+    assert chunked["stats"]["duplicate_rows"] == whole["stats"]["duplicate_rows"] == 9
+    assert chunked["error_count"] == len(whole["errors"])
+    assert chunked["error_counts"] == dict(Counter(f"{e['column']}:{e['check']}" for e in whole["errors"]))
+    assert len(chunked["errors"]) == 5 and chunked["errors_truncated"]
+    assert all(isinstance(e["row"], int) for e in chunked["errors"])
+
+
+@needs_pandera
+def test_column_level_errors_are_counted_once(tmp_path):
+    src = tmp_path / "no_product.csv"
+    pd.DataFrame({"LABORATORIO": ["A"] * 300, "PRECIO": ["1.5"] * 300}).to_csv(src, index=False)
+    result = DataValidator("Argentina").validate_file(src, chunksize=50)
+    assert result["chunks"] == 6 and not result["valid"]
+    assert result["error_count"] == 1
+    assert result["errors"][0]["check"] == "column_in_dataframe"
+    assert result["errors"][0]["failure_case"] == "PRODUCTO"
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("PRODUCTO,PRECIO\n")
+    result = DataValidator("Argentina").validate_file(empty, chunksize=50)
+    assert result["valid"] and result["rows"] == 0 and "DataFrame is empty" in result["warnings"]
+
+
+@needs_pandera
+def test_validate_all_outputs_pool_matches_serial(tmp_path):
+    for seed in range(3):
+        _write_products(tmp_path / f"products_{seed}.csv", n=1500, seed=seed)
+    serial = validate_all_outputs(tmp_path, "Argentina", chunksize=400, processes=1)
+    pooled = validate_all_outputs(tmp_path, "Argentina", chunksize=400, processes=2)
+
+    strip = lambda r: {k: v for k, v in r.items() if k != "validated_at"}
+    assert [strip(r) for r in pooled] == [strip(r) for r in serial]
+    assert len(serial) == 3 and all(r["error_count"] > 0 for r in serial)
+
+
+@pytest.mark.parametrize("chunksize", [50, 400, 10_000])
+def test_basic_validation_does_not_depend_on_chunksize(tmp_path, monkeypatch, chunksize):
+    monkeypatch.setattr(data_validator, "PANDERA_AVAILABLE", False)
+    n = 1000
+    df = pd.DataFrame({
+        "PRODUCTO": [None if i % 97 == 0 else f"p{i}" for i in range(n)],
+        "PRECIO": [-1.0 if i % 250 == 0 else 2.5 for i in range(n)],
+    })
+    src = tmp_path / "products.csv"
+    df.to_csv(src, index=False)
+    validator = DataValidator("Argentina")
+
+    whole = validator.validate_file(src)
+    chunked = validator.validate_file(src, chunksize=chunksize)
+
+    assert chunked["valid"] is whole["valid"] is False
+    assert chunked["error_count"] == len(whole["errors"]) == 2
+    assert chunked["errors"] == whole["errors"]
+    assert chunked["errors"][0]["message"] == "Column 'PRODUCTO' has 11 null values"
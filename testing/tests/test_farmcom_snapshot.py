@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the Russia Farmcom single-snapshot table parser.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+sys.path.insert(0, str(_repo_root / "scripts" / "Russia"))
+
+pytest.importorskip("lxml")
+from farmcom_snapshot import inner_text, parse_report_table
+
+MAIN_ROW = (
+    '<tr><td><img class="bullet" linkhref="frm_reestr_det.php?value=279.24&amp;item_id={item_id}"></td>'
+    '<td>1</td><td> Трейд  {item_id} </td><td>МНН</td><td>Завод,<br>Россия</td>'
+    '<td>таблетки 10 мг {tail}</td><td>531.51<br>03/15/2010</td></tr>'
+)
+EAN_ROW = '<tr class="gray"><td></td><td></td><td></td><td></td><td></td><td>{ean}</td><td></td></tr>'
+
+
+def _table(body: str) -> str:
+    return f'<table class="report"><tbody>{body}</tbody></table>'
+
+
+def test_rows_and_ean_sibling_pairing():
+    body = (
+        MAIN_ROW.format(item_id=101, tail="Barcode") + EAN_ROW.format(ean="4601234567890")
+        + MAIN_ROW.format(item_id=102, tail="4600000000017")  # EAN appended to own cell, no gray row
+        + MAIN_ROW.format(item_id=103, tail="Barcode") + EAN_ROW.format(ean="46 0111 1111 118")
+    )
+    result = parse_report_table(_table(body), page_num=7)
+
+    assert result is not None
+    assert (result.total_rows, result.main_rows, result.gray_rows) == (5, 3, 2)
+    assert [r["item_id"] for r in result.rows] == ["101", "102", "103"]
+    assert [r["ean"] for r in result.rows] == ["4601234567890", "4600000000017", "4601111111118"]
+
+    first = result.rows[0]
+    assert first["tn"] == "Трейд 101"
+    assert first["manufacturer_country"] == "Завод,\nРоссия"
+    assert first["release_form"] == "таблетки 10 мг"
+    assert first["registered_price_rub"] == "531.51"
+    assert first["start_date_text"] == "03/15/2010"
+    assert first["page_number"] == 7
+
+
+def test_fetch_ean_disabled_leaves_ean_empty():
+    body = MAIN_ROW.format(item_id=1, tail="Barcode") + EAN_ROW.format(ean="4601234567890")
+    result = parse_report_table(_table(body), fetch_ean=False)
+    assert result.rows[0]["ean"] == ""
+
+
+@pytest.mark.parametrize("snapshot", [
+    None,
+    "",
+    _table(""),
+    _table(EAN_ROW.format(ean="4601234567890")),  # no main rows
+    _table('<tr><td><img class="bullet" linkhref="x.php?item_id=5"></td><td>only two</td></tr>'),  # no usable rows
+])
+def test_malformed_snapshot_returns_none(snapshot):
+    assert parse_report_table(snapshot) is None
+
+
+def test_short_row_is_skipped_and_the_rest_kept():
+    short = '<tr><td><img class="bullet" linkhref="x.php?item_id=5"></td><td>only two</td></tr>'
+    body = (MAIN_ROW.format(item_id=1, tail="Barcode") + EAN_ROW.format(ean="4601234567890")
+            + short + MAIN_ROW.format(item_id=2, tail=""))
+    result = parse_report_table(_table(body))
+
+    assert result is not None
+    assert [r["item_id"] for r in result.rows] == ["1", "2"]
+    assert result.rows[0]["ean"] == "4601234567890"
+    assert result.skipped_short_rows == 1
+
+
+def test_inner_text_drops_hidden_and_script():
+    from lxml import html
+    td = html.fragment_fromstring(
+        '<td>a <span style="display:none">hidden</span>b<script>x()</script><div>c</div></td>'
+    )
+    assert inner_text(td) == "a b\nc"
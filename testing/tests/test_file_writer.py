@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for core.io.file_writer.BufferedDataWriter
+"""
+
+import csv
+import gzip
+import json
+import hashlib
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.io.file_writer import BufferedDataWriter, FlushPolicy
+
+
+def _read_jsonl(paths):
+    rows = []
+    for p in paths:
+        opener = gzip.open if str(p).endswith(".gz") else open
+        with opener(p, "rt", encoding="utf-8") as f:
+            rows.extend(json.loads(line) for line in f if line.strip())
+    return rows
+
+
+def test_background_jsonl_roundtrip(tmp_path):
+    with BufferedDataWriter(tmp_path, "items.jsonl") as w:
+        for i in range(2500):
+            w.write({"i": i})
+    rows = _read_jsonl(w.files)
+    assert [r["i"] for r in rows] == list(range(2500))
+    assert all("scraped_at" in r for r in rows)
+    assert w.records_written == 2500
+
+
+def test_checkpoint_makes_data_visible(tmp_path):
+    policy = FlushPolicy(max_bytes=0, max_records=0, max_interval=0)
+    w = BufferedDataWriter(tmp_path, "items.jsonl", flush_policy=policy).open()
+    try:
+        w.write({"i": 1})
+        assert w.checkpoint(timeout=5)
+        assert [r["i"] for r in _read_jsonl(w.files)] == [1]
+    finally:
+        w.close()
+
+
+def test_gzip_rotation(tmp_path):
+    with BufferedDataWriter(
+        tmp_path, "items.jsonl", compression="gzip", rotate_bytes=64 * 1024,
+        flush_policy=FlushPolicy(max_records=200), add_timestamp=False,
+    ) as w:
+        for i in range(5000):
+            w.write({"i": i, "pad": hashlib.sha256(str(i).encode()).hexdigest()})
+    assert len(w.files) > 1
+    assert all(p.name.startswith("items_") and p.suffix == ".gz" for p in w.files)
+    assert [r["i"] for r in _read_jsonl(w.files)] == list(range(5000))
+
+
+def test_csv_header_per_file(tmp_path):
+    fields = ["id", "name"]
+    with BufferedDataWriter(
+        tmp_path, "items.csv", fmt="csv", fieldnames=fields, rotate_bytes=256,
+        flush_policy=FlushPolicy(max_records=10), background=False,
+    ) as w:
+        for i in range(100):
+            w.write({"id": i, "name": f"a,{i}", "ignored": 1})
+    ids = []
+    for p in w.files:
+        with open(p, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            assert reader.fieldnames == fields
+            ids.extend(int(r["id"]) for r in reader)
+    assert ids == list(range(100))
+
+
+class _BrokenStream:
+    def write(self, data):
+        raise OSError("No space left on device")
+
+    def close(self):
+        pass
+
+
+def test_writer_failure_is_raised_by_every_later_call(tmp_path):
+    w = BufferedDataWriter(
+        tmp_path, "items.jsonl", max_pending=10,
+        flush_policy=FlushPolicy(max_bytes=0, max_records=0, max_interval=60),
+    ).open()
+    w._stream = _BrokenStream()
+    errors = []
+
+    def produce():
+        # Well past max_pending: with a dead writer thread this must fail, not block
+        for i in range(100):
+            try:
+                w.write({"i": i})
+            except RuntimeError as e:
+                errors.append(e)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    producer.join(timeout=10)
+    assert not producer.is_alive(), "write() blocked after the writer thread died"
+    assert len(errors) >= 89 and all("No space left" in str(e) for e in errors)
+
+    for call in (w.flush, w.checkpoint, w.close, w.close):
+        with pytest.raises(RuntimeError, match="Background writer failed"):
+            call()
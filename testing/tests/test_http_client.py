@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for core.http.client.HttpClient (retries, per-host limits, conditional cache)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.http.client import HttpClient, parse_retry_after
+
+
+class DictCache:
+    """In-memory stand-in for ScrapeCache's HTTP entry methods."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get_http_entry(self, url):
+        return self.entries.get(url)
+
+    def set_http_entry(self, url, entry, expire=None):
+        self.entries[url] = entry
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_conditional_get_serves_304_from_cache():
+    body = b"<html>registry page</html>"
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=body)
+
+    async def run():
+        cache = DictCache()
+        async with HttpClient(conditional_cache=cache, transport=httpx.MockTransport(handler)) as http:
+            first = await http.get("https://example.org/page")
+            second = await http.get("https://example.org/page")
+            return first, second, http.stats
+
+    first, second, stats = asyncio.run(run())
+    assert first.content == second.content == body
+    assert second.status_code == 200
+    assert second.extensions.get("from_cache") is True
+    assert stats["cache_hits"] == 1
+    assert stats["revalidations"] == 1
+    assert stats["bytes_saved"] == len(body)
+
+
+def test_retries_honour_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, content=b"ok")
+
+    async def run():
+        async with HttpClient(retries=3, transport=httpx.MockTransport(handler)) as http:
+            resp = await http.get("https://example.org/")
+            return resp, http.stats
+
+    resp, stats = asyncio.run(run())
+    assert resp.status_code == 200
+    assert len(calls) == 2
+    assert stats["retries"] == 1
+
+
+def test_per_host_concurrency_cap():
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200)
+
+    async def run():
+        async with HttpClient(max_per_host=2, transport=httpx.MockTransport(handler)) as http:
+            await asyncio.gather(*(http.get(f"https://example.org/{i}") for i in range(10)))
+
+    asyncio.run(run())
+    assert in_flight["max"] == 2
+
+
+def test_download_resumes_partial_file(tmp_path):
+    body = bytes(range(256)) * 40
+    ranges = []
+
+    def handler(request):
+        rng = request.headers.get("Range")
+        ranges.append(rng)
+        if rng:
+            start = int(rng.split("=")[1].rstrip("-"))
+            return httpx.Response(206, content=body[start:],
+                                  headers={"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"})
+        return httpx.Response(200, content=body)
+
+    dest = tmp_path / "file.pdf"
+    (tmp_path / "file.pdf.part").write_bytes(body[:1000])
+
+    async def run():
+        async with HttpClient(transport=httpx.MockTransport(handler)) as http:
+            received = await http.download("https://example.org/file.pdf", dest, chunk_size=512)
+            return received, http.stats
+
+    received, stats = asyncio.run(run())
+    assert dest.read_bytes() == body
+    assert not (tmp_path / "file.pdf.part").exists()
+    assert ranges == ["bytes=1000-"]
+    assert received == stats["bytes_downloaded"] == len(body) - 1000
+
+
+def test_download_raises_on_http_error(tmp_path):
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+
+    async def run():
+        async with HttpClient(transport=transport) as http:
+            await http.download("https://example.org/missing.pdf", tmp_path / "missing.pdf")
+
+    try:
+        asyncio.run(run())
+    except httpx.HTTPStatusError as e:
+        assert e.response.status_code == 404
+    else:
+        raise AssertionError("expected HTTPStatusError")
+    assert not (tmp_path / "missing.pdf").exists()
+
+
+def test_download_retry_wait_releases_host_slot(tmp_path):
+    downloads = []
+
+    def handler(request):
+        if request.url.path == "/file.pdf":
+            downloads.append(request)
+            if len(downloads) == 1:
+                return httpx.Response(503, headers={"Retry-After": "0.5"})
+            return httpx.Response(200, content=b"%PDF")
+        return httpx.Response(200, content=b"page")
+
+    async def run():
+        async with HttpClient(max_per_host=1, transport=httpx.MockTransport(handler)) as http:
+            download = asyncio.create_task(http.download("https://example.org/file.pdf", tmp_path / "file.pdf"))
+            await asyncio.sleep(0.05)  # download got its 503 and is waiting to retry
+            started = time.monotonic()
+            await http.get("https://example.org/page")
+            page_wait = time.monotonic() - started
+            await download
+            return page_wait
+
+    page_wait = asyncio.run(run())
+    # The only host slot is free while the download backs off
+    assert page_wait < 0.3
+    assert len(downloads) == 2
+    assert (tmp_path / "file.pdf").read_bytes() == b"%PDF"
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the India step 5 columnar export engine (transforms, chunked QC, part writer).
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+sys.path.insert(0, str(_repo_root / "scripts" / "India"))
+
+from columnar_export import (
+    EXPORT_COLUMNS,
+    ChunkQC,
+    PartWriter,
+    merge_distinct,
+    to_export_frame,
+    year_month_short,
+)
+
+MAIN_COLUMNS = [
+    "formulation", "sku_name", "company", "composition", "pack_size", "dosage_form",
+    "schedule_status", "ceiling_price", "mrp", "mrp_per_unit", "year_month",
+]
+
+
+def _main_frame(rows):
+    return pd.DataFrame.from_records(rows, columns=MAIN_COLUMNS)
+
+
+def test_export_frame_matches_legacy_row_formatting():
+    df = _main_frame([
+        ("PARA", " Calpol ", "GSK", "Paracetamol", "30 TABLET", "Tablet ", "NLEM", "-1", " 12.5", "0.42", "Dec-25"),
+        ("PARA", None, None, None, None, None, None, None, None, None, None),
+        ("PARA", "X", "Y", "Z", "TABLET", "Tab", "", "3.10", "5", "0.5", "Jan-25"),
+    ])
+    out = to_export_frame(df, "MAIN", "sku_name", "mrp")
+    assert list(out.columns) == EXPORT_COLUMNS
+    assert out.iloc[0].tolist() == ["MAIN", "Calpol", "GSK", "Paracetamol", 30, "Tablet", "NLEM",
+                                    "0", "12.5", "0.42", "Dec-25"]
+    assert out.iloc[1].tolist() == ["MAIN", "", "", "", 0, "", "", "0", "", "", ""]
+    assert out["PackSize"].iloc[2] == 0 and out["CeilingPrice"].iloc[2] == "3.10"
+    assert out["YearMonth"].iloc[2] == "Jan-25"
+    assert year_month_short(pd.Series(["Dec-2025", "2025-001", " Jan-25 "])).tolist() == [
+        "Dec-2025", "2025-0", "Jan-25"]  # legacy rule: s[-4] == "-"
+
+
+def test_chunk_qc_counts_across_chunk_boundaries():
+    qc = ChunkQC(required=["hidden_id", "sku_name"], key="hidden_id",
+                 mrp_per_unit="mrp_per_unit", ceiling="ceiling_price")
+    chunks = [
+        pd.DataFrame({"hidden_id": ["a", "b", "b"], "sku_name": ["x", "", None],
+                      "mrp_per_unit": ["1.0", "2.0", "abc"], "ceiling_price": ["1.5", "1.5", ""]}),
+        pd.DataFrame({"hidden_id": ["b", "c"], "sku_name": ["y", "z"],
+                      "mrp_per_unit": ["", "1.2"], "ceiling_price": ["-1", "1.0"]}),
+    ]
+    for chunk in chunks:
+        qc.update(chunk)
+
+    assert qc.rows == 5
+    assert qc.nulls == {"hidden_id": 0, "sku_name": 2}
+    assert qc.duplicates == 2  # b,b inside chunk one + b carried into chunk two
+    assert qc.price_invalid == 1 and qc.price_missing == 1
+    assert qc.price_above_ceiling == 2 and qc.price_checked_vs_ceiling == 3
+    checks = {c["name"]: c for c in qc.null_checks()}
+    assert checks["null_check_sku_name"]["passed"] and "40.0%" in checks["null_check_sku_name"]["message"]
+    assert "2 duplicate hidden_id" in qc.duplicate_check()["message"]
+
+
+def test_price_outliers_from_histogram():
+    qc = ChunkQC(mrp_per_unit="p")
+    normal = [str(v) for v in [1, 1.5, 2, 2.5, 3, 3.5, 4, 5] * 50]
+    qc.update(pd.DataFrame({"p": normal + ["100000", "0.00001"]}))
+    assert qc.price_outliers() == 2
+    lo, hi = qc.price_fences()
+    assert lo < 1 and 5 < hi < 100000
+
+
+def test_part_writer_rotates_without_buffering(tmp_path):
+    cols = ["A", "B"]
+    with PartWriter(tmp_path, "details_combined", cols, max_rows=3) as writer:
+        writer.write(pd.DataFrame({"A": ["1", "2"], "B": [1, 2]}))
+        writer.write(pd.DataFrame({"A": ["3", "4", "a,b"], "B": [3, 4, 5]}))
+    assert [(p.name, n) for p, n in writer.parts] == [
+        ("details_combined_001.csv", 3), ("details_combined_002.csv", 2)]
+    with (tmp_path / "details_combined_002.csv").open(newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["A", "B"], ["4", "4"], ["a,b", "5"]]
+
+
+def test_merge_distinct_matches_sorted_set():
+    main = sorted({"b", "a", "É", ""})
+    alt = sorted({"a", "c", "Z"})
+    assert list(merge_distinct(main, alt)) == sorted(set(main) | set(alt))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for ItalyRepository.save_extracted_sources, the batched Step 3 writer:
+one transaction replaces each parsed source's rows and marks its progress.
+"""
+
+import importlib.util
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+_spec = importlib.util.spec_from_file_location(
+    "italy_repositories", _repo_root / "scripts" / "Italy" / "db" / "repositories.py")
+repositories = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(repositories)
+
+
+class FakeCursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+
+    def fetchone(self):
+        return (7,)
+
+
+class FakeDB:
+    def __init__(self):
+        self.statements = []
+        self.transactions = 0
+
+    @contextmanager
+    def cursor(self, dict_cursor=False):
+        self.transactions += 1
+        yield FakeCursor(self.statements)
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.setattr(repositories, "_HAS_EXECUTE_VALUES", False)
+    return repositories.ItalyRepository(FakeDB(), "run-1")
+
+
+def _product(determina_id, aic, source_pdf):
+    return {"determina_id": determina_id, "aic": aic, "source_pdf": source_pdf, "price_public": 1.5}
+
+
+def test_save_extracted_sources_writes_one_batch(repo):
+    sources = [
+        {"progress_key": "pdf:aa:1_a.pdf", "determina_id": "1", "source_pdf": "1_a.pdf",
+         "products": [_product("1", "0001", "1_a.pdf"), _product("1", "0002", "1_a.pdf")]},
+        {"progress_key": "msf:bb:2", "determina_id": "2", "source_pdf": "MSF_DETAIL", "products": []},
+        {"progress_key": "pdf:cc:3_c.pdf", "determina_id": "3", "source_pdf": "3_c.pdf",
+         "products": [], "error": "PDFSyntaxError: broken"},
+    ]
+    assert repo.save_extracted_sources("Extract Data", sources) == 2
+
+    statements = repo.db.statements
+    assert repo.db.transactions == 1
+    delete_sql, delete_params = statements[0]
+    assert delete_sql.startswith("DELETE FROM it_products")
+    # Only sources that parsed cleanly have their old rows replaced
+    assert delete_params == ("run-1", ["1", "2"], ["1_a.pdf", "MSF_DETAIL"])
+
+    inserts = [p for sql, p in statements if sql.startswith("INSERT INTO it_products")]
+    assert [row[2] for row in inserts] == ["0001", "0002"]
+    assert all(row[0] == "run-1" for row in inserts)
+
+    progress = {p[3]: (p[4], p[5], p[6]) for sql, p in statements
+                if sql.startswith("INSERT INTO it_step_progress")}
+    assert progress == {
+        "pdf:aa:1_a.pdf": ("completed", 2, None),
+        "msf:bb:2": ("completed", 0, None),
+        "pdf:cc:3_c.pdf": ("failed", 0, "PDFSyntaxError: broken"),
+    }
+
+
+def test_save_extracted_sources_with_only_failures_keeps_old_rows(repo):
+    sources = [{"progress_key": "pdf:cc:3_c.pdf", "determina_id": "3", "source_pdf": "3_c.pdf",
+                "products": [], "error": "boom"}]
+    assert repo.save_extracted_sources("Extract Data", sources) == 0
+    assert [sql.split()[0] for sql, _ in repo.db.statements] == ["INSERT"]
+    assert repo.save_extracted_sources("Extract Data", []) == 0
+
+
+def test_count_products_counts_the_whole_run(repo):
+    assert repo.count_products() == 7
+    assert repo.db.statements == [("SELECT COUNT(*) FROM it_products WHERE run_id = %s", ("run-1",))]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the Malaysia shared browser pool (leasing, state persistence, stats).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+sys.path.insert(0, str(_repo_root / "scripts" / "Malaysia"))
+
+from scrapers.browser_pool import BrowserPool, StateStore, apply_state_to_session
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+    def evaluate(self, script):
+        return "FakeAgent/1.0"
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.loaded = storage_state
+        self.cookies = list((storage_state or {}).get("cookies", []))
+        self.pages = []
+        self.closed = False
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def storage_state(self):
+        return {"cookies": self.cookies, "origins": []}
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, storage_state=None):
+        ctx = FakeContext(storage_state)
+        self.contexts.append(ctx)
+        return ctx
+
+
+def _factory(browser, state):
+    return browser.new_context(storage_state=state)
+
+
+def _pool(tmp_path, size=2):
+    pool = BrowserPool(size=size, state_dir=tmp_path / "state", acquire_timeout_s=0.1)
+    pool.browser = FakeBrowser()
+    return pool
+
+
+COOKIE = {"name": "cf_clearance", "value": "abc", "domain": ".pharmacy.moh.gov.my",
+          "path": "/", "expires": -1}
+
+
+def test_context_reused_per_site_and_state_persisted(tmp_path):
+    pool = _pool(tmp_path)
+    with pool.lease("pharmacy.moh.gov.my", _factory) as lease:
+        lease.context.cookies.append(COOKIE)
+        first = lease.context
+    assert first.pages == []  # pages are closed on release, context kept
+
+    with pool.lease("pharmacy.moh.gov.my", _factory) as lease:
+        assert lease.context is first
+
+    saved = StateStore(tmp_path / "state").load("pharmacy.moh.gov.my")
+    assert saved["cookies"] == [COOKIE]
+    assert saved["user_agent"] == "FakeAgent/1.0"
+    assert pool.stats["warm_leases"] == 1 and pool.stats["contexts_created"] == 1
+
+    # A new process (new pool) starts from the saved state
+    fresh = _pool(tmp_path)
+    with fresh.lease("pharmacy.moh.gov.my", _factory) as lease:
+        assert lease.context.loaded["cookies"] == [COOKIE]
+    assert fresh.stats["states_restored"] == 1
+
+
+def test_concurrent_leases_up_to_size_then_eviction(tmp_path):
+    pool = _pool(tmp_path, size=2)
+    with pool.lease("a", _factory) as a, pool.lease("b", _factory) as b:
+        assert a.context is not b.context
+        with pytest.raises(RuntimeError):
+            with pool.lease("c", _factory):
+                pass
+    assert pool.stats["peak_in_use"] == 2
+
+    # "b" was released first (least recently used), so "c" takes its slot
+    b_context = b.context
+    with pool.lease("c", _factory) as c:
+        assert c.context is not a.context
+    assert b_context.closed
+    assert pool._slots[0].key == "a" and pool._slots[1].key == "c"
+
+
+def test_rotation_keeps_site_state(tmp_path):
+    pool = _pool(tmp_path)
+    with pool.lease("a", _factory) as lease:
+        lease.context.cookies.append(COOKIE)
+        old = lease.context
+        new = lease.rotate()
+        assert old.closed and new is lease.context
+        assert new.loaded["cookies"] == [COOKIE]
+
+
+def test_stats_and_requests_cookie_seeding(tmp_path):
+    pool = _pool(tmp_path, size=1)
+    pool._started_at = time.monotonic() - 1.0
+    with pool.lease("a", _factory):
+        time.sleep(0.05)
+    pool.record_challenge(4.0, seen=True, passed=True)
+    pool.record_challenge(0.2, seen=False, passed=True)
+    assert 0 < pool.utilization() < 1
+    assert pool.stats["challenges_seen"] == 1 and pool.stats["challenge_wait_s"] == pytest.approx(4.2)
+    assert "challenges=1/2 checks" in pool.summary()
+
+    session = requests.Session()
+    state = {"cookies": [COOKIE, dict(COOKIE, name="old", expires=1.0),
+                         dict(COOKIE, name="other", domain="example.com")],
+             "user_agent": "FakeAgent/1.0"}
+    assert apply_state_to_session(session, state, "pharmacy.moh.gov.my") == 1
+    assert session.cookies.get("cf_clearance") == "abc"
+    assert session.headers["User-Agent"] == "FakeAgent/1.0"
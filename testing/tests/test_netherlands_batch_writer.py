@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the Netherlands Phase 2 batched writer: per-page counts come from
+the upsert rowcount, and statuses are written for every page in the batch.
+"""
+
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+pytest.importorskip("playwright")
+
+
+@pytest.fixture(scope="module")
+def nl(tmp_path_factory):
+    from core.config.config_manager import ConfigManager
+
+    app_root = tmp_path_factory.mktemp("app")
+    (app_root / "config").mkdir()
+    (app_root / "config" / "platform.env").write_text("")
+    saved = ConfigManager._app_root
+    ConfigManager._app_root = app_root
+    script = _repo_root / "scripts" / "Netherlands" / "scraper.py"
+    spec = importlib.util.spec_from_file_location("nl_scraper", script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        ConfigManager._app_root = saved
+        sys.modules.pop(spec.name, None)
+
+
+class FakeRepo:
+    def __init__(self, written, bulk_fails=False):
+        self.written = written
+        self.bulk_fails = bulk_fails
+        self.per_page_calls = 0
+        self.statuses = []
+
+    def insert_packs_by_url(self, packs, log_db=True):
+        if self.bulk_fails:
+            raise ConnectionError("server closed the connection")
+        counts = {}
+        for pack in packs:
+            c_id = pack["collected_url_id"]
+            counts[c_id] = self.written.get(c_id, 0)
+        return counts
+
+    def insert_packs(self, packs, log_db=True):
+        self.per_page_calls += 1
+        return self.written.get(packs[0]["collected_url_id"], 0)
+
+    def update_url_statuses(self, updates):
+        self.statuses.extend(updates)
+        return len(updates)
+
+
+def _scraper(nl, repo):
+    scraper = object.__new__(nl.NetherlandsScraper)
+    scraper.repo = repo
+    scraper.logger = logging.getLogger("test_nl_writer")
+    scraper.errors = []
+    scraper.record_error = scraper.errors.append
+    return scraper
+
+
+def _batch():
+    packs = lambda c_id, n: [{"collected_url_id": c_id, "pack_id": f"{c_id}-{i}"} for i in range(n)]
+    return [
+        ("u1", 1, packs(1, 3), None),
+        ("u2", 2, packs(2, 2), None),   # upsert touched nothing
+        ("u3", 3, None, "http_404"),
+        ("u4", 4, [], None),
+    ]
+
+
+@pytest.mark.parametrize("bulk_fails", [False, True])
+def test_write_page_batch_reports_real_rowcounts(nl, bulk_fails):
+    repo = FakeRepo({1: 2, 2: 0}, bulk_fails=bulk_fails)
+    outcomes = _scraper(nl, repo)._write_page_batch(_batch())
+
+    assert outcomes == [
+        (1, 2, None),
+        (2, 0, "no_pack_data_or_db_insert_failed"),
+        (3, 0, "http_404"),
+        (4, 0, "no_pack_data_or_db_insert_failed"),
+    ]
+    assert repo.statuses == [
+        (1, "success", None),
+        (2, "failed", "no_pack_data_or_db_insert_failed"),
+        (3, "failed", "http_404"),
+        (4, "failed", "no_pack_data_or_db_insert_failed"),
+    ]
+    assert repo.per_page_calls == (2 if bulk_fails else 0)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the Netherlands FK step: native lxml parsing against the
+BeautifulSoup path, and the pipeline's DB thread and flush failure handling.
+"""
+
+import asyncio
+import functools
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("lxml")
+
+FK_PAGE = """<!DOCTYPE html>
+<html><head><title>
+  paracetamol  </title><script>var title = "x";</script></head>
+<body>
+<div id="p-samenstelling">
+  <section class="recipe first">
+    <h3><span class="name">Panadol <!-- brand --> <b>Junior</b></span>
+        <span class="manfact"> GSK
+          Consumer </span></h3>
+    <dl class="details"><dt class="application">tablet</dt><dd> Tablet,  omhuld </dd>
+        <dt class="concentration">sterkte</dt><dd>500 mg, 1000 mg; 250 mg</dd></dl>
+    <dl class="details"><dt class="application">drank</dt><dd>Drank</dd>
+        <dt class="other">x</dt><dd>y</dd></dl>
+    <dl class="details"><dt>nothing</dt><dd>here</dd></dl>
+  </section>
+  <section class="recipe"><span class="name">Generiek</span><span class="xgvs">niet</span>
+    <dt class="concentration">sterkte</dt><dd>120 mg/ml</dd>
+  </section>
+  <section class="recipe"><span class="name">Zetpil</span><span class="bijlage-2">b2</span>
+    <dl class="details"><dt class="application">zetpil</dt><p>no dd</p><dd>late</dd></dl>
+  </section>
+</div>
+<div id="p-indicaties">
+  <h4 class="list-header">Volwassenen</h4>
+  <ul><li>Pijn</li><li> Koorts <i>(kort)</i></li><li>pijn</li><li>  </li></ul>
+  <h4 class="list-header">Kinderen <ul><li>Nested</li></ul></h4>
+  <h4 class="list-header">Zuigelingen</h4>
+  <div><ul><li>Koorts na vaccinatie</li></ul></div>
+</div>
+</body></html>"""
+
+FLAT_INDICATIONS = """<html><body>
+<div id="x-samenstelling"><section class="recipe"><span class="name">A</span>
+  <dl class="details"><dt class="application">Crème</dt><dd>crème</dd></dl></section></div>
+<div id="x-indicaties"><p>Eczeem</p><p> </p><p>Psoriasis <b>vulgaris</b></p></div>
+</body></html>"""
+
+
+@pytest.fixture(scope="module")
+def fk(tmp_path_factory):
+    from core.config.config_manager import ConfigManager
+
+    app_root = tmp_path_factory.mktemp("app")
+    (app_root / "config").mkdir()
+    (app_root / "config" / "platform.env").write_text("")
+    saved = ConfigManager._app_root
+    ConfigManager._app_root = app_root
+    script = _repo_root / "scripts" / "Netherlands" / "03_fk_scrape_reimbursement.py"
+    spec = importlib.util.spec_from_file_location("nl_fk_step3", script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        ConfigManager._app_root = saved
+        sys.modules.pop(spec.name, None)
+
+
+@pytest.mark.parametrize("page", [FK_PAGE, FLAT_INDICATIONS, "", "<html><body>plain</body></html>"])
+def test_lxml_parser_matches_beautifulsoup(fk, page):
+    native = fk.derive_reimbursement_rows(page, "https://fk/x", parser="lxml")
+    soup = fk.derive_reimbursement_rows(page, "https://fk/x", parser="bs4")
+    assert native == soup
+
+
+def test_lxml_parser_reads_the_sample_page(fk):
+    rows = fk.derive_reimbursement_rows(FK_PAGE, "https://fk/x")
+    first = rows[0]
+    assert first["generic_name"] == "PARACETAMOL"
+    assert first["brand_name"] == "PANADOL JUNIOR"
+    assert first["manufacturer"] == "GSK CONSUMER"
+    assert first["dosage_form"] == "Tablet, omhuld"
+    assert {r["strength"] for r in rows if r["dosage_form"] == "Tablet, omhuld"} == {"500 MG", "1000 MG", "250 MG"}
+    assert {r["reimbursement_status"] for r in rows} == {"REIMBURSED", "NOT REIMBURSED"}
+    assert {r["patient_population"] for r in rows} == {"ADULTS", "ELDERLY", "CHILDREN", "INFANTS"}
+    adults = next(r for r in rows if r["patient_population"] == "ADULTS")
+    assert adults["indication_nl"] == "Pijn ; Koorts (kort)"
+
+
+class FakeDB:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def rollback(self):
+        self.calls.append(("rollback", threading.get_ident()))
+
+
+class FakeRepo:
+    def __init__(self, n_urls, status_failures=0):
+        self.urls = [{"id": i, "url": f"https://fk.test/p/{i}", "generic_slug": f"p{i}"}
+                     for i in range(1, n_urls + 1)]
+        self.status_failures = status_failures
+        self.calls = []
+        self.db = FakeDB(self.calls)
+        self.rows = []
+        self.statuses = {}
+        self.logged = 0
+
+    def _call(self, name):
+        self.calls.append((name, threading.get_ident()))
+
+    def get_fk_url_stats(self):
+        return {"pending": len(self.urls)}
+
+    def get_retryable_fk_urls(self, max_retries=3):
+        return []
+
+    def get_pending_fk_urls(self, limit, after_id):
+        self._call("page")
+        return [u for u in self.urls if u["id"] > after_id][:limit]
+
+    def insert_fk_reimbursement_batch(self, rows):
+        self._call("rows")
+        self.rows.extend(rows)
+        return len(rows)
+
+    def mark_fk_url_statuses(self, updates):
+        self._call("statuses")
+        if self.status_failures:
+            self.status_failures -= 1
+            raise ConnectionError("server closed the connection")
+        for url_id, status, _error in updates:
+            self.statuses[url_id] = status
+        return len(updates)
+
+    def log_requests(self, entries):
+        self._call("logs")
+        self.logged += len(entries)
+        return len(entries)
+
+
+def _run(fk, repo, monkeypatch, **env):
+    for key, value in {"FK_PARSE_PROCESSES": "0", "FK_SLEEP_BETWEEN": "0", "FK_PAGE_SIZE": "3",
+                       "FK_SCRAPE_WORKERS": "3", "FK_FLUSH_SECONDS": "0.1", **env}.items():
+        monkeypatch.setenv(key, value)
+
+    def handler(request):
+        if request.url.path.endswith("/4"):
+            return httpx.Response(404)
+        return httpx.Response(200, text=FK_PAGE)
+
+    client = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(fk.httpx, "AsyncClient", client)
+    return asyncio.run(fk.scrape_fk_details(repo))
+
+
+def test_pipeline_uses_one_db_thread_and_retries_flushes(fk, monkeypatch):
+    repo = FakeRepo(8, status_failures=1)
+    rows = _run(fk, repo, monkeypatch)
+
+    per_page = len(fk.derive_reimbursement_rows(FK_PAGE, "u"))
+    assert rows == 7 * per_page
+    assert repo.statuses == {i: ("failed" if i == 4 else "success") for i in range(1, 9)}
+    assert repo.logged == 8
+    # Feeder pages and writer flushes all ran on the same thread, never the loop's
+    assert len({ident for _name, ident in repo.calls}) == 1
+    assert threading.get_ident() not in {ident for _name, ident in repo.calls}
+    assert [name for name, _ in repo.calls].count("page") == 3
+    assert ("rollback", repo.calls[0][1]) in repo.calls
+
+
+def test_pipeline_fails_loudly_when_writes_keep_failing(fk, monkeypatch):
+    repo = FakeRepo(8, status_failures=100)
+    with pytest.raises(RuntimeError, match="stay pending for resume"):
+        _run(fk, repo, monkeypatch, FK_FLUSH_RETRIES="1")
+    assert repo.statuses == {}
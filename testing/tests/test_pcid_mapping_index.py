@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed PCIDMapping lookup and bulk lookup_many.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.data import pcid_mapping
+from core.data.pcid_mapping import PCIDMapping, PCIDMappingRow
+
+
+ROWS = [
+    PCIDMappingRow("P1", "Acme ", "Fooxin", "foo", "10 TAB"),
+    PCIDMappingRow("P2", "acme", "FOOXIN", "foo", "20 TAB"),
+    PCIDMappingRow("P3", "Acme", "Fooxin", "bar", "10 TAB"),
+    PCIDMappingRow("OOS", "Beta", "Oosol", "", ""),
+]
+
+
+class FakeMapping(PCIDMapping):
+    """PCIDMapping over a fixed row list; counts loads instead of querying a DB."""
+
+    def __init__(self, country="Testland", rows=ROWS):
+        super().__init__(country)
+        self.rows = list(rows)
+        self.loads = 0
+
+    def get_all(self, use_cache=False):
+        self.loads += 1
+        return list(self.rows)
+
+
+def _linear_lookup(rows, company, product, generic="", pack_desc=""):
+    """The original linear-scan semantics, kept here as the reference."""
+    n = PCIDMapping._normalize
+    for m in rows:
+        if n(m.company) == n(company) and n(m.local_product_name) == n(product):
+            if generic and pack_desc:
+                if n(m.generic_name) == n(generic) and n(m.local_pack_description) == n(pack_desc):
+                    return m.pcid
+            elif generic:
+                if n(m.generic_name) == n(generic):
+                    return m.pcid
+            elif pack_desc:
+                if n(m.local_pack_description) == n(pack_desc):
+                    return m.pcid
+            else:
+                return m.pcid
+    return None
+
+
+QUERIES = [
+    ("ACME", "fooxin", "", ""),
+    ("acme", "fooxin", "FOO", ""),
+    ("acme", "fooxin", "", "20 tab"),
+    ("acme", "fooxin", "bar", "10 tab"),
+    ("acme", "fooxin", "bar", "20 tab"),
+    ("beta", "oosol", "", ""),
+    ("nobody", "nothing", "", ""),
+]
+
+
+def test_lookup_matches_linear_scan_and_loads_once():
+    mapping = FakeMapping()
+    for q in QUERIES:
+        assert mapping.lookup(*q) == _linear_lookup(ROWS, *q), q
+    assert mapping.is_oos_product("Beta ", "OOSOL")
+    assert mapping.loads == 1
+
+
+def test_lookup_many_matches_lookup_row_for_row():
+    mapping = FakeMapping()
+    df = pd.DataFrame(QUERIES + [(None, "fooxin", None, None)],
+                      columns=["company", "product", "generic", "pack"])
+    out = mapping.lookup_many(df, "company", "product", "generic", "pack")
+    expected = [mapping.lookup(*(v or "" for v in row)) for row in df.itertuples(index=False)]
+    assert out["pcid"].tolist() == expected
+    assert "pcid" not in df.columns
+
+    only_names = mapping.lookup_many(df[["company", "product"]], "company", "product", out_col="PCID")
+    assert only_names["PCID"].tolist()[:2] == ["P1", "P1"]
+
+
+def test_nan_is_missing_in_lookup_and_lookup_many():
+    rows = ROWS + [PCIDMappingRow("PNAN", "nan", "Fooxin", "nan", "")]
+    mapping = FakeMapping(country="Nanland", rows=rows)
+    nan = float("nan")
+    queries = [("acme", "fooxin", nan, nan), ("acme", "fooxin", "bar", pd.NA),
+               (nan, "fooxin", "", ""), ("nan", "fooxin", "nan", "")]
+    df = pd.DataFrame(queries, columns=["company", "product", "generic", "pack"], dtype=object)
+    out = mapping.lookup_many(df, "company", "product", "generic", "pack")
+
+    expected = [mapping.lookup(*row) for row in queries]
+    assert expected == ["P1", "P3", None, "PNAN"]
+    assert out["pcid"].tolist() == expected
+
+
+def test_reload_invalidates_index(monkeypatch):
+    mapping = FakeMapping(country="Reloadland")
+    assert mapping.lookup("acme", "fooxin") == "P1"
+    mapping.rows = [PCIDMappingRow("NEW", "Acme", "Fooxin", "", "")]
+    assert mapping.lookup("acme", "fooxin") == "P1"  # still indexed
+
+    pcid_mapping._bump_mapping_version("Reloadland")  # what reload_pcid_mapping_from_csv does
+    assert mapping.lookup("acme", "fooxin") == "NEW"
+    assert mapping.loads == 2
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for page-parallel PDF extraction and the page cache.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pdfplumber = pytest.importorskip("pdfplumber")
+from core.parsing import pdf_pages
+from core.parsing.pdf_pages import _chunks, extract_pages, iter_pages
+
+
+def _write_pdf(path: Path, n_pages: int) -> None:
+    """Minimal text-only PDF: page i shows 'PAGE <i> DIN 0000000<i>'."""
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for i in range(n_pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        stream = f"BT /F1 12 Tf 72 720 Td (PAGE {i} DIN {i:08d}) Tj ET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        objects[content_id] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {n_pages} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += f"{num} 0 obj\n{objects[num]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode("latin-1")
+    for num in range(1, size):
+        out += f"{offsets[num]:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(bytes(out))
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "sample.pdf"
+    _write_pdf(path, 10)
+    return path
+
+
+def test_chunks_are_contiguous_and_cover_all():
+    chunks = _chunks(list(range(10)), 4)
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+    assert _chunks([1, 2], 8) == [[1], [2]]
+
+
+def test_parallel_matches_sequential_in_page_order(pdf_path):
+    sequential = extract_pages(pdf_path, "words", processes=1, x_tolerance=3, y_tolerance=3)
+    parallel = extract_pages(pdf_path, "words", processes=2, x_tolerance=3, y_tolerance=3)
+
+    assert parallel == sequential
+    assert [words[1]["text"] for words in parallel] == [str(i) for i in range(10)]
+
+    texts = extract_pages(pdf_path, "text", pages=[7, 2], processes=2)
+    assert texts == ["PAGE 7 DIN 00000007", "PAGE 2 DIN 00000002"]
+
+
+def test_cache_reused_and_keyed_by_options(pdf_path, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = extract_pages(pdf_path, "words", pages=range(3), processes=1, cache_dir=cache_dir, x_tolerance=3)
+
+    calls = []
+    real = pdf_pages._extract_chunk
+    monkeypatch.setattr(pdf_pages, "_extract_chunk",
+                        lambda *args: calls.append(args[3]) or real(*args))
+
+    # Cached pages are served from disk; only the new ones are extracted
+    again = extract_pages(pdf_path, "words", pages=range(5), processes=1, cache_dir=cache_dir, x_tolerance=3)
+    assert again[:3] == first
+    assert calls == [[3, 4]]
+
+    # Different extraction options are a separate cache entry
+    extract_pages(pdf_path, "words", pages=[0], processes=1, cache_dir=cache_dir, x_tolerance=1)
+    assert calls[-1] == [0]
+
+
+def test_unknown_kind_rejected(pdf_path):
+    with pytest.raises(ValueError):
+        extract_pages(pdf_path, "tables")
+
+
+def test_iter_pages_extracts_window_by_window(pdf_path, tmp_path, monkeypatch):
+    calls = []
+    real = pdf_pages._extract_chunk
+    monkeypatch.setattr(pdf_pages, "_extract_chunk",
+                        lambda *args: calls.append(list(args[3])) or real(*args))
+
+    pages = iter_pages(pdf_path, "words", processes=1, cache_dir=tmp_path / "cache",
+                       window=4, x_tolerance=3)
+    first = next(pages)
+    assert first[1]["text"] == "0" and calls == [[0, 1, 2, 3]]  # nothing beyond the first window
+    rest = list(pages)
+    assert calls == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert [first] + rest == extract_pages(pdf_path, "words", processes=1, x_tolerance=3)
+
+    # The cache is written per window, so a second pass extracts nothing
+    calls.clear()
+    assert len(list(iter_pages(pdf_path, "words", processes=1, cache_dir=tmp_path / "cache",
+                               window=3, x_tolerance=3))) == 10
+    assert calls == []
+
+
+def test_bad_page_is_empty_flagged_and_not_cached(pdf_path, tmp_path, monkeypatch):
+    real = pdfplumber.page.Page.extract_words
+
+    def extract_words(page, **kwargs):
+        if page.page_number == 3:
+            raise ValueError("broken content stream")
+        return real(page, **kwargs)
+
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_words", extract_words)
+    cache_dir = tmp_path / "cache"
+    failed = set()
+    pages = extract_pages(pdf_path, "words", pages=range(5), processes=1, cache_dir=cache_dir,
+                          failed_pages=failed, x_tolerance=3)
+
+    assert pages[2] == [] and failed == {2}
+    assert [words[1]["text"] for i, words in enumerate(pages) if i != 2] == ["0", "1", "3", "4"]
+
+    # The failed page was not cached, so a later run extracts it again
+    monkeypatch.setattr(pdfplumber.page.Page, "extract_words", real)
+    failed.clear()
+    again = extract_pages(pdf_path, "words", pages=range(5), processes=1, cache_dir=cache_dir,
+                          failed_pages=failed, x_tolerance=3)
+    assert again[2][1]["text"] == "2" and failed == set()
+
+
+def test_pypdf_text_prefers_pinned_pypdf2():
+    pytest.importorskip("PyPDF2")
+    assert pdf_pages._pdf_reader_class().__module__.split(".")[0] == "PyPDF2"
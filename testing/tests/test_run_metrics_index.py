@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite index behind RunMetricsTracker.list_metrics/get_summary.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.progress.run_metrics_tracker import RunMetrics, RunMetricsTracker
+
+
+def _write_legacy(metrics_dir: Path, run_id: str, scraper: str, duration: float, sent: int):
+    data = RunMetrics(run_id=run_id, scraper_name=scraper, started_at="2026-01-01T00:00:00+00:00",
+                      active_duration_seconds=duration, network_sent_bytes=sent,
+                      status="completed").to_dict()
+    (metrics_dir / f"{run_id}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_migrates_existing_json_files(tmp_path):
+    _write_legacy(tmp_path, "run_001", "Malaysia", 10.0, 1024 ** 3)
+    _write_legacy(tmp_path, "run_002", "India", 20.0, 0)
+    _write_legacy(tmp_path, "run_003", "Malaysia", 30.0, 1024 ** 3)
+
+    tracker = RunMetricsTracker(metrics_dir=tmp_path)
+
+    assert [m.run_id for m in tracker.list_metrics()] == ["run_003", "run_002", "run_001"]
+    assert [m.run_id for m in tracker.list_metrics(scraper_name="Malaysia", limit=1)] == ["run_003"]
+
+    summary = tracker.get_summary(scraper_name="Malaysia")
+    assert summary["total_runs"] == 2
+    assert summary["total_duration_seconds"] == 40.0
+    assert summary["total_network_gb"] == 2.0
+    assert summary["avg_duration_seconds"] == 20.0
+
+
+def test_queries_do_not_read_run_files(tmp_path, monkeypatch):
+    tracker = RunMetricsTracker(metrics_dir=tmp_path)
+    tracker.start_run("run_a", "Russia")
+    tracker.complete_run("run_a")
+
+    def _no_glob(*args, **kwargs):
+        raise AssertionError("list_metrics should not scan the metrics directory")
+
+    monkeypatch.setattr(Path, "glob", _no_glob)
+    listed = tracker.list_metrics(scraper_name="Russia")
+    assert [m.run_id for m in listed] == ["run_a"]
+    assert listed[0].status == "completed"
+    assert tracker.get_summary()["total_runs"] == 1
+
+
+def test_delete_removes_from_index(tmp_path):
+    tracker = RunMetricsTracker(metrics_dir=tmp_path)
+    tracker.start_run("run_x", "Taiwan")
+    tracker.complete_run("run_x")
+    assert tracker.delete_metrics("run_x")
+    assert tracker.list_metrics() == []
+    assert tracker.get_summary()["total_runs"] == 0
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for Russia page sharding (plan/steal/lease iteration) and the item_id bitmap.
+"""
+
+import sys
+from pathlib import Path
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+sys.path.insert(0, str(_repo_root / "scripts" / "Russia"))
+
+from item_id_bitmap import ItemIdBitmap
+from page_shards import LeasedPages, auto_shard_size, plan_shards, steal_split
+
+
+class FakeLeaseRepo:
+    """In-memory stand-in for the ru_page_leases methods of RussiaRepository."""
+
+    def __init__(self, shards):
+        self.rows = {i: {"next": s, "end": e, "status": "pending", "worker": None}
+                     for i, (s, e) in enumerate(shards)}
+        self.released = []
+
+    def lease_page_shard(self, worker, source_type, lease_seconds):
+        free = [i for i, r in sorted(self.rows.items(), key=lambda kv: kv[1]["next"])
+                if r["status"] == "pending"]
+        if not free:
+            return None
+        row = self.rows[free[0]]
+        row.update(status="leased", worker=worker)
+        return free[0], row["next"], row["end"]
+
+    def steal_page_shard(self, worker, source_type, lease_seconds, min_pages):
+        leased = [i for i, r in self.rows.items() if r["status"] == "leased"]
+        if not leased:
+            return None
+        victim = max(leased, key=lambda i: self.rows[i]["end"] - self.rows[i]["next"])
+        row = self.rows[victim]
+        split = steal_split(row["next"], row["end"], min_pages)
+        if split is None:
+            return None
+        new_id = max(self.rows) + 1
+        self.rows[new_id] = {"next": split, "end": row["end"], "status": "leased", "worker": worker}
+        row["end"] = split - 1
+        return new_id, split, self.rows[new_id]["end"]
+
+    def advance_page_shard(self, shard_id, worker, page, lease_seconds):
+        row = self.rows[shard_id]
+        if row["worker"] != worker or row["status"] != "leased":
+            return None
+        row["next"] = page + 1
+        if row["next"] > row["end"]:
+            row["status"] = "done"
+        return row["end"]
+
+    def release_page_shard(self, shard_id, worker):
+        self.released.append(shard_id)
+        self.rows[shard_id].update(status="pending", worker=None)
+
+
+def test_plan_shards_respects_gaps_and_size():
+    pages = [1, 2, 3, 4, 5, 7, 8, 20]
+    assert plan_shards(pages, 3) == [(1, 3), (4, 5), (7, 8), (20, 20)]
+    assert plan_shards([], 5) == []
+    assert auto_shard_size(100, 4) == 13
+
+
+def test_steal_split_takes_upper_half_after_page_in_progress():
+    # Owner is on page 10 of 10..20: pages 11..20 remain, thief gets 16..20
+    assert steal_split(10, 20) == 16
+    assert steal_split(10, 11) is None  # one page left after the current one
+    assert steal_split(10, 12) == 12
+
+
+def test_workers_cover_every_page_once_with_stealing():
+    repo = FakeLeaseRepo(plan_shards(range(1, 31), 15))
+    w1 = iter(LeasedPages(repo, "W1"))
+    w2 = iter(LeasedPages(repo, "W2"))
+    w3 = LeasedPages(repo, "W3")
+
+    seen = [next(w1), next(w2)]          # both shards leased: 1..15 and 16..30
+    seen += list(w3)                     # W3 finds no free shard and steals repeatedly
+    seen += list(w1) + list(w2)
+
+    assert sorted(seen) == list(range(1, 31))
+    assert w3.steals > 0 and w3.pages > 0
+
+
+def test_stopping_early_releases_shard_from_current_page():
+    repo = FakeLeaseRepo([(1, 10)])
+    for page in LeasedPages(repo, "W1"):
+        if page == 4:
+            break
+    assert repo.released == [0]
+    assert repo.rows[0]["next"] == 4 and repo.rows[0]["status"] == "pending"
+    assert next(iter(LeasedPages(repo, "W2"))) == 4
+
+
+def test_item_id_bitmap_membership():
+    ids = ItemIdBitmap(["101", 5, " 7 ", "abc", None])
+    assert len(ids) == 4
+    assert "101" in ids and 101 in ids and "7" in ids and "abc" in ids
+    assert "102" not in ids and None not in ids and 10 ** 12 not in ids
+    assert ids.update(["101", "102", str(10 ** 12)]) == 2
+    assert str(10 ** 12) in ids
+    assert ids.nbytes < 1024
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipelined DistributedURLWorker: concurrent slots over an
+in-memory work queue, batched completions and release of prefetched claims
+on shutdown.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+_repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_repo_root))
+
+from core.pipeline import url_work_queue
+from core.utils import url_worker
+
+
+class FakeQueue:
+    """Thread-safe stand-in for URLWorkQueue with the same status semantics."""
+
+    def __init__(self, urls, max_retries=2):
+        self.lock = threading.Lock()
+        self.rows = {
+            i: {"url": url, "status": "pending", "worker_id": None, "retry_count": 0}
+            for i, url in enumerate(urls, start=1)
+        }
+        self.max_retries = max_retries
+        self.complete_calls = []
+        self.completed_ids = []
+        self.renewed = 0
+
+    def claim_batch(self, worker_id, scraper_name, run_id, batch_size=10, lease_seconds=300):
+        with self.lock:
+            out = []
+            for work_id, row in self.rows.items():
+                if len(out) >= batch_size:
+                    break
+                if row["status"] == "pending" and row["retry_count"] < self.max_retries:
+                    row.update(status="claimed", worker_id=worker_id)
+                    out.append({"id": work_id, "url": row["url"], "url_hash": "",
+                                "priority": 0, "retry_count": row["retry_count"]})
+            return out
+
+    def complete_urls(self, results):
+        with self.lock:
+            self.complete_calls.append(len(results))
+            for work_id, success, _ in results:
+                row = self.rows[work_id]
+                if success:
+                    row["status"] = "completed"
+                    self.completed_ids.append(work_id)
+                else:
+                    row["retry_count"] += 1
+                    row["status"] = "failed" if row["retry_count"] >= self.max_retries else "pending"
+                row["worker_id"] = None
+            return len(results)
+
+    def renew_leases(self, worker_id, work_ids):
+        with self.lock:
+            self.renewed += len(work_ids)
+            return len(work_ids)
+
+    def release_claims(self, worker_id, work_ids):
+        with self.lock:
+            for work_id in work_ids:
+                row = self.rows[work_id]
+                if row["status"] == "claimed" and row["worker_id"] == worker_id:
+                    row.update(status="pending", worker_id=None)
+            return len(work_ids)
+
+    def release_expired_leases(self, lease_seconds=300):
+        return 0
+
+    def get_queue_stats(self, run_id, scraper_name):
+        with self.lock:
+            stats = {"pending": 0, "claimed": 0, "completed": 0, "failed": 0}
+            for row in self.rows.values():
+                stats[row["status"]] += 1
+        stats["total"] = sum(stats.values())
+        stats["remaining"] = stats["pending"] + stats["claimed"]
+        return stats
+
+
+class FakeWorker(url_worker.DistributedURLWorker):
+    def __init__(self, queue, delay=0.005, stop_after=None):
+        super().__init__("Test", "run1", {})
+        self.queue = queue
+        self.delay = delay
+        self.stop_after = stop_after
+        self.seen = []
+        self.opened = []
+
+    def open_slot(self, mode="browser", use_tor=True):
+        self.session = object()
+        self.opened.append(threading.current_thread().name)
+
+    def close_slot(self):
+        self.session = None
+
+    def process_url(self, url, work_id):
+        assert self.session is not None
+        self.seen.append(work_id)
+        if self.stop_after is not None and len(self.seen) >= self.stop_after:
+            self.running = False
+        time.sleep(self.delay)
+        return not url.endswith("bad")
+
+
+@pytest.fixture(autouse=True)
+def _no_database(monkeypatch):
+    monkeypatch.setattr(url_worker, "URLWorkQueue", lambda db_config: None)
+
+
+def test_pipelined_slots_complete_every_url_once():
+    urls = [f"https://example.com/{i}" for i in range(200)] + ["https://example.com/bad"]
+    fake = FakeQueue(urls)
+    worker = FakeWorker(fake)
+    summary = worker.run_pipelined(slots=4, batch_size=10, poll_interval=0.05,
+                                   flush_interval=0.05, flush_size=25)
+
+    statuses = [row["status"] for row in fake.rows.values()]
+    assert statuses.count("completed") == 200 and statuses.count("failed") == 1
+    assert sorted(fake.completed_ids) == list(range(1, 201))
+    # The bad URL is retried up to max_retries, every other URL is processed once
+    assert len(worker.seen) == 202
+    # Completions are written in batches, not per URL
+    assert sum(fake.complete_calls) == 202 and len(fake.complete_calls) < 60
+
+    assert len(set(worker.opened)) == 4
+    assert summary["processed"] == 202 and summary["failed"] == 2
+    assert len(summary["slots"]) == 4
+    assert all(0.0 <= row["utilization"] <= 1.0 for row in summary["slots"])
+    assert sum(row["items"] for row in summary["slots"]) == 202
+    assert summary["mean_utilization"] > 0
+
+
+def test_stop_releases_prefetched_claims():
+    fake = FakeQueue([f"https://example.com/{i}" for i in range(100)])
+    worker = FakeWorker(fake, delay=0.01, stop_after=5)
+    summary = worker.run_pipelined(slots=2, batch_size=20, poll_interval=0.05, flush_interval=0.05)
+
+    statuses = [row["status"] for row in fake.rows.values()]
+    assert "claimed" not in statuses
+    assert statuses.count("completed") == summary["processed"] == len(worker.seen)
+    assert statuses.count("pending") == 100 - len(worker.seen)
+
+
+def test_rejects_unknown_mode():
+    worker = FakeWorker(FakeQueue([]))
+    with pytest.raises(ValueError):
+        worker.run_pipelined(mode="carrier-pigeon")
+
+
+class FakeConnection:
+    """Connection/cursor pair for URLWorkQueue: only ids in `existing` can be updated."""
+
+    def __init__(self, existing):
+        self.existing = set(existing)
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params):
+        self.rowcount = len(self.existing & set(params[0]))
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_complete_urls_counts_rows_actually_updated(monkeypatch):
+    conn = FakeConnection(existing=range(1, 8))
+    page_sizes = []
+
+    def fake_execute_values(cur, sql, rows, template=None, page_size=100, fetch=False):
+        assert "RETURNING" in sql and fetch
+        page_sizes.append(page_size)
+        return [(work_id,) for work_id, _error in rows if work_id in cur.existing]
+
+    monkeypatch.setattr(url_work_queue, "execute_values", fake_execute_values)
+    queue = object.__new__(url_work_queue.URLWorkQueue)
+    queue._get_connection = lambda: conn
+
+    # 9 and 10 were deleted (e.g. a cleaned-up run): neither branch counts them
+    results = [(1, True, None), (2, True, None), (9, True, None),
+               (3, False, "timeout"), (4, False, "http 500"), (10, False, "gone")]
+    assert queue.complete_urls(results) == 4
+    assert conn.commits == 1 and page_sizes == [500]
+    assert queue.complete_urls([]) == 0
@@ -0,0 +1,711 @@
+"""
+Cluster supervisor for distributed URL workers.
+
+Keeps worker processes running on local or SSH nodes and sizes them to the
+work that is left:
+
+- queue depth comes from URLWorkQueue.get_queue_stats (any callable that
+  returns the same dict can stand in);
+- node load comes from the heartbeat lines workers print to stdout
+  (core.utils.worker_heartbeat), picked out of the log stream;
+- each node is scaled up or down by ``scale_step`` workers per evaluation
+  within its ``min_workers`` / ``max_workers`` bounds;
+- crashed workers are restarted with exponential backoff, workers that stop
+  heartbeating are killed and restarted;
+- all worker output goes through one selector-based LogMux instead of a
+  reader thread per pipe.
+
+Usage (see launch_cluster.py --supervise):
+
+    supervisor = ClusterSupervisor(
+        nodes=[NodeSpec.from_config({"host": "local", "min_workers": 1, "max_workers": 4})],
+        script="core/utils/url_worker.py",
+        script_args=["--scraper", "India", "--run-id", run_id],
+        policy=ScalePolicy(backlog_per_worker=500),
+        queue_stats_fn=lambda: queue.get_queue_stats(run_id, "India"),
+    )
+    summary = supervisor.run()
+"""
+
+import logging
+import math
+import os
+import queue
+import selectors
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional
+
+from core.utils.worker_heartbeat import HEARTBEAT_ENV, parse_heartbeat
+
+try:
+    import paramiko
+except ImportError:
+    paramiko = None
+
+log = logging.getLogger(__name__)
+
+LOCAL_HOSTS = ("", "local", "localhost", "127.0.0.1")
+
+
+# ---------------------------------------------------------------------------
+# Log multiplexing
+# ---------------------------------------------------------------------------
+
+class _Stream:
+    """Line splitter for one worker output stream."""
+
+    def __init__(self, label: str, read: Callable[[], bytes], on_line: Callable[[str], None],
+                 close: Optional[Callable[[], None]] = None):
+        self.label = label
+        self.read = read
+        self.on_line = on_line
+        self.close = close
+        self._partial = b""
+
+    def feed(self, chunk: bytes):
+        data = self._partial + chunk
+        *lines, self._partial = data.split(b"\n")
+        for line in lines:
+            self.on_line(line.decode("utf-8", errors="replace").rstrip("\r"))
+
+    def finish(self):
+        if self._partial:
+            self.on_line(self._partial.decode("utf-8", errors="replace").rstrip("\r"))
+            self._partial = b""
+        if self.close:
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+def print_line(label: str, line: str):
+    print(f"[{label}] {line}", flush=True)
+
+
+class LogMux:
+    """
+    Read many worker pipes / SSH channels from one thread with a selector.
+
+    Call ``poll(timeout)`` from the supervising loop; complete lines are
+    handed to each stream's ``on_line`` callback (default: printed with the
+    stream label). Windows selectors only accept sockets, so there each
+    source gets a reader thread feeding a queue that ``poll`` drains.
+    """
+
+    def __init__(self, threaded: Optional[bool] = None):
+        self.threaded = os.name == "nt" if threaded is None else threaded
+        self._selector = None if self.threaded else selectors.DefaultSelector()
+        self._chunks: "queue.Queue" = queue.Queue()
+        self._open = 0
+
+    def __len__(self) -> int:
+        return self._open
+
+    def add_pipe(self, pipe, label: str, on_line: Optional[Callable[[str], None]] = None):
+        """Register a binary subprocess pipe (``Popen(..., stdout=PIPE)``)."""
+        fd = pipe.fileno()
+        self._add(pipe, lambda: os.read(fd, 65536), label, on_line, pipe.close)
+
+    def add_channel(self, channel, label: str, on_line: Optional[Callable[[str], None]] = None):
+        """Register a paramiko channel (stdout, with stderr merged by the pty)."""
+        self._add(channel, lambda: channel.recv(65536), label, on_line)
+
+    def _add(self, fileobj, read, label, on_line, close=None):
+        stream = _Stream(label, read, on_line or (lambda line: print_line(label, line)), close)
+        self._open += 1
+        if self.threaded:
+            threading.Thread(target=self._reader, args=(stream,), daemon=True,
+                             name=f"log-{label}").start()
+        else:
+            self._selector.register(fileobj, selectors.EVENT_READ, stream)
+
+    def _reader(self, stream: _Stream):
+        while True:
+            try:
+                chunk = stream.read()
+            except (OSError, ValueError):
+                chunk = b""
+            self._chunks.put((stream, chunk))
+            if not chunk:
+                return
+
+    def _handle(self, stream: _Stream, chunk: bytes) -> bool:
+        if chunk:
+            stream.feed(chunk)
+            return True
+        stream.finish()
+        self._open -= 1
+        return False
+
+    def poll(self, timeout: float = 1.0) -> int:
+        """Dispatch available output; returns the number of chunks handled."""
+        handled = 0
+        if self.threaded:
+            try:
+                stream, chunk = self._chunks.get(timeout=timeout)
+            except queue.Empty:
+                return 0
+            while True:
+                self._handle(stream, chunk)
+                handled += 1
+                try:
+                    stream, chunk = self._chunks.get_nowait()
+                except queue.Empty:
+                    return handled
+
+        if not self._open:
+            time.sleep(timeout)
+            return 0
+        for key, _ in self._selector.select(timeout):
+            stream = key.data
+            try:
+                chunk = stream.read()
+            except (OSError, ValueError):
+                chunk = b""
+            if not self._handle(stream, chunk):
+                self._selector.unregister(key.fileobj)
+            handled += 1
+        return handled
+
+    def drain(self, timeout: float = 2.0):
+        """Read until every registered stream has hit EOF or ``timeout`` passes."""
+        deadline = time.monotonic() + timeout
+        while self._open and time.monotonic() < deadline:
+            self.poll(min(0.2, max(0.0, deadline - time.monotonic())))
+
+    def close(self):
+        if self._selector is not None:
+            for key in list(self._selector.get_map().values()):
+                key.data.finish()
+            self._selector.close()
+
+
+# ---------------------------------------------------------------------------
+# Nodes and worker processes
+# ---------------------------------------------------------------------------
+
+class LocalProcess:
+    """A worker subprocess on this machine."""
+
+    def __init__(self, popen: subprocess.Popen):
+        self.popen = popen
+        self.pid = popen.pid
+
+    def poll(self) -> Optional[int]:
+        return self.popen.poll()
+
+    def terminate(self):
+        """SIGTERM: url_worker finishes in-flight URLs and releases its claims."""
+        if self.popen.poll() is None:
+            self.popen.terminate()
+
+    def kill(self):
+        if self.popen.poll() is None:
+            self.popen.kill()
+
+
+class RemoteProcess:
+    """A worker running in an SSH channel with a pty."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.pid = None
+
+    def poll(self) -> Optional[int]:
+        if self.channel.exit_status_ready():
+            return self.channel.recv_exit_status()
+        return None
+
+    def terminate(self):
+        """Ctrl-C through the pty: the worker stops like an interactive interrupt."""
+        try:
+            self.channel.send(b"\x03")
+        except Exception:
+            self.kill()
+
+    def kill(self):
+        self.channel.close()
+
+
+@dataclass
+class NodeSpec:
+    """One node of cluster_config.json with its scaling bounds."""
+
+    host: str = "local"
+    workers: int = 1
+    min_workers: int = 1
+    max_workers: int = 1
+    user: Optional[str] = None
+    password: Optional[str] = None
+    key_path: Optional[str] = None
+    repo_path: str = "~/quad99/Scrappers"
+    python_path: str = "python3"
+
+    @classmethod
+    def from_config(cls, node: Dict[str, Any], default_workers: int = 1) -> "NodeSpec":
+        workers = int(node.get("workers", default_workers))
+        min_workers = int(node.get("min_workers", workers))
+        max_workers = max(min_workers, int(node.get("max_workers", workers)))
+        known = {f.name for f in fields(cls)}
+        spec = cls(**{k: v for k, v in node.items() if k in known})
+        spec.min_workers, spec.max_workers = min_workers, max_workers
+        spec.workers = min(max(workers, min_workers), max_workers)
+        spec.host = spec.host or "local"
+        return spec
+
+    @property
+    def is_local(self) -> bool:
+        return self.host in LOCAL_HOSTS
+
+
+class LocalNode:
+    """Starts workers as subprocesses of the supervisor."""
+
+    def __init__(self, spec: NodeSpec):
+        self.spec = spec
+        self.name = "local"
+
+    def spawn(self, script: str, script_args: List[str], env_vars: Dict[str, str],
+              mux: LogMux, label: str, on_line) -> LocalProcess:
+        env = os.environ.copy()
+        env.update(env_vars)
+        env.setdefault("PYTHONUNBUFFERED", "1")
+        popen = subprocess.Popen(
+            [sys.executable, script, *script_args],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        mux.add_pipe(popen.stdout, label, on_line)
+        mux.add_pipe(popen.stderr, f"{label}-ERR", on_line)
+        return LocalProcess(popen)
+
+    def close(self):
+        pass
+
+
+class SSHNode:
+    """Starts workers over one SSH connection per node, one channel per worker."""
+
+    def __init__(self, spec: NodeSpec):
+        if paramiko is None:
+            raise RuntimeError("paramiko not installed; install with 'pip install paramiko' for remote nodes")
+        self.spec = spec
+        self.name = spec.host
+        self._client = None
+
+    def _connect(self):
+        transport = self._client.get_transport() if self._client else None
+        if transport is not None and transport.is_active():
+            return self._client
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        connect_kwargs = {"hostname": self.spec.host, "username": self.spec.user}
+        if self.spec.password:
+            connect_kwargs["password"] = self.spec.password
+        if self.spec.key_path:
+            connect_kwargs["key_filename"] = self.spec.key_path
+        log.info(f"Connecting to {self.spec.user}@{self.spec.host}")
+        client.connect(**connect_kwargs)
+        self._client = client
+        return client
+
+    def spawn(self, script: str, script_args: List[str], env_vars: Dict[str, str],
+              mux: LogMux, label: str, on_line) -> RemoteProcess:
+        client = self._connect()
+        exports = "".join(f"export {k}={shlex.quote(str(v))}; " for k, v in env_vars.items())
+        args = " ".join(shlex.quote(a) for a in script_args)
+        cmd = (f"cd {self.spec.repo_path} && {exports}PYTHONUNBUFFERED=1 "
+               f"{self.spec.python_path} {shlex.quote(script)} {args}").strip()
+        _, stdout, _ = client.exec_command(cmd, get_pty=True)
+        mux.add_channel(stdout.channel, label, on_line)
+        return RemoteProcess(stdout.channel)
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+def make_node(spec: NodeSpec):
+    return LocalNode(spec) if spec.is_local else SSHNode(spec)
+
+
+# ---------------------------------------------------------------------------
+# Scaling policy
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ScalePolicy:
+    """Autoscaling and restart knobs (``autoscale`` section of cluster_config.json)."""
+
+    interval: float = 30.0               # seconds between scaling evaluations
+    backlog_per_worker: int = 200        # remaining URLs that justify one worker
+    max_load_per_cpu: float = 0.9        # node load1/cpus above this blocks scale-up and sheds a worker
+    scale_step: int = 1                  # max workers added/removed per node per evaluation
+    cooldown: float = 60.0               # min seconds between scaling actions
+    heartbeat_interval: float = 15.0     # WORKER_HEARTBEAT passed to workers (0 disables)
+    heartbeat_timeout: float = 0.0       # restart a worker silent this long (0 disables)
+    restart_backoff: float = 5.0         # first restart delay, doubled per consecutive crash
+    restart_backoff_max: float = 300.0
+    stable_seconds: float = 120.0        # a run this long resets the crash streak
+    max_restarts: int = 0                # per worker slot; 0 = unlimited
+    stop_grace: float = 60.0             # SIGTERM -> kill delay when scaling down
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ScalePolicy":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in known})
+
+    def backoff(self, crashes: int) -> float:
+        return min(self.restart_backoff_max, self.restart_backoff * (2 ** max(0, crashes - 1)))
+
+
+@dataclass
+class NodeView:
+    """What the policy sees of a node at evaluation time."""
+
+    name: str
+    current: int
+    min_workers: int
+    max_workers: int
+    load_per_cpu: Optional[float] = None
+    utilization: Optional[float] = None
+
+
+def plan_scaling(nodes: List[NodeView], queue_stats: Optional[Dict[str, int]],
+                 policy: ScalePolicy) -> Dict[str, int]:
+    """
+    Target worker count per node.
+
+    Total demand is ``ceil(remaining / backlog_per_worker)``. Overloaded
+    nodes shed a step; extra demand goes to the least loaded nodes first,
+    surplus is removed from the most loaded first. Without queue stats the
+    current counts are only clamped to bounds (and overload still sheds).
+    """
+    targets = {n.name: min(max(n.current, n.min_workers), n.max_workers) for n in nodes}
+    overloaded = {n.name for n in nodes
+                  if n.load_per_cpu is not None and n.load_per_cpu > policy.max_load_per_cpu}
+    for n in nodes:
+        if n.name in overloaded:
+            targets[n.name] = max(n.min_workers, targets[n.name] - policy.scale_step)
+    if queue_stats is None:
+        return targets
+
+    remaining = int(queue_stats.get("remaining", 0))
+    desired = math.ceil(remaining / max(1, policy.backlog_per_worker))
+    total = sum(targets.values())
+    by_load = sorted(nodes, key=lambda n: (n.load_per_cpu or 0.0, n.utilization or 0.0))
+
+    if desired > total:
+        for n in by_load:
+            if n.name in overloaded or total >= desired:
+                continue
+            add = min(policy.scale_step, n.max_workers - targets[n.name], desired - total)
+            if add > 0:
+                targets[n.name] += add
+                total += add
+    elif desired < total:
+        for n in reversed(by_load):
+            if total <= desired:
+                break
+            if targets[n.name] < n.current:
+                continue  # already shedding this round
+            remove = min(policy.scale_step, targets[n.name] - n.min_workers, total - desired)
+            if remove > 0:
+                targets[n.name] -= remove
+                total -= remove
+    return targets
+
+
+# ---------------------------------------------------------------------------
+# Supervisor
+# ---------------------------------------------------------------------------
+
+@dataclass
+class WorkerHandle:
+    node: str
+    slot: int
+    worker_id: int
+    process: Any
+    started: float
+    crashes: int = 0
+    restarts: int = 0
+    stop_requested: Optional[float] = None
+    last_heartbeat: Optional[float] = None
+    heartbeat: Dict[str, Any] = field(default_factory=dict)
+
+
+class ClusterSupervisor:
+    """Run, restart and autoscale workers across nodes until the queue is drained."""
+
+    def __init__(self, nodes: List[NodeSpec], script: str, policy: Optional[ScalePolicy] = None,
+                 script_args: Optional[List[str]] = None, env_vars: Optional[Dict[str, str]] = None,
+                 queue_stats_fn: Optional[Callable[[], Dict[str, int]]] = None,
+                 mux: Optional[LogMux] = None, line_sink: Callable[[str, str], None] = print_line):
+        self.specs = {_node_name(spec): spec for spec in nodes}
+        self.nodes = {name: make_node(spec) for name, spec in self.specs.items()}
+        self.script = script
+        self.script_args = list(script_args or [])
+        self.policy = policy or ScalePolicy()
+        self.env_vars = dict(env_vars or {})
+        self.queue_stats_fn = queue_stats_fn
+        self.mux = mux or LogMux()
+        self.line_sink = line_sink
+
+        self.workers: Dict[int, WorkerHandle] = {}
+        self.retiring: Dict[int, WorkerHandle] = {}
+        self.restarts_due: List[tuple] = []      # (due, node, slot, crashes, restarts)
+        self.events: List[Dict[str, Any]] = []
+        self.last_queue_stats: Optional[Dict[str, int]] = None
+        self._next_worker_id = 1
+        self._last_scale = float("-inf")
+        self._last_eval = float("-inf")
+        self._stopping = False
+
+    # -- process lifecycle -------------------------------------------------
+
+    def _record(self, kind: str, **details):
+        details.update(event=kind, at=round(time.monotonic(), 3))
+        self.events.append(details)
+
+    def _node_workers(self, name: str) -> List[WorkerHandle]:
+        return [h for h in self.workers.values() if h.node == name]
+
+    def _free_slot(self, name: str) -> int:
+        used = {h.slot for h in self._node_workers(name)} | {r[2] for r in self.restarts_due if r[1] == name}
+        slot = 0
+        while slot in used:
+            slot += 1
+        return slot
+
+    def start_worker(self, name: str, slot: Optional[int] = None, crashes: int = 0,
+                     restarts: int = 0) -> Optional[WorkerHandle]:
+        slot = self._free_slot(name) if slot is None else slot
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        label = f"{name}-Worker-{worker_id}"
+        env = dict(self.env_vars)
+        env.update(WORKER_ID=str(worker_id), WORKER_NODE=name)
+        if self.policy.heartbeat_interval:
+            env[HEARTBEAT_ENV] = str(self.policy.heartbeat_interval)
+
+        handle = WorkerHandle(node=name, slot=slot, worker_id=worker_id, process=None,
+                              started=time.monotonic(), crashes=crashes, restarts=restarts)
+        try:
+            handle.process = self.nodes[name].spawn(
+                self.script, self.script_args, env, self.mux, label,
+                lambda line, h=handle, lb=label: self._on_line(h, lb, line))
+        except Exception as e:
+            log.error(f"Failed to start worker on {name}: {e}")
+            self._schedule_restart(handle, f"spawn failed: {e}")
+            return None
+        self.workers[worker_id] = handle
+        self._record("start", node=name, worker=worker_id, slot=slot, restarts=restarts)
+        log.info(f"Started worker {worker_id} on {name} (slot {slot}, pid {handle.process.pid})")
+        return handle
+
+    def _on_line(self, handle: WorkerHandle, label: str, line: str):
+        payload = parse_heartbeat(line)
+        if payload is None:
+            self.line_sink(label, line)
+            return
+        handle.heartbeat = payload
+        handle.last_heartbeat = time.monotonic()
+
+    def _schedule_restart(self, handle: WorkerHandle, reason: str):
+        crashes = handle.crashes + 1
+        if self.policy.max_restarts and handle.restarts >= self.policy.max_restarts:
+            log.error(f"Worker slot {handle.slot} on {handle.node} gave up after {handle.restarts} restarts ({reason})")
+            self._record("give_up", node=handle.node, slot=handle.slot, reason=reason)
+            return
+        delay = self.policy.backoff(crashes)
+        self.restarts_due.append((time.monotonic() + delay, handle.node, handle.slot, crashes, handle.restarts + 1))
+        self._record("crash", node=handle.node, worker=handle.worker_id, slot=handle.slot,
+                     reason=reason, backoff=delay)
+        log.warning(f"Worker {handle.worker_id} on {handle.node} {reason}; restarting in {delay:.1f}s")
+
+    def _reap(self):
+        now = time.monotonic()
+        for worker_id, handle in list(self.workers.items()):
+            code = handle.process.poll()
+            if code is None:
+                timeout = self.policy.heartbeat_timeout
+                if (timeout and handle.last_heartbeat is not None
+                        and now - handle.last_heartbeat > timeout):
+                    log.warning(f"Worker {worker_id} on {handle.node} silent for "
+                                f"{now - handle.last_heartbeat:.0f}s; killing")
+                    handle.process.kill()
+                    del self.workers[worker_id]
+                    self._schedule_restart(handle, "stopped heartbeating")
+                continue
+            del self.workers[worker_id]
+            if code == 0 or self._stopping:
+                self._record("exit", node=handle.node, worker=worker_id, code=code)
+                log.info(f"Worker {worker_id} on {handle.node} exited with code {code}")
+                continue
+            if now - handle.started >= self.policy.stable_seconds:
+                handle.crashes = 0
+            self._schedule_restart(handle, f"exited with code {code}")
+
+        for worker_id, handle in list(self.retiring.items()):
+            if handle.process.poll() is not None:
+                del self.retiring[worker_id]
+                self._record("retired", node=handle.node, worker=worker_id)
+            elif now - handle.stop_requested > self.policy.stop_grace:
+                handle.process.kill()
+
+    def _restart_due(self):
+        now = time.monotonic()
+        due = [r for r in self.restarts_due if r[0] <= now]
+        if not due:
+            return
+        self.restarts_due = [r for r in self.restarts_due if r[0] > now]
+        for _, name, slot, crashes, restarts in due:
+            if self._stopping:
+                continue
+            if len(self._node_workers(name)) >= self.specs[name].max_workers:
+                continue
+            self.start_worker(name, slot=slot, crashes=crashes, restarts=restarts)
+
+    def retire_worker(self, handle: WorkerHandle):
+        """Ask a worker to stop after its current URLs; kill it after ``stop_grace``."""
+        self.workers.pop(handle.worker_id, None)
+        handle.stop_requested = time.monotonic()
+        self.retiring[handle.worker_id] = handle
+        handle.process.terminate()
+        self._record("retire", node=handle.node, worker=handle.worker_id)
+        log.info(f"Scaling down: stopping worker {handle.worker_id} on {handle.node}")
+
+    # -- scaling -----------------------------------------------------------
+
+    def _queue_stats(self) -> Optional[Dict[str, int]]:
+        if self.queue_stats_fn is None:
+            return None
+        try:
+            self.last_queue_stats = self.queue_stats_fn()
+        except Exception as e:
+            log.warning(f"Queue stats unavailable: {e}")
+            return None
+        return self.last_queue_stats
+
+    def node_view(self, name: str) -> NodeView:
+        spec = self.specs[name]
+        handles = self._node_workers(name)
+        pending_restarts = sum(1 for r in self.restarts_due if r[1] == name)
+        beats = [h.heartbeat for h in handles if h.heartbeat]
+        load = None
+        if beats:
+            latest = max(beats, key=lambda b: b.get("ts") or 0)
+            if latest.get("load1") is not None:
+                load = float(latest["load1"]) / max(1, int(latest.get("cpus") or 1))
+        utils = [b["utilization"] for b in beats if b.get("utilization") is not None]
+        return NodeView(name=name, current=len(handles) + pending_restarts,
+                        min_workers=spec.min_workers, max_workers=spec.max_workers,
+                        load_per_cpu=load, utilization=sum(utils) / len(utils) if utils else None)
+
+    def evaluate(self, queue_stats: Optional[Dict[str, int]] = None):
+        """Apply one scaling decision (respecting the cooldown)."""
+        views = [self.node_view(name) for name in self.specs]
+        targets = plan_scaling(views, queue_stats, self.policy)
+        now = time.monotonic()
+        changes = {v.name: targets[v.name] - v.current for v in views if targets[v.name] != v.current}
+        if not changes:
+            return
+        out_of_bounds = any(not (v.min_workers <= v.current <= v.max_workers) for v in views)
+        if now - self._last_scale < self.policy.cooldown and not out_of_bounds:
+            return
+        self._last_scale = now
+        for name, delta in changes.items():
+            self._record("scale", node=name, delta=delta, target=targets[name],
+                         remaining=(queue_stats or {}).get("remaining"))
+            if delta > 0:
+                log.info(f"Scaling up {name} by {delta} (target {targets[name]})")
+                for _ in range(delta):
+                    self.start_worker(name)
+            else:
+                handles = sorted(self._node_workers(name),
+                                 key=lambda h: (h.heartbeat.get("utilization") or 0.0, -h.started))
+                for handle in handles[:-delta]:
+                    self.retire_worker(handle)
+
+    def _finished(self, queue_stats: Optional[Dict[str, int]]) -> bool:
+        if self.workers or self.restarts_due or self.retiring:
+            return False
+        if self.queue_stats_fn is None:
+            return True
+        return queue_stats is not None and queue_stats.get("remaining", 0) == 0
+
+    # -- main loop ---------------------------------------------------------
+
+    def start(self):
+        for name, spec in self.specs.items():
+            for _ in range(spec.workers):
+                self.start_worker(name)
+        self._last_scale = time.monotonic()
+
+    def step(self, timeout: float = 0.5) -> bool:
+        """One supervision round; returns False once all work is done."""
+        self.mux.poll(timeout)
+        self._reap()
+        self._restart_due()
+        now = time.monotonic()
+        idle = not (self.workers or self.restarts_due or self.retiring)
+        if idle or now - self._last_eval >= self.policy.interval:
+            self._last_eval = now
+            stats = self._queue_stats()
+            if self._finished(stats):
+                return False
+            self.evaluate(stats)
+        return True
+
+    def stop(self):
+        """Stop every worker: SIGTERM / Ctrl-C first, kill after ``stop_grace``."""
+        self._stopping = True
+        self.restarts_due.clear()
+        for handle in list(self.workers.values()):
+            self.retire_worker(handle)
+        deadline = time.monotonic() + self.policy.stop_grace
+        while self.retiring and time.monotonic() < deadline:
+            self.mux.poll(0.2)
+            self._reap()
+        for handle in self.retiring.values():
+            handle.process.kill()
+
+    def run(self, max_runtime: Optional[float] = None) -> Dict[str, Any]:
+        started = time.monotonic()
+        self.start()
+        try:
+            while self.step():
+                if max_runtime is not None and time.monotonic() - started > max_runtime:
+                    log.info("Maximum runtime reached, stopping workers")
+                    break
+        except KeyboardInterrupt:
+            log.info("Interrupted, stopping workers")
+        finally:
+            self.stop()
+            self.mux.drain(timeout=2.0)
+            for node in self.nodes.values():
+                node.close()
+        return self.summary(time.monotonic() - started)
+
+    def summary(self, wall: float) -> Dict[str, Any]:
+        count = lambda kind: sum(1 for e in self.events if e["event"] == kind)
+        return {
+            "wall_seconds": round(wall, 2),
+            "started": count("start"),
+            "crashes": count("crash"),
+            "scale_events": count("scale"),
+            "retired": count("retire"),
+            "queue": self.last_queue_stats,
+        }
+
+
+def _node_name(spec: NodeSpec) -> str:
+    return "local" if spec.is_local else spec.host
@@ -1,13 +1,34 @@
+"""
+Distributed Scraper Launcher
+
+Starts worker scripts locally or on the SSH nodes in cluster_config.json.
+With --supervise, a ClusterSupervisor keeps them running: workers are
+scaled per node from queue depth and heartbeat load, and crashed workers
+are restarted with backoff (see cluster_supervisor.py). Worker output is
+read through one selector-based LogMux in both modes.
+"""
 
 import argparse
 import json
+import logging
+import shlex
 import subprocess
-import threading
 import time
 import os
 import sys
 from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools.distributed.cluster_supervisor import (
+    ClusterSupervisor,
+    LogMux,
+    NodeSpec,
+    ScalePolicy,
+)
+
 # Try to import paramiko for SSH, but don't fail immediately if missing (might be local run)
 try:
     import paramiko
@@ -20,7 +41,18 @@ def load_config(config_path):
     with open(config_path, 'r') as f:
         return json.load(f)
 
-def run_local_worker(script_path, worker_id, env_vars=None):
+_log_mux = None
+
+
+def get_log_mux():
+    """Shared LogMux for workers started without an explicit one."""
+    global _log_mux
+    if _log_mux is None:
+        _log_mux = LogMux()
+    return _log_mux
+
+
+def run_local_worker(script_path, worker_id, env_vars=None, mux=None, script_args=None):
     """Run a worker process locally."""
     env = os.environ.copy()
     if env_vars:
@@ -28,7 +60,7 @@ def run_local_worker(script_path, worker_id, env_vars=None):
     
     env['WORKER_ID'] = str(worker_id)
     
-    cmd = [sys.executable, script_path]
+    cmd = [sys.executable, script_path] + list(script_args or [])
     print(f"[LOCAL] Starting worker {worker_id}: {' '.join(cmd)}")
     
     # We use subprocess.Popen to run in parallel
@@ -37,20 +69,16 @@ def run_local_worker(script_path, worker_id, env_vars=None):
         env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        universal_newlines=True
     )
     
-    # Simple log streamer
-    def stream_logs(pipe, prefix):
-        for line in iter(pipe.readline, ''):
-            print(f"[{prefix}] {line.strip()}")
-            
-    threading.Thread(target=stream_logs, args=(process.stdout, f"Worker-{worker_id}"), daemon=True).start()
-    threading.Thread(target=stream_logs, args=(process.stderr, f"Worker-{worker_id}-ERR"), daemon=True).start()
+    # Output is read by the caller's LogMux.poll() loop, not a thread per pipe
+    mux = mux or get_log_mux()
+    mux.add_pipe(process.stdout, f"Worker-{worker_id}")
+    mux.add_pipe(process.stderr, f"Worker-{worker_id}-ERR")
     
     return process
 
-def run_remote_worker(node_config, script_path, worker_id, global_env_vars=None):
+def run_remote_worker(node_config, script_path, worker_id, global_env_vars=None, mux=None, script_args=None):
     """Run a worker process on a remote node via SSH."""
     if not paramiko:
         print("[ERROR] Paramiko not installed. Cannot run remote workers. Install with 'pip install paramiko'.")
@@ -90,24 +118,14 @@ def run_remote_worker(node_config, script_path, worker_id, global_env_vars=None)
         # Remote command: Use nohup to keep it running? Or just run in foreground of SSH channel?
         # For simplicity, we run in foreground so we can stream logs.
         cmd = f"cd {repo_path} && {env_str} {python_path} {script_path}"
+        if script_args:
+            cmd += " " + " ".join(shlex.quote(a) for a in script_args)
         
         print(f"[REMOTE] {host}: Executing {cmd}")
         stdin, stdout, stderr = client.exec_command(cmd, get_pty=True)
         
-        # Stream logs
-        def stream_remote_logs(channel, prefix):
-            while not channel.exit_status_ready():
-                if channel.recv_ready():
-                    data = channel.recv(1024).decode('utf-8', errors='ignore')
-                    if data:
-                        for line in data.splitlines():
-                            print(f"[{prefix}] {line.strip()}")
-                time.sleep(0.1)
-                
-        # Paramiko exec_command returns channels that are a bit tricky to stream line-by-line in real-time
-        # But let's try a simple loop
-        t = threading.Thread(target=stream_remote_logs, args=(stdout.channel, f"{host}-Worker-{worker_id}"), daemon=True)
-        t.start()
+        # Channels are selectable, so they share the LogMux with local pipes
+        (mux or get_log_mux()).add_channel(stdout.channel, f"{host}-Worker-{worker_id}")
         
         return client, stdout.channel  # Return client to keep connection open
         
@@ -115,6 +133,66 @@ def run_remote_worker(node_config, script_path, worker_id, global_env_vars=None)
         print(f"[ERROR] Failed to start worker on {host}: {e}")
         return None
 
+def build_queue_stats_fn(run_id, scraper):
+    """get_queue_stats for the run, using the DB settings from platform.env / env vars."""
+    if not (run_id and scraper):
+        return None
+    from core.pipeline.url_work_queue import URLWorkQueue
+    
+    env = os.environ.get
+    db_config = {
+        'host': env('POSTGRES_HOST') or env('DB_HOST', 'localhost'),
+        'port': int(env('POSTGRES_PORT') or env('DB_PORT') or 5432),
+        'database': env('POSTGRES_DB') or env('DB_NAME', 'scraper_db'),
+        'user': env('POSTGRES_USER') or env('DB_USER', 'postgres'),
+        'password': env('POSTGRES_PASSWORD') or env('DB_PASSWORD', ''),
+    }
+    work_queue = URLWorkQueue(db_config)
+    return lambda: work_queue.get_queue_stats(run_id, scraper)
+
+
+def run_supervised(args, env_vars, script_args):
+    """--supervise: autoscale and restart workers until the queue is drained."""
+    logging.basicConfig(level=logging.INFO, format='[SUPERVISOR] %(message)s')
+    config = None if args.local else load_config(args.config)
+    policy = ScalePolicy.from_dict((config or {}).get('autoscale'))
+    if args.interval is not None:
+        policy.interval = args.interval
+    
+    if config and config.get('nodes'):
+        global_env = config.get('env_vars', {})
+        global_env.update(env_vars)
+        env_vars = global_env
+        nodes = [NodeSpec.from_config(node, args.workers) for node in config['nodes']]
+    else:
+        if not args.local:
+            print(f"[WARNING] Config file not found at {args.config}. Running locally.")
+        nodes = [NodeSpec.from_config({
+            'host': 'local',
+            'workers': args.workers,
+            'min_workers': args.min_workers if args.min_workers is not None else args.workers,
+            'max_workers': args.max_workers if args.max_workers is not None else args.workers,
+        })]
+    
+    # Workers inherit the run so they claim from the queue being watched
+    if args.run_id and args.scraper:
+        script_args = ['--scraper', args.scraper, '--run-id', args.run_id] + script_args
+    
+    supervisor = ClusterSupervisor(
+        nodes=nodes,
+        script=args.script,
+        policy=policy,
+        script_args=script_args,
+        env_vars=env_vars,
+        queue_stats_fn=build_queue_stats_fn(args.run_id, args.scraper),
+    )
+    for node in nodes:
+        print(f"--- Supervising {node.host}: {node.min_workers}-{node.max_workers} workers "
+              f"(starting {node.workers}) ---")
+    summary = supervisor.run(max_runtime=args.max_runtime)
+    print(f"--- Supervisor finished: {json.dumps(summary, default=str)} ---")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Distributed Scraper Launcher")
     parser.add_argument('--script', required=True, help="Path to the worker script (relative to project root)")
@@ -122,8 +200,19 @@ def main():
     parser.add_argument('--local', action='store_true', help="Run locally (ignore config nodes)")
     parser.add_argument('--workers', type=int, default=1, help="Number of workers (per node OR total local)")
     parser.add_argument('--env', action='append', help="Set env var (KEY=VALUE)")
+    parser.add_argument('--supervise', action='store_true',
+                        help="Autoscale workers from queue depth and heartbeats, restart crashed workers")
+    parser.add_argument('--run-id', help="Run ID whose queue depth drives autoscaling (passed to workers)")
+    parser.add_argument('--scraper', help="Scraper name whose queue depth drives autoscaling (passed to workers)")
+    parser.add_argument('--min-workers', type=int, help="Local --supervise lower bound (default: --workers)")
+    parser.add_argument('--max-workers', type=int, help="Local --supervise upper bound (default: --workers)")
+    parser.add_argument('--interval', type=float, help="Seconds between scaling evaluations")
+    parser.add_argument('--max-runtime', type=float, help="Stop all workers after this many seconds")
+    parser.add_argument('script_args', nargs=argparse.REMAINDER,
+                        help="Arguments after -- are passed to the worker script")
     
     args = parser.parse_args()
+    script_args = [a for a in args.script_args if a != '--'] if args.script_args else []
     
     # Parse env vars
     env_vars = {}
@@ -132,14 +221,19 @@ def main():
             if '=' in item:
                 k, v = item.split('=', 1)
                 env_vars[k] = v
+    
+    if args.supervise:
+        run_supervised(args, env_vars, script_args)
+        return
                 
+    mux = get_log_mux()
     processes = []
     ssh_clients = []
     
     if args.local:
         print(f"--- Launching {args.workers} Local Workers ---")
         for i in range(args.workers):
-            p = run_local_worker(args.script, i+1, env_vars)
+            p = run_local_worker(args.script, i+1, env_vars, mux, script_args)
             processes.append(p)
             time.sleep(1) # Stagger start
             
@@ -149,7 +243,7 @@ def main():
             print(f"[WARNING] Config file not found at {args.config}. Running locally.")
             # Fallback to local
             for i in range(args.workers):
-                 p = run_local_worker(args.script, i+1, env_vars)
+                 p = run_local_worker(args.script, i+1, env_vars, mux, script_args)
                  processes.append(p)
         else:
             global_env = config.get('env_vars', {})
@@ -168,7 +262,7 @@ def main():
                     # We need separate SSH connections for separate streams/processes usually,
                     # or keep one connection and use multiple channels. 
                     # For simplicity, we open a new connection per worker for now (not efficient but easy).
-                    res = run_remote_worker(node, args.script, total_launched+1, global_env)
+                    res = run_remote_worker(node, args.script, total_launched+1, global_env, mux, script_args)
                     if res:
                         client, channel = res
                         ssh_clients.append((client, channel))
@@ -179,7 +273,7 @@ def main():
     
     try:
         while True:
-            time.sleep(1)
+            mux.poll(1.0)
             # Check local processes (iterate over copy to allow safe removal)
             for p in processes[:]:
                 if p.poll() is not None:
@@ -194,6 +288,7 @@ def main():
                      client.close()
             
             if not processes and not ssh_clients:
+                mux.drain()
                 print("All workers finished.")
                 break
                 